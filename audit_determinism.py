@@ -10,12 +10,15 @@ Usage:
 """
 
 import argparse
-import hashlib
 import json
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from canonical_json import canonical_sha256, reject_floats
+
 
 class AuditResult:
     """Audit verification result"""
@@ -57,34 +60,8 @@ def canonical_hash(obj: Dict[str, Any]) -> str:
     - Integers only (no floats)
     - UTF-8 encoding
     """
-    def assert_no_float(n):
-        if not isinstance(n, int):
-            raise ValueError(f"Non-integer number in canonical hash: {n}")
-    
-    def canonicalize(value):
-        if value is None:
-            return "null"
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        if isinstance(value, int):
-            assert_no_float(value)
-            return str(value)
-        if isinstance(value, str):
-            # Minimal JSON escaping
-            escaped = value.replace('\\', '\\\\').replace('"', '\\"')
-            return f'"{escaped}"'
-        if isinstance(value, list):
-            items = ','.join(canonicalize(v) for v in value)
-            return f'[{items}]'
-        if isinstance(value, dict):
-            keys = sorted(value.keys())
-            body = ','.join(f'"{k}":{canonicalize(value[k])}' for k in keys)
-            return f'{{{body}}}'
-        raise ValueError(f"Unsupported type in canonical hash: {type(value)}")
-    
-    canonical_json = canonicalize(obj)
-    digest = hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
-    return digest
+    reject_floats(obj)
+    return canonical_sha256(obj, ensure_ascii=False)
 
 
 def verify_checkpoint_chain(checkpoints_dir: Path, result: AuditResult):
@@ -98,7 +75,7 @@ def verify_checkpoint_chain(checkpoints_dir: Path, result: AuditResult):
         return
     
     # Load all checkpoints
-    checkpoint_files = sorted(checkpoints_dir.glob("ckpt_*.json"))
+    checkpoint_files = sorted(checkpoints_dir.rglob("ckpt_*.json"))
     
     if not checkpoint_files:
         result.record_fail("Checkpoints found", "No checkpoint files")
@@ -8,8 +8,14 @@ Implements:
 
 import json
 import hashlib
+import os
+import sys
 from typing import Any, Dict, List
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from canonical_json import canonical_bytes
+
 
 def canonical_json(obj: Any) -> bytes:
     """
@@ -27,12 +33,7 @@ def canonical_json(obj: Any) -> bytes:
     Returns:
         UTF-8 encoded bytes of canonical JSON
     """
-    return json.dumps(
-        obj,
-        sort_keys=True,
-        separators=(',', ':'),
-        ensure_ascii=False
-    ).encode('utf-8')
+    return canonical_bytes(obj, ensure_ascii=False)
 
 
 def compute_verse_hash(operator: str, lines: List[str]) -> str:
@@ -6,13 +6,17 @@ Clean tick-based API for real-time control.
 import joblib
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Hashable, Optional
 import json
 
-# Add state module
+# Add state module and the shared compiled forest evaluator
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
 from state.state_space import VehicleStateV1, ControlCommand
+from compiled_forest import CompiledForest
+
+COMPILED_FOREST_DIR = "compiled_forest"
 
 
 class RandomForestDriver:
@@ -31,6 +35,7 @@ class RandomForestDriver:
     def __init__(self):
         self.models = {}
         self.scalers = {}
+        self.compiled = None
         self.metadata = None
         
         # Control history (for smoothness features)
@@ -43,6 +48,10 @@ class RandomForestDriver:
         """
         Load trained models from directory.
         
+        A compiled_forest/ directory next to the .joblib files is memory
+        mapped (no unpickling, pages shared between processes); otherwise
+        the forests are compiled on load.
+        
         Args:
             model_dir: Path to directory containing .joblib files and metadata
         
@@ -52,13 +61,22 @@ class RandomForestDriver:
         instance = cls()
         model_path = Path(model_dir)
         
-        # Load models
-        for target in ['steering', 'throttle', 'brake']:
-            instance.models[target] = joblib.load(model_path / f"{target}.joblib")
-        
-        # Load scalers
-        for name in ['features', 'steering', 'throttle', 'brake']:
-            instance.scalers[name] = joblib.load(model_path / f"scaler_{name}.joblib")
+        if (model_path / COMPILED_FOREST_DIR).is_dir():
+            instance.compiled = CompiledForest.load_dir(str(model_path / COMPILED_FOREST_DIR))
+        else:
+            # Load models
+            for target in ['steering', 'throttle', 'brake']:
+                instance.models[target] = joblib.load(model_path / f"{target}.joblib")
+            
+            # Load scalers
+            for name in ['features', 'steering', 'throttle', 'brake']:
+                instance.scalers[name] = joblib.load(model_path / f"scaler_{name}.joblib")
+            
+            instance.compiled = CompiledForest.from_sklearn(
+                instance.models,
+                feature_scaler=instance.scalers['features'],
+                target_scalers={t: instance.scalers[t] for t in ['steering', 'throttle', 'brake']}
+            )
         
         # Load metadata
         with open(model_path / "model_metadata.json") as f:
@@ -81,40 +99,13 @@ class RandomForestDriver:
             ControlCommand with steering/throttle/brake
         """
         # Build feature vector (includes prev controls for smoothness)
-        features = [
-            state.speed_mps,
-            state.yaw_rate_rad_s,
-            state.track_progress_m,
-            state.distance_to_center_m,
-            state.curvature_now_1pm,
-            state.curvature_10m_ahead_1pm,
-            state.curvature_30m_ahead_1pm,
-            state.grad_now,
-            state.dist_left_edge_m,
-            state.dist_right_edge_m,
-            self.prev_steering,
-            self.prev_throttle,
-            self.prev_brake
-        ]
+        features = self._features(state, self.prev_steering, self.prev_throttle, self.prev_brake)
         
         X = np.array([features], dtype=np.float32)
         
-        # Normalize
-        X_scaled = self.scalers['features'].transform(X)
-        
-        # Predict (scaled)
-        predictions = {}
-        for target in ['steering', 'throttle', 'brake']:
-            y_pred_scaled = self.models[target].predict(X_scaled)
-            y_pred = self.scalers[target].inverse_transform(
-                y_pred_scaled.reshape(-1, 1)
-            ).ravel()[0]
-            predictions[target] = float(y_pred)
-        
-        # Clamp to valid ranges
-        steering = np.clip(predictions['steering'], -1.0, 1.0)
-        throttle = np.clip(predictions['throttle'], 0.0, 1.0)
-        brake = np.clip(predictions['brake'], 0.0, 1.0)
+        # Normalize, predict and unscale in one pass over the compiled forests
+        y_pred = self.compiled.predict_one(X).tolist()
+        steering, throttle, brake = self._clamp(dict(zip(self.compiled.output_names, y_pred)))
         
         # Update history
         self.prev_steering = steering
@@ -127,6 +118,34 @@ class RandomForestDriver:
             brake_command=brake
         )
     
+    @staticmethod
+    def _features(state: VehicleStateV1, prev_steering: float, prev_throttle: float, prev_brake: float) -> list:
+        """Model input: state features plus the car's previous commands."""
+        return [
+            state.speed_mps,
+            state.yaw_rate_rad_s,
+            state.track_progress_m,
+            state.distance_to_center_m,
+            state.curvature_now_1pm,
+            state.curvature_10m_ahead_1pm,
+            state.curvature_30m_ahead_1pm,
+            state.grad_now,
+            state.dist_left_edge_m,
+            state.dist_right_edge_m,
+            prev_steering,
+            prev_throttle,
+            prev_brake
+        ]
+    
+    @staticmethod
+    def _clamp(predictions: dict) -> tuple:
+        """Clamp predictions to valid ranges: (steering, throttle, brake)."""
+        return (
+            np.clip(predictions['steering'], -1.0, 1.0),
+            np.clip(predictions['throttle'], 0.0, 1.0),
+            np.clip(predictions['brake'], 0.0, 1.0)
+        )
+    
     def reset(self):
         """Reset control history (e.g., at lap start)."""
         self.prev_steering = 0.0
@@ -160,6 +179,64 @@ class RandomForestDriver:
         return np.mean(r2_values) if r2_values else 0.0
 
 
+class RandomForestFleet:
+    """
+    Several cars sharing one RandomForestDriver's models, predicted together.
+    
+    Keeps each car's control history, gathers a tick's feature vectors into
+    one matrix and runs the compiled forests once. Every car gets the same
+    commands a RandomForestDriver of its own would give for its states.
+    
+    Usage:
+        fleet = RandomForestFleet(RandomForestDriver.load_from_directory("data/models"))
+        
+        for tick in simulation_loop:
+            commands = fleet.tick({car_id: state_v1, ...})
+    """
+    
+    def __init__(self, driver: RandomForestDriver):
+        self.driver = driver
+        self.prev_commands: Dict[Hashable, tuple] = {}
+    
+    def tick(self, states: Dict[Hashable, VehicleStateV1]) -> Dict[Hashable, ControlCommand]:
+        """
+        Compute control commands for every car in states.
+        
+        Args:
+            states: {car_id: VehicleStateV1}; new car ids start with zero history
+        
+        Returns:
+            {car_id: ControlCommand}
+        """
+        car_ids = list(states)
+        if not car_ids:
+            return {}
+        features = [
+            RandomForestDriver._features(states[car_id], *self.prev_commands.get(car_id, (0.0, 0.0, 0.0)))
+            for car_id in car_ids
+        ]
+        X = np.array(features, dtype=np.float32).reshape(len(car_ids), -1)
+        
+        names = self.driver.compiled.output_names
+        commands = {}
+        for car_id, y_pred in zip(car_ids, self.driver.compiled.predict(X).tolist()):
+            steering, throttle, brake = RandomForestDriver._clamp(dict(zip(names, y_pred)))
+            self.prev_commands[car_id] = (steering, throttle, brake)
+            commands[car_id] = ControlCommand(
+                steering_command=steering,
+                throttle_command=throttle,
+                brake_command=brake
+            )
+        return commands
+    
+    def reset(self, car_id: Optional[Hashable]=None):
+        """Reset control history for one car, or the whole fleet."""
+        if car_id is None:
+            self.prev_commands.clear()
+        else:
+            self.prev_commands.pop(car_id, None)
+
+
 # Example usage
 if __name__ == "__main__":
     print("Example: Loading and using RF driver\n")
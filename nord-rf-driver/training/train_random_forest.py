@@ -25,10 +25,13 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
 import yaml
 
-# Add state module to path
+# Add state module and the shared compiled forest evaluator to path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
 from state.state_space import VehicleStateV1
+from compiled_forest import CompiledForest
+from racing_ai_trainer import DeterministicRandomForest
 
 
 def load_config(config_path: str) -> dict:
@@ -123,25 +126,38 @@ def train_model(
     return rf, val_mse, val_r2
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Train Random Forest driver")
-    parser.add_argument('--data', required=True, help='Training data path (.ndjson or .csv)')
-    parser.add_argument('--config', default='training/configs/rf_default.yaml', 
-                       help='Config file')
-    parser.add_argument('--output-dir', default='data/models', 
-                       help='Output directory for models')
-    
-    args = parser.parse_args()
+def iter_training_chunks(data_path: str, chunk_rows: int):
+    """
+    Stream (X, y_dict) chunks of chunk_rows lines with the same filtering
+    as load_training_data, without reading the whole file.
+    """
+    if data_path.endswith('.ndjson'):
+        reader = pd.read_json(data_path, lines=True, chunksize=chunk_rows)
+    elif data_path.endswith('.csv'):
+        reader = pd.read_csv(data_path, chunksize=chunk_rows)
+    else:
+        raise ValueError(f"Unsupported format: {data_path}")
     
-    # Load config
-    config = load_config(args.config)
-    print(f"✓ Loaded config: {args.config}")
-    print(f"  - n_estimators: {config['n_estimators']}")
-    print(f"  - max_depth: {config['max_depth']}")
-    print(f"  - seed: {config['seed']}")
+    feature_cols = VehicleStateV1.feature_names()
+    for df in reader:
+        df = df[(df['valid'] == True) & (df['event'] == '')]
+        if df.empty:
+            continue
+        yield df[feature_cols].values.astype(np.float32), {
+            target: df[f'{target}_command'].values.astype(np.float32)
+            for target in ['steering', 'throttle', 'brake']
+        }
+
+
+def train_in_memory(data_path: str, config: dict) -> tuple:
+    """
+    Load the whole dataset and train one forest per target.
     
+    Returns:
+        (models, scalers, metrics)
+    """
     # Load data
-    df = load_training_data(args.data)
+    df = load_training_data(data_path)
     
     # Extract features & targets
     X, y_dict = extract_features_targets(df)
@@ -211,6 +227,56 @@ def main():
             'test_r2': float(test_r2)
         }
     
+    return models, scalers, metrics
+
+
+def train_streaming(data_path: str, config: dict, chunk_rows: int) -> tuple:
+    """
+    Out-of-core training: per-chunk sub-forests merged into one forest per
+    target, memory bounded by chunk_rows (see incremental_forest).
+    
+    Returns:
+        (models, scalers, metrics)
+    """
+    rf = DeterministicRandomForest(
+        seed=config['seed'],
+        n_estimators=config['n_estimators'],
+        max_depth=config['max_depth'],
+        min_samples_leaf=config['min_samples_leaf'],
+        min_samples_split=config.get('min_samples_split', 10)
+    )
+    report = rf.train_out_of_core(
+        lambda: iter_training_chunks(data_path, chunk_rows),
+        test_size=config.get('test_size', 0.2),
+        validation_size=config.get('val_size', 0.1)
+    )
+    return rf.models, rf.scalers, report['metrics']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train Random Forest driver")
+    parser.add_argument('--data', required=True, help='Training data path (.ndjson or .csv)')
+    parser.add_argument('--config', default='training/configs/rf_default.yaml', 
+                       help='Config file')
+    parser.add_argument('--output-dir', default='data/models', 
+                       help='Output directory for models')
+    parser.add_argument('--chunk-rows', type=int, default=None,
+                       help='Stream the data in chunks of this many rows (out-of-core training)')
+    
+    args = parser.parse_args()
+    
+    # Load config
+    config = load_config(args.config)
+    print(f"✓ Loaded config: {args.config}")
+    print(f"  - n_estimators: {config['n_estimators']}")
+    print(f"  - max_depth: {config['max_depth']}")
+    print(f"  - seed: {config['seed']}")
+    
+    if args.chunk_rows:
+        models, scalers, metrics = train_streaming(args.data, config, args.chunk_rows)
+    else:
+        models, scalers, metrics = train_in_memory(args.data, config)
+    
     # Save models and scalers
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -221,10 +287,21 @@ def main():
     for name, scaler in scalers.items():
         joblib.dump(scaler, output_dir / f"scaler_{name}.joblib")
     
+    # Flat-array export read by RandomForestDriver without sklearn
+    CompiledForest.from_sklearn(
+        models,
+        feature_scaler=scalers['features'],
+        target_scalers={name: scalers[name] for name in models}
+    ).save_dir(str(output_dir / "compiled_forest"))
+    
     print(f"\n✓ Saved models to {output_dir}/")
     
     # Compute training data hash for lineage
-    data_hash = hashlib.sha256(Path(args.data).read_bytes()).hexdigest()
+    data_digest = hashlib.sha256()
+    with open(args.data, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            data_digest.update(block)
+    data_hash = data_digest.hexdigest()
     
     # Save metadata
     metadata = {
@@ -1,2 +1,2 @@
-from .expert_pilot import ExpertPilot, PilotConfig
+from .expert_pilot import ExpertPilot, PilotConfig, build_speed_profile
 from .rf_pilot import RFPilot
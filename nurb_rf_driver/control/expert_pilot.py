@@ -2,15 +2,22 @@
 Expert Pilot Controller.
 Implements Pure Pursuit for steering and Curvature-based speed control.
 Generates 'expert' driving behavior for training the RF model.
+
+The target speed comes from a speed-limit profile precomputed over the
+whole lap at construction: the lateral-grip limit sqrt(a_lat / |k|) at
+every sample, then a forward pass (acceleration limit) and a backward pass
+(braking limit) around the closed track. compute_control() only indexes it.
 """
 
 import math
 import numpy as np
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Tuple
 
 from ..track.track_model import TrackModel
 
+G = 9.81
+
 @dataclass
 class PilotConfig:
     lookahead_min_m: float = 15.0
@@ -21,6 +28,11 @@ class PilotConfig:
     cornering_speed_factor: float = 3.5 # speed = sqrt(lat_accel / curvature)
     max_lat_accel_g: float = 2.5 # High downforce GT3
     
+    max_accel_g: float = 0.5 # forward pass (engine limited)
+    max_brake_decel_g: float = 0.8 # backward pass, margin under ~1 g of brake force
+    profile_step_m: float = 1.0 # speed-limit profile resolution
+    profile_preview_s: float = 0.25 # read the profile this far ahead to cover controller lag
+
     throttle_kp: float = 2.0
     brake_kp: float = 5.0
 
@@ -28,7 +40,16 @@ class ExpertPilot:
     def __init__(self, track_model: TrackModel, config: PilotConfig = PilotConfig()):
         self.track = track_model
         self.config = config
-        
+        self._cursor = track_model.cursor()
+        self.speed_profile = build_speed_profile(track_model, config)
+        self._speed_limits: List[float] = self.speed_profile.tolist()
+        self._samples_per_m = len(self._speed_limits) / track_model.total_length_m
+
+    def target_speed_at(self, dist_m: float) -> float:
+        """Speed limit (m/s) from the precomputed profile at track distance dist_m."""
+        i = int((dist_m % self.track.total_length_m) * self._samples_per_m)
+        return self._speed_limits[i if i < len(self._speed_limits) else -1]
+
     def compute_control(
         self, 
         current_speed_mps: float,
@@ -48,7 +69,7 @@ class ExpertPilot:
         
         # Get target point on track centerline
         target_dist = current_dist_m + lookahead_dist
-        target_state = self.track.get_state_at_distance(target_dist)
+        target_state = self._cursor.state_at(target_dist)
         tx, ty = target_state["x"], target_state["y"]
         
         # Transform target to vehicle frame
@@ -71,19 +92,7 @@ class ExpertPilot:
         steering_norm = max(-1.0, min(1.0, steer_cmd / 0.5))
         
         # 2. Longitudinal Control (Speed Profile)
-        # Lookahead curvature for speed limit
-        # Check specific points ahead to find max curvature constraint
-        curvatures = []
-        for d in [0, 20, 50, 100, 150]:
-            s = self.track.get_state_at_distance(current_dist_m + d)
-            curvatures.append(abs(s["curvature"]))
-            
-        max_curv = max(curvatures) if curvatures else 0.0
-        max_curv = max(0.0001, max_curv) # avoid div0
-        
-        # v_max = sqrt(a_lat_max / k)
-        target_speed = math.sqrt((cfg.max_lat_accel_g * 9.81) / max_curv)
-        target_speed = min(cfg.max_speed_mps, target_speed)
+        target_speed = self.target_speed_at(current_dist_m + cfg.profile_preview_s * current_speed_mps)
         
         # Simple P-Controller for speed
         speed_error = target_speed - current_speed_mps
@@ -97,3 +106,28 @@ class ExpertPilot:
             brake_norm = min(1.0, -speed_error * cfg.brake_kp / 20.0)
             
         return steering_norm, throttle_norm, brake_norm
+
+
+def build_speed_profile(track: TrackModel, config: PilotConfig) -> np.ndarray:
+    """
+    Speed limit (m/s) every config.profile_step_m along the lap.
+
+    Starts from the lateral limit v = sqrt(a_lat / |k|) (capped at
+    max_speed_mps), then enforces v[i+1]^2 <= v[i]^2 + 2 a ds forward and
+    v[i]^2 <= v[i+1]^2 + 2 b ds backward. Each pass runs two laps so the
+    limits carry across the start/finish line.
+    """
+    n = max(1, int(math.ceil(track.total_length_m / config.profile_step_m)))
+    ds = track.total_length_m / n
+    curvature = np.abs(track.get_states_at_distances(np.arange(n) * ds)["curvature"])
+    v2 = np.full(n, config.max_speed_mps ** 2)
+    np.minimum(v2, config.max_lat_accel_g * G / np.maximum(curvature, 1e-12), out=v2)
+    v2 = v2.tolist()
+
+    accel = 2.0 * config.max_accel_g * G * ds
+    for i in range(1, 2 * n):
+        v2[i % n] = min(v2[i % n], v2[(i - 1) % n] + accel)
+    brake = 2.0 * config.max_brake_decel_g * G * ds
+    for i in range(2 * n - 2, -1, -1):
+        v2[i % n] = min(v2[i % n], v2[(i + 1) % n] + brake)
+    return np.sqrt(np.asarray(v2))
@@ -4,23 +4,49 @@ Uses trained RF model to control the vehicle based on extracted features.
 """
 
 import os
+import sys
 import joblib
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
 
 from ..state.feature_extractor import FeatureExtractor
 from ..track.track_model import TrackModel
 
+# Shared compiled forest evaluator lives in the repository's src/
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src"))
+from compiled_forest import CompiledForest
+
 MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models", "rf_driver_v1.joblib")
+COMPILED_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models", "rf_driver_v1_compiled")
+
+def load_rf_model(model_path: Optional[str] = None) -> CompiledForest:
+    """
+    Load the driver model as a CompiledForest.
+
+    Args:
+        model_path: A save_dir() directory or a joblib sklearn model. By
+            default the memory-mapped flat-array export if training wrote
+            one, else the sklearn model compiled on load.
+    """
+    if model_path is None:
+        model_path = COMPILED_MODEL_PATH if os.path.isdir(COMPILED_MODEL_PATH) else MODEL_PATH
+    if os.path.isdir(model_path):
+        print(f"🤖 Loading compiled RF Model from {model_path}...")
+        model = CompiledForest.load_dir(model_path)
+    else:
+        print(f"🤖 Loading RF Model from {model_path}...")
+        model = CompiledForest.from_sklearn(joblib.load(model_path))
+    print("   Model loaded.")
+    return model
+
 
 class RFPilot:
-    def __init__(self, track_model: TrackModel):
+    def __init__(self, track_model: TrackModel, model_path: Optional[str] = None):
         self.track = track_model # Not used by RF directly (reactive), but kept for interface consistency
         self.extractor = FeatureExtractor()
-        
-        print(f"🤖 Loading RF Model from {MODEL_PATH}...")
-        self.model = joblib.load(MODEL_PATH)
-        print("   Model loaded.")
+        # Model input reused every tick; the extractor writes straight into it
+        self._features = np.empty((1, self.extractor.num_features))
+        self.model = load_rf_model(model_path)
         
     def compute_control(
         self, 
@@ -48,17 +74,12 @@ class RFPilot:
             # SimEnv state object has them all.
             raise ValueError("RFPilot requires vehicle_state_obj")
             
-        # Extract features
-        # 1. Extract raw
-        raw_features = self.extractor.extract_features(vehicle_state_obj)
-        
-        # 2. Normalize
-        norm_features = self.extractor.normalize_features(raw_features)
+        # 1-2. Extract and normalize into the (1, n_features) model input
+        X = self._features
+        self.extractor.extract_features_into(vehicle_state_obj, X[0], normalize=True)
         
         # 3. Predict
-        # Reshape to (1, n_features)
-        X = np.array([norm_features])
-        y_pred = self.model.predict(X)[0]
+        y_pred = self.model.predict_one(X)
         
         # 4. Unpack
         # Target order from FeatureExtractor
@@ -1,5 +1,6 @@
 """Nürburgring RF Driver - Environment module."""
 
 from .sim_env import SimEnv, VehicleState, CoordInt
+from .vector_env import VectorSimEnv, split_metadata
 
-__all__ = ['SimEnv', 'VehicleState', 'CoordInt']
+__all__ = ['SimEnv', 'VehicleState', 'CoordInt', 'VectorSimEnv', 'split_metadata']
@@ -7,7 +7,8 @@ import random
 import hashlib
 import struct
 import math
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+from operator import attrgetter
 from typing import Dict, Any, Optional, Tuple
 import os
 
@@ -52,6 +53,14 @@ class VehicleState:
     curvature_ahead_60m: float
 
 
+# hash_state_tensor() input: magic, tick, elapsed time, then every
+# VehicleState field as a big-endian float32 in field-name order
+STATE_HASH_MAGIC = b"STATEv1\x00"
+STATE_HASH_FIELDS = tuple(sorted(field.name for field in fields(VehicleState)))
+STATE_HASH_STRUCT = struct.Struct(">8sQd" + "f" * len(STATE_HASH_FIELDS))
+_state_hash_values = attrgetter(*STATE_HASH_FIELDS)
+
+
 @dataclass
 class CoordInt:
     """Integer coordinate for deterministic phase space."""
@@ -90,6 +99,8 @@ class SimEnv:
         # Initialize Physics & Track
         self.dynamics = VehicleDynamics()
         self.track = TrackModel(track_path)
+        # One segment-index cache per query stream: now, +10 m, +30 m, +60 m
+        self._track_cursors = tuple(self.track.cursor() for _ in range(4))
         
         # Internal state tracking
         self.current_dist_m = 0.0
@@ -122,6 +133,7 @@ class SimEnv:
         
         # Hash chain state
         self.prev_chain_hash: Optional[str] = None
+        self._hash_buffer = bytearray(STATE_HASH_STRUCT.size)
         
         # Fixed-point scaling factors
         self.SCALE_POS = 1000  # millimeters
@@ -166,18 +178,13 @@ class SimEnv:
         Compute deterministic hash over state tensor.
         Returns SHA256 hex string.
         """
-        # Pack state into bytes with stable ordering
-        buf = bytearray()
-        buf += b"STATEv1\x00"
-        buf += struct.pack(">Q", self.tick)
-        buf += struct.pack(">d", self.time_elapsed)
-        
-        # Pack all state fields in fixed order
-        state_dict = asdict(self.vehicle_state)
-        for key in sorted(state_dict.keys()):
-            buf += struct.pack(">f", float(state_dict[key]))
-        
-        return hashlib.sha256(bytes(buf)).hexdigest()
+        # Fixed layout packed into a reused buffer (see STATE_HASH_STRUCT)
+        STATE_HASH_STRUCT.pack_into(
+            self._hash_buffer, 0,
+            STATE_HASH_MAGIC, self.tick, self.time_elapsed,
+            *_state_hash_values(self.vehicle_state)
+        )
+        return hashlib.sha256(self._hash_buffer).hexdigest()
     
     def chain_hash(self, current_hex: str) -> str:
         """
@@ -197,31 +204,59 @@ class SimEnv:
         cur = bytes.fromhex(current_hex)
         return hashlib.sha256(prev + cur).hexdigest()
     
-    def reset(self) -> VehicleState:
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        JSON-serializable restart point for the current tick.
+        restore() of it continues the state and hash chain bit for bit
+        (Python floats round-trip exactly through JSON).
+        """
+        return {
+            "tick": self.tick,
+            "time_elapsed": self.time_elapsed,
+            "current_dist_m": self.current_dist_m,
+            "prev_chain_hash": self.prev_chain_hash,
+            "vehicle_state": asdict(self.vehicle_state)
+        }
+
+    def restore(self, snapshot: Dict[str, Any]) -> VehicleState:
+        """Resume from a snapshot() taken on an env with the same seed, run_id and identity."""
+        self.tick = snapshot["tick"]
+        self.time_elapsed = snapshot["time_elapsed"]
+        self.current_dist_m = snapshot["current_dist_m"]
+        self.prev_chain_hash = snapshot["prev_chain_hash"]
+        self.vehicle_state = VehicleState(**snapshot["vehicle_state"])
+        return self.vehicle_state
+
+    def reset(self, start_dist_m: float = 0.0) -> VehicleState:
         """
         Reset environment to initial state.
         Returns initial vehicle state.
+
+        Args:
+            start_dist_m: Track distance to start from; the car sits at rest on
+                the centerline facing along the track (0.0 is the origin start)
         """
         random.seed(self.seed)
         self.tick = 0
         self.time_elapsed = 0.0
         self.prev_chain_hash = None
-        self.current_dist_m = 0.0
+        self.current_dist_m = start_dist_m % self.track.total_length_m
+        start = self.track.get_state_at_distance(self.current_dist_m)
         
         # Reset vehicle to start position
         self.vehicle_state = VehicleState(
-            track_x_m=0.0,
-            track_y_m=0.0,
+            track_x_m=start["x"],
+            track_y_m=start["y"],
             track_z_m=0.0,
             speed_mps=0.0,
             vx_mps=0.0,
             vy_mps=0.0,
-            heading_rad=0.0,
+            heading_rad=start["heading"],
             yaw_rate_rps=0.0,
             steering_angle_norm=0.0,
             throttle_norm=0.0,
             brake_norm=0.0,
-            track_progress=0.0,
+            track_progress=self.current_dist_m / self.track.total_length_m,
             dist_to_centerline_m=0.0,
             heading_error_rad=0.0,
             curvature_now=0.0,
@@ -315,7 +350,7 @@ class SimEnv:
         self.vehicle_state.track_progress = self.current_dist_m / self.track.total_length_m
         
         # Track Queries
-        track_state = self.track.get_state_at_distance(self.current_dist_m)
+        track_state = self._track_cursors[0].state_at(self.current_dist_m)
         
         # Lateral error (simplified: distance between vehicle pos and track centerline point)
         # Get centerline point
@@ -345,9 +380,9 @@ class SimEnv:
         s_30 = self.current_dist_m + 30.0
         s_60 = self.current_dist_m + 60.0
         
-        self.vehicle_state.curvature_ahead_10m = self.track.get_state_at_distance(s_10)["curvature"]
-        self.vehicle_state.curvature_ahead_30m = self.track.get_state_at_distance(s_30)["curvature"]
-        self.vehicle_state.curvature_ahead_60m = self.track.get_state_at_distance(s_60)["curvature"]
+        self.vehicle_state.curvature_ahead_10m = self._track_cursors[1].curvature_at(s_10)
+        self.vehicle_state.curvature_ahead_30m = self._track_cursors[2].curvature_at(s_30)
+        self.vehicle_state.curvature_ahead_60m = self._track_cursors[3].curvature_at(s_60)
         
         # Advance tick
         # Advance tick
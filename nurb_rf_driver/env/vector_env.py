@@ -0,0 +1,257 @@
+"""
+Vectorized simulation environment pool.
+Steps K SimEnv-equivalent environments in lockstep on (K,) float64 arrays.
+
+Every env has its own run_id (and so its own seed_u64 stream), tick counter
+and hash chain, and produces exactly the state_hash / chain_hash sequence
+a standalone SimEnv with the same run_id, root_identity and controls
+would. Physics and track queries are batched; the per-env work left is the
+three SHA-256 digests of the metadata.
+"""
+
+import hashlib
+import math
+from dataclasses import fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..libm import libm_map
+from .sim_env import STATE_HASH_FIELDS, STATE_HASH_MAGIC, TRACK_PATH, VehicleState
+from .vehicle_dynamics import VehicleDynamics
+from ..track.track_model import TrackModel
+
+# Columns of the observation array, in VehicleState field order
+STATE_FIELDS = tuple(field.name for field in fields(VehicleState))
+_FIELD = {name: i for i, name in enumerate(STATE_FIELDS)}
+
+# SimEnv.hash_state_tensor() layout (STATE_HASH_STRUCT) as a record dtype
+_HASH_ORDER = [_FIELD[name] for name in STATE_HASH_FIELDS]
+_HASH_RECORD = np.dtype([
+    ('magic', 'S8'),
+    ('tick', '>u8'),
+    ('time', '>f8'),
+    ('fields', '>f4', (len(STATE_FIELDS),))
+])
+
+_ZERO_HASH = b"\x00" * 32
+
+
+class VectorSimEnv:
+    """
+    Pool of num_envs deterministic environments stepped together.
+
+    Env k defaults to run_id f"sim_{k + 1:03d}", so env 0 replays
+    SimEnv(run_id="sim_001"). Observations are (K, len(STATE_FIELDS))
+    float64 arrays; metadata is columnar (see split_metadata()).
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        seed: int = 42,
+        dt: float = 0.02,
+        run_ids: Optional[Sequence[str]] = None,
+        root_identity: str = "Han",
+        track_path: str = TRACK_PATH
+    ):
+        if num_envs < 1:
+            raise ValueError("num_envs must be at least 1")
+        if run_ids is None:
+            run_ids = [f"sim_{k + 1:03d}" for k in range(num_envs)]
+        if len(run_ids) != num_envs:
+            raise ValueError(f"Expected {num_envs} run_ids, got {len(run_ids)}")
+
+        self.num_envs = num_envs
+        self.seed = seed
+        self.dt = dt
+        self.run_ids = [str(run_id) for run_id in run_ids]
+        self.root_identity = root_identity
+
+        self.dynamics = VehicleDynamics()
+        self.track = TrackModel(track_path)
+        self._seed_prefixes = [f"{root_identity}|{run_id}|".encode('utf-8') for run_id in self.run_ids]
+
+        self._state = np.zeros((len(STATE_FIELDS), num_envs))
+        self.current_dist_m = np.zeros(num_envs)
+        self.tick = np.zeros(num_envs, dtype=np.int64)
+        self.time_elapsed = np.zeros(num_envs)
+        self._prev_chain: List[bytes] = [_ZERO_HASH] * num_envs
+
+        # Reused hash input records
+        self._records = np.zeros(num_envs, dtype=_HASH_RECORD)
+        self._records['magic'] = STATE_HASH_MAGIC
+
+        # Fixed-point scaling factors
+        self.SCALE_POS = 1000  # millimeters
+
+    def reset(
+        self,
+        env_ids: Optional[Sequence[int]] = None,
+        start_dist_m: Union[float, Sequence[float]] = 0.0
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Reset the given envs (all by default) to the start position.
+
+        start_dist_m (one value, or one per reset env) places the car at
+        rest on the centerline there, as SimEnv.reset(start_dist_m) does.
+
+        Returns:
+            (observations for all envs, metadata for the reset envs)
+        """
+        envs = np.arange(self.num_envs) if env_ids is None else np.asarray(env_ids, dtype=np.intp)
+        starts = np.broadcast_to(np.asarray(start_dist_m, dtype=np.float64), envs.shape).tolist()
+        self._state[:, envs] = 0.0
+        total = self.track.total_length_m
+        for k, dist in zip(envs.tolist(), starts):
+            dist = dist % total
+            start = self.track.get_state_at_distance(dist)
+            self._state[_FIELD['track_x_m'], k] = start["x"]
+            self._state[_FIELD['track_y_m'], k] = start["y"]
+            self._state[_FIELD['heading_rad'], k] = start["heading"]
+            self._state[_FIELD['track_progress'], k] = dist / total
+            self.current_dist_m[k] = dist
+        self.tick[envs] = 0
+        self.time_elapsed[envs] = 0.0
+        for k in envs.tolist():
+            self._prev_chain[k] = _ZERO_HASH
+        return self.observations(), self._compute_metadata(envs)
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Advance every env by one tick.
+
+        Args:
+            actions: (K, 3) steering [-1, 1], throttle [0, 1], brake [0, 1]
+
+        Returns:
+            (observations, metadata), as SimEnv.step() returns per env
+        """
+        self.advance(actions)
+        return self.observations(), self.tick_metadata()
+
+    def advance(self, actions: np.ndarray):
+        """
+        step() without the metadata: physics and track queries only. Must be
+        followed by tick_metadata(), which advances the hash chains.
+        """
+        actions = np.asarray(actions, dtype=np.float64)
+        if actions.shape != (self.num_envs, 3):
+            raise ValueError(f"Expected actions of shape ({self.num_envs}, 3), got {actions.shape}")
+        s, f, dt = self._state, _FIELD, self.dt
+
+        steering, throttle, brake = actions[:, 0], actions[:, 1], actions[:, 2]
+        s[f['steering_angle_norm']] = steering
+        s[f['throttle_norm']] = throttle
+        s[f['brake_norm']] = brake
+
+        (s[f['speed_mps']], s[f['vx_mps']], s[f['vy_mps']],
+         s[f['heading_rad']], s[f['yaw_rate_rps']]) = self.dynamics.update_batch(
+            dt,
+            s[f['speed_mps']], s[f['vx_mps']], s[f['vy_mps']],
+            s[f['heading_rad']], s[f['yaw_rate_rps']],
+            steering, throttle, brake
+        )
+
+        s[f['track_x_m']] += s[f['vx_mps']] * dt
+        s[f['track_y_m']] += s[f['vy_mps']] * dt
+
+        # Distance along track, wrapped once per lap
+        total = self.track.total_length_m
+        dist = self.current_dist_m + s[f['speed_mps']] * dt
+        dist = np.where(dist > total, dist - total, dist)
+        self.current_dist_m = dist
+        s[f['track_progress']] = dist / total
+
+        # Current point and the three lookaheads in one track query
+        k = self.num_envs
+        track = self.track.get_states_at_distances(np.concatenate([dist, dist + 10.0, dist + 30.0, dist + 60.0]))
+        heading = track["heading"][:k]
+
+        dx = s[f['track_x_m']] - track["x"][:k]
+        dy = s[f['track_y_m']] - track["y"][:k]
+        s[f['dist_to_centerline_m']] = -libm_map(math.sin, heading) * dx + libm_map(math.cos, heading) * dy
+
+        ang_diff = s[f['heading_rad']] - heading
+        s[f['heading_error_rad']] = np.remainder(ang_diff + math.pi, 2 * math.pi) - math.pi
+
+        curvature = track["curvature"].reshape(4, k)
+        s[f['curvature_now']] = curvature[0]
+        s[f['curvature_ahead_10m']] = curvature[1]
+        s[f['curvature_ahead_30m']] = curvature[2]
+        s[f['curvature_ahead_60m']] = curvature[3]
+
+        self.tick += 1
+        self.time_elapsed += dt
+
+    def tick_metadata(self) -> Dict[str, Any]:
+        """Columnar metadata and hashes of the tick advance() just produced."""
+        return self._compute_metadata(np.arange(self.num_envs))
+
+    def observations(self) -> np.ndarray:
+        """(K, len(STATE_FIELDS)) copy of every env's state."""
+        return self._state.T.copy()
+
+    def state(self, env_id: int) -> VehicleState:
+        """One env's state as a VehicleState."""
+        return VehicleState(*self._state[:, env_id].tolist())
+
+    def _compute_metadata(self, envs: np.ndarray) -> Dict[str, Any]:
+        """Columnar tick metadata and hashes for envs; advances their chains."""
+        s = self._state
+
+        # Fixed-point coordinate with the origin basis rule
+        coord = np.rint(s[[_FIELD['track_x_m'], _FIELD['track_y_m'], _FIELD['track_z_m']]][:, envs].T
+                        * self.SCALE_POS).astype(np.int64)
+        coord[~coord.any(axis=1), 2] = 1
+
+        records = self._records[:len(envs)]
+        records['tick'] = self.tick[envs]
+        records['time'] = self.time_elapsed[envs]
+        records['fields'] = s[_HASH_ORDER][:, envs].T
+        buf = records.tobytes()
+        size = _HASH_RECORD.itemsize
+
+        sha256 = hashlib.sha256
+        env_list = envs.tolist()
+        ticks = self.tick[envs].tolist()
+        # seed_u64("STATE") message: prefix per env, suffix per distinct tick
+        suffixes = {tick: f"{tick}|STATE".encode('utf-8') for tick in set(ticks)}
+        prefixes = self._seed_prefixes
+        seeds = [
+            int.from_bytes(sha256(prefixes[k] + suffixes[tick]).digest()[:8], 'big')
+            for k, tick in zip(env_list, ticks)
+        ]
+        state_digests = [sha256(buf[start:start + size]).digest() for start in range(0, len(buf), size)]
+        prev_chain = self._prev_chain
+        chain_digests = [sha256(prev_chain[k] + digest).digest() for k, digest in zip(env_list, state_digests)]
+        for k, digest in zip(env_list, chain_digests):
+            prev_chain[k] = digest
+
+        return {
+            "env_ids": envs,
+            "tick": self.tick[envs].copy(),
+            "timestamp_ms": (self.time_elapsed[envs] * 1000).astype(np.int64),
+            "coord_int": coord,
+            "seed_u64": seeds,
+            "state_hash": [digest.hex() for digest in state_digests],
+            "chain_hash": [digest.hex() for digest in chain_digests]
+        }
+
+
+def split_metadata(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Columnar VectorSimEnv metadata as one SimEnv-style dict per env."""
+    return [
+        {
+            "tick": tick,
+            "timestamp_ms": timestamp_ms,
+            "coord_int": tuple(coord),
+            "seed_u64": seed,
+            "state_hash": state_hash,
+            "chain_hash": chain_hash
+        }
+        for tick, timestamp_ms, coord, seed, state_hash, chain_hash in zip(
+            metadata["tick"].tolist(), metadata["timestamp_ms"].tolist(), metadata["coord_int"].tolist(),
+            metadata["seed_u64"], metadata["state_hash"], metadata["chain_hash"]
+        )
+    ]
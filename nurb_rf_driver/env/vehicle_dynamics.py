@@ -1,10 +1,20 @@
 """
 Vehicle Dynamics Model (Bicycle Model).
 Implements 2D vehicle physics for the simulation environment.
+
+update() steps one vehicle; update_batch() steps many with the same
+arithmetic on float64 arrays, bit-identical per vehicle. atan2 and x ** 2
+go through libm (math.atan2 / pow) element by element, since NumPy's SIMD
+arctan2 and its x * x squaring differ from libm in the last bit.
 """
 
 import math
 from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from ..libm import libm_map, square
 
 @dataclass
 class VehicleParams:
@@ -131,3 +141,76 @@ class VehicleDynamics:
             new_speed = 0
         
         return new_speed, current_vx, current_vy, new_heading, new_yaw_rate
+
+    def update_batch(
+        self,
+        dt: float,
+        current_speed: np.ndarray,
+        current_vx: np.ndarray,
+        current_vy: np.ndarray,
+        current_heading: np.ndarray,
+        current_yaw_rate: np.ndarray,
+        steering_norm: np.ndarray,
+        throttle_norm: np.ndarray,
+        brake_norm: np.ndarray
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        update() for N vehicles at once; all arguments but dt are (N,) float64.
+        
+        Returns:
+            (new_speed, new_vx, new_vy, new_heading, new_yaw_rate) arrays
+        """
+        p = self.params
+        
+        delta = steering_norm * 0.5
+        
+        # Longitudinal Forces
+        f_aero = 0.5 * self.rho_air * p.drag_coeff * p.frontal_area_m2 * libm_map(square, current_speed)
+        f_roll = 200.0
+        
+        f_drive = throttle_norm * p.max_engine_force_n
+        max_force_power = 370000.0 / np.maximum(1.0, current_speed)
+        f_drive = np.where(current_speed > 0, np.minimum(f_drive, max_force_power), f_drive)
+        
+        f_brake = brake_norm * p.max_brake_force_n
+        
+        fx = f_drive - f_brake - f_aero - f_roll
+        fx = np.where((current_speed < 0.1) & (fx < 0), 0.0, fx)
+        
+        ax = fx / p.mass_kg
+        
+        # Lateral Dynamics (Bicycle Model)
+        alpha_f = delta - libm_map(math.atan2, current_vy + p.lf_m * current_yaw_rate, current_vx)
+        alpha_r = -libm_map(math.atan2, current_vy - p.lr_m * current_yaw_rate, current_vx)
+        
+        fy_f = p.cf_n_rad * alpha_f
+        fy_r = p.cr_n_rad * alpha_r
+        
+        max_fy = p.mass_kg * 9.81 * p.tire_grip_coeff * 0.5
+        fy_f = np.maximum(-max_fy, np.minimum(max_fy, fy_f))
+        fy_r = np.maximum(-max_fy, np.minimum(max_fy, fy_r))
+        
+        ay = (fy_f + fy_r) / p.mass_kg
+        r_dot = (p.lf_m * fy_f - p.lr_m * fy_r) / p.iz_kgm2
+        
+        # Integration
+        new_yaw_rate = current_yaw_rate + r_dot * dt
+        new_heading = current_heading + current_yaw_rate * dt
+        
+        new_vx = current_vx + (ax + current_yaw_rate * current_vy) * dt
+        new_vy = current_vy + (ay - current_yaw_rate * new_vx) * dt
+        
+        # Damping for stability at zero speed
+        slow = current_speed < 0.5
+        new_vy = np.where(slow, new_vy * 0.9, new_vy)
+        new_yaw_rate = np.where(slow, new_yaw_rate * 0.9, new_yaw_rate)
+        
+        new_speed = np.sqrt(libm_map(square, new_vx) + libm_map(square, new_vy))
+        
+        stopped = new_speed < 0.1
+        if stopped.any():
+            new_vx = np.where(stopped, 0.0, new_vx)
+            new_vy = np.where(stopped, 0.0, new_vy)
+            new_speed = np.where(stopped, 0.0, new_speed)
+        
+        return new_speed, new_vx, new_vy, new_heading, new_yaw_rate
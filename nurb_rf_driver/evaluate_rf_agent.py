@@ -1,23 +1,56 @@
 """
 Evaluate RF Agent.
 Runs the trained RF agent on the simulation environment and evaluates performance.
+
+evaluate_batch() is the evaluation harness: episodes (seeds x start
+positions, each driving one track segment) run in lockstep in a
+VectorSimEnv per batch, with batched feature extraction and one forest
+predict() per tick for the whole batch; batches spread over a process
+pool. The JSON report holds per-episode and aggregate driving KPIs (segment
+/ lap time, off-track events, control smoothness) and the time spent in
+each phase (physics, features, inference, hashing, logging).
+
+Usage:
+    python nurb_rf_driver/evaluate_rf_agent.py
+    python nurb_rf_driver/evaluate_rf_agent.py --report nurb_rf_driver/data/rf_eval_report.json \
+        --seeds 1 2 --starts 0 4000 8000 12000 --batch-size 8 --workers 4
 """
 
 import sys
 import os
+import json
 import time
+import argparse
+import platform
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
 
 # Ensure package path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from nurb_rf_driver.env.sim_env import SimEnv
-from nurb_rf_driver.control.rf_pilot import RFPilot
-from nurb_rf_driver.telemetry.ndjson_logger import NDJSONLogger
+from nurb_rf_driver.env.vector_env import VectorSimEnv, STATE_FIELDS, split_metadata
+from nurb_rf_driver.control.rf_pilot import RFPilot, load_rf_model
+from nurb_rf_driver.state.feature_extractor import FeatureExtractor
+from nurb_rf_driver.telemetry.ndjson_logger import NDJSONLogger, FlushPolicy
 
 OUTPUT_LOG = os.path.join(os.path.dirname(__file__), "data", "rf_run_001.ndjson")
 NUM_LAPS = 1
 TICKS_PER_LAP_APPROX = 15000
 
+IDENTITY = "RF_Driver"
+REPORT_FORMAT = "rf-eval-report.v1"
+PHASES = ("physics", "features", "inference", "hashing", "logging")
+OFF_TRACK_M = 5.0  # half the 10 m track width, as the crash check below
+DEFAULT_BATCH_SIZE = 16
+
+_F = {name: i for i, name in enumerate(STATE_FIELDS)}
+
+# One model per worker process and path
+_models: Dict[Optional[str], Any] = {}
+
 def evaluate_rf_agent():
     print(f"🤖 Starting RF Agent Evaluation...")
     
@@ -98,5 +131,298 @@ def evaluate_rf_agent():
     else:
         print("❌ FAILED: Agent crashed.")
 
+def plan_episodes(
+    seeds: Sequence[int],
+    start_positions: Sequence[float],
+    segment_m: float,
+    max_ticks: int
+) -> List[Dict[str, Any]]:
+    """One episode spec per (seed, start distance), in seed-major order."""
+    episodes = []
+    for seed in seeds:
+        for start_dist_m in start_positions:
+            episodes.append({
+                "episode": len(episodes),
+                "seed": seed,
+                "start_dist_m": float(start_dist_m),
+                "run_id": f"rf_eval_{seed}_{float(start_dist_m):g}",
+                "segment_m": float(segment_m),
+                "max_ticks": max_ticks
+            })
+    return episodes
+
+
+def _model_for(model_path: Optional[str]):
+    model = _models.get(model_path)
+    if model is None:
+        model = _models[model_path] = load_rf_model(model_path)
+    return model
+
+
+def evaluate_episodes(
+    episodes: List[Dict[str, Any]],
+    model_path: Optional[str] = None,
+    log_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Drive a batch of episodes in lockstep until each has covered its
+    segment_m or run max_ticks; finished envs keep stepping but no longer count.
+
+    Actions equal RFPilot.compute_control() on each env's state, so every
+    episode matches a sequential SimEnv + RFPilot run of the same spec.
+
+    Returns:
+        {"episodes": [episode KPIs], "timings": {phase: seconds},
+         "ticks": lockstep ticks, "env_ticks": env-ticks inside episodes}
+    """
+    k = len(episodes)
+    model = _model_for(model_path)
+    extractor = FeatureExtractor()
+    vec = VectorSimEnv(k, run_ids=[e["run_id"] for e in episodes], root_identity=IDENTITY)
+    dt = vec.dt
+    loggers = []
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+        for e in episodes:
+            logger = NDJSONLogger(os.path.join(log_dir, f"episode_{e['episode']:04d}.ndjson"),
+                                  lap_id=e["run_id"], policy=FlushPolicy(max_records=1024))
+            logger.open()
+            loggers.append(logger)
+
+    segment_m = np.array([e["segment_m"] for e in episodes])
+    max_ticks = np.array([e["max_ticks"] for e in episodes])
+    active = np.ones(k, dtype=bool)
+    ticks = np.zeros(k, dtype=np.int64)
+    completed = np.zeros(k, dtype=bool)
+    distance = np.zeros(k)
+    speed_sum = np.zeros(k)
+    max_lat = np.zeros(k)
+    off_track = np.zeros(k, dtype=bool)
+    off_events = np.zeros(k, dtype=np.int64)
+    off_ticks = np.zeros(k, dtype=np.int64)
+    delta_abs = np.zeros((k, 3))
+    steer_delta_sq = np.zeros(k)
+    final_chain = [None] * k
+
+    X = np.empty((k, extractor.num_features))
+    prev_actions = None
+    timings = dict.fromkeys(PHASES, 0.0)
+    clock = time.perf_counter
+    lockstep = 0
+
+    obs, meta = vec.reset(start_dist_m=[e["start_dist_m"] for e in episodes])
+    try:
+        while active.any():
+            t0 = clock()
+            extractor.extract_features_batch(obs, out=X, normalize=True, field_names=STATE_FIELDS)
+            t1 = clock()
+            actions = model.predict(X)
+            np.clip(actions[:, 0], -1.0, 1.0, out=actions[:, 0])
+            np.clip(actions[:, 1:], 0.0, 1.0, out=actions[:, 1:])
+            t2 = clock()
+            vec.advance(actions)
+            next_obs = vec.observations()
+            t3 = clock()
+            next_meta = vec.tick_metadata()
+            t4 = clock()
+            if loggers:
+                # Raw features of Obs(t), Action(t), metadata of Obs(t), as generate_expert_data logs
+                raw = extractor.extract_features_batch(obs, field_names=STATE_FIELDS)
+                env_meta = split_metadata(meta)
+                for i in np.flatnonzero(active).tolist():
+                    loggers[i].log_sample(
+                        tick=env_meta[i]["tick"],
+                        timestamp_ms=env_meta[i]["tick"] * 20,
+                        features=dict(zip(extractor.feature_order, raw[i].tolist())),
+                        targets=dict(zip(extractor.target_order, actions[i].tolist())),
+                        meta=env_meta[i]
+                    )
+            timings["physics"] += t3 - t2
+            timings["features"] += t1 - t0
+            timings["inference"] += t2 - t1
+            timings["hashing"] += t4 - t3
+            timings["logging"] += clock() - t4
+
+            # KPIs of the state each action led to, for episodes still running
+            lockstep += 1
+            speed = next_obs[:, _F["speed_mps"]]
+            lat = np.abs(next_obs[:, _F["dist_to_centerline_m"]])
+            ticks += active
+            distance += np.where(active, speed * dt, 0.0)
+            speed_sum += np.where(active, speed, 0.0)
+            np.maximum(max_lat, np.where(active, lat, 0.0), out=max_lat)
+            now_off = lat > OFF_TRACK_M
+            off_events += active & now_off & ~off_track
+            off_ticks += active & now_off
+            off_track = now_off
+            if prev_actions is not None:
+                delta = np.abs(actions - prev_actions)
+                delta_abs += np.where(active[:, None], delta, 0.0)
+                steer_delta_sq += np.where(active, delta[:, 0] ** 2, 0.0)
+            prev_actions = actions
+
+            completed |= active & (distance >= segment_m)
+            done = active & (completed | (ticks >= max_ticks))
+            for i in np.flatnonzero(done).tolist():
+                final_chain[i] = next_meta["chain_hash"][i]
+            active &= ~done
+            obs, meta = next_obs, next_meta
+    finally:
+        t0 = clock()
+        for logger in loggers:
+            logger.close()
+        timings["logging"] += clock() - t0
+
+    results = []
+    for i, e in enumerate(episodes):
+        n = int(ticks[i])
+        deltas = max(n - 1, 1)
+        results.append(dict(
+            e,
+            ticks=n,
+            completed=bool(completed[i]),
+            segment_time_s=round(n * dt, 2) if completed[i] else None,
+            distance_m=round(float(distance[i]), 3),
+            mean_speed_mps=round(float(speed_sum[i]) / max(n, 1), 3),
+            off_track_events=int(off_events[i]),
+            off_track_ticks=int(off_ticks[i]),
+            max_lat_error_m=round(float(max_lat[i]), 3),
+            steering_delta_mean=round(float(delta_abs[i, 0]) / deltas, 6),
+            steering_delta_rms=round(float(np.sqrt(steer_delta_sq[i] / deltas)), 6),
+            throttle_delta_mean=round(float(delta_abs[i, 1]) / deltas, 6),
+            brake_delta_mean=round(float(delta_abs[i, 2]) / deltas, 6),
+            final_chain_hash=final_chain[i]
+        ))
+    return {"episodes": results, "timings": timings, "ticks": lockstep, "env_ticks": int(ticks.sum())}
+
+
+def summarize_episodes(episodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate driving KPIs over episode results."""
+    finished = [e["segment_time_s"] for e in episodes if e["completed"]]
+    ticks = sum(e["ticks"] for e in episodes)
+    return {
+        "episodes": len(episodes),
+        "completed": len(finished),
+        "mean_segment_time_s": round(sum(finished) / len(finished), 2) if finished else None,
+        "best_segment_time_s": min(finished) if finished else None,
+        "off_track_events": sum(e["off_track_events"] for e in episodes),
+        "episodes_off_track": sum(1 for e in episodes if e["off_track_events"]),
+        "off_track_tick_share": round(sum(e["off_track_ticks"] for e in episodes) / max(ticks, 1), 4),
+        "max_lat_error_m": max((e["max_lat_error_m"] for e in episodes), default=0.0),
+        "mean_speed_mps": round(sum(e["mean_speed_mps"] * e["ticks"] for e in episodes) / max(ticks, 1), 3),
+        "steering_delta_mean": round(sum(e["steering_delta_mean"] * e["ticks"] for e in episodes) / max(ticks, 1), 6)
+    }
+
+
+def evaluate_batch(
+    seeds: Sequence[int],
+    start_positions: Sequence[float],
+    segment_m: Optional[float] = None,
+    max_ticks: int = TICKS_PER_LAP_APPROX,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 1,
+    model_path: Optional[str] = None,
+    log_dir: Optional[str] = None,
+    report_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Evaluate every (seed, start) episode in lockstep batches of batch_size,
+    spread over `workers` processes, and optionally write the JSON report
+    (atomically) to report_path.
+
+    segment_m defaults to one lap, making segment_time_s the lap time.
+
+    Returns:
+        The report
+    """
+    if segment_m is None:
+        segment_m = SimEnv().track.total_length_m
+    episodes = plan_episodes(seeds, start_positions, segment_m, max_ticks)
+    batches = [episodes[i:i + batch_size] for i in range(0, len(episodes), batch_size)]
+
+    start_time = time.perf_counter()
+    if workers <= 1:
+        outcomes = [evaluate_episodes(batch, model_path, log_dir) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(evaluate_episodes, batches, [model_path] * len(batches),
+                                     [log_dir] * len(batches)))
+    wall_s = time.perf_counter() - start_time
+
+    results = [e for outcome in outcomes for e in outcome["episodes"]]
+    stepped = sum(outcome["ticks"] * len(batch) for outcome, batch in zip(outcomes, batches))
+    phase_total = {phase: sum(outcome["timings"][phase] for outcome in outcomes) for phase in PHASES}
+    busy = sum(phase_total.values())
+    report = {
+        "format": REPORT_FORMAT,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "seeds": list(seeds),
+            "start_positions": [float(s) for s in start_positions],
+            "segment_m": float(segment_m),
+            "max_ticks": max_ticks,
+            "batch_size": batch_size,
+            "workers": workers,
+            "model_path": model_path,
+            "logging": log_dir is not None
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "kpis": summarize_episodes(results),
+        "timings": {
+            "wall_s": round(wall_s, 3),
+            "env_ticks": sum(outcome["env_ticks"] for outcome in outcomes),
+            "stepped_env_ticks": stepped,
+            "env_ticks_per_s": round(sum(outcome["env_ticks"] for outcome in outcomes) / wall_s, 1),
+            # Summed over workers; us_per_env_tick is per stepped env-tick
+            "phases": {
+                phase: {
+                    "total_s": round(total, 4),
+                    "share": round(total / busy, 4) if busy else 0.0,
+                    "us_per_env_tick": round(total / max(stepped, 1) * 1e6, 3)
+                }
+                for phase, total in phase_total.items()
+            }
+        },
+        "episodes": results
+    }
+
+    if report_path is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        with open(report_path + ".tmp", 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(report_path + ".tmp", report_path)
+        print(f"📊 Report: {report_path}")
+    kpis = report["kpis"]
+    print(f"🏁 {kpis['episodes']} episodes ({kpis['completed']} completed, "
+          f"{kpis['off_track_events']} off-track events) in {wall_s:.1f}s.")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the RF driver")
+    parser.add_argument("--report", default=None,
+                        help="Run the batched harness and write its JSON report here (default: the single rf_run_001 run)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1337])
+    parser.add_argument("--starts", type=float, nargs="+", default=[0.0], help="Start distances along the track (m)")
+    parser.add_argument("--segment", type=float, default=None, help="Distance per episode (m, default one lap)")
+    parser.add_argument("--max-ticks", type=int, default=TICKS_PER_LAP_APPROX)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model", default=None, help="Compiled forest directory or joblib model")
+    parser.add_argument("--log-dir", default=None, help="Also write one NDJSON log per episode")
+    args = parser.parse_args()
+
+    if args.report is None:
+        evaluate_rf_agent()
+    else:
+        evaluate_batch(args.seeds, args.starts, args.segment, args.max_ticks, args.batch_size,
+                       args.workers, args.model, args.log_dir, args.report)
+
+
 if __name__ == "__main__":
-    evaluate_rf_agent()
+    main()
@@ -1,121 +1,277 @@
 """
 Generate Expert Data.
 Runs the simulation with the Expert Pilot and logs training samples.
+
+generate_dataset() runs a grid of seeds x start positions across a process
+pool. Every shard is one episode with its own SimEnv, hash chain and NDJSON
+file (shard_NNNN.ndjson); manifest.json records each shard's seed, start
+distance, run_id, tick range, final chain hash and file sha256. Shard bytes
+depend only on the shard's own spec, so the dataset is the same for any
+worker count and can be regenerated from the manifest alone.
+
+Usage:
+    python nurb_rf_driver/generate_expert_data.py
+    python nurb_rf_driver/generate_expert_data.py --out-dir nurb_rf_driver/data/expert_v1 \\
+        --seeds 1 2 3 4 --starts 0 4000 8000 12000 --ticks 15000 --workers 8
 """
 
 import os
 import sys
+import json
 import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Sequence, Tuple
 
 # Ensure package path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from nurb_rf_driver.env.sim_env import SimEnv
 from nurb_rf_driver.control.expert_pilot import ExpertPilot
-from nurb_rf_driver.telemetry.ndjson_logger import NDJSONLogger
+from nurb_rf_driver.telemetry.ndjson_logger import NDJSONLogger, DEFAULT_INDEX_EVERY
 from nurb_rf_driver.state.feature_extractor import FeatureExtractor
 
 OUTPUT_LOG = os.path.join(os.path.dirname(__file__), "data", "expert_run_001.ndjson")
 NUM_LAPS = 1 # V1: 1 lap to validation
 TICKS_PER_LAP_APPROX = 15000 # ~5 mins at 50Hz = 15000 ticks (20km track / 66m/s avg)
+SNAPSHOT_INTERVAL = 500 # ticks between embedded SimEnv snapshots (replay restart points)
+
+IDENTITY = "Stig"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = "expert-shards.v1"
+
+# One env + pilot per worker process and identity; the track and speed profile dominate a short shard
+_drivers: Dict[str, Tuple[SimEnv, ExpertPilot, FeatureExtractor]] = {}
+
+
+def run_expert_episode(
+    env: SimEnv,
+    pilot: ExpertPilot,
+    extractor: FeatureExtractor,
+    logger: NDJSONLogger,
+    num_samples: int,
+    start_dist_m: float = 0.0,
+    progress: bool = True
+) -> Dict[str, Any]:
+    """
+    Drive one episode from env.reset(start_dist_m) and log num_samples samples.
+
+    Returns:
+        {"samples", "first_tick", "last_tick", "final_chain_hash"}
+    """
+    state_obj, meta = env.reset(start_dist_m)
+    total_ticks = 0
+    lap_count = 0
+    first_tick = meta["tick"]
+
+    while lap_count < NUM_LAPS and total_ticks < num_samples:
+        # Control
+        steering, throttle, brake = pilot.compute_control(
+            current_speed_mps=state_obj.speed_mps,
+            current_heading_rad=state_obj.heading_rad,
+            track_x_m=state_obj.track_x_m,
+            track_y_m=state_obj.track_y_m,
+            current_dist_m=env.current_dist_m
+        )
+
+        # Restart point for sharded replay, taken before the step like meta
+        snapshot = env.snapshot() if total_ticks % SNAPSHOT_INTERVAL == 0 else None
+
+        # Step Env
+        next_state_obj, next_meta = env.step(steering, throttle, brake)
+
+        # Extract features for logging (Canonical V1)
+        features = dict(zip(extractor.feature_order, extractor.extract_features(state_obj)))
+
+        # Training sample maps Obs(t) -> Action(t); `meta` belongs to Obs(t),
+        # step() returns the metadata of the state it transitioned TO
+        logger.log_sample(
+            tick=env.tick - 1, # Action was taken at prev tick
+            timestamp_ms=(env.tick - 1) * 20,
+            features=features,
+            targets={
+                "steering_command": steering,
+                "throttle_command": throttle,
+                "brake_command": brake
+            },
+            valid=True,
+            meta=meta,
+            snapshot=snapshot
+        )
+        last_chain_hash = meta["chain_hash"]
+
+        state_obj = next_state_obj
+        meta = next_meta
+        total_ticks += 1
+
+        if progress and total_ticks % 1000 == 0:
+            print(f"   Tick {total_ticks}: {state_obj.speed_mps:.1f} m/s | Prog: {state_obj.track_progress*100:.1f}%")
+
+    return {
+        "samples": total_ticks,
+        "first_tick": first_tick,
+        "last_tick": first_tick + total_ticks - 1,
+        "final_chain_hash": last_chain_hash if total_ticks else None
+    }
+
 
 def generate_expert_run():
     print(f"🏎️ Starting Expert Data Generation...")
-    
-    # Init Env
-    env = SimEnv(seed=1337, run_id="expert_001", root_identity="Stig")
-    state_obj, meta = env.reset()
-    
-    # Init Pilot
+
+    env = SimEnv(seed=1337, run_id="expert_001", root_identity=IDENTITY)
     pilot = ExpertPilot(env.track)
-    
-    # Init Extractor
     extractor = FeatureExtractor()
-    
-    # Init Logger
-    logger = NDJSONLogger(OUTPUT_LOG, lap_id="expert_run_001")
+    logger = NDJSONLogger(OUTPUT_LOG, lap_id="expert_run_001", index_every=DEFAULT_INDEX_EVERY)
     logger.open()
-    
-    # Loop
-    total_ticks = 0
-    lap_count = 0
+
     start_time = time.time()
-    
+    total_ticks = 0
     try:
-        while lap_count < NUM_LAPS:
-            # Control
-            
-            steering, throttle, brake = pilot.compute_control(
-                current_speed_mps=state_obj.speed_mps,
-                current_heading_rad=state_obj.heading_rad,
-                track_x_m=state_obj.track_x_m,
-                track_y_m=state_obj.track_y_m,
-                current_dist_m=env.current_dist_m
-            )
-            
-            # Step Env
-            next_state_obj, next_meta = env.step(steering, throttle, brake)
-            
-            # Extract features for logging (Canonical V1)
-            # Need features from PREVIOUS state (state_obj)
-            feature_list = extractor.extract_features(state_obj)
-            features = dict(zip(extractor.feature_order, feature_list))
-            
-            # Construct Training Sample
-            sample = {
-                "tick": env.tick - 1, # Action was taken at prev tick
-                "timestamp_ms": (env.tick - 1) * 20,
-                "lap_id": lap_count,
-                "valid": True,
-                "features": features, # Features from BEFORE action
-                "targets": {
-                    "steering_command": steering,
-                    "throttle_command": throttle,
-                    "brake_command": brake
-                },
-                "meta": meta # Metadata from prev state? 
-                # Actually, standard RL: Obs(t), Action(t), Reward(t+1), NextObs(t+1)
-                # Training sample maps Obs(t) -> Action(t).
-                # Metadata should match Obs(t).
-                # But 'step' returns metadata for t+1?
-                # SimEnv.step returns metadata for the state it just transitioned TO.
-                # So `meta` from reset() corresponds to `state_obj` (tick 0).
-                # `next_meta` corresponds to `next_state_obj` (tick 1).
-                # So we use `meta`.
-            }
-            
-            # Log to file
-            logger.log_sample(
-                tick=sample["tick"],
-                timestamp_ms=sample["timestamp_ms"],
-                features=sample["features"],
-                targets=sample["targets"],
-                valid=sample["valid"],
-                meta=sample["meta"]
-            )
-            
-            state_obj = next_state_obj
-            meta = next_meta
-            total_ticks += 1
-            
-            if total_ticks % 1000 == 0:
-                print(f"   Tick {total_ticks}: {state_obj.speed_mps:.1f} m/s | Prog: {state_obj.track_progress*100:.1f}%")
-                
-            if state_obj.track_progress > 0.99:
-                 pass
-            
-            # Break if timeout/done
-            if total_ticks > TICKS_PER_LAP_APPROX:
-                break
-                
+        # Samples for ticks 0..TICKS_PER_LAP_APPROX inclusive
+        total_ticks = run_expert_episode(env, pilot, extractor, logger, TICKS_PER_LAP_APPROX + 1)["samples"]
     except KeyboardInterrupt:
         print("Stopping...")
     finally:
         logger.close()
-        
+
     duration = time.time() - start_time
     print(f"🏁 Finished. {total_ticks} ticks in {duration:.1f}s.")
     print(f"💾 Data saved to: {OUTPUT_LOG}")
 
+
+def plan_shards(seeds: Sequence[int], start_positions: Sequence[float], ticks: int) -> List[Dict[str, Any]]:
+    """One shard spec per (seed, start distance), in seed-major order."""
+    shards = []
+    for seed in seeds:
+        for start_dist_m in start_positions:
+            shards.append({
+                "shard": len(shards),
+                "seed": seed,
+                "start_dist_m": float(start_dist_m),
+                "run_id": f"expert_{seed}_{float(start_dist_m):g}",
+                "ticks": ticks
+            })
+    return shards
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _driver_for(run_id: str, seed: int, identity: str) -> Tuple[SimEnv, ExpertPilot, FeatureExtractor]:
+    driver = _drivers.get(identity)
+    if driver is None:
+        env = SimEnv(seed=seed, run_id=run_id, root_identity=identity)
+        driver = _drivers[identity] = (env, ExpertPilot(env.track), FeatureExtractor())
+    env = driver[0]
+    # Seed and run_id only feed reset() and the metadata seed stream
+    env.seed, env.run_id = seed, run_id
+    return driver
+
+
+def generate_shard(spec: Dict[str, Any], out_dir: str, identity: str = IDENTITY) -> Dict[str, Any]:
+    """
+    Write one shard's NDJSON log (plus tick index) into out_dir.
+
+    Returns:
+        The spec plus "file", "samples", "first_tick", "last_tick",
+        "final_chain_hash", "bytes" and "sha256" for the manifest
+    """
+    env, pilot, extractor = _driver_for(spec["run_id"], spec["seed"], identity)
+    name = f"shard_{spec['shard']:04d}.ndjson"
+    path = os.path.join(out_dir, name)
+    with NDJSONLogger(path, lap_id=spec["run_id"], index_every=DEFAULT_INDEX_EVERY) as logger:
+        episode = run_expert_episode(env, pilot, extractor, logger, spec["ticks"], spec["start_dist_m"], progress=False)
+
+    entry = dict(spec, file=name, **episode)
+    entry.update(bytes=os.path.getsize(path), sha256=_file_sha256(path))
+    return entry
+
+
+def generate_dataset(
+    out_dir: str,
+    seeds: Sequence[int],
+    start_positions: Sequence[float],
+    ticks: int = TICKS_PER_LAP_APPROX,
+    workers: int = 1,
+    identity: str = IDENTITY
+) -> Dict[str, Any]:
+    """
+    Generate every (seed, start) shard across `workers` processes and write
+    manifest.json (atomically, after all shards are complete).
+
+    Returns:
+        The manifest
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    shards = plan_shards(seeds, start_positions, ticks)
+
+    start_time = time.perf_counter()
+    if workers <= 1:
+        entries = [generate_shard(spec, out_dir, identity) for spec in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(generate_shard, shards, [out_dir] * len(shards), [identity] * len(shards)))
+    duration = time.perf_counter() - start_time
+
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "identity": identity,
+        "snapshot_interval": SNAPSHOT_INTERVAL,
+        "samples": sum(entry["samples"] for entry in entries),
+        "shards": entries
+    }
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+    print(f"🏁 {manifest['samples']} samples in {len(entries)} shards, {duration:.1f}s "
+          f"({manifest['samples'] / duration:.0f} samples/s, {workers} worker(s)).")
+    print(f"💾 Manifest: {path}")
+    return manifest
+
+
+def verify_manifest(out_dir: str) -> List[str]:
+    """
+    Re-hash every shard listed in out_dir's manifest.
+
+    Returns:
+        Names of shards that are missing or whose sha256 differs (empty if intact)
+    """
+    with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    bad = []
+    for entry in manifest["shards"]:
+        path = os.path.join(out_dir, entry["file"])
+        if not os.path.exists(path):
+            bad.append(entry["file"])
+            continue
+        if _file_sha256(path) != entry["sha256"]:
+            bad.append(entry["file"])
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate expert driving data")
+    parser.add_argument("--out-dir", default=None,
+                        help="Write a sharded dataset with a manifest here (default: the single expert_run_001 log)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1337])
+    parser.add_argument("--starts", type=float, nargs="+", default=[0.0], help="Start distances along the track (m)")
+    parser.add_argument("--ticks", type=int, default=TICKS_PER_LAP_APPROX, help="Samples per shard")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.out_dir is None:
+        generate_expert_run()
+    else:
+        generate_dataset(args.out_dir, args.seeds, args.starts, args.ticks, args.workers)
+
+
 if __name__ == "__main__":
-    generate_expert_run()
+    main()
@@ -0,0 +1,22 @@
+"""
+Element-wise libm calls for NumPy arrays.
+
+Batched paths must match their scalar counterparts bit for bit, and the
+scalar paths use Python's math module (libm). NumPy's SIMD sin, cos and
+arctan2, and its x * x for x ** 2, can differ from libm in the last bit,
+so those go through libm_map() instead.
+"""
+
+from functools import partial
+
+import numpy as np
+
+# x ** 2 as Python computes it for floats (libm pow, not x * x)
+square = partial(pow, exp=2)
+
+
+def libm_map(fn, *arrays: np.ndarray) -> np.ndarray:
+    """fn(a[i], b[i], ...) per element as float64, shaped like the first array."""
+    first = arrays[0]
+    flat = np.fromiter(map(fn, *[a.ravel().tolist() for a in arrays]), dtype=np.float64, count=first.size)
+    return flat.reshape(first.shape)
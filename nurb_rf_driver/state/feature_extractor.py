@@ -1,13 +1,22 @@
 """
 Feature extraction for RF driver state vector v1.
 Computes canonical 10-feature vector in stable order.
+
+feature_config.v1.json is compiled once into a plan: an attrgetter over
+the feature names in canonical order and one divisor per feature for
+normalization. extract_features_into / extract_features_batch write
+through the plan into preallocated float64 arrays; the values are the
+same floats the per-name list path produces.
 """
 
 import json
 import os
-from typing import Dict, Any, List, Tuple
+from operator import attrgetter
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from dataclasses import asdict
 
+import numpy as np
+
 
 # Load feature config for stable ordering
 _CONFIG_PATH = os.path.join(os.path.dirname(__file__), "feature_config.v1.json")
@@ -19,6 +28,27 @@ FEATURE_ORDER = [feat["name"] for feat in sorted(FEATURE_CONFIG["features"], key
 TARGET_ORDER = [tgt["name"] for tgt in FEATURE_CONFIG["targets"]]
 
 
+def _compile_divisors(config: Dict[str, Any]) -> List[float]:
+    """
+    Per-feature divisor in canonical order (1.0 = left as is).
+    normalize_features() walks the config list by position, so the list
+    must already be in index order 0..n-1.
+    """
+    indices = [feat["index"] for feat in config["features"]]
+    if indices != list(range(len(indices))):
+        raise ValueError(f"Feature config must list features in index order 0..n-1, got {indices}")
+    divisors = []
+    for feat in config["features"]:
+        norm_method = feat.get("normalization", "none")
+        if norm_method == "divide_by_max":
+            divisors.append(float(feat.get("max_value", 1.0)))
+        elif norm_method == "divide_by_pi":
+            divisors.append(3.14159)
+        else:
+            divisors.append(1.0)
+    return divisors
+
+
 class FeatureExtractor:
     """
     Extract v1 feature vector from vehicle state.
@@ -30,28 +60,88 @@ class FeatureExtractor:
         self.feature_order = FEATURE_ORDER
         self.target_order = TARGET_ORDER
         self.num_features = len(self.feature_order)
+
+        # Compiled plan: canonical-order getter and normalization divisors
+        self._get_features = attrgetter(*self.feature_order)
+        self._divisor_list = _compile_divisors(self.feature_config)
+        self._divisors = np.array(self._divisor_list)
+        self._columns: Dict[Tuple[str, ...], np.ndarray] = {}
     
     def extract_features(self, vehicle_state) -> List[float]:
         """
         Extract features from vehicle state in canonical order.
         
         Args:
-            vehicle_state: VehicleState dataclass instance
+            vehicle_state: VehicleState dataclass instance (or dict)
         
         Returns:
             List of 10 floats in canonical order
         """
-        state_dict = asdict(vehicle_state) if hasattr(vehicle_state, '__dataclass_fields__') else vehicle_state
-        
-        features = []
-        for feat_name in self.feature_order:
-            value = state_dict.get(feat_name, 0.0)
-            features.append(float(value))
-        
-        assert len(features) == self.num_features, \
-            f"Expected {self.num_features} features, got {len(features)}"
-        
-        return features
+        if hasattr(vehicle_state, '__dataclass_fields__'):
+            return list(map(float, self._get_features(vehicle_state)))
+        return [float(vehicle_state.get(feat_name, 0.0)) for feat_name in self.feature_order]
+
+    def extract_features_into(self, vehicle_state, out: np.ndarray, normalize: bool = False) -> np.ndarray:
+        """
+        extract_features() (then normalize_features() if normalize) written
+        into a preallocated (num_features,) float64 array.
+
+        Args:
+            vehicle_state: VehicleState dataclass instance
+            out: Destination, e.g. one row of a reused (1, num_features) input
+            normalize: Apply the config normalization in place
+
+        Returns:
+            out
+        """
+        out[:] = self._get_features(vehicle_state)
+        if normalize:
+            np.divide(out, self._divisors, out=out)
+        return out
+
+    def extract_features_batch(
+        self,
+        states,
+        out: Optional[np.ndarray] = None,
+        normalize: bool = False,
+        field_names: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """
+        (K, num_features) features for K states in canonical order.
+
+        Args:
+            states: Sequence of VehicleState, or a (K, n_fields) array whose
+                columns are field_names (e.g. VectorSimEnv.observations()
+                with vector_env.STATE_FIELDS)
+            out: Optional preallocated (K, num_features) float64 array
+            normalize: Apply the config normalization in place
+            field_names: Column names when states is an array
+
+        Returns:
+            out (allocated if not given)
+        """
+        if isinstance(states, np.ndarray):
+            if field_names is None:
+                raise ValueError("field_names is required for array states")
+            columns = self._columns.get(tuple(field_names))
+            if columns is None:
+                position = {name: i for i, name in enumerate(field_names)}
+                missing = [name for name in self.feature_order if name not in position]
+                if missing:
+                    raise ValueError(f"State columns lack features: {missing}")
+                columns = self._columns[tuple(field_names)] = np.array([position[name] for name in self.feature_order])
+            if out is None:
+                out = np.empty((len(states), self.num_features))
+            np.take(states, columns, axis=1, out=out)
+        else:
+            if out is None:
+                out = np.empty((len(states), self.num_features))
+            get = self._get_features
+            for row, state in zip(out, states):
+                row[:] = get(state)
+        if normalize:
+            np.divide(out, self._divisors, out=out)
+        return out
     
     def extract_targets(self, vehicle_state) -> Dict[str, float]:
         """
@@ -123,23 +213,7 @@ class FeatureExtractor:
         Returns:
             Normalized feature values in [0, 1] or [-1, 1] depending on spec
         """
-        normalized = []
-        
-        for i, value in enumerate(features):
-            feat_info = self.feature_config["features"][i]
-            norm_method = feat_info.get("normalization", "none")
-            max_val = feat_info.get("max_value", 1.0)
-            
-            if norm_method == "already_normalized":
-                normalized.append(value)
-            elif norm_method == "divide_by_max":
-                normalized.append(value / max_val)
-            elif norm_method == "divide_by_pi":
-                normalized.append(value / 3.14159)
-            else:
-                normalized.append(value)
-        
-        return normalized
+        return [value / divisor for value, divisor in zip(features, self._divisor_list)]
     
     def get_feature_names(self) -> List[str]:
         """Get canonical feature names in order."""
@@ -2,12 +2,24 @@
 
 from .ndjson_logger import (
     NDJSONLogger,
+    FlushPolicy,
+    iter_ndjson,
+    iter_ndjson_range,
+    tail_ndjson,
+    build_tick_index,
+    load_tick_index,
     load_ndjson,
     verify_ndjson_determinism
 )
 
 __all__ = [
     'NDJSONLogger',
+    'FlushPolicy',
+    'iter_ndjson',
+    'iter_ndjson_range',
+    'tail_ndjson',
+    'build_tick_index',
+    'load_tick_index',
     'load_ndjson',
     'verify_ndjson_determinism'
 ]
@@ -1,13 +1,63 @@
 """
 NDJSON telemetry logger with deterministic key ordering.
 Writes training samples in stable format for RF driver.
+
+Lines are buffered in flush windows (see FlushPolicy) and each window is
+handed to the OS in a single write, optionally from a writer thread and
+followed by fsync; a timer thread closes windows that reach
+max_interval_s between records. The bytes written never depend on the
+policy.
 """
 
+import bisect
 import json
 import os
-from typing import Dict, Any, Optional, TextIO
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, BinaryIO
 from datetime import datetime, timezone
 
+FSYNC_NONE = "none"
+FSYNC_INTERVAL = "interval"
+FSYNC_EVERY_RECORD = "every_record"
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_INTERVAL, FSYNC_EVERY_RECORD)
+
+# Sidecar tick index: [tick, byte offset] every N records, in <log>.idx.json
+INDEX_SUFFIX = ".idx.json"
+INDEX_FORMAT = "ndjson-tick-index.v1"
+DEFAULT_INDEX_EVERY = 1000
+_TICK_PREFIX = re.compile(rb'\{"tick":(-?\d+)[,}]')
+
+VERIFY_CHUNK_BYTES = 1 << 20
+
+# json.dumps(sort_keys=False, separators=(',', ':')) without a new encoder per call
+_encode_line = json.JSONEncoder(sort_keys=False, separators=(',', ':')).encode
+
+
+@dataclass
+class FlushPolicy:
+    """
+    When NDJSONLogger writes buffered lines, and when it fsyncs them.
+
+    A flush window closes as soon as any enabled limit is reached (0
+    disables a limit); the defaults flush every record, as the logger
+    always has. max_interval_s is enforced by a timer thread, so a window
+    closes that long after its first record even if no further record
+    arrives. With background=True a new window only opens once the writer
+    thread has written the previous one, so a crashed process loses at
+    most one window either way; a power loss also loses whatever has not
+    been fsynced.
+    """
+    max_records: int = 1
+    max_bytes: int = 0
+    max_interval_s: float = 0.0
+    fsync: str = FSYNC_NONE  # none / interval / every_record (forces one-record windows)
+    fsync_interval_s: float = 1.0  # FSYNC_INTERVAL: longest gap between fsyncs at flush time
+    background: bool = False  # write and fsync windows on a writer thread
+
 
 class NDJSONLogger:
     """
@@ -16,7 +66,7 @@ class NDJSONLogger:
     """
     
     # Canonical key order for top-level fields
-    TOP_LEVEL_ORDER = ["tick", "timestamp_ms", "lap_id", "valid", "features", "targets", "meta"]
+    TOP_LEVEL_ORDER = ["tick", "timestamp_ms", "lap_id", "valid", "features", "targets", "meta", "snapshot"]
     
     # Canonical feature key order (matches feature_config.v1.json)
     FEATURE_ORDER = [
@@ -38,33 +88,153 @@ class NDJSONLogger:
     # Canonical meta key order
     META_ORDER = ["coord_int", "seed_u64", "state_hash", "chain_hash"]
     
-    def __init__(self, output_path: str, lap_id: str):
+    def __init__(self, output_path: str, lap_id: str, policy: Optional[FlushPolicy] = None,
+                 index_every: int = 0):
         """
         Initialize NDJSON logger.
         
         Args:
             output_path: Path to output .ndjson file
             lap_id: Unique lap identifier
+            policy: Buffering / fsync policy (default: flush every record)
+            index_every: Write a sidecar tick index (see build_tick_index)
+                with every N-th record on close; 0 disables it
         """
         self.output_path = output_path
         self.lap_id = lap_id
-        self.file_handle: Optional[TextIO] = None
+        self.policy = policy or FlushPolicy()
+        if self.policy.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {self.policy.fsync} (expected one of {FSYNC_POLICIES})")
+        self.file_handle: Optional[BinaryIO] = None
         self.samples_written = 0
+
+        # Open flush window, shared with the interval timer thread
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._window_start = 0.0
+        self._last_fsync = 0.0
+        self._window_lock = threading.Condition()
+        self._timer: Optional[threading.Thread] = None
+        self._closing = False
+
+        # Writer thread (policy.background)
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._writer_error: Optional[BaseException] = None
+
+        # Sidecar tick index
+        self.index_every = index_every
+        self._index_entries: List[List[int]] = []
+        self._offset = 0
         
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
     def open(self):
         """Open file handle for writing."""
-        self.file_handle = open(self.output_path, 'w', encoding='utf-8')
+        self.file_handle = open(self.output_path, 'wb')
+        self._last_fsync = time.monotonic()
+        self._index_entries = []
+        self._offset = 0
+        if self.policy.background:
+            self._queue = queue.Queue(maxsize=1)
+            self._writer = threading.Thread(target=self._writer_loop, name="ndjson-writer", daemon=True)
+            self._writer.start()
+        if self.policy.max_interval_s:
+            self._closing = False
+            self._timer = threading.Thread(target=self._timer_loop, name="ndjson-interval", daemon=True)
+            self._timer.start()
         print(f"📝 Opened NDJSON log: {self.output_path}")
     
     def close(self):
-        """Close file handle and flush."""
+        """Flush the open window, stop the writer, fsync (unless FSYNC_NONE) and close."""
         if self.file_handle:
-            self.file_handle.close()
-            self.file_handle = None
+            try:
+                if self._timer:
+                    with self._window_lock:
+                        self._closing = True
+                        self._window_lock.notify()
+                    self._timer.join()
+                    self._timer = None
+                self.flush()
+                if self._writer:
+                    self._queue.put(None)
+                    self._writer.join()
+                    self._writer = self._queue = None
+                self._raise_writer_error()
+                if self.policy.fsync != FSYNC_NONE:
+                    os.fsync(self.file_handle.fileno())
+            finally:
+                self.file_handle.close()
+                self.file_handle = None
+            if self.index_every:
+                _write_index(self.output_path, self.index_every, self._offset, self._index_entries)
             print(f"✅ Closed NDJSON log: {self.output_path} ({self.samples_written} samples)")
+
+    def flush(self):
+        """Close the open flush window now."""
+        with self._window_lock:
+            self._flush_window()
+
+    def _flush_window(self):
+        # Caller holds _window_lock
+        if not self._pending:
+            return
+        chunk = b"".join(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+        self._raise_writer_error()
+        if self._writer:
+            # Empty queue: log_sample() waited for the previous window before opening this one
+            self._queue.put(chunk)
+        else:
+            self._write(chunk)
+
+    def _timer_loop(self):
+        interval = self.policy.max_interval_s
+        with self._window_lock:
+            while not self._closing:
+                if not self._pending or self._writer_error is not None:
+                    self._window_lock.wait()
+                    continue
+                remaining = self._window_start + interval - time.monotonic()
+                if remaining > 0:
+                    self._window_lock.wait(remaining)
+                    continue
+                try:
+                    self._flush_window()
+                except BaseException as e:  # surfaced on the caller's next flush/close
+                    self._writer_error = e
+
+    def _write(self, chunk: bytes):
+        self.file_handle.write(chunk)
+        self.file_handle.flush()
+        fsync = self.policy.fsync
+        if fsync == FSYNC_EVERY_RECORD:
+            os.fsync(self.file_handle.fileno())
+        elif fsync == FSYNC_INTERVAL:
+            now = time.monotonic()
+            if now - self._last_fsync >= self.policy.fsync_interval_s:
+                os.fsync(self.file_handle.fileno())
+                self._last_fsync = now
+
+    def _writer_loop(self):
+        while True:
+            chunk = self._queue.get()
+            try:
+                if chunk is None:
+                    return
+                if self._writer_error is None:
+                    self._write(chunk)
+            except BaseException as e:  # surfaced on the caller's next flush/close
+                self._writer_error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_writer_error(self):
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            raise RuntimeError(f"NDJSON writer failed for {self.output_path}") from error
     
     def __enter__(self):
         """Context manager entry."""
@@ -93,11 +263,12 @@ class NDJSONLogger:
         features: Dict[str, float],
         targets: Dict[str, float],
         valid: bool = True,
-        meta: Optional[Dict[str, Any]] = None
+        meta: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[Dict[str, Any]] = None
     ):
         """
         Log a single training sample.
-        
+
         Args:
             tick: Simulation tick number
             timestamp_ms: Elapsed time in milliseconds
@@ -105,6 +276,8 @@ class NDJSONLogger:
             targets: Target dictionary (will be ordered canonically)
             valid: Whether sample is valid for training
             meta: Optional metadata (coord_int, seed_u64, state_hash, chain_hash)
+            snapshot: Optional SimEnv.snapshot() of the sample's state,
+                a restart point for sharded replay validation
         """
         if not self.file_handle:
             raise RuntimeError("Logger not opened. Use context manager or call open() first.")
@@ -127,16 +300,36 @@ class NDJSONLogger:
         # Optional meta in canonical order
         if meta:
             sample["meta"] = self._ordered_dict(meta, self.META_ORDER)
-        
+
+        if snapshot:
+            sample["snapshot"] = snapshot
+
         # Ensure top-level ordering
         sample_ordered = self._ordered_dict(sample, self.TOP_LEVEL_ORDER)
         
         # Write as single JSON line (sort_keys=False to preserve manual order)
-        json_line = json.dumps(sample_ordered, sort_keys=False, separators=(',', ':'))
-        self.file_handle.write(json_line + '\n')
-        self.file_handle.flush()  # Ensure immediate write
-        
-        self.samples_written += 1
+        json_line = _encode_line(sample_ordered)
+        line = (json_line + '\n').encode('utf-8')
+        policy = self.policy
+        with self._window_lock:
+            if not self._pending:
+                if self._writer:
+                    # One unwritten window at most: the previous one must be out first
+                    self._queue.join()
+                self._window_start = time.monotonic()
+                self._window_lock.notify()
+            if self.index_every and self.samples_written % self.index_every == 0:
+                self._index_entries.append([tick, self._offset])
+            self._offset += len(line)
+            self._pending.append(line)
+            self._pending_bytes += len(line)
+            self.samples_written += 1
+
+            if (policy.fsync == FSYNC_EVERY_RECORD
+                    or (policy.max_records and len(self._pending) >= policy.max_records)
+                    or (policy.max_bytes and self._pending_bytes >= policy.max_bytes)
+                    or (policy.max_interval_s and time.monotonic() - self._window_start >= policy.max_interval_s)):
+                self._flush_window()
     
     def log_from_sim_state(
         self,
@@ -182,17 +375,16 @@ class NDJSONLogger:
         )
 
 
-def load_ndjson(filepath: str) -> list:
+def iter_ndjson(filepath: str):
     """
-    Load NDJSON file and return list of samples.
+    Yield samples from an NDJSON file one line at a time.
     
     Args:
         filepath: Path to .ndjson file
     
-    Returns:
-        List of sample dictionaries
+    Yields:
+        Sample dictionaries
     """
-    samples = []
     with open(filepath, 'r', encoding='utf-8') as f:
         for line_num, line in enumerate(f, 1):
             line = line.strip()
@@ -200,18 +392,188 @@ def load_ndjson(filepath: str) -> list:
                 continue
             
             try:
-                sample = json.loads(line)
-                samples.append(sample)
+                yield json.loads(line)
             except json.JSONDecodeError as e:
                 print(f"⚠️  Skipping malformed JSON at line {line_num}: {e}")
+
+
+def index_path(filepath: str) -> str:
+    """Sidecar tick index location for a log."""
+    return filepath + INDEX_SUFFIX
+
+
+def _line_tick(line: bytes) -> Optional[int]:
+    # NDJSONLogger always writes "tick" first; anything else is parsed fully
+    match = _TICK_PREFIX.match(line)
+    if match:
+        return int(match.group(1))
+    try:
+        return json.loads(line).get("tick")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _write_index(filepath: str, every: int, size: int, entries: List[List[int]]) -> Dict[str, Any]:
+    index = {"format": INDEX_FORMAT, "every": every, "size": size, "entries": entries}
+    tmp_path = index_path(filepath) + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp_path, index_path(filepath))
+    return index
+
+
+def build_tick_index(filepath: str, every: int = DEFAULT_INDEX_EVERY) -> Dict[str, Any]:
+    """
+    Scan a log and write its sidecar tick index: [tick, byte offset] of
+    every `every`-th record. Only the tick prefix of each line is parsed.
     
-    return samples
+    Returns:
+        The index ({"format", "every", "size", "entries"})
+    """
+    entries = []
+    records = 0
+    offset = 0
+    with open(filepath, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # partial last line of a live log
+            if line.strip():
+                if records % every == 0:
+                    tick = _line_tick(line)
+                    if tick is not None:
+                        entries.append([tick, offset])
+                records += 1
+            offset += len(line)
+    return _write_index(filepath, every, offset, entries)
+
+
+def load_tick_index(filepath: str) -> Optional[Dict[str, Any]]:
+    """
+    The log's sidecar tick index, or None if it is missing or no longer
+    matches the log. A log that has only grown since keeps its index (it
+    covers the prefix).
+    """
+    try:
+        with open(index_path(filepath), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("format") != INDEX_FORMAT or os.path.getsize(filepath) < index["size"]:
+            return None
+        if index["entries"]:
+            tick, offset = index["entries"][-1]
+            with open(filepath, 'rb') as f:
+                f.seek(offset)
+                if _line_tick(f.readline()) != tick:
+                    return None
+        return index
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def iter_ndjson_range(filepath: str, start_tick: Optional[int] = None, stop_tick: Optional[int] = None):
+    """
+    Yield samples with start_tick <= tick < stop_tick, streaming.
+
+    With a valid sidecar index the read starts at the last indexed record
+    at or before start_tick instead of the top of the file. Ticks are
+    assumed non-decreasing, as NDJSONLogger writes them.
+    """
+    offset = 0
+    index = load_tick_index(filepath) if start_tick is not None else None
+    if index and index["entries"]:
+        ticks = [tick for tick, _ in index["entries"]]
+        i = bisect.bisect_right(ticks, start_tick) - 1
+        if i >= 0:
+            offset = index["entries"][i][1]
+
+    with open(filepath, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            # Skip records before the range on the tick prefix alone
+            match = _TICK_PREFIX.match(line)
+            if match and start_tick is not None and int(match.group(1)) < start_tick:
+                continue
+            try:
+                sample = json.loads(line)
+            except ValueError as e:
+                print(f"⚠️  Skipping malformed JSON at byte {line_offset}: {e}")
+                continue
+            tick = sample.get("tick")
+            if tick is None:
+                continue
+            if start_tick is not None and tick < start_tick:
+                continue
+            if stop_tick is not None and tick >= stop_tick:
+                return
+            yield sample
+
+
+def tail_ndjson(filepath: str, from_start: bool = True, poll_interval_s: float = 0.1,
+                idle_timeout_s: Optional[float] = None):
+    """
+    Follow a log that is still being written, yielding each sample once
+    its line is complete (a partial last line waits for its newline).
+
+    Args:
+        filepath: Path to .ndjson file (may not exist yet)
+        from_start: Yield existing samples first, else only new ones
+        poll_interval_s: Sleep between polls when no new data
+        idle_timeout_s: Stop after this long without new data (None: never)
+    """
+    last_data = time.monotonic()
+    while not os.path.exists(filepath):
+        if idle_timeout_s is not None and time.monotonic() - last_data >= idle_timeout_s:
+            return
+        time.sleep(poll_interval_s)
+
+    with open(filepath, 'rb') as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        partial = b""
+        while True:
+            line = f.readline()
+            if not line:
+                if idle_timeout_s is not None and time.monotonic() - last_data >= idle_timeout_s:
+                    return
+                time.sleep(poll_interval_s)
+                continue
+            last_data = time.monotonic()
+            partial += line
+            if not partial.endswith(b"\n"):
+                continue
+            line, partial = partial, b""
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                print(f"⚠️  Skipping malformed JSON while tailing: {e}")
+
+
+def load_ndjson(filepath: str) -> list:
+    """
+    Load NDJSON file and return list of samples.
+    Holds the whole log in memory; iter_ndjson / iter_ndjson_range stream.
+    
+    Args:
+        filepath: Path to .ndjson file
+    
+    Returns:
+        List of sample dictionaries
+    """
+    return list(iter_ndjson(filepath))
 
 
 def verify_ndjson_determinism(filepath1: str, filepath2: str) -> bool:
     """
     Verify two NDJSON files are byte-for-byte identical.
     
+    Streams both files side by side in fixed-size chunks (constant memory)
+    and stops at the first differing byte.
+    
     Args:
         filepath1: First file path
         filepath2: Second file path
@@ -221,21 +583,25 @@ def verify_ndjson_determinism(filepath1: str, filepath2: str) -> bool:
     """
     import hashlib
     
-    def file_hash(path: str) -> str:
-        h = hashlib.sha256()
-        with open(path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                h.update(chunk)
-        return h.hexdigest()
-    
-    hash1 = file_hash(filepath1)
-    hash2 = file_hash(filepath2)
-    
-    if hash1 == hash2:
-        print(f"✅ Files are identical: {hash1}")
-        return True
-    else:
-        print(f"❌ Files differ:")
-        print(f"   File 1: {hash1}")
-        print(f"   File 2: {hash2}")
-        return False
+    h = hashlib.sha256()
+    lines = 0
+    with open(filepath1, 'rb') as f1, open(filepath2, 'rb') as f2:
+        while True:
+            chunk1 = f1.read(VERIFY_CHUNK_BYTES)
+            chunk2 = f2.read(VERIFY_CHUNK_BYTES)
+            if chunk1 != chunk2:
+                at = next((i for i, (a, b) in enumerate(zip(chunk1, chunk2)) if a != b),
+                          min(len(chunk1), len(chunk2)))
+                line_num = lines + chunk1.count(b"\n", 0, at) + 1
+                print(f"❌ Files differ:")
+                print(f"   First difference on line {line_num}")
+                print(f"   File 1: {filepath1}")
+                print(f"   File 2: {filepath2}")
+                return False
+            if not chunk1:
+                break
+            h.update(chunk1)
+            lines += chunk1.count(b"\n")
+    
+    print(f"✅ Files are identical: {h.hexdigest()}")
+    return True
@@ -0,0 +1,127 @@
+"""
+Validation tests for the batched RF evaluation harness.
+Every lockstep episode must drive exactly as a sequential SimEnv + RFPilot
+run of the same spec, for any batch size and worker count, and the report
+must carry KPIs and every phase timing.
+"""
+
+import unittest
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+from sklearn.ensemble import RandomForestRegressor
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+from nurb_rf_driver.control.expert_pilot import ExpertPilot
+from nurb_rf_driver.control.rf_pilot import RFPilot, CompiledForest
+from nurb_rf_driver.evaluate_rf_agent import PHASES, REPORT_FORMAT, evaluate_batch, plan_episodes
+from nurb_rf_driver.state.feature_extractor import FeatureExtractor, TARGET_ORDER
+from nurb_rf_driver.validate_replay import replay_log
+
+STARTS = [0.0, 3000.0, 9000.0]
+SEGMENT_M = 150.0
+MAX_TICKS = 400
+
+
+def train_model(directory):
+    """Small forest fitted on a short expert run, saved for load_rf_model()."""
+    env = SimEnv(run_id="harness_train")
+    pilot = ExpertPilot(env.track)
+    extractor = FeatureExtractor()
+    X, y = [], []
+    for start in (0.0, 6000.0):
+        state, _ = env.reset(start)
+        for _ in range(600):
+            controls = pilot.compute_control(state.speed_mps, state.heading_rad, state.track_x_m,
+                                             state.track_y_m, env.current_dist_m)
+            X.append(extractor.normalize_features(extractor.extract_features(state)))
+            y.append(controls)
+            state, _ = env.step(*controls)
+    forest = RandomForestRegressor(n_estimators=8, max_depth=8, random_state=0).fit(X, y)
+    CompiledForest.from_sklearn(forest, output_names=TARGET_ORDER).save_dir(directory)
+    return directory
+
+
+def sequential_episode(model_path, spec):
+    """Reference run: one SimEnv driven by RFPilot, episode by episode."""
+    env = SimEnv(run_id=spec["run_id"], root_identity="RF_Driver")
+    pilot = RFPilot(env.track, model_path=model_path)
+    state, meta = env.reset(spec["start_dist_m"])
+    distance, ticks, off_events, was_off = 0.0, 0, 0, False
+    while True:
+        controls = pilot.compute_control(state.speed_mps, state.heading_rad, state.track_x_m,
+                                         state.track_y_m, env.current_dist_m, vehicle_state_obj=state)
+        state, meta = env.step(*controls)
+        ticks += 1
+        distance += state.speed_mps * env.dt
+        off = abs(state.dist_to_centerline_m) > 5.0
+        off_events += off and not was_off
+        was_off = off
+        if distance >= spec["segment_m"] or ticks >= spec["max_ticks"]:
+            return {"ticks": ticks, "completed": distance >= spec["segment_m"],
+                    "off_track_events": off_events, "final_chain_hash": meta["chain_hash"]}
+
+
+class TestEvalHarness(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.model_path = train_model(os.path.join(cls.tmp.name, "model"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.quiet = contextlib.redirect_stdout(io.StringIO())
+        self.quiet.__enter__()
+
+    def tearDown(self):
+        self.quiet.__exit__(None, None, None)
+
+    def run_harness(self, **kwargs):
+        return evaluate_batch([1, 2], STARTS, SEGMENT_M, MAX_TICKS, model_path=self.model_path, **kwargs)
+
+    def test_matches_sequential_pilot(self):
+        report = self.run_harness(batch_size=4)
+        keys = ("ticks", "completed", "off_track_events", "final_chain_hash")
+        for spec, episode in zip(plan_episodes([1, 2], STARTS, SEGMENT_M, MAX_TICKS), report["episodes"]):
+            expected = sequential_episode(self.model_path, spec)
+            self.assertEqual({key: episode[key] for key in keys}, expected)
+
+    def test_batching_and_workers_agree(self):
+        reference = self.run_harness(batch_size=6)["episodes"]
+        for batch_size, workers in ((1, 1), (4, 2)):
+            self.assertEqual(self.run_harness(batch_size=batch_size, workers=workers)["episodes"], reference)
+
+    def test_report_and_logs(self):
+        report_path = os.path.join(self.tmp.name, "report.json")
+        log_dir = os.path.join(self.tmp.name, "logs")
+        report = self.run_harness(batch_size=3, log_dir=log_dir, report_path=report_path)
+        with open(report_path) as f:
+            self.assertEqual(json.load(f), report)
+
+        self.assertEqual(report["format"], REPORT_FORMAT)
+        self.assertEqual(set(report["timings"]["phases"]), set(PHASES))
+        self.assertGreater(report["timings"]["phases"]["logging"]["total_s"], 0.0)
+        self.assertEqual(report["kpis"]["episodes"], 6)
+        self.assertEqual(report["timings"]["env_ticks"], sum(e["ticks"] for e in report["episodes"]))
+
+        # Episode logs carry the pre-action hashes, so they replay like any training log
+        episode = report["episodes"][4]
+        path = os.path.join(log_dir, f"episode_{episode['episode']:04d}.ndjson")
+        result = replay_log(path, start_dist_m=episode["start_dist_m"])
+        self.assertEqual((result["samples"], result["mismatch"]), (episode["ticks"], None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Validation tests for the ExpertPilot speed-limit profile.
+The profile must respect the lateral, acceleration and braking limits
+around the closed lap, and each tick must read it back unchanged.
+"""
+
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.control.expert_pilot import ExpertPilot, PilotConfig, G
+from nurb_rf_driver.track.track_model import TrackModel
+
+TRACK_PATH = os.path.join(os.path.dirname(__file__), '..', 'track', 'track_nordschleife.json')
+
+
+class TestSpeedProfile(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.track = TrackModel(TRACK_PATH)
+        cls.config = PilotConfig()
+        cls.pilot = ExpertPilot(cls.track, cls.config)
+
+    def test_respects_limits(self):
+        cfg = self.config
+        v = self.pilot.speed_profile
+        ds = self.track.total_length_m / len(v)
+        curvature = np.abs(self.track.get_states_at_distances(np.arange(len(v)) * ds)["curvature"])
+        v2 = v * v
+        tol = 1e-9
+
+        self.assertTrue(np.all(v > 0.0))
+        self.assertTrue(np.all(v <= cfg.max_speed_mps + tol))
+        self.assertTrue(np.all(v2 * curvature <= cfg.max_lat_accel_g * G + tol))
+        # Closed lap: the last sample leads into the first
+        step = np.roll(v2, -1) - v2
+        self.assertTrue(np.all(step <= 2.0 * cfg.max_accel_g * G * ds + tol))
+        self.assertTrue(np.all(-step <= 2.0 * cfg.max_brake_decel_g * G * ds + tol))
+        # Corners actually slow the car
+        self.assertLess(v.min(), 0.5 * cfg.max_speed_mps)
+
+    def test_tick_reads_profile(self):
+        v = self.pilot.speed_profile
+        ds = self.track.total_length_m / len(v)
+        for i in (0, 1, len(v) // 2, len(v) - 1):
+            self.assertEqual(self.pilot.target_speed_at((i + 0.5) * ds), v[i])
+            self.assertEqual(self.pilot.target_speed_at((i + 0.5) * ds + self.track.total_length_m), v[i])
+
+        # Stationary at the start line: throttle toward the profile speed
+        steering, throttle, brake = self.pilot.compute_control(0.0, 0.0, 0.0, 0.0, 0.0)
+        self.assertEqual(steering, 0.0)
+        self.assertGreater(throttle, 0.0)
+        self.assertEqual(brake, 0.0)
+
+    def test_deterministic(self):
+        again = ExpertPilot(self.track, self.config)
+        np.testing.assert_array_equal(again.speed_profile, self.pilot.speed_profile)
+
+
+if __name__ == '__main__':
+    unittest.main()
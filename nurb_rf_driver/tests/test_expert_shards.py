@@ -0,0 +1,88 @@
+"""
+Validation tests for sharded expert data generation.
+Shards and manifest must not depend on the worker count, start positions
+must replay from their own reset(), and the manifest must catch a changed
+shard.
+"""
+
+import unittest
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+from nurb_rf_driver.generate_expert_data import MANIFEST_NAME, generate_dataset, plan_shards, verify_manifest
+from nurb_rf_driver.telemetry.ndjson_logger import iter_ndjson
+from nurb_rf_driver.validate_replay import replay_log
+
+SEEDS = [3, 4]
+STARTS = [0.0, 5000.0]
+TICKS = 300
+
+
+class TestExpertShards(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.quiet = contextlib.redirect_stdout(io.StringIO())
+        self.quiet.__enter__()
+
+    def tearDown(self):
+        self.quiet.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_worker_count_independent(self):
+        manifests = {}
+        for workers in (1, 2):
+            out_dir = os.path.join(self.tmp.name, f"w{workers}")
+            generate_dataset(out_dir, SEEDS, STARTS, TICKS, workers=workers)
+            with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+                manifests[workers] = json.load(f)
+        self.assertEqual(manifests[1], manifests[2])
+
+        manifest = manifests[1]
+        self.assertEqual(manifest["samples"], len(SEEDS) * len(STARTS) * TICKS)
+        self.assertEqual([(s["seed"], s["start_dist_m"]) for s in manifest["shards"]],
+                         [(seed, start) for seed in SEEDS for start in STARTS])
+        for entry in manifest["shards"]:
+            samples = list(iter_ndjson(os.path.join(self.tmp.name, "w1", entry["file"])))
+            self.assertEqual((samples[0]["tick"], samples[-1]["tick"]), (entry["first_tick"], entry["last_tick"]))
+            self.assertEqual(samples[-1]["meta"]["chain_hash"], entry["final_chain_hash"])
+
+    def test_start_position_replays(self):
+        generate_dataset(self.tmp.name, [7], [5000.0], TICKS)
+        with open(os.path.join(self.tmp.name, MANIFEST_NAME)) as f:
+            entry = json.load(f)["shards"][0]
+        path = os.path.join(self.tmp.name, entry["file"])
+
+        env = SimEnv()
+        state, _ = env.reset(5000.0)
+        self.assertEqual(env.current_dist_m, 5000.0)
+        self.assertEqual((state.track_x_m, state.track_y_m), (
+            env.track.get_state_at_distance(5000.0)["x"], env.track.get_state_at_distance(5000.0)["y"]))
+
+        self.assertIsNone(replay_log(path, start_dist_m=5000.0)["mismatch"])
+        self.assertEqual(replay_log(path, start_dist_m=0.0)["mismatch"], 0)
+
+    def test_manifest_detects_changed_shard(self):
+        generate_dataset(self.tmp.name, [1], [0.0, 100.0], 50)
+        self.assertEqual(verify_manifest(self.tmp.name), [])
+        with open(os.path.join(self.tmp.name, "shard_0001.ndjson"), 'ab') as f:
+            f.write(b"\n")
+        os.remove(os.path.join(self.tmp.name, "shard_0000.ndjson"))
+        self.assertEqual(verify_manifest(self.tmp.name), ["shard_0000.ndjson", "shard_0001.ndjson"])
+
+    def test_plan_run_ids_unique(self):
+        shards = plan_shards([1, 2], [0, 250.5], 10)
+        self.assertEqual(len({s["run_id"] for s in shards}), 4)
+        self.assertEqual([s["shard"] for s in shards], [0, 1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
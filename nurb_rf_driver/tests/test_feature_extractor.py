@@ -0,0 +1,98 @@
+"""
+Validation tests for the compiled FeatureExtractor plan.
+The preallocated single and batched paths must produce exactly the floats
+of the per-name asdict / normalize_features path, in canonical order.
+"""
+
+import unittest
+import copy
+import os
+import sys
+from dataclasses import asdict, fields
+
+import numpy as np
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.env.sim_env import VehicleState
+from nurb_rf_driver.env.vector_env import STATE_FIELDS
+from nurb_rf_driver.state import feature_extractor
+from nurb_rf_driver.state.feature_extractor import FeatureExtractor, FEATURE_CONFIG, FEATURE_ORDER
+
+
+def random_states(rng, count):
+    names = [field.name for field in fields(VehicleState)]
+    states = [VehicleState(*rng.uniform(-50.0, 50.0, len(names))) for _ in range(count)]
+    # Signed zeros must survive the plan
+    states[0].yaw_rate_rps = -0.0
+    return states
+
+
+def legacy_normalized(state):
+    """Per-name lookup and per-feature branch, as before the plan."""
+    state_dict = asdict(state)
+    normalized = []
+    for i, name in enumerate(FEATURE_ORDER):
+        value = float(state_dict.get(name, 0.0))
+        feat_info = FEATURE_CONFIG["features"][i]
+        norm_method = feat_info.get("normalization", "none")
+        if norm_method == "divide_by_max":
+            value = value / feat_info.get("max_value", 1.0)
+        elif norm_method == "divide_by_pi":
+            value = value / 3.14159
+        normalized.append(value)
+    return normalized
+
+
+def bits(values):
+    return np.asarray(values, dtype=np.float64).view(np.uint64).tolist()
+
+
+class TestFeatureExtractor(unittest.TestCase):
+
+    def setUp(self):
+        self.extractor = FeatureExtractor()
+        self.states = random_states(np.random.RandomState(7), 64)
+
+    def test_single_state_paths(self):
+        out = np.empty(self.extractor.num_features)
+        for state in self.states:
+            raw = [float(asdict(state)[name]) for name in FEATURE_ORDER]
+            self.assertEqual(bits(self.extractor.extract_features(state)), bits(raw))
+            self.assertEqual(bits(self.extractor.normalize_features(raw)), bits(legacy_normalized(state)))
+            self.extractor.extract_features_into(state, out, normalize=True)
+            self.assertEqual(bits(out), bits(legacy_normalized(state)))
+            self.extractor.extract_features_into(state, out)
+            self.assertEqual(bits(out), bits(raw))
+
+    def test_batch_paths(self):
+        expected = np.array([legacy_normalized(state) for state in self.states])
+        batch = self.extractor.extract_features_batch(self.states, normalize=True)
+        self.assertEqual(bits(batch), bits(expected))
+
+        obs = np.array([[getattr(state, name) for name in STATE_FIELDS] for state in self.states])
+        out = np.empty((len(self.states), self.extractor.num_features))
+        result = self.extractor.extract_features_batch(obs, out=out, normalize=True, field_names=STATE_FIELDS)
+        self.assertIs(result, out)
+        self.assertEqual(bits(out), bits(expected))
+
+        with self.assertRaises(ValueError):
+            self.extractor.extract_features_batch(obs)
+        with self.assertRaises(ValueError):
+            self.extractor.extract_features_batch(obs[:, :3], field_names=STATE_FIELDS[:3])
+
+    def test_dict_state_and_order(self):
+        self.assertEqual(self.extractor.get_feature_names(), FEATURE_ORDER)
+        self.assertEqual(self.extractor.extract_features({"speed_mps": 12, "curvature_ahead_60m": 0.5}),
+                         [12.0] + [0.0] * 8 + [0.5])
+
+    def test_rejects_out_of_order_config(self):
+        config = copy.deepcopy(FEATURE_CONFIG)
+        config["features"][0], config["features"][1] = config["features"][1], config["features"][0]
+        with self.assertRaises(ValueError):
+            feature_extractor._compile_divisors(config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+Validation tests for NDJSONLogger flush policies and streaming readers.
+Every policy must write the same bytes, and unflushed data must stay
+within one flush window. Indexed range reads, tailing and the streaming
+determinism check must agree with a plain full read.
+"""
+
+import unittest
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.telemetry.ndjson_logger import (
+    NDJSONLogger, FlushPolicy, FSYNC_INTERVAL, FSYNC_EVERY_RECORD,
+    build_tick_index, iter_ndjson, iter_ndjson_range, load_tick_index, tail_ndjson,
+    verify_ndjson_determinism
+)
+
+POLICIES = {
+    "default": FlushPolicy(),
+    "records": FlushPolicy(max_records=7),
+    "bytes": FlushPolicy(max_records=0, max_bytes=1000),
+    "interval": FlushPolicy(max_records=0, max_interval_s=0.001, fsync=FSYNC_INTERVAL, fsync_interval_s=0.0),
+    "every_record": FlushPolicy(fsync=FSYNC_EVERY_RECORD),
+    "background": FlushPolicy(max_records=5, background=True),
+    "unbounded": FlushPolicy(max_records=0)
+}
+
+
+def log(logger, tick):
+    logger.log_sample(
+        tick=tick,
+        timestamp_ms=tick * 20,
+        features={"speed_mps": tick * 0.1, "yaw_rate_rps": -0.0, "curvature_now": 1e-300},
+        targets={"steering_command": 0.1, "throttle_command": 0.5, "brake_command": 0.0},
+        meta={"coord_int": [tick, 0, 1], "seed_u64": 2 ** 64 - 1, "state_hash": "ab" * 32, "chain_hash": "cd" * 32}
+    )
+
+
+def line_count(path):
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+class TestNDJSONLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.quiet = contextlib.redirect_stdout(io.StringIO())
+        self.quiet.__enter__()
+
+    def tearDown(self):
+        self.quiet.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_identical_bytes(self):
+        digests = {}
+        for name, policy in POLICIES.items():
+            path = os.path.join(self.tmp.name, f"{name}.ndjson")
+            with NDJSONLogger(path, lap_id="lap_001", policy=policy) as logger:
+                for tick in range(100):
+                    log(logger, tick)
+            with open(path, 'rb') as f:
+                digests[name] = hashlib.sha256(f.read()).hexdigest()
+        self.assertEqual(len(set(digests.values())), 1, digests)
+
+    def test_loss_bounded_by_window(self):
+        path = os.path.join(self.tmp.name, "default.ndjson")
+        logger = NDJSONLogger(path, lap_id="lap_001")
+        logger.open()
+        for tick in range(3):
+            log(logger, tick)
+            self.assertEqual(line_count(path), tick + 1)
+        logger.close()
+
+        path = os.path.join(self.tmp.name, "records.ndjson")
+        logger = NDJSONLogger(path, lap_id="lap_001", policy=FlushPolicy(max_records=10))
+        logger.open()
+        for tick in range(25):
+            log(logger, tick)
+        self.assertEqual(line_count(path), 20)
+        logger.flush()
+        self.assertEqual(line_count(path), 25)
+        logger.close()
+
+        path = os.path.join(self.tmp.name, "background.ndjson")
+        logger = NDJSONLogger(path, lap_id="lap_001", policy=FlushPolicy(max_records=10, background=True))
+        logger.open()
+        for tick in range(25):
+            log(logger, tick)
+        # Only the open window (5) is unwritten: it waited for the writer to finish 10..19
+        self.assertEqual(line_count(path), 20)
+        logger.close()
+        self.assertEqual(line_count(path), 25)
+
+    def test_interval_window(self):
+        path = os.path.join(self.tmp.name, "interval.ndjson")
+        logger = NDJSONLogger(path, lap_id="lap_001", policy=FlushPolicy(max_records=0, max_interval_s=0.05))
+        logger.open()
+        log(logger, 0)
+        self.assertEqual(line_count(path), 0)
+        # The timer closes the window without another record arriving
+        time.sleep(0.2)
+        self.assertEqual(line_count(path), 1)
+        log(logger, 1)
+        logger.close()
+        self.assertEqual(line_count(path), 2)
+
+    def test_rejects_unknown_fsync(self):
+        with self.assertRaises(ValueError):
+            NDJSONLogger(os.path.join(self.tmp.name, "x.ndjson"), lap_id="lap", policy=FlushPolicy(fsync="always"))
+
+
+class TestStreamingReaders(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.quiet = contextlib.redirect_stdout(io.StringIO())
+        self.quiet.__enter__()
+        self.path = os.path.join(self.tmp.name, "run.ndjson")
+        with NDJSONLogger(self.path, lap_id="lap_001", index_every=16) as logger:
+            for tick in range(1, 501):
+                log(logger, tick)
+
+    def tearDown(self):
+        self.quiet.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_logger_index_matches_scan(self):
+        written = load_tick_index(self.path)
+        self.assertIsNotNone(written)
+        self.assertEqual(written, build_tick_index(self.path, every=16))
+        self.assertEqual(written["entries"][:2], [[1, 0], [17, written["entries"][1][1]]])
+
+    def test_range_reads(self):
+        full = list(iter_ndjson(self.path))
+        for start, stop in [(1, 2), (100, 140), (17, 33), (490, None), (None, 5), (600, 700)]:
+            expected = [s for s in full if (start is None or s["tick"] >= start) and (stop is None or s["tick"] < stop)]
+            self.assertEqual(list(iter_ndjson_range(self.path, start, stop)), expected)
+
+        # Rewritten log: the old index no longer matches and is ignored
+        with NDJSONLogger(self.path, lap_id="lap_002") as logger:
+            for tick in range(1000, 1600):
+                log(logger, tick)
+        self.assertIsNone(load_tick_index(self.path))
+        self.assertEqual([s["tick"] for s in iter_ndjson_range(self.path, 1200, 1203)], [1200, 1201, 1202])
+
+    def test_tail_live_log(self):
+        path = os.path.join(self.tmp.name, "live.ndjson")
+        with open(self.path, 'rb') as f:
+            lines = f.readlines()[:20]
+
+        def writer():
+            with open(path, 'wb') as f:
+                for line in lines:
+                    # Each line lands in two halves
+                    f.write(line[:10])
+                    f.flush()
+                    time.sleep(0.002)
+                    f.write(line[10:])
+                    f.flush()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        ticks = [s["tick"] for s in tail_ndjson(path, poll_interval_s=0.001, idle_timeout_s=0.5)]
+        thread.join()
+        self.assertEqual(ticks, list(range(1, 21)))
+
+    def test_verify_determinism_streaming(self):
+        copy = os.path.join(self.tmp.name, "copy.ndjson")
+        with open(self.path, 'rb') as src, open(copy, 'wb') as dst:
+            dst.write(src.read())
+        self.assertTrue(verify_ndjson_determinism(self.path, copy))
+
+        with open(copy, 'ab') as f:
+            f.write(b"\n")
+        self.assertFalse(verify_ndjson_determinism(self.path, copy))
+        with NDJSONLogger(copy, lap_id="lap_001") as logger:
+            for tick in range(1, 501):
+                log(logger, tick if tick != 321 else 0)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertFalse(verify_ndjson_determinism(self.path, copy))
+        self.assertIn("line 321", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Validation tests for sharded replay validation.
+Replaying snapshot shards in parallel must report exactly the first
+mismatching tick that a sequential replay from reset() reports.
+"""
+
+import unittest
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+from nurb_rf_driver.telemetry.ndjson_logger import NDJSONLogger
+from nurb_rf_driver.validate_replay import replay_log
+
+RUN = {"seed": 5, "run_id": "shard_test", "identity": "Han"}
+TICKS = 600
+SNAPSHOT_INTERVAL = 40
+
+
+def write_log(path):
+    env = SimEnv(seed=RUN["seed"], run_id=RUN["run_id"], root_identity=RUN["identity"])
+    _, meta = env.reset()
+    rng = np.random.RandomState(5)
+    with contextlib.redirect_stdout(io.StringIO()), NDJSONLogger(path, lap_id="lap_001") as logger:
+        for tick in range(TICKS):
+            targets = {
+                "steering_command": float(rng.uniform(-0.3, 0.3)),
+                "throttle_command": float(rng.rand()),
+                "brake_command": float(rng.rand() * 0.1)
+            }
+            snapshot = env.snapshot() if tick % SNAPSHOT_INTERVAL == 0 else None
+            logger.log_sample(tick=tick, timestamp_ms=tick * 20, features={}, targets=targets,
+                              meta=dict(meta, coord_int=list(meta["coord_int"])), snapshot=snapshot)
+            _, meta = env.step(*targets.values())
+
+
+def edit_line(path, index, edit):
+    with open(path) as f:
+        lines = f.readlines()
+    lines[index] = edit(lines[index])
+    with open(path, "w") as f:
+        f.writelines(lines)
+
+
+class TestReplayShards(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "run.ndjson")
+        write_log(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def replay(self, workers):
+        return replay_log(self.path, workers=workers, **RUN)
+
+    def test_clean_log(self):
+        sequential = self.replay(1)
+        sharded = self.replay(3)
+        self.assertEqual(sequential["samples"], TICKS)
+        self.assertIsNone(sequential["mismatch"])
+        self.assertIsNone(sharded["mismatch"])
+        self.assertGreater(sharded["shards"], 3)
+        self.assertEqual(sharded["restarted_shards"], 0)
+
+    def test_first_mismatch_matches_sequential(self):
+        def corrupt(line):
+            sample = json.loads(line)
+            sample["meta"]["state_hash"] = "0" * 64
+            return json.dumps(sample) + "\n"
+
+        # Mid-shard, then an earlier one on a restart line itself
+        edit_line(self.path, 437, corrupt)
+        self.assertEqual(self.replay(1)["mismatch"], 437)
+        self.assertEqual(self.replay(3)["mismatch"], 437)
+        edit_line(self.path, 320, corrupt)
+        self.assertEqual(self.replay(1)["mismatch"], 320)
+        self.assertEqual(self.replay(3)["mismatch"], 320)
+
+    def test_bad_snapshot_is_not_trusted(self):
+        def corrupt(line):
+            sample = json.loads(line)
+            sample["snapshot"]["vehicle_state"]["speed_mps"] += 1e-9
+            return json.dumps(sample) + "\n"
+
+        # The hashes still match; only the restart point is wrong
+        edit_line(self.path, 240, corrupt)
+        sharded = self.replay(3)
+        self.assertIsNone(sharded["mismatch"])
+        self.assertGreaterEqual(sharded["restarted_shards"], 1)
+
+    def test_malformed_line(self):
+        edit_line(self.path, 101, lambda line: line[:40] + "\n")
+        self.assertEqual(self.replay(1)["mismatch"], 101)
+        self.assertEqual(self.replay(3)["mismatch"], 101)
+
+
+if __name__ == '__main__':
+    unittest.main()
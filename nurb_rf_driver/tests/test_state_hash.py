@@ -0,0 +1,70 @@
+"""
+Validation tests for SimEnv state hashing.
+The packed layout must reproduce the original per-field packing and the
+hash chain recorded in data/demo_run.ndjson.
+"""
+
+import unittest
+import hashlib
+import json
+import os
+import struct
+import sys
+from dataclasses import asdict
+
+import numpy as np
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+
+DEMO_RUN = os.path.join(os.path.dirname(__file__), '..', 'data', 'demo_run.ndjson')
+
+
+def reference_state_hash(env: SimEnv) -> str:
+    """The original hash_state_tensor(): asdict() and one struct.pack per field."""
+    buf = bytearray()
+    buf += b"STATEv1\x00"
+    buf += struct.pack(">Q", env.tick)
+    buf += struct.pack(">d", env.time_elapsed)
+    state_dict = asdict(env.vehicle_state)
+    for key in sorted(state_dict.keys()):
+        buf += struct.pack(">f", float(state_dict[key]))
+    return hashlib.sha256(bytes(buf)).hexdigest()
+
+
+class TestStateHash(unittest.TestCase):
+
+    def test_matches_reference_packing(self):
+        env = SimEnv(seed=7, run_id="hash_test")
+        env.reset()
+        rng = np.random.RandomState(7)
+        for _ in range(300):
+            env.step(float(rng.uniform(-1, 1)), float(rng.rand()), float(rng.rand() * 0.2))
+            self.assertEqual(env.hash_state_tensor(), reference_state_hash(env))
+
+        # Ints, numpy scalars, signed zeros and float32 rounding edges
+        state = env.vehicle_state
+        state.vx_mps = 0
+        state.vy_mps = -0.0
+        state.speed_mps = np.float64(1.0000000596046448)
+        state.track_x_m = 3.4e38
+        state.track_y_m = -1e-45
+        self.assertEqual(env.hash_state_tensor(), reference_state_hash(env))
+
+    def test_replays_recorded_chain(self):
+        with open(DEMO_RUN) as f:
+            records = [json.loads(line) for line in f]
+
+        # Recorded by demo_sim_env.demo_ndjson_logging, chained from the first step
+        env = SimEnv(seed=42, run_id="log_demo_001", root_identity="Han")
+        for record in records:
+            targets = record['targets']
+            _, meta = env.step(targets['steering_command'], targets['throttle_command'], targets['brake_command'])
+            self.assertEqual(meta['state_hash'], record['meta']['state_hash'])
+            self.assertEqual(meta['chain_hash'], record['meta']['chain_hash'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Validation tests for the cubic-spline TrackModel.
+Scalar, cursor and array queries must agree bit for bit, straights must
+stay exactly straight and arcs must report their radius.
+"""
+
+import unittest
+import json
+import math
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.track.track_model import TrackModel
+
+TRACK_PATH = os.path.join(os.path.dirname(__file__), '..', 'track', 'track_nordschleife.json')
+KEYS = ("x", "y", "heading", "curvature", "width", "idx", "alpha")
+
+
+def write_track(directory, points):
+    path = os.path.join(directory, "track.json")
+    with open(path, "w") as f:
+        json.dump({"name": "test", "points": [
+            {"idx": i, "x": x, "y": y, "width": 10.0} for i, (x, y) in enumerate(points)
+        ]}, f)
+    return path
+
+
+class TestTrackModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.track = TrackModel(TRACK_PATH)
+
+    def test_scalar_cursor_and_array_agree(self):
+        rng = np.random.RandomState(0)
+        distances = np.concatenate([
+            rng.uniform(-100.0, 2 * self.track.total_length_m, 2000),
+            np.asarray(self.track.cumulative_dist[:200])
+        ])
+        batch = self.track.get_states_at_distances(distances)
+        cursor = self.track.cursor()
+        curvature_cursor = self.track.cursor()
+        for dist in sorted(distances.tolist()):
+            state = self.track.get_state_at_distance(dist)
+            self.assertEqual(cursor.state_at(dist), state)
+            self.assertEqual(curvature_cursor.curvature_at(dist), state["curvature"])
+        for k, dist in enumerate(distances.tolist()):
+            state = self.track.get_state_at_distance(dist)
+            self.assertEqual(state, {key: batch[key][k].item() for key in KEYS})
+
+        grid = self.track.get_states_at_distances(distances[:12].reshape(3, 4))
+        self.assertEqual(grid["curvature"].shape, (3, 4))
+        np.testing.assert_array_equal(grid["heading"].ravel(), batch["heading"][:12])
+
+    def test_interpolates_track_points(self):
+        states = self.track.get_states_at_distances(np.asarray(self.track.cumulative_dist[:-1]))
+        np.testing.assert_allclose(states["x"], [p.x_m for p in self.track.raw_points[:-1]], atol=1e-9)
+        np.testing.assert_allclose(states["y"], [p.y_m for p in self.track.raw_points[:-1]], atol=1e-9)
+
+    def test_straight_is_exactly_straight(self):
+        # The track opens on a straight along +x
+        states = self.track.get_states_at_distances(np.linspace(0.0, 50.0, 101))
+        np.testing.assert_array_equal(states["curvature"], 0.0)
+        np.testing.assert_array_equal(states["heading"], 0.0)
+        np.testing.assert_array_equal(states["y"], 0.0)
+
+    def test_arc_curvature(self):
+        radius = 100.0
+        angles = np.linspace(0.0, math.pi, 61)
+        points = [(-50.0, 0.0)] + [(radius * math.sin(a), radius * (1.0 - math.cos(a))) for a in angles]
+        with tempfile.TemporaryDirectory() as tmp:
+            track = TrackModel(write_track(tmp, points))
+        # Away from the straight-to-arc joint and the free end
+        arc = np.linspace(track.cumulative_dist[10], track.cumulative_dist[50], 200)
+        np.testing.assert_allclose(track.get_states_at_distances(arc)["curvature"], 1.0 / radius, rtol=1e-3)
+        self.assertGreater(track.curvature_at(float(arc[0])), 0.0)
+
+    def test_rejects_degenerate_tracks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                TrackModel(write_track(tmp, [(0.0, 0.0)]))
+            with self.assertRaises(ValueError):
+                TrackModel(write_track(tmp, [(0.0, 0.0), (1.0, 0.0), (1.0, 0.0), (2.0, 0.0)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Validation tests for VectorSimEnv.
+Every env in the pool must replay a standalone SimEnv bit for bit.
+"""
+
+import unittest
+import os
+import sys
+from dataclasses import astuple
+
+import numpy as np
+
+# Repository root, so the package's relative imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+from nurb_rf_driver.env.vector_env import VectorSimEnv, split_metadata
+
+
+def random_actions(rng, num_envs, tick):
+    actions = np.column_stack([
+        rng.uniform(-1.0, 1.0, num_envs),
+        rng.uniform(0.0, 1.0, num_envs),
+        (rng.rand(num_envs) < 0.2) * rng.rand(num_envs)
+    ])
+    if tick % 200 > 150:
+        # Hard braking down to standstill exercises the low-speed branches
+        actions[:, 1] = 0.0
+        actions[:, 2] = 1.0
+    return actions
+
+
+class TestVectorSimEnv(unittest.TestCase):
+
+    def assert_matches(self, vec, envs, obs, meta, standalone_meta):
+        self.assertEqual(split_metadata(meta), standalone_meta)
+        np.testing.assert_array_equal(obs, np.array([astuple(env.vehicle_state) for env in envs]))
+
+    def test_chains_match_standalone_envs(self):
+        num_envs = 5
+        vec = VectorSimEnv(num_envs, run_ids=[f"run_{k}" for k in range(num_envs)])
+        envs = [SimEnv(run_id=f"run_{k}") for k in range(num_envs)]
+
+        obs, meta = vec.reset()
+        self.assert_matches(vec, envs, obs, meta, [env.reset()[1] for env in envs])
+
+        rng = np.random.RandomState(0)
+        for tick in range(600):
+            actions = random_actions(rng, num_envs, tick)
+            obs, meta = vec.step(actions)
+            standalone = [env.step(*actions[k].tolist())[1] for k, env in enumerate(envs)]
+            self.assert_matches(vec, envs, obs, meta, standalone)
+
+        # Distinct run_ids give distinct seed streams and chains
+        self.assertEqual(len(set(meta["seed_u64"])), num_envs)
+        self.assertEqual(len(set(meta["chain_hash"])), num_envs)
+
+    def test_partial_reset_and_lap_wrap(self):
+        vec = VectorSimEnv(3)
+        envs = [SimEnv(run_id=f"sim_{k + 1:03d}") for k in range(3)]
+        vec.reset()
+        for env in envs:
+            env.reset()
+
+        # Start near the end of the lap so the distance wraps
+        for k, env in enumerate(envs):
+            env.current_dist_m = env.track.total_length_m - 5.0 - k
+        vec.current_dist_m[:] = [env.current_dist_m for env in envs]
+
+        rng = np.random.RandomState(1)
+        for tick in range(400):
+            if tick == 250:
+                _, meta = vec.reset([1])
+                self.assertEqual(split_metadata(meta), [envs[1].reset()[1]])
+            actions = random_actions(rng, 3, tick)
+            obs, meta = vec.step(actions)
+            standalone = [env.step(*actions[k].tolist())[1] for k, env in enumerate(envs)]
+            self.assert_matches(vec, envs, obs, meta, standalone)
+        self.assertEqual(meta["tick"].tolist(), [400, 150, 400])
+
+    def test_rejects_bad_shapes(self):
+        with self.assertRaises(ValueError):
+            VectorSimEnv(2, run_ids=["a"])
+        with self.assertRaises(ValueError):
+            VectorSimEnv(2).step(np.zeros((3, 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
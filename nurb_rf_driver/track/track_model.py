@@ -1,6 +1,13 @@
 """
 Track Model and Spline Interpolation.
 Provides mathematical representation of the track centerline, width, and curvature.
+
+The centerline is a natural cubic spline through the track points,
+parametrized by cumulative chord length s. Each segment i stores
+x(t) = a + b*t + c*t^2 + d*t^3 (same for y) with t = s - s_i, so position,
+heading atan2(y', x') and signed curvature (x'y'' - y'x'') / |v|^3 are
+analytic. Scalar and array queries evaluate the same expressions in the
+same order (atan2 via libm in both), so their results are bit-identical.
 """
 
 import json
@@ -9,6 +16,13 @@ import bisect
 from dataclasses import dataclass
 from typing import List, Tuple, Dict, Optional
 
+import numpy as np
+
+from ..libm import libm_map
+
+# Spline second derivatives below this (1/m) are treated as exactly zero
+SECOND_DERIVATIVE_EPS = 1e-12
+
 @dataclass
 class TrackPoint:
     """A single point definition on the track centerline."""
@@ -28,29 +42,51 @@ class SplineSegment:
     b_x: float
     c_x: float
     d_x: float
-    
+
     y0: float
     dy: float
     a_y: float
     b_y: float
     c_y: float
     d_y: float
-    
+
     length_m: float
     cumulative_dist_m: float
 
+
+class TrackCursor:
+    """
+    Cached segment index for one stream of queries.
+
+    Queries that move forward (or stay) within a segment or into the next
+    one skip the bisect. Keep one cursor per lookahead offset, e.g. the
+    current position and each curvature lookahead, so each stream stays
+    monotonic.
+    """
+
+    def __init__(self, track: 'TrackModel'):
+        self.track = track
+        self.idx = 0
+
+    def state_at(self, dist_m: float) -> Dict[str, float]:
+        return self.track.get_state_at_distance(dist_m, cursor=self)
+
+    def curvature_at(self, dist_m: float) -> float:
+        return self.track.curvature_at(dist_m, cursor=self)
+
+
 class TrackModel:
     """
     Represent the track using cubic splines for smooth curvature.
     """
-    
+
     def __init__(self, track_json_path: str):
         with open(track_json_path, 'r') as f:
             data = json.load(f)
-            
+
         self.name = data.get("name", "Unknown")
         self.total_length_m = data.get("total_length_m", 0.0)
-        
+
         # Load raw points
         self.raw_points: List[TrackPoint] = []
         for p in data.get("points", []):
@@ -62,65 +98,112 @@ class TrackModel:
                 width_m=p.get("width", 10.0),
                 camber_rad=p.get("camber", 0.0)
             ))
-            
-        # Build splines (placeholder: simple linear segments for now, TODO: Cubic)
-        # For v1, we will use piecewise linear with smoothed curvature lookups
-        # or implement simple cubic Hermite splines if needed.
-        # For simplicity in this step, we'll store points and implement
-        # a query method that linearly interpolates.
-        
+        if len(self.raw_points) < 2:
+            raise ValueError("Track needs at least two points")
+
         # Precompute cumulative distance
         self.cumulative_dist = [0.0]
         for i in range(1, len(self.raw_points)):
             p0 = self.raw_points[i-1]
             p1 = self.raw_points[i]
             dist = math.sqrt((p1.x_m - p0.x_m)**2 + (p1.y_m - p0.y_m)**2)
+            if dist <= 0.0:
+                raise ValueError(f"Track points {i - 1} and {i} coincide")
             self.cumulative_dist.append(self.cumulative_dist[-1] + dist)
-            
+
         self.total_length_m = self.cumulative_dist[-1]
+        self._compile()
+        self._cursor = TrackCursor(self)
+
+    def _compile(self):
+        """Fit the splines and lay out per-segment coefficient tables."""
+        s = np.array(self.cumulative_dist)
+        self._cum_dist = s
+        self._width = np.array([p.width_m for p in self.raw_points])
+        self._segment_len = np.diff(s)
+
+        # (n_segments, 4) tables: value coefficients a..d, and the
+        # derivative coefficients 2c, 3d, 6d used by heading and curvature
+        x_coef = _natural_cubic_spline(s, np.array([p.x_m for p in self.raw_points]))
+        y_coef = _natural_cubic_spline(s, np.array([p.y_m for p in self.raw_points]))
+        self._x_coef = x_coef
+        self._y_coef = y_coef
+        self._x_deriv = np.column_stack([x_coef[:, 1], 2.0 * x_coef[:, 2], 3.0 * x_coef[:, 3], 6.0 * x_coef[:, 3]])
+        self._y_deriv = np.column_stack([y_coef[:, 1], 2.0 * y_coef[:, 2], 3.0 * y_coef[:, 3], 6.0 * y_coef[:, 3]])
+
+        # (19, n_segments): x coef, y coef, x deriv, y deriv, width at both
+        # ends and length, so an array query gathers everything in one take
+        table = np.column_stack([
+            x_coef, y_coef, self._x_deriv, self._y_deriv, self._width[:-1], self._width[1:], self._segment_len
+        ])
+        self._columns = np.ascontiguousarray(table.T)
+
+        # Row lists for scalar queries (plain floats, same values)
+        self._cum_list = s.tolist()
+        self._rows = [tuple(row) for row in table.tolist()]
+        self._deriv_rows = [tuple(row) for row in np.column_stack([self._x_deriv, self._y_deriv]).tolist()]
+
+        self.segments: List[SplineSegment] = [
+            SplineSegment(
+                x0=p0.x_m, dx=p1.x_m - p0.x_m,
+                a_x=xc[0], b_x=xc[1], c_x=xc[2], d_x=xc[3],
+                y0=p0.y_m, dy=p1.y_m - p0.y_m,
+                a_y=yc[0], b_y=yc[1], c_y=yc[2], d_y=yc[3],
+                length_m=length, cumulative_dist_m=s0
+            )
+            for p0, p1, xc, yc, length, s0 in zip(
+                self.raw_points[:-1], self.raw_points[1:], x_coef.tolist(), y_coef.tolist(),
+                self._segment_len.tolist(), self._cum_list[:-1]
+            )
+        ]
+
+    def cursor(self) -> TrackCursor:
+        """New segment-index cache for a monotonic stream of queries."""
+        return TrackCursor(self)
+
+    def _segment_index(self, dist_m: float, cursor: TrackCursor) -> int:
+        """bisect_right(cumulative_dist, dist_m) - 1, clamped, trying the cursor's segment first."""
+        cum = self._cum_list
+        idx = cursor.idx
+        if cum[idx] <= dist_m < cum[idx + 1]:
+            return idx
+        if idx + 2 < len(cum) and cum[idx + 1] <= dist_m < cum[idx + 2]:
+            cursor.idx = idx + 1
+            return idx + 1
+        idx = bisect.bisect_right(cum, dist_m) - 1
+        idx = max(0, min(idx, len(cum) - 2))
+        cursor.idx = idx
+        return idx
 
-    def get_state_at_distance(self, dist_m: float) -> Dict[str, float]:
+    def get_state_at_distance(self, dist_m: float, cursor: Optional[TrackCursor] = None) -> Dict[str, float]:
         """
         Get track state (x, y, heading, curvature, width) at distance s.
         Handles wrapping for closed tracks.
+
+        cursor caches the segment index between calls (the model's own
+        cursor by default); it never changes the result.
         """
         dist_m = dist_m % self.total_length_m
-        
-        # Find segment
-        idx = bisect.bisect_right(self.cumulative_dist, dist_m) - 1
-        idx = max(0, min(idx, len(self.raw_points) - 2))
-        
-        p0 = self.raw_points[idx]
-        p1 = self.raw_points[idx + 1]
-        
-        s0 = self.cumulative_dist[idx]
-        s1 = self.cumulative_dist[idx + 1]
-        segment_len = s1 - s0
-        
-        if segment_len < 1e-6:
-            alpha = 0.0
-        else:
-            alpha = (dist_m - s0) / segment_len
-            
-        # Linear interp for pos
-        x = p0.x_m + alpha * (p1.x_m - p0.x_m)
-        y = p0.y_m + alpha * (p1.y_m - p0.y_m)
-        width = p0.width_m + alpha * (p1.width_m - p0.width_m)
-        
-        # Heading (tangent)
-        heading = math.atan2(p1.y_m - p0.y_m, p1.x_m - p0.x_m)
-        
-        # Curvature (requires 3 points, simplified here)
-        # For true curvature, we need the spline derivatives.
-        # Placeholder: 0.0 for linear segments
-        curvature = 0.0 
-        
-        # Better curvature estimation: Circle through prev, curr, next
-        if idx > 0 and idx < len(self.raw_points) - 2:
-            pp = self.raw_points[idx-1]
-            # Use 3 points: pp, p0, p1 to estimate curvature at p0?
-            # This is rough. For v2 we want cubic splines.
-            pass
+        idx = self._segment_index(dist_m, cursor or self._cursor)
+        (ax, bx, cx, dx, ay, by, cy, dy,
+         b1x, c2x, d3x, d6x, b1y, c2y, d3y, d6y, w0, w1, segment_len) = self._rows[idx]
+
+        t = dist_m - self._cum_list[idx]
+        x = ax + t * (bx + t * (cx + t * dx))
+        y = ay + t * (by + t * (cy + t * dy))
+
+        # First and second derivatives along s
+        x1 = b1x + t * (c2x + t * d3x)
+        y1 = b1y + t * (c2y + t * d3y)
+        x2 = c2x + t * d6x
+        y2 = c2y + t * d6y
+
+        heading = math.atan2(y1, x1)
+        speed2 = x1 * x1 + y1 * y1
+        curvature = (x1 * y2 - y1 * x2) / (speed2 * math.sqrt(speed2))
+
+        alpha = t / segment_len
+        width = w0 + alpha * (w1 - w0)
 
         return {
             "x": x,
@@ -132,8 +215,90 @@ class TrackModel:
             "alpha": alpha
         }
 
-    def curvature_at(self, dist_m: float) -> float:
-        """Get curvature at specific distance."""
-        # For now, return 0 or look up precomputed curvature
-        # Implementation to be refined with build_track.py pre-calculation
-        return self.get_state_at_distance(dist_m)["curvature"]
+    def get_states_at_distances(self, dist_m: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        get_state_at_distance() for an array of distances.
+        Returns the same keys, each an array shaped like dist_m.
+        """
+        dist_m = np.remainder(np.asarray(dist_m, dtype=np.float64), self.total_length_m)
+
+        # dist_m >= 0 = cumulative_dist[0], so only the upper end needs clamping
+        idx = np.searchsorted(self._cum_dist, dist_m, side='right') - 1
+        idx = np.minimum(idx, len(self.raw_points) - 2)
+
+        t = dist_m - self._cum_dist[idx]
+        (ax, bx, cx, dx, ay, by, cy, dy,
+         b1x, c2x, d3x, d6x, b1y, c2y, d3y, d6y, w0, w1, segment_len) = self._columns[:, idx]
+
+        x1 = b1x + t * (c2x + t * d3x)
+        y1 = b1y + t * (c2y + t * d3y)
+        x2 = c2x + t * d6x
+        y2 = c2y + t * d6y
+        speed2 = x1 * x1 + y1 * y1
+
+        alpha = t / segment_len
+        return {
+            "x": ax + t * (bx + t * (cx + t * dx)),
+            "y": ay + t * (by + t * (cy + t * dy)),
+            "heading": libm_map(math.atan2, y1, x1),
+            "curvature": (x1 * y2 - y1 * x2) / (speed2 * np.sqrt(speed2)),
+            "width": w0 + alpha * (w1 - w0),
+            "idx": idx,
+            "alpha": alpha
+        }
+
+    def curvature_at(self, dist_m: float, cursor: Optional[TrackCursor] = None) -> float:
+        """
+        Get curvature at specific distance.
+
+        Only the derivative terms are evaluated, for the lookahead queries
+        that need nothing else; the value equals
+        get_state_at_distance(dist_m)["curvature"].
+        """
+        dist_m = dist_m % self.total_length_m
+        idx = self._segment_index(dist_m, cursor or self._cursor)
+        b1x, c2x, d3x, d6x, b1y, c2y, d3y, d6y = self._deriv_rows[idx]
+
+        t = dist_m - self._cum_list[idx]
+        x1 = b1x + t * (c2x + t * d3x)
+        y1 = b1y + t * (c2y + t * d3y)
+        x2 = c2x + t * d6x
+        y2 = c2y + t * d6y
+        speed2 = x1 * x1 + y1 * y1
+        return (x1 * y2 - y1 * x2) / (speed2 * math.sqrt(speed2))
+
+
+def _natural_cubic_spline(s: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    (n - 1, 4) coefficients a, b, c, d of the natural cubic spline through
+    (s, values), in powers of t = s - s_i. Second derivatives come from the
+    tridiagonal system, solved with the Thomas algorithm.
+    """
+    n = len(s)
+    h = np.diff(s)
+    slope = np.diff(values) / h
+    m = np.zeros(n)  # second derivatives, zero at both ends
+    if n > 2:
+        lower = h[:-1].tolist()
+        diag = (2.0 * (h[:-1] + h[1:])).tolist()
+        upper = h[1:].tolist()
+        rhs = (6.0 * np.diff(slope)).tolist()
+        for i in range(1, len(diag)):
+            w = lower[i] / diag[i - 1]
+            diag[i] -= w * upper[i - 1]
+            rhs[i] -= w * rhs[i - 1]
+        interior = [0.0] * len(diag)
+        interior[-1] = rhs[-1] / diag[-1]
+        for i in range(len(diag) - 2, -1, -1):
+            interior[i] = (rhs[i] - upper[i] * interior[i + 1]) / diag[i]
+        m[1:-1] = interior
+        # The solve leaks exponentially small values into straights; flush
+        # them so a straight stays exactly straight (zero heading change)
+        m[np.abs(m) < SECOND_DERIVATIVE_EPS] = 0.0
+
+    return np.column_stack([
+        values[:-1],
+        slope - h * (2.0 * m[:-1] + m[1:]) / 6.0,
+        m[:-1] / 2.0,
+        (m[1:] - m[:-1]) / (6.0 * h)
+    ])
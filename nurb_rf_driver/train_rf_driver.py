@@ -6,17 +6,22 @@ Training a Random Forest Regressor on Expert Data.
 import sys
 import os
 import json
+import argparse
 import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
 
-# Ensure package path
+# Ensure package path, plus the repository's src/ for the shared forest modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from nurb_rf_driver.telemetry.ndjson_logger import load_ndjson
+from nurb_rf_driver.telemetry.ndjson_logger import iter_ndjson
 from nurb_rf_driver.state.feature_extractor import FeatureExtractor
+from nurb_rf_driver.control.rf_pilot import COMPILED_MODEL_PATH
+from compiled_forest import CompiledForest
+from racing_ai_trainer import CONTROL_NAMES, DeterministicRandomForest
 
 INPUT_LOG = os.path.join(os.path.dirname(__file__), "data", "expert_run_001.ndjson")
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "rf_driver_v1.joblib")
@@ -24,15 +29,9 @@ MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "rf_driver_v1.job
 def train_rf_driver():
     print(f"🌲 Training RF Driver...")
     
-    # 1. Load Data
-    print(f"   Loading data from {INPUT_LOG}...")
-    samples = load_ndjson(INPUT_LOG)
-    print(f"   Loaded {len(samples)} samples.")
+    # 1. Stream Data (one sample in memory at a time, only X / y accumulate)
+    print(f"   Streaming data from {INPUT_LOG}...")
     
-    if not samples:
-        print("❌ No data found.")
-        return
-        
     extractor = FeatureExtractor()
     feature_names = extractor.get_feature_names()
     target_names = extractor.get_target_names()
@@ -45,7 +44,7 @@ def train_rf_driver():
     y = []
     
     print("   Preprocessing...")
-    for s in samples:
+    for s in iter_ndjson(INPUT_LOG):
         if not s.get("valid", True):
             continue
             
@@ -66,6 +65,10 @@ def train_rf_driver():
         tgt_list = [tgt_dict[name] for name in target_names]
         y.append(tgt_list)
         
+    if not X:
+        print("❌ No data found.")
+        return
+        
     X = np.array(X)
     y = np.array(y)
     
@@ -107,7 +110,79 @@ def train_rf_driver():
     # 6. Save
     print(f"   Saving model to {MODEL_PATH}...")
     joblib.dump(rf, MODEL_PATH)
+    CompiledForest.from_sklearn(rf, output_names=target_names).save_dir(COMPILED_MODEL_PATH)
     print("✅ Training Complete.")
 
+def iter_training_chunks(log_path: str, chunk_rows: int, extractor: FeatureExtractor):
+    """Stream normalized (X, y) chunks of valid samples from an expert log."""
+    feature_names = extractor.get_feature_names()
+    target_names = extractor.get_target_names()
+    X, y = [], []
+    for s in iter_ndjson(log_path):
+        if not s.get("valid", True):
+            continue
+        feat_dict = s["features"]
+        X.append(extractor.normalize_features([feat_dict[name] for name in feature_names]))
+        tgt_dict = s["targets"]
+        y.append([tgt_dict[name] for name in target_names])
+        if len(X) == chunk_rows:
+            yield np.array(X), np.array(y)
+            X, y = [], []
+    if X:
+        yield np.array(X), np.array(y)
+
+
+def train_rf_driver_streaming(chunk_rows: int=50000, n_estimators: int=20):
+    """
+    Out-of-core variant of train_rf_driver: streams the log in chunks through
+    DeterministicRandomForest.train_out_of_core, which grows a multi-output
+    sub-forest per chunk and merges them. Memory is bounded by chunk_rows
+    instead of the log size.
+    
+    Only the compiled forest is saved: the merged trees work on standardized
+    inputs and targets, so they are no drop-in for the joblib model.
+    """
+    print(f"🌲 Training RF Driver (streaming, {chunk_rows} rows per chunk)...")
+    extractor = FeatureExtractor()
+    target_names = extractor.get_target_names()
+    
+    def chunks():
+        # Targets by position: steering, throttle, brake in both orders
+        for X, y in iter_training_chunks(INPUT_LOG, chunk_rows, extractor):
+            yield X, dict(zip(CONTROL_NAMES, y.T))
+    
+    rf = DeterministicRandomForest(seed=42, n_estimators=n_estimators, max_depth=16, mode="multi_output",
+                                   min_samples_leaf=1, min_samples_split=2)
+    try:
+        report = rf.train_out_of_core(chunks, test_size=0.2, validation_size=0.0)
+    except ValueError:
+        print("❌ No data found.")
+        return
+    
+    metrics = [report['metrics'][name] for name in CONTROL_NAMES]
+    print("-" * 40)
+    for name, m in zip(target_names, metrics):
+        print(f"   Target: {name:20s} | MSE: {m['test_mse']:.6f} | R2: {m['test_r2']:.4f}")
+    print("-" * 40)
+    print(f"   Average R2: {np.mean([m['test_r2'] for m in metrics]):.4f}")
+    
+    print(f"   Saving compiled model to {COMPILED_MODEL_PATH}...")
+    rf.compiled.save_dir(COMPILED_MODEL_PATH)
+    print("✅ Training Complete.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the RF driver on expert data")
+    parser.add_argument("--chunk-rows", type=int, default=None,
+                        help="Stream the log in chunks of this many rows (out-of-core training)")
+    parser.add_argument("--n-estimators", type=int, default=20, help="Trees in the streamed forest")
+    args = parser.parse_args()
+    
+    if args.chunk_rows:
+        train_rf_driver_streaming(args.chunk_rows, args.n_estimators)
+    else:
+        train_rf_driver()
+
+
 if __name__ == "__main__":
-    train_rf_driver()
+    main()
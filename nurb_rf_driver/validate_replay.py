@@ -1,90 +1,230 @@
 """
 Validate Replay Determinism.
 Loads a training log (NDJSON) and replays it in SimEnv to verify exact state reproduction.
+
+Samples that carry a "snapshot" (SimEnv.snapshot() of that tick, see
+NDJSONLogger.log_sample) are restart points. With workers > 1 the log is cut
+into shards at snapshots and every shard is replayed in its own process,
+starting from its snapshot. Each shard also applies its last action and
+hands the resulting snapshot to the next shard; the chain is stitched only
+if that hand-off equals the logged snapshot, otherwise the next shard is
+replayed again from the handed-over state. The first mismatching tick is
+therefore exactly the one a sequential replay from reset() reports.
+
+Usage:
+    python nurb_rf_driver/validate_replay.py --log nurb_rf_driver/data/expert_run_001.ndjson --workers 8
 """
 
 import sys
 import os
 import json
-import math
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 # Ensure package path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from nurb_rf_driver.env.sim_env import SimEnv
-from nurb_rf_driver.telemetry.ndjson_logger import load_ndjson
-from nurb_rf_driver.state.feature_extractor import FeatureExtractor
 
 INPUT_LOG = os.path.join(os.path.dirname(__file__), "data", "expert_run_001.ndjson")
 SEED = 1337      # Must match generation
-RUN_ID = "expert_001" 
+RUN_ID = "expert_001"
 IDENTITY = "Stig"
 
-def validate_replay():
-    print(f"🕵️ Validating Replay: {INPUT_LOG}")
-    
-    # Load samples
-    print("   Loading NDJSON...")
-    samples = load_ndjson(INPUT_LOG)
-    print(f"   Loaded {len(samples)} samples.")
-    
-    if not samples:
-        print("❌ No samples found.")
-        return
-        
-    # Init Env
-    env = SimEnv(seed=SEED, run_id=RUN_ID, root_identity=IDENTITY)
-    state_obj, meta = env.reset()
-    
-    extractor = FeatureExtractor()
-    
-    mismatches = 0
-    
-    print("   Replaying...")
-    
-    # iterate samples
-    # Sample i contains features(i) and targets(i) [action]
-    # We check if env state matches features(i), then apply targets(i) to get to i+1
-    
-    for i, sample in enumerate(samples):
-        # 1. Verify State (Features)
-        # Extract features from current env state
-        current_features_list = extractor.extract_features(state_obj)
-        current_features = dict(zip(extractor.feature_order, current_features_list))
-        
-        logged_features = sample["features"]
-        
-        # Check specific key features (exact match expected if deterministic?)
-        # Floating point might differ slightly if JSON truncation occurred.
-        # NDJSONLogger typically uses standard json dump.
-        # If we want exact hash check, we check metadata['state_hash'].
-        
-        logged_hash = sample["meta"]["state_hash"]
-        current_hash = meta["state_hash"]
-        
-        if logged_hash != current_hash:
-            print(f"❌ Hash Mismatch at tick {i}!")
-            print(f"   Logged:  {logged_hash}")
-            print(f"   Current: {current_hash}")
-            mismatches += 1
-            if mismatches > 5:
+SNAPSHOT_KEY = b'"snapshot":'
+SHARDS_PER_WORKER = 4  # more shards than workers evens out the tail
+
+# One env per worker process and run; building the track dominates a short shard
+_envs: Dict[Tuple[Any, ...], SimEnv] = {}
+
+
+def _env_for(env_kwargs: Dict[str, Any]) -> SimEnv:
+    key = tuple(sorted(env_kwargs.items()))
+    env = _envs.get(key)
+    if env is None:
+        env = _envs[key] = SimEnv(**env_kwargs)
+    return env
+
+
+def index_log(path: str) -> Tuple[int, List[Tuple[int, int, Dict[str, Any]]]]:
+    """
+    Scan a log without parsing ordinary samples.
+
+    Returns:
+        (sample count, [(sample index, byte offset, snapshot)] per snapshot line)
+    """
+    count = 0
+    offset = 0
+    restarts = []
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                if SNAPSHOT_KEY in line:
+                    try:
+                        restarts.append((count, offset, json.loads(line)["snapshot"]))
+                    except (ValueError, KeyError):
+                        pass  # replay reports the line itself
+                count += 1
+            offset += len(line)
+    return count, restarts
+
+
+def plan_shards(count: int, restarts: List[Tuple[int, int, Dict[str, Any]]], shards: int) -> List[Tuple[int, int, int, Optional[Dict[str, Any]]]]:
+    """
+    Up to `shards` (start, end, byte offset, snapshot) ranges covering
+    samples [0, count). The first starts at reset() (snapshot None), the
+    rest at the restart points closest to even splits.
+    """
+    starts = [(0, 0, None)]
+    candidates = [r for r in restarts if 0 < r[0] < count]
+    for k in range(1, shards):
+        target = count * k // shards
+        best = min(candidates, key=lambda r: abs(r[0] - target), default=None)
+        if best is not None and best[0] > starts[-1][0]:
+            starts.append(best)
+    ends = [start for start, _, _ in starts[1:]] + [count]
+    return [(start, end, offset, snapshot) for (start, offset, snapshot), end in zip(starts, ends)]
+
+
+def replay_shard(
+    path: str,
+    start: int,
+    end: int,
+    offset: int,
+    snapshot: Optional[Dict[str, Any]],
+    env_kwargs: Dict[str, Any],
+    start_dist_m: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Replay samples [start, end) read from byte offset, from reset(start_dist_m) or a snapshot.
+
+    Sample i holds the hashes of tick i; its targets lead to tick i + 1.
+
+    Returns:
+        {"mismatch": first mismatching sample index or None,
+         "logged"/"replayed": hashes at the mismatch,
+         "end": snapshot after the last action, for the next shard}
+    """
+    env = _env_for(env_kwargs)
+    if snapshot is None:
+        _, meta = env.reset(start_dist_m)
+    else:
+        env.restore(snapshot)
+        meta = {"state_hash": env.hash_state_tensor(), "chain_hash": env.prev_chain_hash}
+
+    i = start
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if i == end:
                 break
-        
-        # 2. Apply Action
-        targets = sample["targets"]
-        steering = targets["steering_command"]
-        throttle = targets["throttle_command"]
-        brake = targets["brake_command"]
-        
-        next_state_obj, next_meta = env.step(steering, throttle, brake)
-        
-        state_obj = next_state_obj
-        meta = next_meta
-        
-    if mismatches == 0:
+            if not line.strip():
+                continue
+            try:
+                sample = json.loads(line)
+                logged = sample.get("meta") or {}
+                targets = sample["targets"]
+            except (ValueError, KeyError, AttributeError):
+                return {"mismatch": i, "logged": None, "replayed": meta, "end": None}
+
+            if logged.get("state_hash") != meta["state_hash"] or \
+                    logged.get("chain_hash", meta["chain_hash"]) != meta["chain_hash"]:
+                return {"mismatch": i, "logged": logged, "replayed": meta, "end": None}
+
+            _, meta = env.step(targets["steering_command"], targets["throttle_command"], targets["brake_command"])
+            i += 1
+    return {"mismatch": None, "logged": None, "replayed": None, "end": env.snapshot()}
+
+
+def _same_snapshot(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    # Through JSON so -0.0 vs 0.0 and int vs float count as different
+    return json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+
+
+def replay_log(
+    path: str,
+    workers: int = 1,
+    seed: int = SEED,
+    run_id: str = RUN_ID,
+    identity: str = IDENTITY,
+    start_dist_m: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Verify every sample's state_hash (and chain_hash, when logged) by replay.
+
+    workers=1 replays the whole log from reset() in this process; more
+    workers replay snapshot shards in parallel with the same result.
+    start_dist_m is the reset() start of the logged run (see the
+    generate_expert_data manifest).
+
+    Returns:
+        {"samples", "shards", "restarted_shards", "mismatch", "logged", "replayed"}
+    """
+    env_kwargs = {"seed": seed, "run_id": run_id, "root_identity": identity}
+    count, restarts = index_log(path) if workers > 1 else (_count_samples(path), [])
+    shards = plan_shards(count, restarts, workers * SHARDS_PER_WORKER)
+    result = {"samples": count, "shards": len(shards), "restarted_shards": 0,
+              "mismatch": None, "logged": None, "replayed": None}
+
+    if len(shards) == 1:
+        start, end, offset, snapshot = shards[0]
+        outcome = replay_shard(path, start, end, offset, snapshot, env_kwargs, start_dist_m)
+        result.update(mismatch=outcome["mismatch"], logged=outcome["logged"], replayed=outcome["replayed"])
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(replay_shard, path, *shard, env_kwargs, start_dist_m) for shard in shards]
+        handoff = None
+        for (start, end, offset, snapshot), future in zip(shards, futures):
+            outcome = future.result()
+            if snapshot is not None and not _same_snapshot(snapshot, handoff):
+                # The logged restart point disagrees with the replayed chain:
+                # this shard's parallel result is void, redo it from the hand-off
+                result["restarted_shards"] += 1
+                outcome = replay_shard(path, start, end, offset, handoff, env_kwargs, start_dist_m)
+            if outcome["mismatch"] is not None:
+                pool.shutdown(cancel_futures=True)
+                result.update(mismatch=outcome["mismatch"], logged=outcome["logged"], replayed=outcome["replayed"])
+                return result
+            handoff = outcome["end"]
+    return result
+
+
+def _count_samples(path: str) -> int:
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.strip())
+
+
+def validate_replay(log_path: str = INPUT_LOG, workers: int = 1, start_dist_m: float = 0.0) -> bool:
+    print(f"🕵️ Validating Replay: {log_path}")
+
+    result = replay_log(log_path, workers=workers, start_dist_m=start_dist_m)
+    print(f"   Replayed {result['samples']} samples in {result['shards']} shard(s).")
+
+    if result["samples"] == 0:
+        print("❌ No samples found.")
+        return False
+    if result["mismatch"] is None:
         print("✅ REPLAY SUCCESS: All hashes matched!")
-    else:
-        print(f"❌ REPLAY FAILED: {mismatches} mismatches.")
+        return True
+
+    logged = result["logged"] or {}
+    print(f"❌ Hash Mismatch at tick {result['mismatch']}!")
+    print(f"   Logged:  {logged.get('state_hash')}")
+    print(f"   Current: {result['replayed']['state_hash']}")
+    print("❌ REPLAY FAILED")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an NDJSON training log and verify its hashes")
+    parser.add_argument("--log", default=INPUT_LOG)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--start-dist", type=float, default=0.0, help="reset() start distance of the logged run (m)")
+    args = parser.parse_args()
+    sys.exit(0 if validate_replay(args.log, args.workers, args.start_dist) else 1)
+
 
 if __name__ == "__main__":
-    validate_replay()
+    main()
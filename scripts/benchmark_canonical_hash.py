@@ -0,0 +1,126 @@
+"""
+Canonical Hash Benchmark
+Compares per-call json.dumps hashing with the shared canonical encoder.
+
+Usage:
+    python scripts/benchmark_canonical_hash.py --iterations 50000 --companies 2000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from canonical_json import canonical_sha256, canonical_sha256_stream
+from game_engine import GameEngine, IndustrySector, OperationType
+from ledger import Account, LedgerEntry, Transaction, TransactionType
+
+
+def legacy_sha256(obj) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def rate(fn, iterations: int) -> float:
+    """Calls per second"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def compare(name: str, legacy, shared, iterations: int) -> dict:
+    if legacy() != shared():
+        raise RuntimeError(f"{name}: shared encoder digest differs from json.dumps")
+    legacy_rate = rate(legacy, iterations)
+    shared_rate = rate(shared, iterations)
+    return {
+        "case": name,
+        "iterations": iterations,
+        "legacy_hashes_per_sec": round(legacy_rate, 1),
+        "shared_hashes_per_sec": round(shared_rate, 1),
+        "speedup": round(shared_rate / legacy_rate, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Canonical hash benchmark")
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--companies", type=int, default=2000, help="Companies in the full-state case")
+    args = parser.parse_args()
+
+    txn = Transaction(
+        transaction_id="txn_bench",
+        timestamp="2026-01-01T00:00:00+00:00",
+        tick=12,
+        from_company_id="SYSTEM",
+        to_company_id="company_bench",
+        amount_usd=12500.25,
+        transaction_type=TransactionType.REVENUE,
+        ledger_entry=LedgerEntry(Account.CASH, Account.REVENUE),
+        prev_transaction_hash="0" * 64,
+        metadata={"units": 10, "price": 1250.025}
+    )
+    legacy_txn = lambda: legacy_sha256({
+        "transaction_id": txn.transaction_id,
+        "timestamp": txn.timestamp,
+        "tick": txn.tick,
+        "from_company_id": txn.from_company_id,
+        "to_company_id": txn.to_company_id,
+        "amount_usd": txn.amount_usd,
+        "transaction_type": txn.transaction_type.value,
+        "ledger_entry": txn.ledger_entry.to_dict(),
+        "prev_transaction_hash": txn.prev_transaction_hash,
+        "related_operation_id": txn.related_operation_id,
+        "metadata": txn.metadata
+    })
+
+    game = GameEngine(seed=42)
+    for i in range(args.companies):
+        company = game.register_company(
+            company_name=f"Bench Corp {i}",
+            founding_capital_usd=1_000_000.0,
+            industry_sector=IndustrySector.TECH,
+            sovereign_signature="a" * 64
+        )
+        game.execute_operation(company.company_id, OperationType.HIRE, {"num_employees": 1})
+    game.tick()
+    company = next(iter(game.companies.values()))
+    legacy_company = lambda: legacy_sha256({
+        "company_id": company.company_id,
+        "tick": company.current_tick,
+        "resources": company.resources.to_dict(),
+        "financial_state": company.financial.to_dict(),
+        "performance_metrics": company.metrics.to_dict()
+    })
+    company_dict = company.to_dict()
+    full_state = {
+        "tick": game.current_tick,
+        "seed": game.seed,
+        "market": game.market_conditions.to_dict(),
+        "companies": [c.to_dict() for c in game.companies.values()]
+    }
+    full_iterations = max(1, args.iterations // args.companies)
+
+    results = {
+        "companies": args.companies,
+        "runs": [
+            compare("transaction_integrity_hash", legacy_txn,
+                    txn.compute_integrity_hash, args.iterations),
+            compare("company_state_hash", legacy_company,
+                    company.compute_state_hash, args.iterations),
+            compare("dict_payload", lambda: legacy_sha256(company_dict),
+                    lambda: canonical_sha256(company_dict), args.iterations),
+            compare("full_state_streamed", lambda: legacy_sha256(full_state),
+                    lambda: canonical_sha256_stream(full_state), full_iterations),
+        ]
+    }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Checkpoint Restore Benchmark
+Measures full-state restore time to first tick and to full ledger verification.
+
+Usage:
+    python scripts/benchmark_checkpoint_restore.py --companies 100000 --ticks 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from game_engine import GameEngine, IndustrySector, OperationType
+from checkpoint import LocalCheckpointStore, create_checkpoint, replay_from_checkpoint
+
+
+def build_game(num_companies: int, ticks: int) -> GameEngine:
+    """Game with every company carrying a multi-transaction ledger"""
+    game = GameEngine(seed=42)
+    for i in range(num_companies):
+        company = game.register_company(
+            company_name=f"Bench Corp {i}",
+            founding_capital_usd=1_000_000.0,
+            industry_sector=IndustrySector.TECH,
+            sovereign_signature="a" * 64
+        )
+        game.execute_operation(company.company_id, OperationType.HIRE, {"num_employees": 1})
+    for _ in range(ticks):
+        game.tick()
+    return game
+
+
+def benchmark_restore(store: LocalCheckpointStore, cid: str, lazy: bool) -> dict:
+    """Time restore → first tick → verify_all_chains"""
+    start = time.perf_counter()
+    game = replay_from_checkpoint(cid, store, lazy_ledgers=lazy)
+    restored = time.perf_counter()
+
+    game.tick()
+    first_tick = time.perf_counter()
+
+    chains = game.verify_all_chains()
+    verified = time.perf_counter()
+
+    if not all(chains.values()):
+        raise RuntimeError("Restored ledger chain failed verification")
+
+    return {
+        "lazy_ledgers": lazy,
+        "restore_sec": round(restored - start, 4),
+        "time_to_first_tick_sec": round(first_tick - start, 4),
+        "time_to_full_verification_sec": round(verified - start, 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpoint restore benchmark")
+    parser.add_argument("--companies", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=5, help="Ticks before checkpoint (ledger length)")
+    args = parser.parse_args()
+
+    print(f"Building game: {args.companies} companies, {args.ticks} ticks...")
+    game = build_game(args.companies, args.ticks)
+
+    base_path = tempfile.mkdtemp(prefix="ckpt_bench_")
+    try:
+        store = LocalCheckpointStore(base_path)
+
+        start = time.perf_counter()
+        cid = store.save_checkpoint(create_checkpoint(game))
+        save_sec = time.perf_counter() - start
+
+        results = {
+            "companies": args.companies,
+            "transactions_per_company": game.companies[next(iter(game.companies))].ledger.transaction_count(),
+            "checkpoint_bytes": os.path.getsize(store._loose_path(cid)),
+            "save_sec": round(save_sec, 4),
+            "runs": [benchmark_restore(store, cid, lazy) for lazy in (True, False)]
+        }
+    finally:
+        shutil.rmtree(base_path)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Evaluation Harness Benchmark
+Env-ticks/s of evaluating the RF driver one episode at a time (SimEnv +
+RFPilot.compute_control per tick, as evaluate_rf_agent() does) against the
+batched harness (evaluate_rf_agent.evaluate_batch) at several lockstep batch
+sizes, with the harness's per-phase time split. No trained model ships with
+the repo, so a forest is fitted on a short expert run first.
+
+Usage:
+    python scripts/benchmark_eval_harness.py --episodes 16 --ticks 1000 --batch-sizes 1 4 16
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+from nurb_rf_driver.control.expert_pilot import ExpertPilot
+from nurb_rf_driver.control.rf_pilot import RFPilot, CompiledForest
+from nurb_rf_driver.evaluate_rf_agent import evaluate_batch, plan_episodes
+from nurb_rf_driver.state.feature_extractor import FeatureExtractor, TARGET_ORDER
+
+
+def train_model(directory: str, trees: int) -> str:
+    env = SimEnv(run_id="bench_train")
+    pilot = ExpertPilot(env.track)
+    extractor = FeatureExtractor()
+    X, y = [], []
+    for start in (0.0, 5000.0, 10000.0):
+        state, _ = env.reset(start)
+        for _ in range(2000):
+            controls = pilot.compute_control(state.speed_mps, state.heading_rad, state.track_x_m,
+                                             state.track_y_m, env.current_dist_m)
+            X.append(extractor.normalize_features(extractor.extract_features(state)))
+            y.append(controls)
+            state, _ = env.step(*controls)
+    forest = RandomForestRegressor(n_estimators=trees, max_depth=12, random_state=0).fit(X, y)
+    CompiledForest.from_sklearn(forest, output_names=TARGET_ORDER).save_dir(directory)
+    return directory
+
+
+def sequential(model_path: str, episodes) -> int:
+    """Episode after episode, one compute_control() per tick."""
+    env = SimEnv(root_identity="RF_Driver")
+    pilot = RFPilot(env.track, model_path=model_path)
+    env_ticks = 0
+    for spec in episodes:
+        env.run_id = spec["run_id"]
+        state, _ = env.reset(spec["start_dist_m"])
+        distance = 0.0
+        for _ in range(spec["max_ticks"]):
+            controls = pilot.compute_control(state.speed_mps, state.heading_rad, state.track_x_m,
+                                             state.track_y_m, env.current_dist_m, vehicle_state_obj=state)
+            state, _ = env.step(*controls)
+            env_ticks += 1
+            distance += state.speed_mps * env.dt
+            if distance >= spec["segment_m"]:
+                break
+    return env_ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched RF evaluation benchmark")
+    parser.add_argument("--episodes", type=int, default=16)
+    parser.add_argument("--ticks", type=int, default=1000, help="Max ticks per episode")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--trees", type=int, default=50)
+    args = parser.parse_args()
+
+    starts = np.linspace(0.0, 16000.0, args.episodes).tolist()
+    segment_m = 1e9  # run every episode for the full --ticks
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        model_path = train_model(os.path.join(tmp, "model"), args.trees)
+        episodes = plan_episodes([1], starts, segment_m, args.ticks)
+
+        start = time.perf_counter()
+        env_ticks = sequential(model_path, episodes)
+        sequential_rate = env_ticks / (time.perf_counter() - start)
+
+        results = {}
+        for batch_size in args.batch_sizes:
+            report = evaluate_batch([1], starts, segment_m, args.ticks, batch_size=batch_size,
+                                    workers=args.workers, model_path=model_path)
+            timings = report["timings"]
+            results[batch_size] = {
+                "env_ticks_per_sec": round(timings["env_ticks_per_s"]),
+                "speedup": round(timings["env_ticks_per_s"] / sequential_rate, 1),
+                "us_per_env_tick": {phase: t["us_per_env_tick"] for phase, t in timings["phases"].items()}
+            }
+
+    print(json.dumps({
+        "episodes": args.episodes,
+        "ticks_per_episode": args.ticks,
+        "trees": args.trees,
+        "sequential_env_ticks_per_sec": round(sequential_rate),
+        "batch_sizes": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
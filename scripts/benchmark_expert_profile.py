@@ -0,0 +1,116 @@
+"""
+Expert Profile Benchmark
+ExpertPilot.compute_control() cost per tick and lap time with the
+precomputed speed-limit profile, against the original five-point curvature
+lookahead heuristic. Both drive SimEnv from a standing start until one lap
+of distance is covered; overspeed counts ticks above the lateral-grip limit
+sqrt(a_lat / |k|) at the car's position.
+
+Usage:
+    python scripts/benchmark_expert_profile.py --calls 50000
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+from nurb_rf_driver.control.expert_pilot import ExpertPilot, G
+
+
+class HeuristicPilot(ExpertPilot):
+    """compute_control() prior to the speed-limit profile"""
+
+    def compute_control(self, current_speed_mps, current_heading_rad, track_x_m, track_y_m, current_dist_m):
+        cfg = self.config
+        lookahead_dist = cfg.lookahead_min_m + cfg.lookahead_gain * current_speed_mps
+        target_state = self.track.get_state_at_distance(current_dist_m + lookahead_dist)
+        dx = target_state["x"] - track_x_m
+        dy = target_state["y"] - track_y_m
+        local_y = math.sin(-current_heading_rad) * dx + math.cos(-current_heading_rad) * dy
+        pp_curvature = 2.0 * local_y / (lookahead_dist ** 2)
+        steer_cmd = math.atan(2.7 * pp_curvature) * cfg.steer_gain
+        steering_norm = max(-1.0, min(1.0, steer_cmd / 0.5))
+
+        curvatures = []
+        for d in [0, 20, 50, 100, 150]:
+            s = self.track.get_state_at_distance(current_dist_m + d)
+            curvatures.append(abs(s["curvature"]))
+        max_curv = max(0.0001, max(curvatures))
+        target_speed = min(cfg.max_speed_mps, math.sqrt((cfg.max_lat_accel_g * 9.81) / max_curv))
+
+        speed_error = target_speed - current_speed_mps
+        throttle_norm = 0.0
+        brake_norm = 0.0
+        if speed_error > 0:
+            throttle_norm = min(1.0, speed_error * cfg.throttle_kp / 10.0)
+        else:
+            brake_norm = min(1.0, -speed_error * cfg.brake_kp / 20.0)
+        return steering_norm, throttle_norm, brake_norm
+
+
+def drive_lap(pilot_cls, max_ticks: int) -> dict:
+    env = SimEnv(seed=1337, run_id="profile_bench")
+    state, _ = env.reset()
+    pilot = pilot_cls(env.track)
+    lat_accel = pilot.config.max_lat_accel_g * G
+    distance = 0.0
+    overspeed = 0
+    worst = 0.0
+    for tick in range(1, max_ticks + 1):
+        controls = pilot.compute_control(state.speed_mps, state.heading_rad, state.track_x_m, state.track_y_m,
+                                         env.current_dist_m)
+        state, _ = env.step(*controls)
+        distance += state.speed_mps * env.dt
+        excess = state.speed_mps - math.sqrt(lat_accel / max(1e-12, abs(state.curvature_now)))
+        if excess > 0:
+            overspeed += 1
+            worst = max(worst, excess)
+        if distance >= env.track.total_length_m:
+            break
+    return {
+        "lap_time_s": round(tick * env.dt, 2) if distance >= env.track.total_length_m else None,
+        "overspeed_ticks": overspeed,
+        "worst_overspeed_mps": round(worst, 2)
+    }
+
+
+def us_per_tick(pilot: ExpertPilot, calls: int) -> float:
+    total = pilot.track.total_length_m
+    start = time.perf_counter()
+    for k in range(calls):
+        pilot.compute_control(60.0, 0.0, 0.0, 0.0, (k * 1.2) % total)
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expert pilot speed profile benchmark")
+    parser.add_argument("--calls", type=int, default=50000)
+    parser.add_argument("--max-ticks", type=int, default=40000)
+    args = parser.parse_args()
+
+    track = SimEnv(seed=1337).track
+    start = time.perf_counter()
+    profiled = ExpertPilot(track)
+    build_ms = (time.perf_counter() - start) * 1000
+    heuristic = HeuristicPilot(track)
+
+    result = {
+        "profile_samples": len(profiled.speed_profile),
+        "profile_build_ms": round(build_ms, 1),
+        "heuristic_us_per_tick": round(us_per_tick(heuristic, args.calls), 2),
+        "profile_us_per_tick": round(us_per_tick(profiled, args.calls), 2),
+        "heuristic_lap": drive_lap(HeuristicPilot, args.max_ticks),
+        "profile_lap": drive_lap(ExpertPilot, args.max_ticks)
+    }
+    result["speedup"] = round(result["heuristic_us_per_tick"] / result["profile_us_per_tick"], 2)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Expert Shards Benchmark
+Samples/s of generate_expert_data.generate_dataset() against worker count,
+on the same seeds x start positions grid. Every worker count must produce
+the same manifest (same shard bytes and final chain hashes).
+
+Usage:
+    python scripts/benchmark_expert_shards.py --seeds 1 2 --starts 0 4000 8000 12000 --ticks 5000 --workers 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.generate_expert_data import generate_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel expert data generation benchmark")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--starts", type=float, nargs="+", default=[0.0, 4000.0, 8000.0, 12000.0])
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    results = {}
+    manifests = []
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                manifest = generate_dataset(tmp, args.seeds, args.starts, args.ticks, workers=workers)
+            elapsed = time.perf_counter() - start
+        manifests.append(manifest)
+        results[workers] = {"wall_s": round(elapsed, 2), "samples_per_sec": round(manifest["samples"] / elapsed)}
+    if any(manifest != manifests[0] for manifest in manifests):
+        raise RuntimeError("Worker counts produced different datasets")
+
+    base = results[args.workers[0]]["samples_per_sec"]
+    for result in results.values():
+        result["speedup"] = round(result["samples_per_sec"] / base, 2)
+    print(json.dumps({
+        "cpu_count": os.cpu_count(),
+        "shards": len(manifests[0]["shards"]),
+        "samples": manifests[0]["samples"],
+        "identical_manifests": True,
+        "workers": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
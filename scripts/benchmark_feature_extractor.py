@@ -0,0 +1,103 @@
+"""
+Feature Extractor Benchmark
+Per-state cost of building RFPilot's model input: the legacy asdict +
+per-name lookup + normalize_features + np.array path against the compiled
+plan writing into a preallocated (1, n) array, and batched extraction
+from a list of states and from a VectorSimEnv observation matrix.
+
+Usage:
+    python scripts/benchmark_feature_extractor.py --states 4096 --repeats 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, fields
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.env.sim_env import VehicleState
+from nurb_rf_driver.env.vector_env import STATE_FIELDS
+from nurb_rf_driver.state.feature_extractor import FeatureExtractor, FEATURE_CONFIG, FEATURE_ORDER
+
+
+def legacy_input(state) -> np.ndarray:
+    """extract_features() + normalize_features() + np.array as RFPilot did it."""
+    state_dict = asdict(state)
+    features = [float(state_dict.get(name, 0.0)) for name in FEATURE_ORDER]
+    normalized = []
+    for i, value in enumerate(features):
+        feat_info = FEATURE_CONFIG["features"][i]
+        norm_method = feat_info.get("normalization", "none")
+        max_val = feat_info.get("max_value", 1.0)
+        if norm_method == "divide_by_max":
+            normalized.append(value / max_val)
+        elif norm_method == "divide_by_pi":
+            normalized.append(value / 3.14159)
+        else:
+            normalized.append(value)
+    return np.array([normalized])
+
+
+def best_us(fn, count: int, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiled feature plan benchmark")
+    parser.add_argument("--states", type=int, default=4096)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    n_fields = len(fields(VehicleState))
+    states = [VehicleState(*rng.uniform(-50.0, 50.0, n_fields)) for _ in range(args.states)]
+    obs = np.array([[getattr(state, name) for name in STATE_FIELDS] for state in states])
+
+    extractor = FeatureExtractor()
+    X = np.empty((1, extractor.num_features))
+    batch_out = np.empty((args.states, extractor.num_features))
+
+    def legacy():
+        for state in states:
+            legacy_input(state)
+
+    def plan():
+        for state in states:
+            extractor.extract_features_into(state, X[0], normalize=True)
+
+    legacy_rows = np.vstack([legacy_input(state) for state in states])
+    batch = extractor.extract_features_batch(states, normalize=True)
+    matrix = extractor.extract_features_batch(obs, out=batch_out, normalize=True, field_names=STATE_FIELDS)
+    if not (np.array_equal(legacy_rows, batch) and np.array_equal(legacy_rows, matrix)):
+        raise RuntimeError("Plan and legacy features differ")
+
+    legacy_us = best_us(legacy, args.states, args.repeats)
+    plan_us = best_us(plan, args.states, args.repeats)
+    result = {
+        "states": args.states,
+        "identical_features": True,
+        "legacy_us_per_state": round(legacy_us, 2),
+        "plan_us_per_state": round(plan_us, 2),
+        "batch_states_us_per_state": round(best_us(
+            lambda: extractor.extract_features_batch(states, out=batch_out, normalize=True),
+            args.states, args.repeats), 3),
+        "batch_matrix_us_per_state": round(best_us(
+            lambda: extractor.extract_features_batch(obs, out=batch_out, normalize=True, field_names=STATE_FIELDS),
+            args.states, args.repeats), 4),
+        "speedup": round(legacy_us / plan_us, 1)
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
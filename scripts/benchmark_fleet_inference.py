@@ -0,0 +1,97 @@
+"""
+Fleet Inference Benchmark
+Tick latency vs AI car count for one DeterministicRandomForest: per-car
+sklearn calls (3 forest calls per car), per-car compiled predict(), and one
+RFFleetController tick for all cars.
+
+Usage:
+    python scripts/benchmark_fleet_inference.py --cars 1 5 10 20 50 --ticks 50
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from fleet_controller import RFFleetController
+from racing_ai_trainer import FEATURES, DeterministicRandomForest
+from racing_simulator import ControlInput, RacingSimulator
+
+
+def simulated_states(steps: int) -> list:
+    sim = RacingSimulator(seed=5)
+    rng = np.random.RandomState(5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(steps):
+            sim.step(ControlInput(float(rng.uniform(-0.5, 0.5)), float(rng.rand()), float(rng.rand() * 0.3)))
+    records = list(sim.state_action_history)
+    for record in records:
+        record['state']['current_section'] = record['state']['current_section'].value
+    return records
+
+
+def tick_ms(fn, ticks: int) -> float:
+    start = time.perf_counter()
+    for tick in range(ticks):
+        fn(tick)
+    return (time.perf_counter() - start) * 1000 / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet inference benchmark")
+    parser.add_argument("--cars", type=int, nargs="+", default=[1, 5, 10, 20, 50])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--trees", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=12)
+    parser.add_argument("--max-sklearn-cars", type=int, default=20,
+                        help="Skip the per-car sklearn baseline above this many cars")
+    args = parser.parse_args()
+
+    records = simulated_states(2000)
+    X, y = FEATURES.extract_records(records)
+    model = DeterministicRandomForest(seed=42, n_estimators=args.trees, max_depth=args.depth)
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.train(X, y)
+    for forest in model.models.values():
+        forest.set_params(n_jobs=1)
+    states = [record['state'] for record in records]
+
+    runs = []
+    for num_cars in args.cars:
+        fleet = RFFleetController()
+        for car in range(num_cars):
+            fleet.add_car(car, model)
+
+        def tick_states(tick):
+            return {car: states[(tick * num_cars + car) % len(states)] for car in range(num_cars)}
+
+        for tick in range(args.ticks):
+            batch = fleet.tick(tick_states(tick))
+            if any(batch[car] != model.predict(state) for car, state in tick_states(tick).items()):
+                raise RuntimeError("Fleet controls differ from per-car predict")
+
+        run = {"cars": num_cars, "ticks": args.ticks}
+        run["per_car_compiled_ms"] = round(tick_ms(
+            lambda t: [model.predict(s) for s in tick_states(t).values()], args.ticks), 3)
+        run["fleet_ms"] = round(tick_ms(lambda t: fleet.tick(tick_states(t)), args.ticks), 3)
+        run["fleet_speedup"] = round(run["per_car_compiled_ms"] / run["fleet_ms"], 2)
+        if num_cars <= args.max_sklearn_cars:
+            def sklearn_tick(t):
+                for state in tick_states(t).values():
+                    row = np.array([FEATURES.row(state)], dtype=np.float32)
+                    model._predict_scaled(model.scalers['features'].transform(row))
+            run["per_car_sklearn_ms"] = round(tick_ms(sklearn_tick, min(args.ticks, 10)), 3)
+        runs.append(run)
+
+    print(json.dumps({"trees_per_target": args.trees, "max_depth": args.depth, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Forest Inference Benchmark
+Per-tick latency of the sklearn control path (feature scaler, one forest
+per target, inverse target scalers) vs the same models as a
+CompiledForest, for single samples and small batches. Also checks the
+compiled predictions are bit-identical.
+
+Usage:
+    python scripts/benchmark_forest_inference.py --forests 10x12 20x16 100x20 --ticks 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from compiled_forest import CompiledForest
+
+TARGETS = ('steering', 'throttle', 'brake')
+
+
+def train(n_estimators: int, max_depth: int, samples: int, features: int):
+    rng = np.random.RandomState(7)
+    X = rng.randn(samples, features).astype(np.float32)
+    Y = np.column_stack([np.tanh(X[:, 0] + X[:, 1]), np.sin(X[:, 2]), X[:, 3] * X[:, 4]])
+    Y += 0.05 * rng.randn(*Y.shape)
+
+    feature_scaler = StandardScaler().fit(X)
+    X_scaled = feature_scaler.transform(X)
+    target_scalers, forests = {}, {}
+    for k, name in enumerate(TARGETS):
+        target_scalers[name] = StandardScaler().fit(Y[:, [k]])
+        forests[name] = RandomForestRegressor(
+            n_estimators=n_estimators, max_depth=max_depth, min_samples_leaf=5, random_state=k, n_jobs=-1
+        ).fit(X_scaled, target_scalers[name].transform(Y[:, [k]]).ravel())
+        forests[name].set_params(n_jobs=1)
+    return X, forests, feature_scaler, target_scalers
+
+
+def sklearn_tick(X, forests, feature_scaler, target_scalers):
+    X_scaled = feature_scaler.transform(X)
+    return np.column_stack([
+        target_scalers[name].inverse_transform(forests[name].predict(X_scaled).reshape(-1, 1)).ravel()
+        for name in TARGETS
+    ])
+
+
+def per_call_us(fn, rows) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        fn(row)
+    return (time.perf_counter() - start) * 1e6 / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forest inference benchmark")
+    parser.add_argument("--forests", nargs="+", default=["10x12", "20x16", "100x20"],
+                        help="Trees x max_depth per target forest")
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=16, help="Small-batch size (cars per call)")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--features", type=int, default=13)
+    args = parser.parse_args()
+
+    runs = []
+    for spec in args.forests:
+        n_estimators, max_depth = (int(v) for v in spec.split("x"))
+        X, forests, feature_scaler, target_scalers = train(n_estimators, max_depth, args.samples, args.features)
+        compiled = CompiledForest.from_sklearn(forests, feature_scaler, target_scalers)
+
+        queries = X[:args.ticks]
+        identical = bool(np.array_equal(
+            compiled.predict(queries), sklearn_tick(queries, forests, feature_scaler, target_scalers)
+        ))
+        rows = [queries[i:i + 1] for i in range(len(queries))]
+        batches = [queries[i:i + args.batch] for i in range(0, len(queries) - args.batch + 1, args.batch)]
+
+        sklearn_us = per_call_us(lambda row: sklearn_tick(row, forests, feature_scaler, target_scalers),
+                                 rows[:max(20, args.ticks // 10)])
+        compiled_us = per_call_us(compiled.predict, rows)
+        batch_us = per_call_us(compiled.predict, batches) / args.batch
+
+        runs.append({
+            "trees_per_target": n_estimators,
+            "max_depth": max_depth,
+            "nodes": compiled.node_count,
+            "compiled_bytes": compiled.nbytes,
+            "evaluator": "walk" if compiled._walk_trees else "levelwise",
+            "identical": identical,
+            "sklearn_us_per_tick": round(sklearn_us, 1),
+            "compiled_us_per_tick": round(compiled_us, 1),
+            f"compiled_batch{args.batch}_us_per_sample": round(batch_us, 1),
+            "speedup": round(sklearn_us / compiled_us, 1)
+        })
+
+    print(json.dumps({"targets": list(TARGETS), "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+State-Action History Memory Benchmark
+Runs RacingSimulator for a span of simulated time and samples traced Python
+heap at intervals; with the ring buffer it should stay flat while the spill
+file grows. Also times export_training_data streaming the full history.
+
+Usage:
+    python scripts/benchmark_history_memory.py --hours 24 --capacity 65536
+"""
+
+import argparse
+import builtins
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from racing_simulator import ControlInput, RacingSimulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="State-action history memory benchmark")
+    parser.add_argument("--hours", type=float, default=1.0, help="Simulated hours at 60 Hz")
+    parser.add_argument("--capacity", type=int, default=65536)
+    parser.add_argument("--samples", type=int, default=8, help="Memory samples over the run")
+    parser.add_argument("--skip-export", action="store_true")
+    args = parser.parse_args()
+
+    steps = int(args.hours * 3600 * 60)
+    interval = max(1, steps // args.samples)
+    control = ControlInput(steering_command=0.05, throttle_command=0.7, brake_command=0.0)
+
+    # Lap-complete messages would dominate the run
+    quiet_print, builtins.print = builtins.print, lambda *a, **k: None
+    tmp = tempfile.mkdtemp(prefix="history_bench_")
+    try:
+        tracemalloc.start()
+        sim = RacingSimulator(seed=42, history_capacity=args.capacity, history_spill_dir=tmp)
+        samples = []
+        start = time.perf_counter()
+        for i in range(1, steps + 1):
+            sim.step(control)
+            if i % interval == 0:
+                current, _ = tracemalloc.get_traced_memory()
+                samples.append({"sim_hours": round(i / 216000, 3), "traced_mb": round(current / 2**20, 2)})
+        run_sec = time.perf_counter() - start
+        tracemalloc.stop()
+
+        history = sim.state_action_history
+        result = {
+            "steps": steps,
+            "capacity": args.capacity,
+            "ring_mb": round(history.memory_bytes / 2**20, 2),
+            "spilled_rows": history.spilled_rows,
+            "usec_per_step": round(run_sec * 1e6 / steps, 2),
+            "memory": samples
+        }
+
+        if not args.skip_export:
+            start = time.perf_counter()
+            path = sim.export_training_data(os.path.join(tmp, "export.ndjson"))
+            result["export_sec"] = round(time.perf_counter() - start, 2)
+            result["export_mb"] = round(os.path.getsize(path) / 2**20, 1)
+            os.remove(path)
+        history.clear()
+    finally:
+        builtins.print = quiet_print
+        os.rmdir(tmp)
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Model Registry Cold-Start Benchmark
+Startup time and per-process memory of N concurrent inference workers
+loading one trained DeterministicRandomForest two ways: unpickling the
+joblib forests and scalers and compiling them (the previous load path), and
+ModelRegistry.get() mapping the compiled tables read-only. Memory comes
+from /proc/self/smaps_rollup after every worker has loaded and predicted:
+PSS charges shared pages 1/N to each process, USS counts only private ones.
+Files are in the page cache for both variants (the model is just written).
+
+Usage:
+    python scripts/benchmark_model_registry.py --workers 1 4 8 --trees 100 --depth 20
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC)
+
+from model_registry import ModelRegistry
+from racing_ai_trainer import FEATURES, DeterministicRandomForest, create_training_ledger_entry
+from racing_simulator import ControlInput, RacingSimulator
+
+WORKER_SCRIPT = """
+import json, sys, time
+import numpy as np
+sys.path.insert(0, {src!r})
+import joblib
+from compiled_forest import CompiledForest
+from model_registry import ModelRegistry
+
+def smaps_kb():
+    fields = {{}}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {{'rss': fields['Rss'], 'pss': fields['Pss'],
+            'uss': fields['Private_Clean'] + fields['Private_Dirty']}}
+
+X = np.load({inputs!r})
+before = smaps_kb()
+start = time.perf_counter()
+if {mode!r} == 'joblib':
+    directory = {model_dir!r}
+    models = {{name: joblib.load(f'{{directory}}/rf_{{name}}.joblib') for name in ('steering', 'throttle', 'brake')}}
+    scalers = {{name: joblib.load(f'{{directory}}/scaler_{{name}}.joblib') for name in ('features', 'steering', 'throttle', 'brake')}}
+    model = CompiledForest.from_sklearn(models, feature_scaler=scalers['features'],
+                                        target_scalers={{n: scalers[n] for n in ('steering', 'throttle', 'brake')}})
+else:
+    model = ModelRegistry({root!r}).get({key!r}).compiled
+loaded = time.perf_counter()
+model.predict(X[0])
+first = time.perf_counter()
+model.predict(X)
+print('ready', flush=True)
+sys.stdin.readline()
+after = smaps_kb()
+print(json.dumps({{'load_ms': (loaded - start) * 1000, 'first_predict_ms': (first - loaded) * 1000,
+                  'delta_kb': {{k: after[k] - before[k] for k in after}}}}))
+"""
+
+
+def train_model(trees: int, depth: int, steps: int):
+    sim = RacingSimulator(seed=42)
+    rng = np.random.RandomState(42)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(steps):
+            sim.step(ControlInput(float(rng.uniform(-0.5, 0.5)), float(rng.rand()), float(rng.rand() * 0.3)))
+    records = list(sim.state_action_history)
+    for record in records:
+        record['state']['current_section'] = record['state']['current_section'].value
+    X, y = FEATURES.extract_records(records)
+    model = DeterministicRandomForest(seed=42, n_estimators=trees, max_depth=depth, min_samples_leaf=1, min_samples_split=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = model.train(X, y)
+    return model, report, X
+
+
+def run_workers(count: int, **params) -> list:
+    script = WORKER_SCRIPT.format(src=SRC, **params)
+    workers = [subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE, text=True) for _ in range(count)]
+    # Hold every worker until all have loaded, so shared pages are counted once across them
+    for worker in workers:
+        if worker.stdout.readline().strip() != 'ready':
+            raise RuntimeError("Worker failed to load the model")
+    results = []
+    for worker in workers:
+        out, _ = worker.communicate('go\n')
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+def summarize(results: list) -> dict:
+    def mean(values):
+        return round(float(np.mean(values)), 2)
+    return {
+        "load_ms": mean([r["load_ms"] for r in results]),
+        "first_predict_ms": mean([r["first_predict_ms"] for r in results]),
+        "rss_mb": mean([r["delta_kb"]["rss"] / 1024 for r in results]),
+        "pss_mb": mean([r["delta_kb"]["pss"] / 1024 for r in results]),
+        "uss_mb": mean([r["delta_kb"]["uss"] / 1024 for r in results])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model registry cold-start benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--sim-steps", type=int, default=6000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="model_registry_bench_")
+    try:
+        model, report, X = train_model(args.trees, args.depth, args.sim_steps)
+        model_dir = os.path.join(directory, "model")
+        with contextlib.redirect_stdout(io.StringIO()):
+            model.save_models(model_dir)
+        data_file = os.path.join(directory, "training.ndjson")
+        with open(data_file, "w") as f:
+            f.write("{}\n")
+        registry = ModelRegistry(os.path.join(directory, "registry"))
+        key = registry.register(model, create_training_ledger_entry(data_file, report, model_dir))
+        inputs = os.path.join(directory, "inputs.npy")
+        np.save(inputs, X[:1000])
+
+        runs = []
+        for count in args.workers:
+            run = {"workers": count}
+            for mode in ("joblib", "registry"):
+                run[mode] = summarize(run_workers(count, mode=mode, model_dir=model_dir, root=registry.root,
+                                                  key=key, inputs=inputs))
+            runs.append(run)
+        sizes = {
+            "joblib_mb": round(sum(os.path.getsize(os.path.join(model_dir, name))
+                                   for name in os.listdir(model_dir) if name.endswith(".joblib")) / 2**20, 1),
+            "compiled_mb": round(model.compiled.nbytes / 2**20, 1)
+        }
+    finally:
+        shutil.rmtree(directory)
+
+    print(json.dumps({"trees_per_target": args.trees, "max_depth": args.depth,
+                      "nodes": model.compiled.node_count, "artifact": sizes, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
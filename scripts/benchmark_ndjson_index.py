@@ -0,0 +1,117 @@
+"""
+NDJSON Index Benchmark
+Large telemetry logs: peak memory of load_ndjson (whole list) against
+streaming iter_ndjson, time to read a 100-tick window near the end of the
+log with and without the sidecar tick index, and time / peak memory of
+verify_ndjson_determinism on two copies.
+
+Usage:
+    python scripts/benchmark_ndjson_index.py --records 200000 --index-every 1000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.telemetry.ndjson_logger import (
+    NDJSONLogger, FlushPolicy, build_tick_index, index_path, iter_ndjson, iter_ndjson_range, load_ndjson,
+    verify_ndjson_determinism
+)
+
+FEATURES = {
+    "speed_mps": 61.25, "yaw_rate_rps": -0.0123, "steering_angle_norm": 0.05, "track_progress": 0.25,
+    "dist_to_centerline_m": -0.5, "heading_error_rad": 0.01, "curvature_now": 0.002,
+    "curvature_ahead_10m": 0.003, "curvature_ahead_30m": 0.004, "curvature_ahead_60m": 0.001
+}
+TARGETS = {"steering_command": 0.05, "throttle_command": 0.8, "brake_command": 0.0}
+
+
+def write_log(path: str, records: int, index_every: int):
+    with NDJSONLogger(path, lap_id="bench", policy=FlushPolicy(max_records=1024), index_every=index_every) as logger:
+        for tick in range(records):
+            logger.log_sample(
+                tick=tick, timestamp_ms=tick * 20, features=FEATURES, targets=TARGETS,
+                meta={"coord_int": [tick, -tick, 1], "seed_u64": tick * 7919,
+                      "state_hash": "ab" * 32, "chain_hash": "cd" * 32}
+            )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def consume(iterator) -> int:
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming / indexed NDJSON read benchmark")
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--index-every", type=int, default=1000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "run.ndjson")
+        copy = os.path.join(tmp, "copy.ndjson")
+        with contextlib.redirect_stdout(io.StringIO()):
+            write_log(path, args.records, args.index_every)
+        shutil.copyfile(path, copy)
+
+        start_tick = args.records - 1000
+        window = lambda: consume(iter_ndjson_range(path, start_tick, start_tick + 100))
+        indexed_count, indexed_s = timed(window)
+        os.rename(index_path(path), index_path(path) + ".off")
+        scan_count, scan_s = timed(window)
+        os.rename(index_path(path) + ".off", index_path(path))
+        if not indexed_count == scan_count == 100:
+            raise RuntimeError("Range reads disagree")
+        _, index_build_s = timed(lambda: build_tick_index(path, args.index_every))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            same, verify_s = timed(lambda: verify_ndjson_determinism(path, copy))
+            verify_mb = peak_mb(lambda: verify_ndjson_determinism(path, copy))
+        if not same:
+            raise RuntimeError("Copies reported different")
+
+        result = {
+            "records": args.records,
+            "log_mb": round(os.path.getsize(path) / 1e6, 1),
+            "load_ndjson_peak_mb": round(peak_mb(lambda: load_ndjson(path)), 1),
+            "iter_ndjson_peak_mb": round(peak_mb(lambda: consume(iter_ndjson(path))), 3),
+            "range_100_indexed_ms": round(indexed_s * 1000, 2),
+            "range_100_scan_ms": round(scan_s * 1000, 1),
+            "index_build_ms": round(index_build_s * 1000, 1),
+            "verify_ms": round(verify_s * 1000, 1),
+            "verify_peak_mb": round(verify_mb, 2)
+        }
+        result["range_speedup"] = round(scan_s / indexed_s, 1)
+        print(json.dumps(result, indent=2))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+NDJSON Logger Benchmark
+Records/s of NDJSONLogger.log_sample() under each FlushPolicy: flush every
+record (the original behaviour), record / byte / time windows, fsync
+policies and the background writer thread. Every run's output must hash
+identically.
+
+Usage:
+    python scripts/benchmark_ndjson_logger.py --records 50000
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.telemetry.ndjson_logger import (
+    NDJSONLogger, FlushPolicy, FSYNC_INTERVAL, FSYNC_EVERY_RECORD
+)
+
+MODES = {
+    "per_record": FlushPolicy(),
+    "records_256": FlushPolicy(max_records=256),
+    "bytes_64k": FlushPolicy(max_records=0, max_bytes=64 * 1024),
+    "interval_100ms": FlushPolicy(max_records=0, max_interval_s=0.1),
+    "records_256_fsync_1s": FlushPolicy(max_records=256, fsync=FSYNC_INTERVAL),
+    "records_256_background": FlushPolicy(max_records=256, background=True),
+    "fsync_every_record": FlushPolicy(fsync=FSYNC_EVERY_RECORD)
+}
+
+FEATURES = {
+    "speed_mps": 61.25, "yaw_rate_rps": -0.0123, "steering_angle_norm": 0.05, "track_progress": 0.25,
+    "dist_to_centerline_m": -0.5, "heading_error_rad": 0.01, "curvature_now": 0.002,
+    "curvature_ahead_10m": 0.003, "curvature_ahead_30m": 0.004, "curvature_ahead_60m": 0.001
+}
+TARGETS = {"steering_command": 0.05, "throttle_command": 0.8, "brake_command": 0.0}
+
+
+def run(path: str, policy: FlushPolicy, records: int) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with NDJSONLogger(path, lap_id="bench", policy=policy) as logger:
+            for tick in range(records):
+                logger.log_sample(
+                    tick=tick, timestamp_ms=tick * 20, features=FEATURES, targets=TARGETS,
+                    meta={"coord_int": [tick, -tick, 1], "seed_u64": tick * 7919,
+                          "state_hash": "ab" * 32, "chain_hash": "cd" * 32}
+                )
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NDJSON logger flush policy benchmark")
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--fsync-records", type=int, default=2000,
+                        help="Records for fsync_every_record, which is bound by the disk")
+    args = parser.parse_args()
+
+    results = {}
+    digests = set()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, policy in MODES.items():
+            records = args.fsync_records if name == "fsync_every_record" else args.records
+            path = os.path.join(tmp, f"{name}.ndjson")
+            elapsed = run(path, policy, records)
+            with open(path, 'rb') as f:
+                data = f.read()
+            if records == args.records:
+                digests.add(hashlib.sha256(data).hexdigest())
+            results[name] = {"records": records, "records_per_sec": round(records / elapsed)}
+    if len(digests) != 1:
+        raise RuntimeError("Flush policies produced different bytes")
+
+    base = results["per_record"]["records_per_sec"]
+    for result in results.values():
+        result["vs_per_record"] = round(result["records_per_sec"] / base, 2)
+    print(json.dumps({"identical_output": True, "modes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
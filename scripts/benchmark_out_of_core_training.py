@@ -0,0 +1,117 @@
+"""
+Out-of-Core Training Benchmark
+Wall time, peak RSS and held-out R² of DeterministicRandomForest.train
+(whole dataset in memory) vs train_out_of_core (per-chunk sub-forests
+streamed from a columnar dataset) as the dataset grows. Each run is a
+fresh subprocess so RSS is not shared. Datasets tile a simulated history;
+the held-out set comes from a separately seeded run.
+
+Usage:
+    python scripts/benchmark_out_of_core_training.py --samples 100000 400000 --chunk-rows 65536
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC)
+
+from racing_simulator import ControlInput, RacingSimulator
+from training_data import ColumnarWriter
+
+TRAIN_SCRIPT = """
+import contextlib, io, json, resource, sys, time
+import numpy as np
+sys.path.insert(0, {src!r})
+from racing_ai_trainer import CONTROL_NAMES, DeterministicRandomForest, TrainingDataLoader
+from sklearn.metrics import r2_score
+rf = DeterministicRandomForest(seed=42, n_estimators={trees}, max_depth={depth})
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    loader = TrainingDataLoader({path!r})
+    loader.load()
+    if {mode!r} == "in_memory":
+        X, y = loader.extract_features()
+        rf.train(X, y)
+        del X, y
+    else:
+        rf.train_out_of_core(lambda: loader.iter_feature_chunks({chunk_rows}))
+elapsed = time.perf_counter() - start
+max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+with contextlib.redirect_stdout(io.StringIO()):
+    holdout = TrainingDataLoader({holdout!r})
+    holdout.load()
+    X, y = holdout.extract_features()
+Y = rf.predict_batch(X)
+print(json.dumps({{"sec": elapsed, "max_rss_kb": max_rss_kb,
+                  "holdout_r2": {{name: float(r2_score(y[name], Y[:, k])) for k, name in enumerate(CONTROL_NAMES)}}}}))
+"""
+
+
+def simulate(seed: int, steps: int):
+    sim = RacingSimulator(seed=seed)
+    rng = np.random.RandomState(seed)
+    for _ in range(steps):
+        sim.step(ControlInput(float(rng.uniform(-0.3, 0.3)), float(rng.uniform(0.3, 1.0)), float(rng.rand() * 0.2)))
+    return sim.state_action_history
+
+
+def write_dataset(path: str, history, samples: int, chunk_rows: int):
+    blocks = list(history.iter_blocks())
+    with ColumnarWriter(path, history.column_specs, chunk_rows=chunk_rows) as writer:
+        written = 0
+        while written < samples:
+            for block in blocks:
+                block = block[:, :samples - written]
+                writer.write(block)
+                written += block.shape[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core training benchmark")
+    parser.add_argument("--samples", type=int, nargs="+", default=[50000, 200000])
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    parser.add_argument("--trees", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=12)
+    parser.add_argument("--sim-steps", type=int, default=5000, help="Simulated steps tiled into each dataset")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="out_of_core_bench_")
+    runs = []
+    try:
+        history = simulate(42, args.sim_steps)
+        holdout_path = os.path.join(directory, "holdout")
+        holdout = simulate(7, args.sim_steps // 2)
+        write_dataset(holdout_path, holdout, len(holdout), args.chunk_rows)
+
+        for samples in args.samples:
+            path = os.path.join(directory, f"train_{samples}")
+            write_dataset(path, history, samples, args.chunk_rows)
+            run = {"samples": samples, "chunk_rows": args.chunk_rows}
+            for mode in ("in_memory", "out_of_core"):
+                script = TRAIN_SCRIPT.format(src=SRC, path=path, holdout=holdout_path, mode=mode,
+                                             trees=args.trees, depth=args.depth, chunk_rows=args.chunk_rows)
+                out = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+                result = json.loads(out.strip().splitlines()[-1])
+                run[mode] = {
+                    "train_sec": round(result["sec"], 2),
+                    "max_rss_mb": round(result["max_rss_kb"] / 1024, 1),
+                    "holdout_r2": {k: round(v, 4) for k, v in result["holdout_r2"].items()}
+                }
+            shutil.rmtree(path)
+            runs.append(run)
+    finally:
+        shutil.rmtree(directory)
+
+    print(json.dumps({"trees": args.trees, "max_depth": args.depth, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
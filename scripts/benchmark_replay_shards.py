@@ -0,0 +1,102 @@
+"""
+Replay Shards Benchmark
+Wall time of validate_replay.replay_log() on a generated log with embedded
+SimEnv snapshots, sequential (1 worker, whole log from reset) against
+snapshot shards across a process pool. A copy with one corrupted hash is
+checked to fail at the same tick for every worker count.
+
+Usage:
+    python scripts/benchmark_replay_shards.py --ticks 30000 --workers 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+from nurb_rf_driver.telemetry.ndjson_logger import NDJSONLogger
+from nurb_rf_driver.validate_replay import replay_log
+
+RUN = {"seed": 1337, "run_id": "replay_bench", "identity": "Stig"}
+
+
+def write_log(path: str, ticks: int, snapshot_interval: int):
+    env = SimEnv(seed=RUN["seed"], run_id=RUN["run_id"], root_identity=RUN["identity"])
+    _, meta = env.reset()
+    rng = np.random.RandomState(0)
+    with contextlib.redirect_stdout(io.StringIO()), NDJSONLogger(path, lap_id="bench") as logger:
+        for tick in range(ticks):
+            targets = {
+                "steering_command": float(rng.uniform(-0.3, 0.3)),
+                "throttle_command": float(rng.uniform(0.3, 1.0)),
+                "brake_command": float(rng.rand() * 0.1)
+            }
+            snapshot = env.snapshot() if tick % snapshot_interval == 0 else None
+            logger.log_sample(tick=tick, timestamp_ms=tick * 20, features={}, targets=targets,
+                              meta=dict(meta, coord_int=list(meta["coord_int"])), snapshot=snapshot)
+            _, meta = env.step(*targets.values())
+
+
+def corrupt_copy(path: str, out_path: str, index: int):
+    with open(path) as src, open(out_path, "w") as dst:
+        for i, line in enumerate(src):
+            if i == index:
+                sample = json.loads(line)
+                sample["meta"]["state_hash"] = "0" * 64
+                line = json.dumps(sample) + "\n"
+            dst.write(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded replay validation benchmark")
+    parser.add_argument("--ticks", type=int, default=30000)
+    parser.add_argument("--snapshot-interval", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.ndjson")
+        bad_path = os.path.join(tmp, "bad.ndjson")
+        write_log(path, args.ticks, args.snapshot_interval)
+        bad_index = args.ticks * 2 // 3 + 7
+        corrupt_copy(path, bad_path, bad_index)
+
+        runs = []
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = replay_log(path, workers=workers, **RUN)
+            elapsed = time.perf_counter() - start
+            if result["mismatch"] is not None:
+                raise RuntimeError(f"Clean log failed at tick {result['mismatch']} with {workers} workers")
+            bad = replay_log(bad_path, workers=workers, **RUN)
+            if bad["mismatch"] != bad_index:
+                raise RuntimeError(f"Expected mismatch at {bad_index}, got {bad['mismatch']} with {workers} workers")
+            runs.append({
+                "workers": workers,
+                "shards": result["shards"],
+                "seconds": round(elapsed, 3),
+                "ticks_per_sec": round(args.ticks / elapsed)
+            })
+
+    base = runs[0]["seconds"]
+    for run in runs:
+        run["speedup"] = round(base / run["seconds"], 2)
+    print(json.dumps({
+        "ticks": args.ticks,
+        "snapshot_interval": args.snapshot_interval,
+        "cpu_count": os.cpu_count(),
+        "runs": runs
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Runtime Block Generation Benchmark
+Blocks/s for a directory of local config sources: per-call generation vs
+generate_batch (serial and with a worker pool), plus bulk verification.
+The pool only pays off once per-config work outweighs pickling configs to
+the workers; directory_serial includes reading the files.
+
+Usage:
+    python scripts/benchmark_runtime_blocks.py --sources 5000 --distinct 500 --workers 4
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from runtime_block_generator import RuntimeBlockGenerator
+
+
+def write_sources(directory: str, count: int, distinct: int) -> None:
+    """count config files drawn from `distinct` different contents"""
+    for i in range(count):
+        k = i % distinct
+        config = {
+            "seed": f"seed_{k}",
+            "simulation": {"ticks": 1000 + k, "dt": 0.016, "track": "nordschleife"},
+            "vehicles": [{"id": f"car_{j}", "mass_kg": 1200 + j, "drivetrain": "rwd"} for j in range(8)],
+            "weather": {"rain": (k % 10) / 10, "temperature_c": 18}
+        }
+        with open(os.path.join(directory, f"source_{i:06d}.json"), 'w') as f:
+            json.dump(config, f)
+
+
+def timed(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runtime block generation benchmark")
+    parser.add_argument("--sources", type=int, default=5000)
+    parser.add_argument("--distinct", type=int, default=500, help="Distinct config contents")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="runtime_blocks_")
+    try:
+        write_sources(directory, args.sources, args.distinct)
+
+        names = sorted(os.listdir(directory))
+        configs = []
+        for name in names:
+            with open(os.path.join(directory, name), 'r') as f:
+                configs.append(json.load(f))
+
+        def per_call():
+            generator = RuntimeBlockGenerator()
+            return [generator.generate_from_local(c, metadata={"source_file": n}) for n, c in zip(names, configs)]
+
+        metadata = [{"source_file": n} for n in names]
+        runs = []
+        for label, fn in (
+            ("per_call", per_call),
+            ("batch_serial", lambda: RuntimeBlockGenerator().generate_batch(configs, metadata=metadata)),
+            (f"batch_workers_{args.workers}",
+             lambda: RuntimeBlockGenerator().generate_batch(configs, metadata=metadata, workers=args.workers)),
+            ("directory_serial", lambda: RuntimeBlockGenerator().generate_from_directory(directory)),
+        ):
+            blocks, elapsed = timed(fn)
+            runs.append({"mode": label, "blocks": len(blocks), "sec": round(elapsed, 4),
+                         "blocks_per_sec": round(len(blocks) / elapsed, 1)})
+
+        verifier = RuntimeBlockGenerator()
+        verify = []
+        for workers in (1, args.workers):
+            ok, elapsed = timed(lambda: verifier.verify_blocks(blocks, workers=workers))
+            if not all(ok):
+                raise RuntimeError("Bulk verification failed")
+            verify.append({"workers": workers, "blocks_per_sec": round(len(blocks) / elapsed, 1)})
+    finally:
+        shutil.rmtree(directory)
+
+    print(json.dumps({
+        "sources": args.sources,
+        "distinct": args.distinct,
+        "generate": runs,
+        "verify": verify
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Schema Validation Benchmark
+Compares jsonschema.Draft7Validator with the compiled validators on
+documents the engine emits.
+
+Usage:
+    python scripts/benchmark_schema_validation.py --iterations 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import jsonschema
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from game_engine import GameEngine, IndustrySector, OperationType
+from schema_validator import precompile_all
+
+
+def build_documents(num_companies: int) -> dict:
+    game = GameEngine(seed=42)
+    for i in range(num_companies):
+        company = game.register_company(
+            company_name=f"Bench Corp {i}",
+            founding_capital_usd=1_000_000.0,
+            industry_sector=IndustrySector.TECH,
+            sovereign_signature="a" * 64
+        )
+        game.execute_operation(company.company_id, OperationType.HIRE, {"num_employees": 1})
+    game.tick()
+
+    company = next(iter(game.companies.values()))
+    return {
+        "sim_telemetry": {
+            "schema_version": "sim.telemetry.v1",
+            "run_id": "sim_bench",
+            "vehicle_id": "car_1",
+            "tick": 100,
+            "timestamp_ms": 1760000000000,
+            "speed_mps": 55.0,
+            "accel_mps2": 3.2,
+            "position_lat": 50.33,
+            "position_lon": 6.94,
+            "heading_deg": 181.0
+        },
+        "business_operation": {
+            "operation_id": "8b0f6c1e-3c1a-4f7e-9a51-0f6b3f1f2a10",
+            "company_id": company.company_id,
+            "tick": 1,
+            "operation_type": "HIRE",
+            "resource_delta": {"cash_usd": -1500.0, "employees": 1},
+            "decision_trace": [{"step": "budget_check", "result": "PASS"}],
+            "prev_operation_hash": None,
+            "operation_hash": "ab" * 32
+        },
+        "company_state": company.to_dict(),
+        "market_state": game.get_market_state(),
+        "checkpoint_capsule": game.create_checkpoint()
+    }
+
+
+def rate(fn, document, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(document)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema validation benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--companies", type=int, default=20, help="Companies in the checkpoint capsule")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    validators = precompile_all()
+    compile_sec = time.perf_counter() - start
+
+    runs = []
+    for name, document in build_documents(args.companies).items():
+        compiled = validators[name]
+        reference = jsonschema.Draft7Validator(compiled.schema)
+        if compiled.is_valid(document) != reference.is_valid(document):
+            raise RuntimeError(f"{name}: compiled validator disagrees with jsonschema")
+
+        iterations = args.iterations if name != "checkpoint_capsule" else max(1, args.iterations // 100)
+        reference_rate = rate(reference.is_valid, document, iterations)
+        compiled_rate = rate(compiled.is_valid, document, iterations)
+        runs.append({
+            "schema": name,
+            "iterations": iterations,
+            "jsonschema_docs_per_sec": round(reference_rate, 1),
+            "compiled_docs_per_sec": round(compiled_rate, 1),
+            "compiled_usec_per_doc": round(1e6 / compiled_rate, 2),
+            "speedup": round(compiled_rate / reference_rate, 2)
+        })
+
+    print(json.dumps({"compile_all_sec": round(compile_sec, 4), "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Spline Track Benchmark
+Per-query cost of the Nürburgring TrackModel: the original bisect + linear
+interpolation lookup (curvature always 0) against the cubic-spline
+get_state_at_distance, for monotonic progress through a cursor and for
+random distances, the curvature-only cursor query used for lookaheads, and
+get_states_at_distances for arrays of N distances.
+
+Usage:
+    python scripts/benchmark_spline_track.py --queries 200000 --batch 16 64 4096
+"""
+
+import argparse
+import bisect
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.track.track_model import TrackModel
+
+
+def legacy_state_at_distance(track, dist_m):
+    """get_state_at_distance prior to the spline tables"""
+    dist_m = dist_m % track.total_length_m
+    idx = bisect.bisect_right(track.cumulative_dist, dist_m) - 1
+    idx = max(0, min(idx, len(track.raw_points) - 2))
+    p0 = track.raw_points[idx]
+    p1 = track.raw_points[idx + 1]
+    s0 = track.cumulative_dist[idx]
+    s1 = track.cumulative_dist[idx + 1]
+    segment_len = s1 - s0
+    alpha = 0.0 if segment_len < 1e-6 else (dist_m - s0) / segment_len
+    return {
+        "x": p0.x_m + alpha * (p1.x_m - p0.x_m),
+        "y": p0.y_m + alpha * (p1.y_m - p0.y_m),
+        "heading": math.atan2(p1.y_m - p0.y_m, p1.x_m - p0.x_m),
+        "curvature": 0.0,
+        "width": p0.width_m + alpha * (p1.width_m - p0.width_m),
+        "idx": idx,
+        "alpha": alpha
+    }
+
+
+def ns_per_query(fn, distances) -> float:
+    start = time.perf_counter_ns()
+    for d in distances:
+        fn(d)
+    return (time.perf_counter_ns() - start) / len(distances)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spline track query benchmark")
+    parser.add_argument("--queries", type=int, default=200000)
+    parser.add_argument("--batch", type=int, nargs="+", default=[16, 64, 4096])
+    args = parser.parse_args()
+
+    track = TrackModel(os.path.join(os.path.dirname(__file__), '..', 'nurb_rf_driver', 'track', 'track_nordschleife.json'))
+    # Monotonic progress at ~60 m/s and 50 Hz, and uniformly random distances
+    monotonic = (np.arange(args.queries) * 1.2 % track.total_length_m).tolist()
+    random_d = np.random.RandomState(0).uniform(0, track.total_length_m, args.queries).tolist()
+    cursor = track.cursor()
+
+    result = {
+        "segments": len(track.segments),
+        "legacy_ns": round(ns_per_query(lambda d: legacy_state_at_distance(track, d), monotonic)),
+        "spline_monotonic_cursor_ns": round(ns_per_query(cursor.state_at, monotonic)),
+        "spline_monotonic_curvature_ns": round(ns_per_query(track.cursor().curvature_at, monotonic)),
+        "spline_random_ns": round(ns_per_query(track.get_state_at_distance, random_d)),
+        "batched": []
+    }
+    for size in args.batch:
+        distances = np.asarray(random_d[:size])
+        calls = max(1, args.queries // size)
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            track.get_states_at_distances(distances)
+        result["batched"].append({
+            "batch": size,
+            "ns_per_query": round((time.perf_counter_ns() - start) / (calls * size))
+        })
+
+    # Corner response: straights exactly 0, arcs near the generator's 1/R
+    curvature = track.get_states_at_distances(np.asarray(monotonic))["curvature"]
+    result["max_abs_curvature"] = round(float(np.abs(curvature).max()), 5)
+    result["straight_share"] = round(float(np.mean(curvature == 0.0)), 3)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+State Hash Benchmark
+ns per SimEnv.hash_state_tensor() call: the original asdict() + per-field
+struct.pack version against the precompiled STATE_HASH_STRUCT packer, plus
+the share of a full SimEnv.step() each takes. Both hashes are compared on
+every sampled state first.
+
+Usage:
+    python scripts/benchmark_state_hash.py --calls 200000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from dataclasses import asdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+
+
+def legacy_state_hash(env: SimEnv) -> str:
+    buf = bytearray()
+    buf += b"STATEv1\x00"
+    buf += struct.pack(">Q", env.tick)
+    buf += struct.pack(">d", env.time_elapsed)
+    state_dict = asdict(env.vehicle_state)
+    for key in sorted(state_dict.keys()):
+        buf += struct.pack(">f", float(state_dict[key]))
+    return hashlib.sha256(bytes(buf)).hexdigest()
+
+
+def ns_per_call(fn, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="State hash benchmark")
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--steps", type=int, default=5000)
+    args = parser.parse_args()
+
+    env = SimEnv(seed=42, run_id="bench")
+    env.reset()
+    rng = np.random.RandomState(0)
+    controls = [(float(rng.uniform(-0.3, 0.3)), float(rng.uniform(0.3, 1.0)), float(rng.rand() * 0.1))
+                for _ in range(args.steps)]
+    for control in controls:
+        env.step(*control)
+        if env.hash_state_tensor() != legacy_state_hash(env):
+            raise RuntimeError(f"Hash mismatch at tick {env.tick}")
+
+    legacy_ns = ns_per_call(lambda: legacy_state_hash(env), args.calls)
+    packed_ns = ns_per_call(env.hash_state_tensor, args.calls)
+    sha_ns = ns_per_call(lambda: hashlib.sha256(env._hash_buffer).hexdigest(), args.calls)
+
+    env.reset()
+    start = time.perf_counter_ns()
+    for control in controls:
+        env.step(*control)
+    step_ns = (time.perf_counter_ns() - start) / len(controls)
+
+    print(json.dumps({
+        "legacy_ns_per_hash": round(legacy_ns),
+        "packed_ns_per_hash": round(packed_ns),
+        "sha256_only_ns": round(sha_ns),
+        "speedup": round(legacy_ns / packed_ns, 2),
+        "step_ns": round(step_ns),
+        "legacy_share_of_step": round(legacy_ns / (step_ns - packed_ns + legacy_ns), 3),
+        "packed_share_of_step": round(packed_ns / step_ns, 3)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Track Lookup Benchmark
+Per-query latency of NurburgringTrack.get_track_data against the original
+per-call horizon loop and section scan, plus get_track_data_batch for N cars.
+
+Usage:
+    python scripts/benchmark_track_lookup.py --queries 200000 --cars 1 100 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from racing_simulator import NurburgringTrack, TrackSection
+
+
+def legacy_track_data(track, progress):
+    """get_track_data prior to the precomputed lookup tables"""
+    distance = progress * track.TRACK_LENGTH
+    idx = int((distance / track.TRACK_LENGTH) * track.num_points)
+    idx = min(idx, track.num_points - 1)
+    curvature = track.curvature_profile[idx]
+    gradient = track.gradient_profile[idx]
+    upcoming_curvature = []
+    for d in [10, 25, 50, 100, 200]:
+        future_idx = min(idx + int(d / 10), track.num_points - 1)
+        upcoming_curvature.append(track.curvature_profile[future_idx])
+    section = TrackSection.HATZENBACH
+    for sec, (start, end) in track.sections.items():
+        if start <= distance < end:
+            section = sec
+            break
+    return {'curvature': curvature, 'gradient': gradient,
+            'upcoming_curvature': tuple(upcoming_curvature), 'section': section}
+
+
+def usec_per_query(fn, values) -> float:
+    start = time.perf_counter()
+    for p in values:
+        fn(p)
+    return (time.perf_counter() - start) * 1e6 / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track lookup benchmark")
+    parser.add_argument("--queries", type=int, default=200000)
+    parser.add_argument("--cars", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--batches", type=int, default=2000, help="Batched calls per car count")
+    args = parser.parse_args()
+
+    track = NurburgringTrack(seed=42)
+    values = np.random.RandomState(0).rand(args.queries).tolist()
+
+    legacy = usec_per_query(lambda p: legacy_track_data(track, p), values)
+    compiled = usec_per_query(track.get_track_data, values)
+
+    batched = []
+    for num_cars in args.cars:
+        progress = np.random.RandomState(num_cars).rand(num_cars)
+        start = time.perf_counter()
+        for _ in range(args.batches):
+            track.get_track_data_batch(progress)
+        elapsed = time.perf_counter() - start
+        batched.append({
+            "cars": num_cars,
+            "usec_per_call": round(elapsed * 1e6 / args.batches, 3),
+            "usec_per_car": round(elapsed * 1e6 / (args.batches * num_cars), 4)
+        })
+
+    print(json.dumps({
+        "queries": args.queries,
+        "scalar": {
+            "legacy_usec_per_query": round(legacy, 3),
+            "compiled_usec_per_query": round(compiled, 3),
+            "speedup": round(legacy / compiled, 2)
+        },
+        "batched": batched
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
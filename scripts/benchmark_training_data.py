@@ -0,0 +1,112 @@
+"""
+Training Data Load Benchmark
+Load time and peak RSS of TrainingDataLoader (load + extract_features) on
+the same samples stored as NDJSON and as columnar datasets (uncompressed,
+zlib, lzma). Each loader runs in a fresh subprocess so RSS is not shared.
+
+Usage:
+    python scripts/benchmark_training_data.py --samples 1000000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC)
+
+from racing_simulator import ControlInput, RacingSimulator
+from training_data import ColumnarDataset, ColumnarWriter
+
+LOAD_SCRIPT = """
+import contextlib, io, json, resource, sys, time
+sys.path.insert(0, {src!r})
+from racing_ai_trainer import TrainingDataLoader
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    loader = TrainingDataLoader({path!r})
+    loader.load()
+    X, y = loader.extract_features()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"sec": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  "rows": int(X.shape[0])}}))
+"""
+
+
+def build_datasets(directory: str, samples: int, sim_steps: int) -> dict:
+    """Simulate sim_steps, then tile the history up to `samples` rows"""
+    sim = RacingSimulator(seed=42)
+    control = ControlInput(steering_command=0.05, throttle_command=0.7, brake_command=0.0)
+    for _ in range(sim_steps):
+        sim.step(control)
+    history = sim.state_action_history
+    blocks = list(history.iter_blocks())
+
+    paths = {}
+    for compression in (None, "zlib", "lzma"):
+        path = os.path.join(directory, f"columnar_{compression or 'raw'}")
+        with ColumnarWriter(path, history.column_specs, compression=compression) as writer:
+            written = 0
+            while written < samples:
+                for block in blocks:
+                    block = block[:, :samples - written]
+                    writer.write(block)
+                    written += block.shape[1]
+        paths[f"columnar_{compression or 'raw'}"] = path
+
+    ndjson_path = os.path.join(directory, "train.ndjson")
+    with open(ndjson_path, 'w') as f:
+        for record in ColumnarDataset(paths["columnar_raw"]).iter_records():
+            f.write(json.dumps(record) + '\n')
+    return {"ndjson": ndjson_path, **paths}
+
+
+def disk_bytes(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training data load benchmark")
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--sim-steps", type=int, default=5000, help="Simulated steps tiled into the dataset")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="training_data_bench_")
+    try:
+        start = time.perf_counter()
+        paths = build_datasets(directory, args.samples, args.sim_steps)
+        build_sec = time.perf_counter() - start
+
+        runs = []
+        for label, path in paths.items():
+            out = subprocess.run(
+                [sys.executable, "-c", LOAD_SCRIPT.format(src=SRC, path=path)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            runs.append({
+                "format": label,
+                "disk_mb": round(disk_bytes(path) / 2**20, 1),
+                "load_sec": round(result["sec"], 3),
+                "max_rss_mb": round(result["max_rss_kb"] / 1024, 1),
+                "rows": result["rows"]
+            })
+    finally:
+        shutil.rmtree(directory)
+
+    baseline = runs[0]["load_sec"]
+    for run in runs:
+        run["speedup"] = round(baseline / run["load_sec"], 2)
+
+    print(json.dumps({"samples": args.samples, "build_sec": round(build_sec, 1), "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Vector Sim Env Benchmark
+Aggregate env-steps/s of VectorSimEnv as the pool grows, against stepping
+standalone SimEnv instances one by one. Both include the per-tick state
+hash, hash chain and seed_u64 metadata. A short prefix of every run is
+checked chain-for-chain against standalone envs.
+
+Usage:
+    python scripts/benchmark_vector_env.py --envs 1 16 256 1024 --ticks 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nurb_rf_driver.env.sim_env import SimEnv
+from nurb_rf_driver.env.vector_env import VectorSimEnv
+
+
+def actions_for(num_envs: int, ticks: int) -> np.ndarray:
+    rng = np.random.RandomState(0)
+    actions = np.empty((ticks, num_envs, 3))
+    actions[:, :, 0] = rng.uniform(-0.3, 0.3, (ticks, num_envs))
+    actions[:, :, 1] = rng.uniform(0.3, 1.0, (ticks, num_envs))
+    actions[:, :, 2] = rng.rand(ticks, num_envs) * 0.1
+    return actions
+
+
+def check_chains(num_envs: int, actions: np.ndarray, ticks: int):
+    vec = VectorSimEnv(num_envs)
+    envs = [SimEnv(run_id=run_id) for run_id in vec.run_ids[:4]]
+    vec.reset()
+    for env in envs:
+        env.reset()
+    for tick in range(ticks):
+        _, meta = vec.step(actions[tick])
+        expected = [env.step(*actions[tick, k].tolist())[1]["chain_hash"] for k, env in enumerate(envs)]
+        if meta["chain_hash"][:len(envs)] != expected:
+            raise RuntimeError(f"Chain mismatch at tick {tick + 1} with {num_envs} envs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector sim env benchmark")
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, 4, 16, 64, 256, 1024])
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--max-scalar-envs", type=int, default=64,
+                        help="Skip the standalone SimEnv baseline above this many envs")
+    args = parser.parse_args()
+
+    runs = []
+    for num_envs in args.envs:
+        actions = actions_for(num_envs, args.ticks)
+        check_chains(num_envs, actions, min(args.ticks, 20))
+
+        vec = VectorSimEnv(num_envs)
+        vec.reset()
+        start = time.perf_counter()
+        for tick in range(args.ticks):
+            vec.step(actions[tick])
+        elapsed = time.perf_counter() - start
+        run = {
+            "envs": num_envs,
+            "ticks": args.ticks,
+            "vector_steps_per_sec": round(num_envs * args.ticks / elapsed),
+            "vector_tick_ms": round(elapsed * 1000 / args.ticks, 3)
+        }
+
+        if num_envs <= args.max_scalar_envs:
+            envs = [SimEnv(run_id=run_id) for run_id in vec.run_ids]
+            for env in envs:
+                env.reset()
+            start = time.perf_counter()
+            for tick in range(args.ticks):
+                for k, env in enumerate(envs):
+                    env.step(*actions[tick, k].tolist())
+            elapsed = time.perf_counter() - start
+            run["scalar_steps_per_sec"] = round(num_envs * args.ticks / elapsed)
+            run["speedup"] = round(run["vector_steps_per_sec"] / run["scalar_steps_per_sec"], 2)
+        runs.append(run)
+
+    print(json.dumps({"runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
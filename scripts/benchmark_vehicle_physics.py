@@ -0,0 +1,79 @@
+"""
+Vehicle Physics Benchmark
+Car-steps/s for N independent DeterministicVehiclePhysics instances vs one
+BatchedVehiclePhysics stepping all N cars.
+
+Usage:
+    python scripts/benchmark_vehicle_physics.py --cars 1 100 1000 10000 --steps 600
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from racing_simulator import BatchedVehiclePhysics, ControlInput, DeterministicVehiclePhysics, WeatherState
+
+
+def benchmark_scalar(num_cars: int, steps: int, throttle, brake, steering, gradient, grip) -> float:
+    cars = [DeterministicVehiclePhysics(42) for _ in range(num_cars)]
+    controls = [ControlInput(float(steering[i]), float(throttle[i]), float(brake[i])) for i in range(num_cars)]
+    weather = [WeatherState(grip_mu=float(grip[i])) for i in range(num_cars)]
+    gradient = gradient.tolist()
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        for i, car in enumerate(cars):
+            car.step(controls[i], 0.0, gradient[i], weather[i])
+    return time.perf_counter() - start
+
+
+def benchmark_batched(num_cars: int, steps: int, throttle, brake, steering, gradient, grip) -> float:
+    batch = BatchedVehiclePhysics(num_cars)
+    curvature = np.zeros(num_cars)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        batch.step(throttle, brake, steering, curvature, gradient, grip)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vehicle physics benchmark")
+    parser.add_argument("--cars", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--steps", type=int, default=600, help="Steps per run (600 = 10 s at 60 Hz)")
+    parser.add_argument("--max-scalar-cars", type=int, default=1000,
+                        help="Skip the scalar baseline above this many cars")
+    args = parser.parse_args()
+
+    runs = []
+    for num_cars in args.cars:
+        rng = np.random.RandomState(num_cars)
+        inputs = (
+            rng.uniform(0.3, 1.0, num_cars),
+            np.where(rng.rand(num_cars) < 0.1, rng.rand(num_cars), 0.0),
+            rng.uniform(-0.3, 0.3, num_cars),
+            rng.uniform(-0.05, 0.05, num_cars),
+            rng.uniform(0.8, 1.2, num_cars),
+        )
+        car_steps = num_cars * args.steps
+
+        run = {"cars": num_cars, "steps": args.steps}
+        batched_sec = benchmark_batched(num_cars, args.steps, *inputs)
+        run["batched_car_steps_per_sec"] = round(car_steps / batched_sec, 1)
+        if num_cars <= args.max_scalar_cars:
+            scalar_sec = benchmark_scalar(num_cars, args.steps, *inputs)
+            run["scalar_car_steps_per_sec"] = round(car_steps / scalar_sec, 1)
+            run["speedup"] = round(scalar_sec / batched_sec, 2)
+        runs.append(run)
+
+    print(json.dumps({"runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Forest Mode Comparison
+Trains DeterministicRandomForest in per-target and multi-output mode on the
+same training data and seed, and writes the accuracy/size/latency report.
+
+Usage:
+    python scripts/compare_forest_modes.py data/nurburgring_expert.ndjson --output forest_modes.json
+    python scripts/compare_forest_modes.py --sim-steps 5000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from racing_ai_trainer import FEATURES, TrainingDataLoader, compare_forest_modes
+from racing_simulator import ControlInput, RacingSimulator
+
+
+def simulated_training_set(steps: int, seed: int):
+    """Randomized controls around a throttle-heavy line"""
+    sim = RacingSimulator(seed=seed)
+    rng = np.random.RandomState(seed)
+    for _ in range(steps):
+        sim.step(ControlInput(float(rng.uniform(-0.4, 0.4)), float(rng.uniform(0.3, 1.0)), float(rng.rand() * 0.2)))
+    records = list(sim.state_action_history)
+    return FEATURES.extract_records(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-target and multi-output forests")
+    parser.add_argument("training_file", nargs="?", help="NDJSON file or columnar dataset directory")
+    parser.add_argument("--sim-steps", type=int, default=5000, help="Simulated samples when no file is given")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--output", help="Write the JSON report here as well")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if args.training_file:
+            loader = TrainingDataLoader(args.training_file)
+            loader.load()
+            X, y = loader.extract_features()
+        else:
+            X, y = simulated_training_set(args.sim_steps, args.seed)
+        report = compare_forest_modes(X, y, seed=args.seed, n_estimators=args.n_estimators,
+                                      max_depth=args.max_depth)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,16 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
+# Same profile as src/canonical_json.py, built once instead of per call
+_encode = json.JSONEncoder(sort_keys=True, separators=(',', ':')).encode
+
 
 def jcs_canonicalize(obj: Any) -> bytes:
     """
     JCS (RFC 8785) canonicalization.
     Keys sorted, no whitespace, UTF-8 bytes.
     """
-    return json.dumps(obj, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return _encode(obj).encode('utf-8')
 
 
 def sha256_hex(data: bytes) -> str:
@@ -0,0 +1,231 @@
+"""
+Canonical JSON encoding shared by every hash-chained record.
+Byte-identical to json.dumps(obj, sort_keys=True, separators=(',', ':')),
+with a reusable encoder, precompiled key order for fixed-shape records
+and streaming straight into a hashlib object for large snapshots.
+"""
+
+import hashlib
+import json
+import threading
+from json.encoder import c_make_encoder, encode_basestring, encode_basestring_ascii
+from typing import Any, Callable, Dict, Optional, Sequence
+
+
+_INFINITY = float('inf')
+
+
+class CanonicalEncoder:
+    """
+    Sorted keys, no whitespace, UTF-8 bytes.
+
+    ensure_ascii=True matches json.dumps defaults (\\uXXXX escapes, used by the
+    ledger, checkpoints and the vault); ensure_ascii=False emits raw UTF-8
+    (CanonicalizationLawV1 / JCS).
+    """
+
+    FLUSH_BYTES = 1 << 16  # Streaming buffer size before feeding the hasher
+
+    def __init__(self, ensure_ascii: bool = True, stream_depth: int = 2):
+        self.ensure_ascii = ensure_ascii
+        self.stream_depth = stream_depth
+        self._encode_str = encode_basestring_ascii if ensure_ascii else encode_basestring
+        self._fallback = json.JSONEncoder(
+            sort_keys=True,
+            separators=(',', ':'),
+            ensure_ascii=ensure_ascii,
+            check_circular=False
+        )
+
+        # Build the C encoder once instead of per json.dumps call
+        # (None on interpreters without the _json accelerator)
+        self._c_encode = None
+        if c_make_encoder is not None:
+            try:
+                self._c_encode = c_make_encoder(
+                    None, self._fallback.default, self._encode_str, None,
+                    ':', ',', True, False, True
+                )
+            except TypeError:
+                pass
+
+        self._local = threading.local()
+
+    def encode(self, obj: Any) -> str:
+        """Canonical JSON string"""
+        if self._c_encode is not None:
+            return ''.join(self._c_encode(obj, 0))
+        return self._fallback.encode(obj)
+
+    def encode_bytes(self, obj: Any) -> bytes:
+        """Canonical JSON as UTF-8 bytes"""
+        return self.encode(obj).encode('utf-8')
+
+    def sha256(self, obj: Any) -> str:
+        """SHA-256 hex digest of the canonical bytes"""
+        return hashlib.sha256(self.encode(obj).encode('utf-8')).hexdigest()
+
+    def sha256_stream(self, obj: Any) -> str:
+        """SHA-256 of a large object without materializing its full encoding"""
+        hasher = hashlib.sha256()
+        self.update(hasher, obj)
+        return hasher.hexdigest()
+
+    def update(self, hasher: Any, obj: Any) -> None:
+        """
+        Stream the canonical encoding of obj into hasher.
+        Containers down to stream_depth are walked item by item; everything
+        below is encoded in one shot. Output bytes are identical to encode().
+        """
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+
+        state = [0]  # Pending characters in buffer
+
+        def write(chunk: str) -> None:
+            buffer.append(chunk)
+            state[0] += len(chunk)
+            if state[0] >= self.FLUSH_BYTES:
+                hasher.update(''.join(buffer).encode('utf-8'))
+                buffer.clear()
+                state[0] = 0
+
+        try:
+            self._stream(obj, write, 0)
+            if buffer:
+                hasher.update(''.join(buffer).encode('utf-8'))
+        finally:
+            buffer.clear()
+
+    def encode_value(self, value: Any) -> str:
+        """Encode one value, skipping the C encoder for plain scalars"""
+        value_type = type(value)
+        if value_type is str:
+            return self._encode_str(value)
+        if value is None:
+            return 'null'
+        if value_type is int:
+            return int.__repr__(value)
+        if value_type is float and value == value and value not in (_INFINITY, -_INFINITY):
+            return float.__repr__(value)
+        if value is True:
+            return 'true'
+        if value is False:
+            return 'false'
+        return self.encode(value)
+
+    def _stream(self, obj: Any, write: Callable[[str], None], depth: int) -> None:
+        if depth >= self.stream_depth:
+            write(self.encode(obj))
+        elif isinstance(obj, dict) and obj and all(type(k) is str for k in obj):
+            separator = '{'
+            for key in sorted(obj):
+                write(separator + self._encode_str(key) + ':')
+                self._stream(obj[key], write, depth + 1)
+                separator = ','
+            write('}')
+        elif isinstance(obj, (list, tuple)) and obj:
+            separator = '['
+            for item in obj:
+                write(separator)
+                self._stream(item, write, depth + 1)
+                separator = ','
+            write(']')
+        else:
+            write(self.encode(obj))
+
+
+class CanonicalSchema:
+    """
+    Precompiled encoder for a fixed-shape record.
+    Key order and encoded key prefixes are computed once; values are passed
+    positionally in declaration order, so no dict is built or sorted per call.
+
+    Example:
+        schema = CanonicalSchema(("tick", "amount_usd"))
+        schema.sha256(5, 12.5) == canonical_sha256({"tick": 5, "amount_usd": 12.5})
+    """
+
+    def __init__(self, keys: Sequence[str], encoder: Optional[CanonicalEncoder] = None):
+        self.keys = tuple(keys)
+        self.encoder = encoder or ASCII
+
+        order = sorted(range(len(self.keys)), key=lambda i: self.keys[i])
+        self._order = tuple(order)
+        self._prefixes = tuple(
+            ('{' if n == 0 else ',') + self.encoder._encode_str(self.keys[i]) + ':'
+            for n, i in enumerate(order)
+        )
+
+    def encode(self, *values: Any) -> str:
+        """Canonical JSON for a record whose values follow self.keys"""
+        if len(values) != len(self.keys):
+            raise ValueError(f"Expected {len(self.keys)} values, got {len(values)}")
+        if not values:
+            return '{}'
+
+        encode_value = self.encoder.encode_value
+        parts = []
+        for prefix, i in zip(self._prefixes, self._order):
+            parts.append(prefix)
+            parts.append(encode_value(values[i]))
+        parts.append('}')
+        return ''.join(parts)
+
+    def encode_dict(self, record: Dict[str, Any]) -> str:
+        """Canonical JSON for a dict with exactly self.keys"""
+        return self.encode(*(record[key] for key in self.keys))
+
+    def sha256(self, *values: Any) -> str:
+        """SHA-256 hex digest of the canonical record"""
+        return hashlib.sha256(self.encode(*values).encode('utf-8')).hexdigest()
+
+
+# Shared profiles
+ASCII = CanonicalEncoder(ensure_ascii=True)
+UTF8 = CanonicalEncoder(ensure_ascii=False)
+
+
+def _profile(ensure_ascii: bool) -> CanonicalEncoder:
+    return ASCII if ensure_ascii else UTF8
+
+
+def canonical_dumps(obj: Any, ensure_ascii: bool = True) -> str:
+    """Drop-in for json.dumps(obj, sort_keys=True, separators=(',', ':'))"""
+    return _profile(ensure_ascii).encode(obj)
+
+
+def canonical_bytes(obj: Any, ensure_ascii: bool = True) -> bytes:
+    """Canonical JSON as UTF-8 bytes"""
+    return _profile(ensure_ascii).encode_bytes(obj)
+
+
+def canonical_sha256(obj: Any, ensure_ascii: bool = True) -> str:
+    """SHA-256 hex digest of canonical JSON"""
+    return _profile(ensure_ascii).sha256(obj)
+
+
+def canonical_sha256_stream(obj: Any, ensure_ascii: bool = True) -> str:
+    """SHA-256 hex digest of canonical JSON, streamed for large snapshots"""
+    return _profile(ensure_ascii).sha256_stream(obj)
+
+
+def reject_floats(obj: Any) -> None:
+    """
+    Raise ValueError if obj contains a float (integers-only hash contract).
+    Also rejects types that JSON cannot represent canonically.
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if value is None or isinstance(value, (bool, int, str)):
+            continue
+        if isinstance(value, float):
+            raise ValueError(f"Non-integer number in canonical hash: {value}")
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        else:
+            raise ValueError(f"Unsupported type in canonical hash: {type(value)}")
@@ -6,9 +6,12 @@ Implements IPFS-style CID-based state persistence with Merkle lineage.
 import hashlib
 import json
 import os
-from typing import Dict, Any, Optional
+import random
+from typing import Dict, Any, Iterator, List, Optional, Set
 from datetime import datetime, timezone
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, field
+
+from canonical_json import canonical_dumps, canonical_sha256_stream
 
 
 @dataclass
@@ -23,6 +26,55 @@ class CheckpointMetadata:
     ledger_root: str
 
 
+@dataclass
+class RetentionPolicy:
+    """
+    Which checkpoints survive a compaction pass.
+    A checkpoint is kept if it matches any rule.
+    """
+    keep_last: int = 100  # Most recent N checkpoints (by tick) stay loose and hot
+    keep_every: int = 0  # Every Kth tick is kept forever (0 = disabled)
+    keep_tagged: bool = True  # Tagged checkpoints are never pruned
+    min_segment_live: float = 0.5  # Segments with a smaller live byte fraction are repacked (0 = never)
+
+    def hot_set(self, entries: List['ManifestEntry']) -> Set[str]:
+        """CIDs of the most recent `keep_last` checkpoints"""
+        if self.keep_last <= 0:
+            return set()
+        newest = sorted(entries, key=lambda e: (e.tick, e.checkpoint_id))[-self.keep_last:]
+        return {e.checkpoint_id for e in newest}
+
+    def select(self, entries: List['ManifestEntry']) -> Set[str]:
+        """CIDs to retain out of `entries`"""
+        keep = self.hot_set(entries)
+        for entry in entries:
+            if self.keep_every > 0 and entry.tick % self.keep_every == 0:
+                keep.add(entry.checkpoint_id)
+            elif self.keep_tagged and entry.tags:
+                keep.add(entry.checkpoint_id)
+        return keep
+
+
+@dataclass
+class ManifestEntry:
+    """
+    Index record for one checkpoint in a LocalCheckpointStore.
+    Loose checkpoints have segment=None; packed ones point into a segment archive.
+    Pruned entries keep their lineage (tick, prev link) after the content is dropped.
+    """
+    checkpoint_id: str
+    tick: int
+    prev_checkpoint_cid: Optional[str]
+    tags: List[str] = field(default_factory=list)
+    segment: Optional[str] = None
+    offset: int = 0
+    length: int = 0
+    pruned: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
 class CheckpointStore:
     """Base class for checkpoint storage backends"""
     
@@ -38,40 +90,91 @@ class CheckpointStore:
         """Verify checkpoint integrity"""
         raise NotImplementedError
 
+    def lineage_entry(self, cid: str) -> Optional[ManifestEntry]:
+        """Indexed lineage record for CID (None if the backend keeps no index)"""
+        return None
+
 
 class LocalCheckpointStore(CheckpointStore):
     """
     Local filesystem checkpoint storage.
     Content-addressed: checkpoint files named by their CID.
+
+    Layout under base_path:
+        manifest.ndjson            append-only index (last record per CID wins)
+        <cid prefix>/<cid>.json    loose checkpoints, sharded by CID prefix
+        segments/seg_NNNNNN.ndjson packed checkpoints (one canonical JSON per line)
+        segments/seg_NNNNNN.index.json  offset table for the segment
+
+    Listing and lineage walks read the in-memory manifest, never the directory.
+    Flat `<cid>.json` files from older stores are indexed on first open.
     """
+
+    MANIFEST_FILE = "manifest.ndjson"
+    SEGMENT_DIR = "segments"
     
-    def __init__(self, base_path: str = './checkpoints'):
+    def __init__(
+        self,
+        base_path: str = './checkpoints',
+        shard_width: int = 2,
+        retention: Optional[RetentionPolicy] = None
+    ):
         self.base_path = base_path
+        self.shard_width = shard_width
+        self.retention = retention
         os.makedirs(base_path, exist_ok=True)
+
+        self.manifest_path = os.path.join(base_path, self.MANIFEST_FILE)
+        self.segment_path = os.path.join(base_path, self.SEGMENT_DIR)
+        self.manifest: Dict[str, ManifestEntry] = {}
+        self._load_manifest()
     
     def save_checkpoint(self, checkpoint: Dict[str, Any]) -> str:
         """Save checkpoint to local file"""
         # Compute CID
         cid = compute_checkpoint_cid(checkpoint)
         checkpoint["checkpoint_id"] = cid
+
+        # Content-addressed: an identical live checkpoint is already stored
+        existing = self.manifest.get(cid)
+        if existing is not None and not existing.pruned:
+            return cid
         
-        # Save to file (named by CID)
-        filepath = os.path.join(self.base_path, f"{cid}.json")
+        # Save to file (named by CID, sharded by prefix)
+        filepath = self._shard_path(cid)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
         with open(filepath, 'w') as f:
             json.dump(checkpoint, f, sort_keys=True, indent=2)
+
+        entry = ManifestEntry(
+            checkpoint_id=cid,
+            tick=checkpoint["tick"],
+            prev_checkpoint_cid=checkpoint["merkle_proof"]["prev_checkpoint_cid"],
+            tags=existing.tags if existing else []
+        )
+        self._append_manifest(entry)
         
         return cid
     
     def load_checkpoint(self, cid: str) -> Dict[str, Any]:
         """Load checkpoint by CID"""
-        filepath = os.path.join(self.base_path, f"{cid}.json")
-        
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"Checkpoint not found: {cid}")
-        
-        with open(filepath, 'r') as f:
-            checkpoint = json.load(f)
+        entry = self.manifest.get(cid)
+
+        if entry is not None and entry.pruned:
+            raise FileNotFoundError(f"Checkpoint pruned by retention policy: {cid}")
+
+        if entry is not None and entry.segment is not None:
+            with open(os.path.join(self.segment_path, entry.segment), 'rb') as f:
+                f.seek(entry.offset)
+                checkpoint = json.loads(f.read(entry.length))
+        else:
+            filepath = self._loose_path(cid)
+            if filepath is None:
+                raise FileNotFoundError(f"Checkpoint not found: {cid}")
+            
+            with open(filepath, 'r') as f:
+                checkpoint = json.load(f)
         
         # Verify CID matches content
         if not self.verify_checkpoint(checkpoint):
@@ -90,10 +193,232 @@ class LocalCheckpointStore(CheckpointStore):
         
         return claimed_cid == computed_cid
     
-    def list_checkpoints(self) -> list[str]:
-        """List all checkpoint CIDs"""
-        files = os.listdir(self.base_path)
-        return [f.replace('.json', '') for f in files if f.endswith('.json')]
+    def list_checkpoints(self, include_pruned: bool = False) -> list[str]:
+        """List checkpoint CIDs in tick order (from the manifest)"""
+        entries = sorted(self.manifest.values(), key=lambda e: (e.tick, e.checkpoint_id))
+        return [e.checkpoint_id for e in entries if include_pruned or not e.pruned]
+
+    def lineage_entry(self, cid: str) -> Optional[ManifestEntry]:
+        """Manifest record for CID"""
+        return self.manifest.get(cid)
+
+    def iter_lineage(self, cid: str) -> Iterator[ManifestEntry]:
+        """Walk prev links from CID back to genesis using only the manifest"""
+        current_cid = cid
+        visited = set()
+
+        while current_cid:
+            if current_cid in visited:
+                raise ValueError(f"Circular reference detected: {current_cid}")
+            visited.add(current_cid)
+
+            entry = self.manifest.get(current_cid)
+            if entry is None:
+                raise FileNotFoundError(f"Checkpoint not in manifest: {current_cid}")
+
+            yield entry
+            current_cid = entry.prev_checkpoint_cid
+
+    def tag_checkpoint(self, cid: str, tag: str) -> None:
+        """Tag a checkpoint (tagged checkpoints survive retention by default)"""
+        entry = self.manifest.get(cid)
+        if entry is None:
+            raise FileNotFoundError(f"Checkpoint not found: {cid}")
+        if tag not in entry.tags:
+            entry.tags.append(tag)
+            self._append_manifest(entry)
+
+    def compact(self, policy: Optional[RetentionPolicy] = None) -> Dict[str, Any]:
+        """
+        Apply retention and pack aged checkpoints into a segment archive.
+
+        - Checkpoints not selected by the policy are pruned (lineage kept in manifest)
+        - Retained checkpoints outside the hot window are packed into a new segment
+        - Segments whose live bytes fall below policy.min_segment_live are
+          repacked into that segment too, and deleted, so pruning frees space
+        - The manifest is rewritten with one record per CID
+
+        Returns:
+            Summary with packed/pruned counts, the segment name (if any) and
+            the segments removed
+        """
+        policy = policy or self.retention or RetentionPolicy()
+
+        live = [e for e in self.manifest.values() if not e.pruned]
+        keep = policy.select(live)
+        hot = policy.hot_set(live)
+
+        to_prune = [e for e in live if e.checkpoint_id not in keep]
+
+        # Live bytes per segment once this pass has pruned
+        live_bytes: Dict[str, int] = {}
+        for entry in live:
+            if entry.segment is not None and entry.checkpoint_id in keep:
+                live_bytes[entry.segment] = live_bytes.get(entry.segment, 0) + entry.length + 1
+        stale_segments = [
+            name for name in self._segment_names()
+            if live_bytes.get(name, 0) < policy.min_segment_live * os.path.getsize(os.path.join(self.segment_path, name))
+        ]
+
+        to_pack = sorted(
+            (e for e in live
+             if e.checkpoint_id in keep
+             and ((e.checkpoint_id not in hot and e.segment is None) or e.segment in stale_segments)),
+            key=lambda e: (e.tick, e.checkpoint_id)
+        )
+
+        # Loose files and old segments are removed only after the new manifest is durable
+        stale_files = [self._loose_path(e.checkpoint_id) for e in to_prune + to_pack if e.segment is None]
+        for name in stale_segments:
+            stale_files += [os.path.join(self.segment_path, name),
+                            os.path.join(self.segment_path, name.replace('.ndjson', '.index.json'))]
+
+        segment_name = self._write_segment(to_pack) if to_pack else None
+
+        for entry in to_prune:
+            entry.pruned = True
+            entry.segment = None
+            entry.offset = entry.length = 0
+        self._rewrite_manifest()
+
+        for filepath in stale_files:
+            if filepath is not None:
+                os.remove(filepath)
+
+        return {
+            "packed": len(to_pack),
+            "pruned": len(to_prune),
+            "retained": len(keep),
+            "segment": segment_name,
+            "removed_segments": stale_segments
+        }
+
+    def _shard_path(self, cid: str) -> str:
+        """Path of a loose checkpoint: <base>/<cid prefix>/<cid>.json"""
+        if self.shard_width <= 0:
+            return os.path.join(self.base_path, f"{cid}.json")
+        prefix = cid[len("ckpt_"):len("ckpt_") + self.shard_width]
+        return os.path.join(self.base_path, prefix, f"{cid}.json")
+
+    def _loose_path(self, cid: str) -> Optional[str]:
+        """Existing loose file for CID (sharded, or flat from older stores)"""
+        for filepath in (self._shard_path(cid), os.path.join(self.base_path, f"{cid}.json")):
+            if os.path.exists(filepath):
+                return filepath
+        return None
+
+    def _segment_names(self) -> List[str]:
+        """Segment archives on disk, oldest first"""
+        if not os.path.isdir(self.segment_path):
+            return []
+        return sorted(name for name in os.listdir(self.segment_path) if name.endswith('.ndjson'))
+
+    def _entry_bytes(self, entry: ManifestEntry) -> bytes:
+        """Canonical JSON of a loose or packed checkpoint"""
+        if entry.segment is not None:
+            with open(os.path.join(self.segment_path, entry.segment), 'rb') as f:
+                f.seek(entry.offset)
+                return f.read(entry.length)
+        with open(self._loose_path(entry.checkpoint_id), 'r') as f:
+            return canonical_dumps(json.load(f)).encode('utf-8')
+
+    def _write_segment(self, entries: List[ManifestEntry]) -> str:
+        """Pack loose or packed checkpoints into a new segment archive with an offset table"""
+        os.makedirs(self.segment_path, exist_ok=True)
+        # Numbered past the newest segment: repacking deletes older ones
+        numbers = [int(name[len('seg_'):-len('.ndjson')]) for name in self._segment_names()]
+        segment_name = f"seg_{max(numbers, default=-1) + 1:06d}.ndjson"
+
+        offsets: Dict[str, List[int]] = {}
+        tmp_path = os.path.join(self.segment_path, segment_name + '.tmp')
+        with open(tmp_path, 'wb') as out:
+            for entry in entries:
+                data = self._entry_bytes(entry)
+                offsets[entry.checkpoint_id] = [out.tell(), len(data)]
+                out.write(data + b'\n')
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, os.path.join(self.segment_path, segment_name))
+
+        index_path = os.path.join(self.segment_path, segment_name.replace('.ndjson', '.index.json'))
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump(offsets, f, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(index_path + '.tmp', index_path)
+
+        for entry in entries:
+            entry.segment = segment_name
+            entry.offset, entry.length = offsets[entry.checkpoint_id]
+
+        return segment_name
+
+    def _load_manifest(self) -> None:
+        """Load the manifest, or build it once from files on disk"""
+        if not os.path.exists(self.manifest_path):
+            self._rebuild_manifest()
+            return
+
+        with open(self.manifest_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = ManifestEntry(**json.loads(line))
+                    self.manifest[entry.checkpoint_id] = entry
+
+    def _rebuild_manifest(self) -> None:
+        """Index loose and packed checkpoints found on disk (one-time O(files) scan)"""
+        if os.path.isdir(self.segment_path):
+            for name in sorted(os.listdir(self.segment_path)):
+                if not name.endswith('.index.json'):
+                    continue
+                segment_name = name.replace('.index.json', '.ndjson')
+                with open(os.path.join(self.segment_path, name), 'r') as f:
+                    offsets = json.load(f)
+                with open(os.path.join(self.segment_path, segment_name), 'rb') as seg:
+                    for cid, (offset, length) in offsets.items():
+                        seg.seek(offset)
+                        checkpoint = json.loads(seg.read(length))
+                        self.manifest[cid] = ManifestEntry(
+                            checkpoint_id=cid,
+                            tick=checkpoint["tick"],
+                            prev_checkpoint_cid=checkpoint["merkle_proof"]["prev_checkpoint_cid"],
+                            segment=segment_name,
+                            offset=offset,
+                            length=length
+                        )
+
+        for root, dirs, files in os.walk(self.base_path):
+            dirs[:] = [d for d in dirs if d != self.SEGMENT_DIR]
+            for name in files:
+                if not (name.startswith('ckpt_') and name.endswith('.json')):
+                    continue
+                with open(os.path.join(root, name), 'r') as f:
+                    checkpoint = json.load(f)
+                cid = name[:-len('.json')]
+                self.manifest[cid] = ManifestEntry(
+                    checkpoint_id=cid,
+                    tick=checkpoint["tick"],
+                    prev_checkpoint_cid=checkpoint["merkle_proof"]["prev_checkpoint_cid"]
+                )
+
+        self._rewrite_manifest()
+
+    def _append_manifest(self, entry: ManifestEntry) -> None:
+        """Persist one manifest record (last record per CID wins on reload)"""
+        self.manifest[entry.checkpoint_id] = entry
+        with open(self.manifest_path, 'a') as f:
+            f.write(canonical_dumps(entry.to_dict()) + '\n')
+
+    def _rewrite_manifest(self) -> None:
+        """Atomically replace the manifest with one record per CID"""
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for cid in self.list_checkpoints(include_pruned=True):
+                f.write(canonical_dumps(self.manifest[cid].to_dict()) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
 
 
 def compute_checkpoint_cid(checkpoint: Dict[str, Any]) -> str:
@@ -113,11 +438,8 @@ def compute_checkpoint_cid(checkpoint: Dict[str, Any]) -> str:
         "merkle_proof": checkpoint["merkle_proof"]
     }
     
-    # Canonical JSON serialization (determinism contract)
-    canonical_json = json.dumps(payload, sort_keys=True, separators=(',', ':'))
-    
-    # SHA-256 hash
-    digest = hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+    # SHA-256 of canonical JSON (determinism contract)
+    digest = canonical_sha256_stream(payload)
     
     # CID format: "ckpt_" prefix + first 32 chars of hash
     cid = f"ckpt_{digest[:32]}"
@@ -138,7 +460,7 @@ def create_checkpoint(
     - Percentages stored as basis points (multiply by 100)
     - Metrics scaled by 100
     """
-    from game_engine import Company
+    from game_engine import encode_rng_state
     
     # Collect company snapshots (integer-only)
     company_snapshots = []
@@ -164,7 +486,7 @@ def create_checkpoint(
                 "employee_productivity_scaled": int(company.metrics.employee_productivity * 100)
             },
             "ledger_hash": company.ledger.get_latest_hash() or "genesis",
-            "ledger_transactions": len(company.ledger.transactions)
+            "ledger_transactions": company.ledger.transaction_count()
         }
         company_snapshots.append(snapshot)
     
@@ -195,6 +517,27 @@ def create_checkpoint(
             "ledger_root": compute_ledger_merkle_root(game_engine)
         },
         
+        # Exact (float) state for replay; outside the CID payload, verified
+        # on restore against merkle_proof.state_hash and the ledger heads
+        "restore_state": {
+            "market_conditions": game_engine.market_conditions.to_dict(),
+            "prev_market_hash": game_engine.prev_market_hash,
+            "rng_state": encode_rng_state(random.getstate()),
+            "companies": [
+                {
+                    "registration": company.registration_info(),
+                    "is_ai": company.is_ai,
+                    "tick": company.current_tick,
+                    "prev_state_hash": company.prev_state_hash,
+                    "resources": company.resources.to_dict(),
+                    "financial": asdict(company.financial),
+                    "metrics": company.metrics.to_dict(),
+                    "ledger": company.ledger.export_segment()
+                }
+                for company in game_engine.companies.values()
+            ]
+        },
+        
         "replay_metadata": {
             "resume_token": f"tick_{game_engine.current_tick}",
             "determinism_flags": {
@@ -218,8 +561,7 @@ def compute_state_hash(game_engine) -> str:
         "companies": [c.to_dict() for c in game_engine.companies.values()]
     }
     
-    canonical_json = json.dumps(state, sort_keys=True, separators=(',', ':'))
-    return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+    return canonical_sha256_stream(state)
 
 
 def compute_ledger_merkle_root(game_engine) -> str:
@@ -241,13 +583,20 @@ def compute_ledger_merkle_root(game_engine) -> str:
 
 def replay_from_checkpoint(
     cid: str,
-    store: CheckpointStore
+    store: CheckpointStore,
+    lazy_ledgers: bool = True
 ):
     """
     Deterministic replay: reconstruct game state from checkpoint CID.
     Returns initialized GameEngine with restored state.
+
+    Company ledgers are rebuilt from their checkpointed head + segment. With
+    lazy_ledgers (default) each chain is decoded on first access, so the game
+    can tick as soon as the company table is restored; heads are verified
+    against the CID-covered snapshot and ledger root up front, and
+    game.verify_all_chains() decodes and verifies every chain in full.
     """
-    from game_engine import GameEngine, MarketConditions, Company, CompanyResources, FinancialState, PerformanceMetrics
+    from game_engine import GameEngine, MarketConditions, Company, CompanyResources, FinancialState, PerformanceMetrics, decode_rng_state
     from ledger import CompanyLedger
     
     # Load checkpoint
@@ -256,43 +605,42 @@ def replay_from_checkpoint(
     # Verify integrity
     if not store.verify_checkpoint(checkpoint):
         raise ValueError(f"Checkpoint {cid} failed integrity verification!")
+
+    restore_state = checkpoint.get("restore_state")
+    if restore_state is None:
+        raise ValueError(f"Checkpoint {cid} has no restore_state (created before full-state checkpoints)")
     
     # Create game engine with original seed
     game = GameEngine(seed=checkpoint["game_seed"])
     game.current_tick = checkpoint["tick"]
+    random.setstate(decode_rng_state(restore_state["rng_state"]))
     
     # Restore market conditions
-    market_data = checkpoint["state_vector"]["market_conditions"]
-    game.market_conditions = MarketConditions(**market_data)
+    game.market_conditions = MarketConditions(**restore_state["market_conditions"])
+    game.prev_market_hash = restore_state["prev_market_hash"]
     
-    # Restore companies
-    for company_data in checkpoint["state_vector"]["companies"]:
-        # Create company object
-        company = Company(
-            company_id=company_data["company_id"],
-            company_name=company_data["company_name"],
-            founding_capital_usd=0,  # Will be overwritten
-            industry_sector=game_engine.IndustrySector.TECH,  # Default
-            sovereign_signature="restored",
-            is_ai=False
-        )
+    # Restore companies (same order as the snapshot, so state hashes line up)
+    snapshots = checkpoint["state_vector"]["companies"]
+    if len(snapshots) != len(restore_state["companies"]):
+        raise ValueError(f"Checkpoint {cid} restore_state does not match its company snapshots")
+
+    for snapshot, company_data in zip(snapshots, restore_state["companies"]):
+        registration = company_data["registration"]
+        ledger_state = company_data["ledger"]
+
+        # Recorded head must match the CID-covered snapshot
+        if snapshot["company_id"] != registration["company_id"] or \
+                snapshot["ledger_hash"] != (ledger_state["head"] or "genesis"):
+            raise ValueError(f"Ledger head mismatch for company {registration['company_id']}")
+
+        ledger = CompanyLedger.restore(registration["company_id"], ledger_state, lazy=lazy_ledgers)
+        company = Company.restore(registration, ledger, is_ai=company_data["is_ai"])
         
-        # Restore resources
         company.resources = CompanyResources(**company_data["resources"])
-        
-        # Restore financial state
-        financial_data = company_data["financial"]
-        company.financial = FinancialState()
-        company.financial.total_revenue_usd = financial_data["total_revenue_usd"]
-        company.financial.total_expenses_usd = financial_data["total_expenses_usd"]
-        
-        # Restore metrics
+        company.financial = FinancialState(**company_data["financial"])
         company.metrics = PerformanceMetrics(**company_data["metrics"])
-        
-        # Note: Full ledger restoration would require separate ledger checkpoints
-        company.ledger = CompanyLedger(company.company_id)
-        
-        company.current_tick = checkpoint["tick"]
+        company.prev_state_hash = company_data["prev_state_hash"]
+        company.current_tick = company_data["tick"]
         game.companies[company.company_id] = company
     
     # Verify restored state hash matches checkpoint
@@ -301,6 +649,9 @@ def replay_from_checkpoint(
     
     if restored_hash != original_hash:
         raise ValueError(f"State hash mismatch! Original: {original_hash}, Restored: {restored_hash}")
+
+    if compute_ledger_merkle_root(game) != checkpoint["merkle_proof"]["ledger_root"]:
+        raise ValueError("Ledger root mismatch!")
     
     return game
 
@@ -308,11 +659,16 @@ def replay_from_checkpoint(
 def verify_checkpoint_chain(
     cid: str,
     store: CheckpointStore,
-    genesis_cid: Optional[str] = None
+    genesis_cid: Optional[str] = None,
+    verify_content: bool = True
 ) -> bool:
     """
     Verify Merkle chain integrity from CID back to genesis.
     Returns True if chain is intact.
+
+    Stores with a manifest resolve prev links from the index; checkpoints
+    pruned by retention are walked through by their recorded lineage.
+    With verify_content=False the walk never touches checkpoint files.
     """
     current_cid = cid
     visited = set()
@@ -322,16 +678,25 @@ def verify_checkpoint_chain(
             raise ValueError(f"Circular reference detected: {current_cid}")
         
         visited.add(current_cid)
-        
-        # Load checkpoint
-        checkpoint = store.load_checkpoint(current_cid)
-        
-        # Verify integrity
-        if not store.verify_checkpoint(checkpoint):
-            return False
-        
-        # Get previous CID
-        prev_cid = checkpoint["merkle_proof"]["prev_checkpoint_cid"]
+
+        entry = store.lineage_entry(current_cid)
+
+        if entry is not None and (entry.pruned or not verify_content):
+            # Lineage only: content dropped by retention or not requested
+            prev_cid = entry.prev_checkpoint_cid
+        else:
+            # Load checkpoint
+            checkpoint = store.load_checkpoint(current_cid)
+            
+            # Verify integrity
+            if not store.verify_checkpoint(checkpoint):
+                return False
+            
+            # Get previous CID
+            prev_cid = checkpoint["merkle_proof"]["prev_checkpoint_cid"]
+
+            if entry is not None and entry.prev_checkpoint_cid != prev_cid:
+                return False  # Manifest disagrees with content
         
         # If we reached genesis
         if prev_cid is None:
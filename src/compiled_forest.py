@@ -0,0 +1,604 @@
+"""
+Compiled Random Forest Inference
+Flattens trained sklearn forests into contiguous node tables (feature,
+threshold, child, value) and evaluates them with NumPy, without sklearn at
+runtime. Used on the per-tick control path, where sklearn's input
+validation and thread dispatch cost more than the traversal itself.
+
+All trees advance one level per step. Node indices are kept doubled
+(2 * node) so each step is a single gather:
+
+    n2 = child2[n2 + (x[feature2[n2]] <= threshold2[n2])]
+
+child2[2n] is the right child and child2[2n + 1] the left child, both
+doubled; leaves point back at themselves, so max_depth steps put every
+tree on its leaf.
+
+Predictions are bit-identical to sklearn's RandomForestRegressor.predict
+with n_jobs=1: features are cast to float32 before comparison, NaN follows
+missing_go_to_left, and tree outputs are summed in estimator order before
+dividing by the tree count. With n_jobs > 1 sklearn accumulates trees in
+thread completion order, so it can differ from this (fixed) order in the
+last bit.
+
+Several forests (e.g. one per control target) are merged into one
+traversal; each one is a "head" covering a slice of the trees and of the
+outputs. An optional feature StandardScaler (applied before traversal) and
+per-output target scalers (inverted after) are embedded with sklearn's
+dtype behaviour.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+FORMAT_VERSION = "cforest.v1"
+
+# Single-sample evaluation walks trees in Python up to n_trees * max_depth
+# of this many steps, and steps all trees level by level with NumPy above it
+PYTHON_WALK_MAX_STEPS = 512
+
+# Arrays persisted by save(); everything else is derived on load
+_ARRAY_NAMES = (
+    'feature', 'threshold', 'left', 'right', 'value', 'missing_left',
+    'tree_offsets', 'tree_depths', 'heads',
+    'feature_mean', 'feature_scale', 'target_mean', 'target_scale'
+)
+
+# Evaluation tables save_dir() also writes, so load_dir() maps them as-is
+_TABLE_NAMES = ('feature2', 'threshold2', 'child2', 'missing_left2')
+
+META_FILE = "meta.json"
+
+# save_dir() puts each save's tables in a fresh <TABLES_PREFIX><token>/ that
+# meta.json names, so files other processes have mapped are never rewritten
+TABLES_PREFIX = "tables-"
+
+
+class CompiledForest:
+    """
+    Flat-array forest evaluator.
+
+    Build with from_sklearn() or load(); predict() takes (n_features,) or
+    (B, n_features) and returns (B, n_outputs) float64.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        missing_left: np.ndarray,
+        tree_offsets: np.ndarray,
+        tree_depths: np.ndarray,
+        heads: np.ndarray,
+        n_features: int,
+        output_names: Sequence[str],
+        feature_mean: Optional[np.ndarray]=None,
+        feature_scale: Optional[np.ndarray]=None,
+        target_mean: Optional[np.ndarray]=None,
+        target_scale: Optional[np.ndarray]=None,
+        tables: Optional[Mapping[str, np.ndarray]]=None
+    ):
+        """
+        Node tables use sklearn's per-tree layout concatenated: left/right
+        are tree-local child indices (-1 at leaves), value is (nodes,
+        max head outputs), tree_offsets (n_trees + 1,) delimit the trees and
+        heads rows are (tree_start, tree_stop, output_start, n_outputs).
+        tables holds precomputed evaluation tables (see load_dir()).
+        """
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.missing_left = np.ascontiguousarray(missing_left, dtype=np.uint8)
+        self.tree_offsets = np.ascontiguousarray(tree_offsets, dtype=np.int64)
+        self.tree_depths = np.ascontiguousarray(tree_depths, dtype=np.int32)
+        self.heads = np.ascontiguousarray(heads, dtype=np.int64).reshape(-1, 4)
+        self.n_features = int(n_features)
+        self.output_names = [str(name) for name in output_names]
+        self.feature_mean = feature_mean
+        self.feature_scale = feature_scale
+        self.target_mean = target_mean
+        self.target_scale = target_scale
+
+        n_nodes = len(self.feature)
+        if not (len(self.threshold) == len(self.left) == len(self.right) ==
+                len(self.missing_left) == len(self.value) == n_nodes):
+            raise ValueError("Node tables have mismatched lengths")
+        if self.tree_offsets[-1] != n_nodes or len(self.tree_depths) != self.n_trees:
+            raise ValueError("tree_offsets/tree_depths do not match the node tables")
+        if int(self.heads[:, 3].sum()) != self.n_outputs or len(self.output_names) != self.n_outputs:
+            raise ValueError("Head outputs do not match output_names")
+        if tables is not None and len(tables.get('child2', ())) != 2 * n_nodes:
+            raise ValueError("Evaluation tables do not match the node tables")
+
+        self._compile(tables)
+
+    # ------------------------------------------------------------------
+    # Construction
+
+    @classmethod
+    def from_sklearn(
+        cls,
+        forests: Union[Any, Sequence[Any], Mapping[str, Any]],
+        feature_scaler: Any=None,
+        target_scalers: Optional[Mapping[str, Any]]=None,
+        output_names: Optional[Sequence[str]]=None
+    ) -> 'CompiledForest':
+        """
+        Compile fitted RandomForestRegressor(s).
+
+        Args:
+            forests: One forest, a list of forests, or {name: forest}. Heads
+                keep the given order; outputs are concatenated.
+            feature_scaler: Fitted StandardScaler applied to inputs
+            target_scalers: {output_name: fitted StandardScaler} inverted
+                on the matching output column
+            output_names: Output column names. Defaults to the mapping keys
+                (single-output forests) or head{i}_{k}.
+        """
+        if isinstance(forests, Mapping):
+            named = list(forests.items())
+        elif isinstance(forests, (list, tuple)):
+            named = [(f"head{i}", forest) for i, forest in enumerate(forests)]
+        else:
+            named = [("head0", forests)]
+        if not named:
+            raise ValueError("No forests to compile")
+        for head_name, forest in named:
+            if not hasattr(forest, 'estimators_'):
+                raise ValueError(f"Forest '{head_name}' is not fitted")
+
+        features, thresholds, lefts, rights, values, missing, sizes, depths = [], [], [], [], [], [], [], []
+        heads, default_names = [], []
+        n_features = None
+        max_outputs = max(int(forest.n_outputs_) for _, forest in named)
+        n_trees = n_outputs = 0
+
+        for head_name, forest in named:
+            if n_features is None:
+                n_features = int(forest.n_features_in_)
+            elif int(forest.n_features_in_) != n_features:
+                raise ValueError("All forests must take the same features")
+            head_outputs = int(forest.n_outputs_)
+
+            for estimator in forest.estimators_:
+                tree = estimator.tree_
+                if tree.value.shape[2] != 1:
+                    raise ValueError("Only regression forests can be compiled")
+                leaf = tree.children_left < 0
+                features.append(np.where(leaf, 0, tree.feature))
+                thresholds.append(np.where(leaf, np.inf, tree.threshold))
+                lefts.append(tree.children_left)
+                rights.append(tree.children_right)
+                node_values = np.zeros((tree.node_count, max_outputs))
+                node_values[:, :head_outputs] = tree.value[:, :, 0]
+                values.append(node_values)
+                missing.append(tree.missing_go_to_left)
+                sizes.append(tree.node_count)
+                depths.append(tree.max_depth)
+
+            heads.append((n_trees, n_trees + len(forest.estimators_), n_outputs, head_outputs))
+            n_trees += len(forest.estimators_)
+            n_outputs += head_outputs
+            if head_outputs == 1 and isinstance(forests, Mapping):
+                default_names.append(head_name)
+            else:
+                default_names.extend(f"{head_name}_{k}" for k in range(head_outputs))
+
+        names = list(output_names) if output_names is not None else default_names
+        if len(names) != n_outputs:
+            raise ValueError(f"Expected {n_outputs} output names, got {len(names)}")
+
+        feature_mean = feature_scale = None
+        if feature_scaler is not None:
+            feature_mean, feature_scale = _scaler_params(feature_scaler, n_features)
+
+        target_mean = target_scale = None
+        if target_scalers:
+            unknown = set(target_scalers) - set(names)
+            if unknown:
+                raise ValueError(f"Target scalers for unknown outputs: {sorted(unknown)}")
+            target_mean, target_scale = np.zeros(n_outputs), np.ones(n_outputs)
+            for k, name in enumerate(names):
+                if name in target_scalers:
+                    mean, scale = _scaler_params(target_scalers[name], 1)
+                    if mean is not None:
+                        target_mean[k] = mean[0]
+                    if scale is not None:
+                        target_scale[k] = scale[0]
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            missing_left=np.concatenate(missing),
+            tree_offsets=np.concatenate([[0], np.cumsum(sizes)]),
+            tree_depths=np.array(depths),
+            heads=np.array(heads),
+            n_features=n_features,
+            output_names=names,
+            feature_mean=feature_mean,
+            feature_scale=feature_scale,
+            target_mean=target_mean,
+            target_scale=target_scale
+        )
+
+    def _compile(self, tables: Optional[Mapping[str, np.ndarray]]=None):
+        """
+        Build the doubled-index evaluation tables, or adopt ones read by
+        load_dir() (possibly memory-mapped, so processes share the pages).
+        """
+        n_nodes = len(self.feature)
+        leaf = left = right = None
+
+        def global_children():
+            starts = np.repeat(self.tree_offsets[:-1], np.diff(self.tree_offsets))
+            own = np.arange(n_nodes, dtype=np.intp)
+            leaf = self.left < 0
+            return leaf, np.where(leaf, own, self.left + starts), np.where(leaf, own, self.right + starts)
+
+        if tables is not None:
+            self._feature2 = tables['feature2']
+            self._threshold2 = tables['threshold2']
+            self._child2 = tables['child2']
+            self._missing_left2 = tables['missing_left2']
+            # save_dir() writes leaf values already normalised
+            self._leaf_value = self.value
+        else:
+            leaf, left, right = global_children()
+            self._feature2 = np.repeat(self.feature.astype(np.intp), 2)
+            self._threshold2 = np.repeat(_float32_floor(self.threshold), 2)
+            self._child2 = np.empty(2 * n_nodes, dtype=np.intp)
+            self._child2[0::2] = 2 * right
+            self._child2[1::2] = 2 * left
+            self._missing_left2 = np.repeat(self.missing_left.astype(bool) & ~leaf, 2)
+            # + 0.0 turns -0.0 leaves into +0.0, matching sklearn's zero-initialised sum
+            self._leaf_value = self.value + 0.0
+        self._roots2 = 2 * self.tree_offsets[:-1].astype(np.intp)
+        self._depth = int(self.tree_depths.max()) if self.n_trees else 0
+
+        # Small forests: walking each tree in Python beats per-level NumPy calls
+        self._walk_trees = self.n_trees * self._depth <= PYTHON_WALK_MAX_STEPS
+        if self._walk_trees:
+            if leaf is None:
+                leaf, left, right = global_children()
+            self._roots_list = self.tree_offsets[:-1].tolist()
+            self._feature_list = self.feature.tolist()
+            self._threshold_list = self.threshold.tolist()
+            self._left_list = np.where(leaf, -1, left).tolist()
+            self._right_list = right.tolist()
+            self._value_columns = [column.tolist() for column in self._leaf_value.T]
+            if self.target_scale is not None:
+                self._target_scale_list = self.target_scale.tolist()
+                self._target_mean_list = self.target_mean.tolist()
+        self._heads = [(int(t0), int(t1), int(o0), int(n)) for t0, t1, o0, n in self.heads]
+        # Heads of equal shape (e.g. one forest per target) are reduced in one pass
+        shapes = {(t1 - t0, n) for t0, t1, _, n in self._heads}
+        self._uniform_heads = len(shapes) == 1 and self._heads[0][3] == self.value.shape[1]
+
+        self._scale_inputs = self.feature_mean is not None or self.feature_scale is not None
+        self._input_params = {}
+        if self._scale_inputs:
+            for dtype in (np.float32, np.float64):
+                self._input_params[np.dtype(dtype)] = (
+                    None if self.feature_mean is None else self.feature_mean.astype(dtype),
+                    None if self.feature_scale is None else self.feature_scale.astype(dtype)
+                )
+
+    # ------------------------------------------------------------------
+    # Introspection
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_offsets) - 1
+
+    @property
+    def n_outputs(self) -> int:
+        return len(self.output_names)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.feature)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the persisted tables."""
+        return sum(array.nbytes for array in self._arrays().values())
+
+    # ------------------------------------------------------------------
+    # Evaluation
+
+    def _prepare(self, X) -> np.ndarray:
+        """Apply the feature scaler with sklearn's dtype rules, then cast to float32."""
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected input with {self.n_features} features, got shape {X.shape}")
+
+        if self._scale_inputs:
+            if X.dtype not in self._input_params:
+                X = X.astype(np.float64)
+            mean, scale = self._input_params[X.dtype]
+            if mean is not None:
+                X = X - mean
+            if scale is not None:
+                X = X / scale
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    def apply(self, X) -> np.ndarray:
+        """(B, n_trees) global leaf node index per sample and tree."""
+        X32 = self._prepare(X)
+        return self._apply(X32) >> 1
+
+    def _apply(self, X32: np.ndarray) -> np.ndarray:
+        feature2, threshold2, child2 = self._feature2, self._threshold2, self._child2
+        batch = X32.shape[0]
+        if np.isnan(X32).any():
+            return self._apply_missing(X32)
+
+        if batch == 1:
+            x = X32[0]
+            n2 = self._roots2
+            for _ in range(self._depth):
+                n2 = child2[n2 + (x[feature2[n2]] <= threshold2[n2])]
+            return n2.reshape(1, -1)
+
+        flat = X32.ravel()
+        rows = (np.arange(batch, dtype=np.intp) * self.n_features)[:, None]
+        n2 = np.broadcast_to(self._roots2, (batch, self.n_trees))
+        for _ in range(self._depth):
+            n2 = child2[n2 + (flat[feature2[n2] + rows] <= threshold2[n2])]
+        return n2
+
+    def _apply_missing(self, X32: np.ndarray) -> np.ndarray:
+        """Traversal with NaN features routed by missing_go_to_left."""
+        flat = X32.ravel()
+        rows = (np.arange(X32.shape[0], dtype=np.intp) * self.n_features)[:, None]
+        n2 = np.broadcast_to(self._roots2, (X32.shape[0], self.n_trees))
+        for _ in range(self._depth):
+            x = flat[self._feature2[n2] + rows]
+            go_left = (x <= self._threshold2[n2]) | (np.isnan(x) & self._missing_left2[n2])
+            n2 = self._child2[n2 + go_left]
+        return n2
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict for one sample (n_features,) or a batch (B, n_features).
+
+        Returns:
+            (B, n_outputs) float64, target scalers already inverted
+        """
+        X32 = self._prepare(X)
+        if self._walk_trees and X32.shape[0] == 1 and not np.isnan(X32).any():
+            return self._walk(X32[0].tolist())
+
+        leaves = self._apply(X32) >> 1
+        batch = leaves.shape[0]
+
+        # cumsum adds strictly in tree order, like sklearn's accumulation loop
+        if self._uniform_heads:
+            n_head_trees = self._heads[0][1] - self._heads[0][0]
+            tree_values = self._leaf_value[leaves].reshape(batch, len(self._heads), n_head_trees, -1)
+            out = np.cumsum(tree_values, axis=2)[:, :, -1].reshape(batch, self.n_outputs) / n_head_trees
+        else:
+            out = np.empty((batch, self.n_outputs))
+            for t0, t1, o0, n in self._heads:
+                tree_values = self._leaf_value[leaves[:, t0:t1], :n]
+                out[:, o0:o0 + n] = np.cumsum(tree_values, axis=1)[:, -1] / (t1 - t0)
+
+        if self.target_scale is not None:
+            out *= self.target_scale
+            out += self.target_mean
+        return out
+
+    def predict_one(self, x) -> np.ndarray:
+        """(n_outputs,) prediction for a single feature vector."""
+        return self.predict(x)[0]
+
+    def _walk(self, x: List[float]) -> np.ndarray:
+        """
+        predict() for one NaN-free sample of a small forest, tree by tree in
+        plain Python. float32 inputs are exact as Python floats, so the
+        comparisons, the running sums and the scaling match the array path.
+        """
+        feature, threshold = self._feature_list, self._threshold_list
+        left, right = self._left_list, self._right_list
+        leaves = []
+        for node in self._roots_list:
+            child = left[node]
+            while child >= 0:
+                node = child if x[feature[node]] <= threshold[node] else right[node]
+                child = left[node]
+            leaves.append(node)
+
+        out = []
+        for t0, t1, o0, n in self._heads:
+            head_leaves = leaves[t0:t1]
+            for column in self._value_columns[:n]:
+                total = 0.0
+                for node in head_leaves:
+                    total += column[node]
+                out.append(total / (t1 - t0))
+        if self.target_scale is not None:
+            out = [y * scale + mean for y, scale, mean in zip(out, self._target_scale_list, self._target_mean_list)]
+        return np.array([out])
+
+    # ------------------------------------------------------------------
+    # Persistence
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        empty = np.zeros(0)
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'left': self.left,
+            'right': self.right,
+            'value': self.value,
+            'missing_left': self.missing_left,
+            'tree_offsets': self.tree_offsets,
+            'tree_depths': self.tree_depths,
+            'heads': self.heads,
+            'feature_mean': empty if self.feature_mean is None else self.feature_mean,
+            'feature_scale': empty if self.feature_scale is None else self.feature_scale,
+            'target_mean': empty if self.target_mean is None else self.target_mean,
+            'target_scale': empty if self.target_scale is None else self.target_scale
+        }
+
+    def _meta(self) -> Dict[str, Any]:
+        return {
+            'format': FORMAT_VERSION,
+            'n_features': self.n_features,
+            'output_names': self.output_names,
+            'has_feature_mean': self.feature_mean is not None,
+            'has_feature_scale': self.feature_scale is not None,
+            'has_target_scalers': self.target_scale is not None
+        }
+
+    def save(self, path: str) -> str:
+        """Write an .npz (no pickled objects) via a temp file; returns path."""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(self._meta(), sort_keys=True)), **self._arrays())
+        os.replace(tmp_path, path)
+        return path
+
+    def save_dir(self, directory: str) -> str:
+        """
+        Write one raw .npy per table plus meta.json, for load_dir().
+
+        Besides the node tables this stores the evaluation tables, so a
+        memory-mapped load does no per-node work and every process mapping
+        the directory shares the same page-cache pages. Returns directory.
+
+        Saving over a directory that is in use is safe: the tables go to a
+        new subdirectory and meta.json is swapped to point at it, so a
+        published .npy is never truncated under a reader's mapping (which
+        would end in SIGBUS). Superseded table sets are unlinked; existing
+        mappings keep their pages until they are dropped.
+        """
+        os.makedirs(directory, exist_ok=True)
+        arrays = self._arrays()
+        arrays['value'] = self._leaf_value
+        arrays.update({
+            'feature2': self._feature2,
+            'threshold2': self._threshold2,
+            'child2': self._child2,
+            'missing_left2': self._missing_left2
+        })
+        tables = TABLES_PREFIX + uuid.uuid4().hex
+        tmp_dir = os.path.join(directory, '.' + tables + '.tmp')
+        os.makedirs(tmp_dir)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, name + '.npy'), np.ascontiguousarray(array), allow_pickle=False)
+        os.replace(tmp_dir, os.path.join(directory, tables))
+
+        tmp_path = os.path.join(directory, META_FILE + '.' + tables + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(self._meta(), tables=tables), f, sort_keys=True)
+        # meta.json last: a directory without it is incomplete
+        os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+        # Earlier saves: versioned table sets and the older flat .npy layout
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            if entry.startswith(TABLES_PREFIX) and entry != tables:
+                shutil.rmtree(path, ignore_errors=True)
+            elif entry.endswith('.npy'):
+                os.remove(path)
+        return directory
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledForest':
+        """Load a forest written by save() (or by save_dir(), if path is a directory)."""
+        if os.path.isdir(path):
+            return cls.load_dir(path)
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            arrays = {name: data[name] for name in _ARRAY_NAMES}
+        return cls._from_saved(meta, arrays)
+
+    @classmethod
+    def load_dir(cls, directory: str, mmap_mode: Optional[str]='r') -> 'CompiledForest':
+        """
+        Load a forest written by save_dir().
+
+        With mmap_mode='r' (the default) the tables are read-only memory
+        maps: loading touches only the headers, pages are faulted in by the
+        first predictions, and they are shared between processes. Pass
+        mmap_mode=None to read everything into private memory.
+        """
+        meta_path = os.path.join(directory, META_FILE)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"No compiled forest in {directory}")
+
+        def read(table_dir, name):
+            return np.load(os.path.join(table_dir, name + '.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+
+        for attempt in range(3):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            # Directories written before versioned table sets keep the .npy files at the top
+            table_dir = os.path.join(directory, meta.pop('tables', ''))
+            try:
+                arrays = {name: read(table_dir, name) for name in _ARRAY_NAMES}
+                tables = {name: read(table_dir, name) for name in _TABLE_NAMES}
+            except FileNotFoundError:
+                # A concurrent save_dir() replaced this table set; read meta.json again
+                if attempt == 2:
+                    raise
+                continue
+            return cls._from_saved(meta, arrays, tables)
+
+    @classmethod
+    def _from_saved(cls, meta: Dict[str, Any], arrays: Dict[str, np.ndarray],
+                    tables: Optional[Dict[str, np.ndarray]]=None) -> 'CompiledForest':
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled forest format: {meta.get('format')}")
+        optional = {
+            'feature_mean': meta['has_feature_mean'],
+            'feature_scale': meta['has_feature_scale'],
+            'target_mean': meta['has_target_scalers'],
+            'target_scale': meta['has_target_scalers']
+        }
+        for name, present in optional.items():
+            if not present:
+                arrays[name] = None
+        return cls(n_features=meta['n_features'], output_names=meta['output_names'], tables=tables, **arrays)
+
+
+def _float32_floor(threshold: np.ndarray) -> np.ndarray:
+    """
+    Largest float32 <= each float64 threshold. For float32 x,
+    x <= threshold exactly when x <= _float32_floor(threshold), so the
+    traversal compares float32 against float32.
+    """
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def _scaler_params(scaler: Any, n_features: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """(mean, scale) of a fitted StandardScaler; None where the scaler skips that step."""
+    if not hasattr(scaler, 'n_features_in_'):
+        raise ValueError("Scaler is not fitted")
+    if int(scaler.n_features_in_) != n_features:
+        raise ValueError(f"Scaler expects {scaler.n_features_in_} features, forest {n_features}")
+    mean = getattr(scaler, 'mean_', None) if scaler.with_mean else None
+    scale = getattr(scaler, 'scale_', None) if scaler.with_std else None
+    return (
+        None if mean is None else np.asarray(mean, dtype=np.float64).copy(),
+        None if scale is None else np.asarray(scale, dtype=np.float64).copy()
+    )
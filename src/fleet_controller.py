@@ -0,0 +1,77 @@
+"""
+RF Fleet Controller
+Drives many AI cars per tick with one forest call per model instead of one
+per car: the tick's state dicts are gathered into a feature matrix per
+model, predicted in a single batch and scattered back by car id.
+
+Each car's controls are identical to calling model.predict(state) for that
+car alone.
+"""
+
+from typing import Any, Dict, Hashable, List, Mapping, Tuple
+
+from racing_ai_trainer import CONTROL_NAMES, DeterministicRandomForest
+
+
+class RFFleetController:
+    """
+    Batched control for cars driven by DeterministicRandomForest models.
+
+    Usage:
+        fleet = RFFleetController()
+        for car_id in ai_cars:
+            fleet.add_car(car_id, model)
+
+        for tick in simulation_loop:
+            controls = fleet.tick({car_id: state_dict, ...})
+    """
+
+    def __init__(self):
+        self._models: Dict[Hashable, DeterministicRandomForest] = {}
+        self._groups: List[Tuple[DeterministicRandomForest, List[Hashable]]] = []
+
+    @property
+    def car_ids(self) -> List[Hashable]:
+        return list(self._models)
+
+    def add_car(self, car_id: Hashable, model: DeterministicRandomForest):
+        """Register a car (or move it to another model)."""
+        self._models[car_id] = model
+        self._regroup()
+
+    def remove_car(self, car_id: Hashable):
+        del self._models[car_id]
+        self._regroup()
+
+    def _regroup(self):
+        """Cars per model, in registration order; rebuilt only when the fleet changes."""
+        groups: Dict[int, Tuple[DeterministicRandomForest, List[Hashable]]] = {}
+        for car_id, model in self._models.items():
+            groups.setdefault(id(model), (model, []))[1].append(car_id)
+        self._groups = list(groups.values())
+
+    def tick(self, states: Mapping[Hashable, Dict[str, Any]]) -> Dict[Hashable, Dict[str, float]]:
+        """
+        Controls for every registered car with a state this tick.
+
+        Args:
+            states: {car_id: VehicleState as dictionary}. Registered cars
+                without a state are skipped; unknown car ids raise KeyError.
+
+        Returns:
+            {car_id: {'steering': ..., 'throttle': ..., 'brake': ...}} in
+            the order of states
+        """
+        unknown = [car_id for car_id in states if car_id not in self._models]
+        if unknown:
+            raise KeyError(f"Cars not registered with the fleet: {unknown}")
+
+        controls = {}
+        for model, car_ids in self._groups:
+            present = [car_id for car_id in car_ids if car_id in states]
+            if not present:
+                continue
+            Y = model.predict_states([states[car_id] for car_id in present]).tolist()
+            for car_id, row in zip(present, Y):
+                controls[car_id] = dict(zip(CONTROL_NAMES, row))
+        return {car_id: controls[car_id] for car_id in states}
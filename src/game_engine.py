@@ -4,7 +4,6 @@ Implements market simulation, company management, and SSOT integration.
 """
 
 import hashlib
-import json
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
@@ -13,6 +12,8 @@ from enum import Enum
 import random
 
 from ledger import CompanyLedger, Account, TransactionType
+from canonical_json import canonical_sha256, canonical_sha256_stream
+from schema_validator import get_validator
 try:
     from ipfs_bridge import IPFSBridge, IPFSConfig
 except ImportError:
@@ -148,6 +149,36 @@ class Company:
         self.current_tick = 0
         self.prev_state_hash: Optional[str] = None
 
+    @classmethod
+    def restore(
+        cls,
+        registration: Dict[str, Any],
+        ledger: CompanyLedger,
+        is_ai: bool = False
+    ) -> 'Company':
+        """
+        Rebuild a company from checkpointed registration info and ledger.
+        Skips the genesis transaction; resources/financials are set by the caller.
+        """
+        company = cls.__new__(cls)
+        company.company_id = registration["company_id"]
+        company.company_name = registration["company_name"]
+        company.industry_sector = IndustrySector(registration["industry_sector"])
+        company.sovereign_signature = registration["sovereign_signature"]
+        company.is_ai = is_ai
+
+        company.resources = CompanyResources()
+        company.financial = FinancialState()
+        company.metrics = PerformanceMetrics()
+
+        company.ledger = ledger
+        company.merkle_genesis_hash = registration["merkle_genesis_hash"]
+        company.incorporation_timestamp = registration["incorporation_timestamp"]
+
+        company.current_tick = 0
+        company.prev_state_hash = None
+        return company
+
     def compute_state_hash(self) -> str:
         """Compute SHA-256 hash of complete company state"""
         state = {
@@ -157,8 +188,7 @@ class Company:
             "financial_state": self.financial.to_dict(),
             "performance_metrics": self.metrics.to_dict()
         }
-        canonical_json = json.dumps(state, sort_keys=True, separators=(',', ':'))
-        return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+        return canonical_sha256(state)
 
     def to_dict(self) -> Dict[str, Any]:
         """Export complete company state"""
@@ -465,8 +495,7 @@ class GameEngine:
         }
 
         # Compute Merkle state hash
-        canonical_json = json.dumps(market_state, sort_keys=True, separators=(',', ':'))
-        market_state["merkle_state_hash"] = hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+        market_state["merkle_state_hash"] = canonical_sha256(market_state)
 
         # Update history
         self.prev_market_hash = market_state["merkle_state_hash"]
@@ -507,9 +536,8 @@ class GameEngine:
             "seed": self.seed
         }
         
-        # Compute canonical hash
-        canonical_json = json.dumps(flow_state, sort_keys=True, separators=(',', ':'))
-        canonical_sha256 = hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+        # Compute canonical hash (streamed: flow_state grows with company count)
+        canonical_sha256 = canonical_sha256_stream(flow_state)
         
         # Compute Merkle root from all company ledger chains
         company_hashes = [c.ledger.get_chain_head_hash() for c in self.companies.values()]
@@ -519,6 +547,10 @@ class GameEngine:
         else:
             merkle_root = canonical_sha256  # Fallback if no companies
         
+        # Ledger heads + compacted segments, so restored chains stay verifiable
+        ledger_state = {cid: c.ledger.export_segment() for cid, c in self.companies.items()}
+        registrations = {cid: c.registration_info() for cid, c in self.companies.items()}
+        
         # Build resume token
         resume_token = f"{checkpoint_id}@{self.current_tick}"
         
@@ -533,6 +565,10 @@ class GameEngine:
             "prev_checkpoint_hash": self.prev_checkpoint_hash,
             "merkle_root": merkle_root,
             "replay_authorized": True,
+            "ledger_state": ledger_state,
+            "registrations": registrations,
+            "rng_state": encode_rng_state(random.getstate()),
+            "prev_market_hash": self.prev_market_hash,
             "metadata": {
                 "creator": "game_engine",
                 "purpose": "auto_checkpoint" if self.auto_checkpoint_interval else "manual_save"
@@ -585,21 +621,55 @@ class GameEngine:
         if not self.ipfs_bridge.verify_cid(cid, checkpoint):
             raise ValueError(f"CID verification failed for: {cid}")
         
+        # Verify capsule shape (checkpoint_capsule.v1.schema.json)
+        get_validator("checkpoint_capsule").validate(checkpoint)
+        
         # Verify canonical hash
         flow_state = checkpoint.get("flow_state")
         if not flow_state:
             raise ValueError("Invalid checkpoint: missing flow_state")
         
-        canonical_json = json.dumps(flow_state, sort_keys=True, separators=(',', ':'))
-        computed_hash = hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+        computed_hash = canonical_sha256_stream(flow_state)
         
         if computed_hash != checkpoint.get("canonical_sha256"):
             raise ValueError("Canonical hash verification failed")
         
+        self.restore_checkpoint(checkpoint)
+        
+        print(f"✅ Checkpoint restored from CID: {cid} (tick {self.current_tick})")
+
+    def restore_checkpoint(self, checkpoint: Dict[str, Any], lazy_ledgers: bool = True) -> None:
+        """
+        Restore game state (companies, ledgers, market, RNG) from a checkpoint capsule.
+        
+        Ledgers are rebuilt from their compacted segments. With lazy_ledgers the
+        company table is usable immediately and each chain is decoded on first
+        access; recorded heads are checked against merkle_root up front.
+        
+        Raises:
+            ValueError: If the capsule lacks ledger state or heads don't match
+        """
+        flow_state = checkpoint["flow_state"]
+        ledger_state = checkpoint.get("ledger_state")
+        registrations = checkpoint.get("registrations")
+        if ledger_state is None or registrations is None:
+            raise ValueError("Invalid checkpoint: missing ledger_state (created before full-state checkpoints)")
+        
+        # Ledger heads must reproduce the checkpointed Merkle root
+        if flow_state["companies"]:
+            combined = ''.join(sorted(state["head"] for state in ledger_state.values()))
+            if hashlib.sha256(combined.encode('utf-8')).hexdigest() != checkpoint.get("merkle_root"):
+                raise ValueError("Ledger Merkle root verification failed")
+        
         # Restore game state
         self.current_tick = checkpoint["tick"]
         self.seed = flow_state["seed"]
-        random.seed(self.seed)  # Re-initialize RNG for deterministic replay
+        if "rng_state" in checkpoint:
+            random.setstate(decode_rng_state(checkpoint["rng_state"]))
+        else:
+            random.seed(self.seed)  # Re-initialize RNG for deterministic replay
+        # Next get_market_state() links to the last pre-checkpoint market state
+        self.prev_market_hash = checkpoint.get("prev_market_hash")
         
         # Restore market conditions
         market_data = flow_state["market_conditions"]
@@ -608,19 +678,19 @@ class GameEngine:
         # Restore companies
         self.companies.clear()
         for company_id, company_data in flow_state["companies"].items():
-            # Reconstruct company from state snapshot
-            company = Company(
-                company_id=company_id,
-                company_name=company_data["company_name"],
-                founding_capital_usd=0.0,  # Will be overridden
-                industry_sector=IndustrySector.TECH,  # Placeholder, will be restored
-                sovereign_signature="restored",
+            ledger = CompanyLedger.restore(company_id, ledger_state[company_id], lazy=lazy_ledgers)
+            company = Company.restore(
+                registrations[company_id],
+                ledger,
                 is_ai=company_data.get("is_ai", False)
             )
             
             # Restore resources
             company.resources = CompanyResources(**company_data["resources"])
-            company.financial = FinancialState(**company_data["financial_state"])
+            financial_data = company_data["financial_state"]
+            company.financial = FinancialState(**{
+                name: financial_data[name] for name in FinancialState.__dataclass_fields__
+            })
             company.metrics = PerformanceMetrics(**company_data["performance_metrics"])
             company.current_tick = company_data["tick"]
             company.prev_state_hash = company_data.get("prev_state_hash")
@@ -629,8 +699,6 @@ class GameEngine:
         
         # Update checkpoint tracking
         self.prev_checkpoint_hash = checkpoint["canonical_sha256"]
-        
-        print(f"✅ Checkpoint restored from CID: {cid} (tick {self.current_tick})")
     
     def verify_checkpoint_chain(self, checkpoint_ids: List[str]) -> bool:
         """
@@ -681,3 +749,15 @@ class GameEngine:
             prev_hash = checkpoint["canonical_sha256"]
         
         return True
+
+
+def encode_rng_state(state: tuple) -> List[Any]:
+    """random.getstate() as JSON-friendly lists"""
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def decode_rng_state(encoded: List[Any]) -> tuple:
+    """Inverse of encode_rng_state"""
+    version, internal, gauss_next = encoded
+    return (version, tuple(internal), gauss_next)
@@ -11,11 +11,11 @@ Manages the complete battle lifecycle:
 from dataclasses import dataclass, field
 from typing import Optional, List, Callable
 from enum import Enum
-import hashlib
-import json
 import uuid
 from datetime import datetime, timezone
 
+from canonical_json import canonical_sha256
+
 from .sp_system import SPSystem, SPConfig, SPState
 from .rival_entity import RivalEntity, RivalTier
 
@@ -62,8 +62,7 @@ class BattleResult:
     
     def compute_hash(self) -> str:
         """Compute deterministic hash for SSOT."""
-        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+        return canonical_sha256(self.to_dict())[:16]
 
 
 @dataclass
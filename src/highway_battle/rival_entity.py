@@ -11,10 +11,10 @@ Rivals are the AI opponents in highway battles. Each has:
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Tuple, Optional, Dict, Any
-import hashlib
-import json
 import uuid
 
+from canonical_json import canonical_sha256
+
 
 class RivalTier(Enum):
     """Rival difficulty tiers."""
@@ -198,8 +198,7 @@ class RivalEntity:
             "base_sp_pool": self.base_sp_pool,
             "aggression": self.aggression,
         }
-        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+        return canonical_sha256(data)[:16]
 
 
 # Factory functions for creating standard rivals
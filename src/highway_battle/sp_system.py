@@ -12,8 +12,8 @@ This implementation is deterministic for replay verification.
 
 from dataclasses import dataclass, field
 from typing import Tuple
-import hashlib
-import json
+
+from canonical_json import canonical_sha256
 
 
 @dataclass
@@ -84,8 +84,7 @@ class SPState:
     
     def compute_hash(self) -> str:
         """Compute deterministic hash for SSOT verification."""
-        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+        return canonical_sha256(self.to_dict())[:16]
 
 
 class SPSystem:
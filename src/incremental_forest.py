@@ -0,0 +1,126 @@
+"""
+Out-of-Core Forest Training
+Building blocks for training random forests from chunks streamed off disk,
+so peak memory follows the chunk size rather than the dataset size:
+
+- RowSplitter: deterministic train/validation/test assignment that only
+  depends on the row's position in the stream, not on the chunk size
+- tree_budget: spreads a forest's trees over the chunks
+- merge_forests: joins per-chunk sub-forests into one RandomForestRegressor
+- StreamingRegressionMetrics: MSE and R² accumulated chunk by chunk
+
+Each chunk's sub-forest sees only that chunk's training rows, so a merged
+forest is a different (bagged-by-chunk) model from one fitted on all rows
+at once; compare their metrics before switching a pipeline over.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+TRAIN, VALIDATION, TEST = 0, 1, 2
+
+
+class RowSplitter:
+    """
+    Streams split codes (TRAIN / VALIDATION / TEST) for consecutive rows.
+
+    Codes come from one seeded uniform stream, so row i gets the same code
+    however the rows are chunked. Call reset() before each pass.
+    """
+
+    def __init__(self, seed: int, test_size: float=0.2, validation_size: float=0.1):
+        if test_size < 0 or validation_size < 0 or test_size + validation_size >= 1:
+            raise ValueError("test_size + validation_size must be in [0, 1)")
+        self.seed = seed
+        self.test_size = test_size
+        self.validation_size = validation_size
+        self.reset()
+
+    def reset(self):
+        self._rng = np.random.RandomState(self.seed)
+
+    def assign(self, n_rows: int) -> np.ndarray:
+        """(n_rows,) int8 split codes for the next rows of the stream."""
+        u = self._rng.random_sample(n_rows)
+        codes = np.full(n_rows, TRAIN, dtype=np.int8)
+        codes[u < self.test_size + self.validation_size] = VALIDATION
+        codes[u < self.test_size] = TEST
+        return codes
+
+
+def tree_budget(n_estimators: int, n_chunks: int) -> List[int]:
+    """
+    Trees to grow per chunk: n_estimators spread as evenly as possible,
+    earlier chunks taking the remainder. Every chunk gets at least one tree,
+    so more chunks than n_estimators yields n_chunks trees.
+    """
+    if n_chunks <= 0:
+        return []
+    base, extra = divmod(n_estimators, n_chunks)
+    return [max(1, base + (1 if i < extra else 0)) for i in range(n_chunks)]
+
+
+def merge_forests(forests: Sequence):
+    """
+    One forest holding every tree of the given fitted forests, in order.
+
+    The first forest is extended in place and returned; all must have been
+    fitted on the same features and number of outputs.
+    """
+    if not forests:
+        raise ValueError("No forests to merge")
+    merged = forests[0]
+    for forest in forests[1:]:
+        if forest.n_features_in_ != merged.n_features_in_ or forest.n_outputs_ != merged.n_outputs_:
+            raise ValueError("Cannot merge forests fitted on different features or outputs")
+        merged.estimators_ += forest.estimators_
+    merged.n_estimators = len(merged.estimators_)
+    return merged
+
+
+class StreamingRegressionMetrics:
+    """
+    MSE and R² per output, accumulated over chunks.
+
+    Target mean and spread are combined with Chan's pairwise update, so
+    the result does not depend on a running sum of squares.
+    """
+
+    def __init__(self, n_outputs: int):
+        self.count = 0
+        self._mean = np.zeros(n_outputs)
+        self._m2 = np.zeros(n_outputs)
+        self._sse = np.zeros(n_outputs)
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        """Add (N, n_outputs) targets and predictions."""
+        y_true = np.asarray(y_true, dtype=np.float64).reshape(len(y_true), -1)
+        y_pred = np.asarray(y_pred, dtype=np.float64).reshape(y_true.shape)
+        n = len(y_true)
+        if n == 0:
+            return
+        mean = y_true.mean(axis=0)
+        m2 = ((y_true - mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = mean - self._mean
+        self._mean += delta * n / total
+        self._m2 += m2 + delta ** 2 * self.count * n / total
+        self._sse += ((y_true - y_pred) ** 2).sum(axis=0)
+        self.count = total
+
+    def mse(self) -> np.ndarray:
+        return self._sse / self.count if self.count else np.full(len(self._sse), np.nan)
+
+    def r2(self) -> np.ndarray:
+        """1 - SSE / SST; like sklearn, 1.0 for a perfect fit of a constant target and 0.0 otherwise."""
+        if not self.count:
+            return np.full(len(self._sse), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r2 = 1.0 - self._sse / self._m2
+        constant = self._m2 == 0
+        r2[constant] = np.where(self._sse[constant] == 0, 1.0, 0.0)
+        return r2
+
+    def summary(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.mse(), self.r2()
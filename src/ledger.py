@@ -3,14 +3,17 @@ Idempotent ledger with Merkle chain for financial transactions.
 Implements determinism contract v1 with ordered hashing and decision traces.
 """
 
-import hashlib
+import base64
 import json
 import uuid
+import zlib
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from canonical_json import CanonicalSchema
+
 
 class TransactionType(Enum):
     """Financial transaction types"""
@@ -52,6 +55,13 @@ class LedgerEntry:
         }
 
 
+_TRANSACTION_HASH_SCHEMA = CanonicalSchema((
+    "transaction_id", "timestamp", "tick", "from_company_id", "to_company_id",
+    "amount_usd", "transaction_type", "ledger_entry", "prev_transaction_hash",
+    "related_operation_id", "metadata"
+))
+
+
 @dataclass
 class Transaction:
     """Financial transaction with Merkle chain link"""
@@ -69,22 +79,57 @@ class Transaction:
 
     def compute_integrity_hash(self) -> str:
         """Compute SHA-256 hash of transaction payload (deterministic)"""
-        payload = {
-            "transaction_id": self.transaction_id,
-            "timestamp": self.timestamp,
-            "tick": self.tick,
-            "from_company_id": self.from_company_id,
-            "to_company_id": self.to_company_id,
-            "amount_usd": self.amount_usd,
-            "transaction_type": self.transaction_type.value,
-            "ledger_entry": self.ledger_entry.to_dict(),
-            "prev_transaction_hash": self.prev_transaction_hash,
-            "related_operation_id": self.related_operation_id,
-            "metadata": self.metadata
-        }
-        # Determinism contract: ordered hashing
-        canonical_json = json.dumps(payload, sort_keys=True, separators=(',', ':'))
-        return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+        # Determinism contract: ordered hashing (key order precompiled)
+        return _TRANSACTION_HASH_SCHEMA.sha256(
+            self.transaction_id,
+            self.timestamp,
+            self.tick,
+            self.from_company_id,
+            self.to_company_id,
+            self.amount_usd,
+            self.transaction_type.value,
+            self.ledger_entry.to_dict(),
+            self.prev_transaction_hash,
+            self.related_operation_id,
+            self.metadata
+        )
+
+    def to_row(self) -> List[Any]:
+        """Positional row in LEDGER_SEGMENT_FIELDS order (compact checkpoint form)"""
+        return [
+            self.transaction_id,
+            self.timestamp,
+            self.tick,
+            self.from_company_id,
+            self.to_company_id,
+            self.amount_usd,
+            self.transaction_type.value,
+            self.ledger_entry.debit_account.value,
+            self.ledger_entry.credit_account.value,
+            self.prev_transaction_hash,
+            self.related_operation_id,
+            self.metadata
+        ]
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> 'Transaction':
+        """Rebuild a transaction from its positional row"""
+        (transaction_id, timestamp, tick, from_company_id, to_company_id, amount_usd,
+         transaction_type, debit_account, credit_account, prev_transaction_hash,
+         related_operation_id, metadata) = row
+        return cls(
+            transaction_id=transaction_id,
+            timestamp=timestamp,
+            tick=tick,
+            from_company_id=from_company_id,
+            to_company_id=to_company_id,
+            amount_usd=amount_usd,
+            transaction_type=TransactionType(transaction_type),
+            ledger_entry=LedgerEntry(Account(debit_account), Account(credit_account)),
+            prev_transaction_hash=prev_transaction_hash,
+            related_operation_id=related_operation_id,
+            metadata=metadata
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -104,6 +149,30 @@ class Transaction:
         }
 
 
+LEDGER_SEGMENT_FIELDS = (
+    "transaction_id", "timestamp", "tick", "from_company_id", "to_company_id",
+    "amount_usd", "transaction_type", "debit_account", "credit_account",
+    "prev_transaction_hash", "related_operation_id", "metadata"
+)
+
+
+def encode_ledger_segment(transactions: List[Transaction]) -> str:
+    """
+    Compact a transaction chain for checkpoint storage.
+    Rows are positional (LEDGER_SEGMENT_FIELDS), JSON-encoded, zlib-compressed, base64.
+    Floats round-trip exactly, so integrity hashes recompute bit-for-bit.
+    """
+    rows = [txn.to_row() for txn in transactions]
+    raw = json.dumps(rows, separators=(',', ':')).encode('utf-8')
+    return base64.b64encode(zlib.compress(raw)).decode('ascii')
+
+
+def decode_ledger_segment(segment: str) -> List[Transaction]:
+    """Inverse of encode_ledger_segment"""
+    rows = json.loads(zlib.decompress(base64.b64decode(segment)))
+    return [Transaction.from_row(row) for row in rows]
+
+
 class CompanyLedger:
     """
     Per-company transaction ledger with Merkle chain integrity.
@@ -139,10 +208,6 @@ class CompanyLedger:
         """
         transaction_id = str(uuid.uuid4())
 
-        # Check idempotency (duplicate detection)
-        if transaction_id in self.transaction_index:
-            raise ValueError(f"Duplicate transaction_id: {transaction_id}")
-
         # Create transaction
         transaction = Transaction(
             transaction_id=transaction_id,
@@ -159,11 +224,18 @@ class CompanyLedger:
         )
 
         # Append to chain
-        self.transactions.append(transaction)
-        self.transaction_index[transaction_id] = len(self.transactions) - 1
+        self._append(transaction)
 
         return transaction
 
+    def _append(self, transaction: Transaction) -> None:
+        """Append to the chain with idempotency (duplicate detection)"""
+        if transaction.transaction_id in self.transaction_index:
+            raise ValueError(f"Duplicate transaction_id: {transaction.transaction_id}")
+
+        self.transactions.append(transaction)
+        self.transaction_index[transaction.transaction_id] = len(self.transactions) - 1
+
     def verify_chain(self) -> bool:
         """
         Verify Merkle chain integrity for all transactions.
@@ -228,3 +300,106 @@ class CompanyLedger:
         if not self.transactions:
             return None
         return self.transactions[0].compute_integrity_hash()
+
+    def get_chain_head_hash(self) -> Optional[str]:
+        """Get hash of the chain head (alias of get_latest_hash)"""
+        return self.get_latest_hash()
+
+    def transaction_count(self) -> int:
+        """Number of transactions in the chain"""
+        return len(self.transactions)
+
+    def export_segment(self) -> Dict[str, Any]:
+        """Export chain head plus compacted transaction segment (for checkpoints)"""
+        return {
+            "head": self.get_latest_hash(),
+            "count": len(self.transactions),
+            "segment": encode_ledger_segment(self.transactions)
+        }
+
+    @classmethod
+    def restore(cls, company_id: str, ledger_state: Dict[str, Any], lazy: bool = True) -> 'CompanyLedger':
+        """
+        Rebuild a ledger from export_segment() output.
+        Lazy ledgers decode their segment on first access to the full chain.
+        """
+        ledger = LazyCompanyLedger(
+            company_id,
+            head_hash=ledger_state["head"],
+            count=ledger_state["count"],
+            segment=ledger_state["segment"]
+        )
+        if not lazy:
+            ledger.load()
+        return ledger
+
+
+class LazyCompanyLedger(CompanyLedger):
+    """
+    Ledger restored from a checkpoint segment.
+    The head hash and length are known up front, so new transactions can be
+    chained (and checkpointed again) without decoding history. The sealed
+    segment is decoded and checked against the recorded head on first access.
+    """
+
+    def __init__(self, company_id: str, head_hash: Optional[str], count: int, segment: str):
+        self.company_id = company_id
+        self._head_hash = head_hash
+        self._sealed_count = count
+        self._segment: Optional[str] = segment
+        self._tail: List[Transaction] = []
+        self._transactions: List[Transaction] = []
+        self._transaction_index: Dict[str, int] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._segment is None
+
+    @property
+    def transactions(self) -> List[Transaction]:
+        self.load()
+        return self._transactions
+
+    @property
+    def transaction_index(self) -> Dict[str, int]:
+        self.load()
+        return self._transaction_index
+
+    def load(self) -> None:
+        """Decode the sealed segment and verify it against the recorded head"""
+        if self._segment is None:
+            return
+
+        sealed = decode_ledger_segment(self._segment)
+        sealed_head = sealed[-1].compute_integrity_hash() if sealed else None
+        if len(sealed) != self._sealed_count or sealed_head != self._head_hash:
+            raise ValueError(f"Ledger segment for {self.company_id} does not match recorded head")
+
+        self._segment = None
+        for transaction in sealed + self._tail:
+            CompanyLedger._append(self, transaction)
+        self._tail = []
+
+    def get_latest_hash(self) -> Optional[str]:
+        if self.is_loaded:
+            return super().get_latest_hash()
+        if self._tail:
+            return self._tail[-1].compute_integrity_hash()
+        return self._head_hash
+
+    def transaction_count(self) -> int:
+        if self.is_loaded:
+            return len(self._transactions)
+        return self._sealed_count + len(self._tail)
+
+    def export_segment(self) -> Dict[str, Any]:
+        # Untouched history re-exports without a decode round-trip
+        if not self.is_loaded and not self._tail:
+            return {"head": self._head_hash, "count": self._sealed_count, "segment": self._segment}
+        return super().export_segment()
+
+    def _append(self, transaction: Transaction) -> None:
+        if self.is_loaded:
+            super()._append(transaction)
+        else:
+            self._tail.append(transaction)
@@ -14,7 +14,7 @@ sys.path.append('./src')
 from game_engine import GameEngine, IndustrySector, OperationType
 from ai_agents import AgentOrchestrator
 from ssot_bridge import SSOTBridge
-from checkpoint import LocalCheckpointStore, create_checkpoint, verify_checkpoint_chain
+from checkpoint import LocalCheckpointStore, RetentionPolicy, create_checkpoint, verify_checkpoint_chain
 
 # Configuration from environment
 GAME_API_URL = os.getenv("GAME_API_URL", "http://localhost:8001")
@@ -23,6 +23,9 @@ TICK_INTERVAL_SECONDS = int(os.getenv("TICK_INTERVAL_SECONDS", "5"))
 AUTO_SPAWN_AI = os.getenv("AUTO_SPAWN_AI", "true").lower() == "true"
 NUM_AI_COMPANIES = int(os.getenv("NUM_AI_COMPANIES", "3"))
 CHECKPOINT_INTERVAL = int(os.getenv("CHECKPOINT_INTERVAL", "10"))
+CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "100"))
+CHECKPOINT_KEEP_EVERY = int(os.getenv("CHECKPOINT_KEEP_EVERY", "1000"))
+CHECKPOINT_COMPACT_EVERY = int(os.getenv("CHECKPOINT_COMPACT_EVERY", "500"))  # checkpoints between compactions
 
 # Logging setup
 logging.basicConfig(
@@ -42,7 +45,13 @@ class ContentAddressedMasterAgent:
         self.game = GameEngine(seed=42)
         self.orchestrator = AgentOrchestrator(self.game)
         self.ssot = SSOTBridge(ssot_api_url=SSOT_API_URL)
-        self.checkpoint_store = LocalCheckpointStore('./data/checkpoints')
+        self.checkpoint_store = LocalCheckpointStore(
+            './data/checkpoints',
+            retention=RetentionPolicy(
+                keep_last=CHECKPOINT_KEEP_LAST,
+                keep_every=CHECKPOINT_KEEP_EVERY
+            )
+        )
         
         self.running = True
         self.tick_count = 0
@@ -136,6 +145,12 @@ class ContentAddressedMasterAgent:
                 else:
                     logger.error("❌ Checkpoint chain integrity FAILED!")
 
+            # Retention + segment packing keeps the store directory bounded
+            if CHECKPOINT_COMPACT_EVERY > 0 and len(self.checkpoint_chain) % CHECKPOINT_COMPACT_EVERY == 0:
+                summary = self.checkpoint_store.compact()
+                logger.info(f"🗜️  Checkpoint store compacted: {summary['packed']} packed, "
+                            f"{summary['pruned']} pruned")
+
         except Exception as e:
             logger.error(f"Failed to save checkpoint: {e}")
 
@@ -0,0 +1,177 @@
+"""
+Model Artifact Registry
+Trained DeterministicRandomForest models stored under the hash of their
+training ledger entry (create_training_ledger_entry), loaded lazily.
+
+Layout of a registry directory:
+    index.json              entry hash -> lineage hash, model version
+    <entry_hash>/           save_models() output plus ledger_entry.json
+        compiled_forest/    raw .npy tables, memory-mapped by get()
+        ...
+
+get() returns a model without unpickling anything: load_models() maps the
+compiled tables read-only when the model is loaded, and their pages are
+faulted in by the first predictions. Every process serving the same entry
+shares one copy of those pages in the OS page cache. The sklearn forests
+are only read if a caller touches model.models or model.scalers.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import uuid
+from typing import Any, Dict, Iterator, List
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: index updates are then unlocked
+    fcntl = None
+
+from racing_ai_trainer import DeterministicRandomForest
+
+FORMAT_VERSION = "rfreg.v1"
+INDEX_NAME = "index.json"
+LOCK_NAME = "index.json.lock"
+LEDGER_ENTRY_NAME = "ledger_entry.json"
+
+
+class ModelRegistry:
+    """
+    Hash-keyed store of trained models.
+
+    Entries are keyed by the ledger entry hash; resolve() also accepts the
+    training lineage hash, the model version or a unique prefix (8+ hex
+    characters) of the entry hash. Loaded models are cached per registry.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self._entries = self._read_index()
+        self._loaded: Dict[str, DeterministicRandomForest] = {}
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as f:
+            index = json.load(f)
+        if index.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported model registry format: {index.get('format')}")
+        return index['entries']
+
+    @contextlib.contextmanager
+    def _index_lock(self) -> Iterator[None]:
+        """Exclusive lock on the index across processes sharing the registry."""
+        with open(os.path.join(self.root, LOCK_NAME), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _write_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'format': FORMAT_VERSION, 'entries': self._entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def register(self, model: DeterministicRandomForest, ledger_entry: Dict[str, Any]) -> str:
+        """
+        Store a trained model under its ledger entry hash.
+
+        The entry must describe this model (same lineage hash). Registering
+        an existing entry again is a no-op. Returns the entry hash.
+        """
+        key = ledger_entry['hash']
+        if ledger_entry.get('lineage_hash') != model.training_lineage.get('training_hash'):
+            raise ValueError("Ledger entry lineage_hash does not match the model's training hash")
+        if key in self._entries:
+            return key
+
+        # Written to a private temp directory and renamed, so a partial entry is never visible
+        path = os.path.join(self.root, key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                model.save_models(tmp_path)
+            with open(os.path.join(tmp_path, LEDGER_ENTRY_NAME), 'w') as f:
+                json.dump(ledger_entry, f, indent=2, sort_keys=True)
+
+            with self._index_lock():
+                if os.path.isdir(path):
+                    # Left by a crash before the index was written, or by another
+                    # process registering the same entry: adopt it
+                    self._check_entry_dir(path, key)
+                else:
+                    os.replace(tmp_path, path)
+
+                # Other processes may have registered entries since this one read the index
+                self._entries = self._read_index()
+                self._entries[key] = {
+                    'lineage_hash': ledger_entry['lineage_hash'],
+                    'model_version': ledger_entry['model_version']
+                }
+                self._write_index()
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        return key
+
+    @staticmethod
+    def _check_entry_dir(path: str, key: str):
+        try:
+            with open(os.path.join(path, LEDGER_ENTRY_NAME)) as f:
+                existing = json.load(f)
+        except (OSError, ValueError):
+            existing = {}
+        if existing.get('hash') != key:
+            raise ValueError(f"Registry directory {path} exists but does not hold entry {key}")
+
+    def resolve(self, key: str) -> str:
+        """Entry hash for an entry hash, lineage hash, model version or unique entry hash prefix."""
+        if key in self._entries:
+            return key
+        matches = [
+            entry_hash for entry_hash, entry in self._entries.items()
+            if key in (entry['lineage_hash'], entry['model_version'])
+        ]
+        if not matches and len(key) >= 8:
+            matches = [entry_hash for entry_hash in self._entries if entry_hash.startswith(key)]
+        if not matches:
+            raise KeyError(f"No registered model for {key!r}")
+        if len(set(matches)) > 1:
+            raise KeyError(f"Ambiguous model key {key!r}: {len(matches)} entries")
+        return matches[0]
+
+    def path(self, key: str) -> str:
+        """Directory of an entry (a load_models() directory)."""
+        return os.path.join(self.root, self.resolve(key))
+
+    def get(self, key: str) -> DeterministicRandomForest:
+        """Lazily loaded model for key; the same object on repeated calls."""
+        entry_hash = self.resolve(key)
+        if entry_hash not in self._loaded:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self._loaded[entry_hash] = DeterministicRandomForest.load_models(self.path(entry_hash))
+        return self._loaded[entry_hash]
+
+    def ledger_entry(self, key: str) -> Dict[str, Any]:
+        with open(os.path.join(self.path(key), LEDGER_ENTRY_NAME)) as f:
+            return json.load(f)
+
+    def keys(self) -> List[str]:
+        return sorted(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self.resolve(key)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,10 +4,15 @@ Deterministic training with SSOT lineage tracking.
 """
 
 import numpy as np
+import io
 import json
 import hashlib
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from dataclasses import dataclass
+from itertools import chain
+from operator import itemgetter
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
 from datetime import datetime, timezone
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
@@ -15,18 +20,191 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
 import joblib
 
+from compiled_forest import CompiledForest
+from incremental_forest import TRAIN, VALIDATION, TEST, RowSplitter, StreamingRegressionMetrics, merge_forests, tree_budget
+from training_data import ColumnarDataset, is_columnar_dataset
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """
+    One model input: where it lives in a state record and how to transform it.
+    
+    path is a key path into the state dict ('speed',) or into one of its
+    tuples ('wheel_speeds', 2). default is only used when predicting from
+    older states that lack the key; training extraction requires it.
+    """
+    name: str
+    path: Tuple[Any, ...]
+    default: Optional[float] = None
+    transform: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    
+    @property
+    def column(self) -> str:
+        """Column name in a columnar training dataset."""
+        if len(self.path) == 2:
+            return f"state.{self.path[0]}_{self.path[1]}"
+        return f"state.{self.path[0]}"
+
+
+# Feature order is part of the model contract (must be deterministic)
+FEATURE_SPEC: Tuple[FeatureSpec, ...] = tuple(
+    [FeatureSpec(name, (name,)) for name in (
+        'speed', 'yaw_rate', 'longitudinal_accel', 'lateral_accel',
+        'steering_angle', 'throttle_input', 'brake_input',
+        'engine_rpm', 'gear',
+        'track_x', 'track_y', 'heading',
+        'distance_to_centerline', 'track_progress',
+        'current_curvature', 'track_gradient',
+        'distance_to_apex', 'apex_radius',
+        'dist_left_edge', 'dist_right_edge',
+        'front_ray', 'front_left_ray', 'front_right_ray'
+    )] +
+    # Degradation features (new, with defaults for backwards compat)
+    [FeatureSpec(name, (name,), default) for name, default in (
+        ('tire_wear', 0.0), ('tire_grip_mult', 1.0), ('fuel_normalized', 1.0),
+        ('weather_grip', 1.2), ('rain_intensity', 0.0)
+    )] +
+    # Upcoming curvature (5 horizon points) and wheel speeds (4 wheels)
+    [FeatureSpec(f'upcoming_curvature_{i}', ('upcoming_curvature', i)) for i in range(5)] +
+    [FeatureSpec(f'wheel_speed_{i}', ('wheel_speeds', i)) for i in range(4)]
+)
+
+# Target name -> action field
+TARGET_SPEC: Tuple[Tuple[str, str], ...] = (
+    ('steering', 'steering_command'),
+    ('throttle', 'throttle_command'),
+    ('brake', 'brake_command')
+)
+
+
+class CompiledFeatureSpec:
+    """
+    A feature spec compiled once into column gathers.
+    
+    Records are read with one itemgetter call per state for the scalar
+    features and one per tuple field, then assembled into the float32
+    matrix column-wise; values go through float64 on the way, exactly as
+    the element-wise float32 assignment did.
+    """
+    
+    def __init__(self, specs: Sequence[FeatureSpec]=FEATURE_SPEC, targets=TARGET_SPEC):
+        self.specs = tuple(specs)
+        self.names = [spec.name for spec in self.specs]
+        self.columns = [spec.column for spec in self.specs]
+        self.dimension = len(self.specs)
+        self.target_names = [name for name, _ in targets]
+        self.target_columns = [f"action.{field}" for _, field in targets]
+        
+        # Scalar features: one itemgetter, positions in the output
+        scalar = [(j, spec.path[0]) for j, spec in enumerate(self.specs) if len(spec.path) == 1]
+        self._scalar_pos = np.array([j for j, _ in scalar], dtype=np.intp)
+        self._scalar_get = itemgetter(*[key for _, key in scalar]) if scalar else None
+        self._scalar_single = len(scalar) == 1
+        
+        # Tuple features grouped by parent key: (key, element indices, output positions)
+        groups: Dict[str, List[Tuple[int, int]]] = {}
+        for j, spec in enumerate(self.specs):
+            if len(spec.path) == 2:
+                groups.setdefault(spec.path[0], []).append((spec.path[1], j))
+        self._tuple_groups = [
+            (key, np.array([i for i, _ in items], dtype=np.intp), np.array([j for _, j in items], dtype=np.intp))
+            for key, items in groups.items()
+        ]
+        
+        self._transforms = [(j, spec.transform) for j, spec in enumerate(self.specs) if spec.transform is not None]
+        self._target_get = itemgetter(*[field for _, field in targets])
+        self._defaults = [(spec.path, spec.default) for spec in self.specs]
+    
+    def _finish(self, X64: np.ndarray) -> np.ndarray:
+        for j, transform in self._transforms:
+            X64[:, j] = transform(X64[:, j])
+        return X64.astype(np.float32)
+    
+    def extract_states(self, states: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """(N, D) float32 matrix from state dicts."""
+        n = len(states)
+        X64 = np.empty((n, self.dimension), dtype=np.float64)
+        if n == 0:
+            return self._finish(X64)
+        if self._scalar_get is not None:
+            get = self._scalar_get
+            if self._scalar_single:
+                X64[:, self._scalar_pos[0]] = [get(state) for state in states]
+            else:
+                k = len(self._scalar_pos)
+                values = np.fromiter(chain.from_iterable([get(state) for state in states]),
+                                     dtype=np.float64, count=n * k)
+                X64[:, self._scalar_pos] = values.reshape(n, k)
+        for key, elements, positions in self._tuple_groups:
+            X64[:, positions] = np.array([state[key] for state in states], dtype=np.float64)[:, elements]
+        return self._finish(X64)
+    
+    def extract_records(self, records: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Features and float32 targets from {'state', 'action'} records."""
+        X = self.extract_states([record['state'] for record in records])
+        actions = np.array([self._target_get(record['action']) for record in records], dtype=np.float32)
+        actions = actions.reshape(len(records), len(self.target_names))
+        return X, {name: np.ascontiguousarray(actions[:, k]) for k, name in enumerate(self.target_names)}
+    
+    def extract_block(self, block: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Features and targets from one chunk of dataset columns."""
+        rows = len(block[self.columns[0]])
+        X64 = np.empty((rows, self.dimension), dtype=np.float64)
+        for j, column in enumerate(self.columns):
+            X64[:, j] = block[column]
+        targets = {name: block[column].astype(np.float32)
+                   for name, column in zip(self.target_names, self.target_columns)}
+        return self._finish(X64), targets
+    
+    def extract_dataset(self, dataset: ColumnarDataset) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Features and targets for a whole columnar dataset, filled chunk by chunk."""
+        if self._transforms:
+            X = self._finish(dataset.read_matrix(self.columns, dtype=np.float64))
+        else:
+            X = dataset.read_matrix(self.columns, dtype=np.float32)
+        actions = dataset.read_matrix(self.target_columns, dtype=np.float32)
+        return X, {name: np.ascontiguousarray(actions[:, k]) for k, name in enumerate(self.target_names)}
+    
+    def row(self, state: Dict[str, Any]) -> List[float]:
+        """Single feature vector, falling back to spec defaults and transformed like extract_states()."""
+        features = []
+        for path, default in self._defaults:
+            if len(path) == 1:
+                features.append(state[path[0]] if default is None else state.get(path[0], default))
+            else:
+                features.append(state[path[0]][path[1]])
+        for j, transform in self._transforms:
+            features[j] = float(transform(np.array([features[j]], dtype=np.float64))[0])
+        return features
+
+
+FEATURES = CompiledFeatureSpec()
+
 
 class TrainingDataLoader:
-    """Load and preprocess state-action pairs from NDJSON."""
+    """
+    Load and preprocess state-action pairs.
     
-    def __init__(self, training_file: str):
+    training_file is either a columnar dataset directory (read chunk by
+    chunk, never as dicts) or a legacy NDJSON file.
+    """
+    
+    def __init__(self, training_file: str, features: CompiledFeatureSpec=FEATURES):
         self.training_file = training_file
+        self.feature_spec = features
         self.data: List[Dict] = []
+        self.dataset: ColumnarDataset = None
         self.features: np.ndarray = None
         self.targets: Dict[str, np.ndarray] = {}
         
     def load(self) -> int:
-        """Load NDJSON training data."""
+        """Load training data (columnar dataset or NDJSON)."""
+        if is_columnar_dataset(self.training_file):
+            self.dataset = ColumnarDataset(self.training_file)
+            print(f"✓ Opened {len(self.dataset)} training samples ({self.dataset.dataset_hash[:16]}...)")
+            return len(self.dataset)
+        
         with open(self.training_file, 'r') as f:
             for line in f:
                 self.data.append(json.loads(line.strip()))
@@ -42,105 +220,93 @@ class TrainingDataLoader:
             X: Feature matrix (N x D)
             y_dict: {'steering': [...], 'throttle': [...], 'brake': [...]}
         """
-        N = len(self.data)
-        
-        # Define feature order (must be deterministic)
-        feature_names = [
-            'speed', 'yaw_rate', 'longitudinal_accel', 'lateral_accel',
-            'steering_angle', 'throttle_input', 'brake_input',
-            'engine_rpm', 'gear',
-            'track_x', 'track_y', 'heading',
-            'distance_to_centerline', 'track_progress',
-            'current_curvature', 'track_gradient',
-            'distance_to_apex', 'apex_radius',
-            'dist_left_edge', 'dist_right_edge',
-            'front_ray', 'front_left_ray', 'front_right_ray',
-            # Degradation features (new)
-            'tire_wear', 'tire_grip_mult', 'fuel_normalized',
-            'weather_grip', 'rain_intensity'
-        ]
-        
-        # Add upcoming curvature (5 horizon points)
-        for i in range(5):
-            feature_names.append(f'upcoming_curvature_{i}')
-        
-        # Add wheel speeds (4 wheels)
-        for i in range(4):
-            feature_names.append(f'wheel_speed_{i}')
-        
-        D = len(feature_names)
-        X = np.zeros((N, D), dtype=np.float32)
-        
-        # Extract features
-        for i, record in enumerate(self.data):
-            state = record['state']
-            
-            for j, fname in enumerate(feature_names):
-                if fname.startswith('upcoming_curvature'):
-                    idx = int(fname.split('_')[-1])
-                    X[i, j] = state['upcoming_curvature'][idx]
-                elif fname.startswith('wheel_speed'):
-                    idx = int(fname.split('_')[-1])
-                    X[i, j] = state['wheel_speeds'][idx]
-                else:
-                    X[i, j] = state[fname]
-        
-        # Extract targets
-        y_steering = np.array([record['action']['steering_command'] for record in self.data], dtype=np.float32)
-        y_throttle = np.array([record['action']['throttle_command'] for record in self.data], dtype=np.float32)
-        y_brake = np.array([record['action']['brake_command'] for record in self.data], dtype=np.float32)
+        if self.dataset is not None:
+            X, targets = self.feature_spec.extract_dataset(self.dataset)
+        else:
+            X, targets = self.feature_spec.extract_records(self.data)
         
         self.features = X
-        self.targets = {
-            'steering': y_steering,
-            'throttle': y_throttle,
-            'brake': y_brake
-        }
+        self.targets = targets
         
         print(f"✓ Extracted features: {X.shape}")
-        print(f"  - Feature dimension: {D}")
-        print(f"  - Samples: {N}")
+        print(f"  - Feature dimension: {X.shape[1]}")
+        print(f"  - Samples: {X.shape[0]}")
         
         return X, self.targets
+    
+    def iter_feature_chunks(self, chunk_rows: int=65536) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """
+        Yield (X, y_dict) per chunk without holding the dataset in memory.
+        Columnar datasets yield per stored chunk; NDJSON files are streamed
+        chunk_rows lines at a time.
+        """
+        spec = self.feature_spec
+        if is_columnar_dataset(self.training_file):
+            dataset = self.dataset or ColumnarDataset(self.training_file)
+            for block in dataset.iter_chunks(spec.columns + spec.target_columns):
+                yield spec.extract_block(block)
+            return
+        
+        records = []
+        with open(self.training_file, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                records.append(json.loads(line))
+                if len(records) == chunk_rows:
+                    yield spec.extract_records(records)
+                    records = []
+        if records:
+            yield spec.extract_records(records)
+
+
+FOREST_MODES = ("per_target", "multi_output")
+CONTROL_NAMES = [name for name, _ in TARGET_SPEC]
+
+# Memory-mappable CompiledForest directory written by save_models()
+COMPILED_FOREST_DIR = "compiled_forest"
 
 
 class DeterministicRandomForest:
     """
     Random Forest with deterministic training for reproducibility.
+    
+    mode='per_target' trains one forest per control output (steering,
+    throttle, brake). mode='multi_output' trains a single forest on the
+    three standardized targets, so every tree is traversed once per sample
+    for all controls and splits are chosen on their summed impurity.
+    
+    predict() and predict_batch() run on a CompiledForest built from the
+    trained forests and scalers; sklearn is only used for training.
+    
+    Instances from load_models() are lazy: the compiled forest is memory
+    mapped, so its pages are read by the first predictions, and the sklearn
+    forests and scalers are only unpickled when models or scalers are
+    accessed.
     """
     
-    def __init__(self, seed: int=42, n_estimators: int=100, max_depth: int=20):
+    def __init__(
+        self,
+        seed: int=42,
+        n_estimators: int=100,
+        max_depth: int=20,
+        mode: str="per_target",
+        min_samples_leaf: int=5,
+        min_samples_split: int=10
+    ):
+        if mode not in FOREST_MODES:
+            raise ValueError(f"mode must be one of {FOREST_MODES}")
         self.seed = seed
         self.n_estimators = n_estimators
         self.max_depth = max_depth
+        self.mode = mode
+        self.min_samples_leaf = min_samples_leaf
+        self.min_samples_split = min_samples_split
         
-        # Create three models (one per control output)
-        self.models = {
-            'steering': RandomForestRegressor(
-                n_estimators=n_estimators,
-                max_depth=max_depth,
-                min_samples_split=10,
-                min_samples_leaf=5,
-                random_state=seed,
-                n_jobs=-1
-            ),
-            'throttle': RandomForestRegressor(
-                n_estimators=n_estimators,
-                max_depth=max_depth,
-                min_samples_split=10,
-                min_samples_leaf=5,
-                random_state=seed,
-                n_jobs=-1
-            ),
-            'brake': RandomForestRegressor(
-                n_estimators=n_estimators,
-                max_depth=max_depth,
-                min_samples_split=10,
-                min_samples_leaf=5,
-                random_state=seed,
-                n_jobs=-1
-            )
-        }
+        # One model per control output, or one joint model
+        model_names = CONTROL_NAMES if mode == "per_target" else ['joint']
+        self.models = {name: self._make_forest() for name in model_names}
         
         # Scalers for normalization
         self.scalers = {
@@ -149,17 +315,59 @@ class DeterministicRandomForest:
             'throttle': StandardScaler(),
             'brake': StandardScaler()
         }
+        self._compiled = None
+        self._source_directory = None
         
         # Training lineage
         self.training_lineage = {
             'seed': seed,
             'n_estimators': n_estimators,
             'max_depth': max_depth,
+            'forest_mode': mode,
             'train_time': None,
             'training_hash': None,
             'model_version': None
         }
     
+    @property
+    def models(self) -> Dict[str, RandomForestRegressor]:
+        self._load_sklearn()
+        return self._models
+    
+    @models.setter
+    def models(self, models: Dict[str, RandomForestRegressor]):
+        self._models = models
+    
+    @property
+    def scalers(self) -> Dict[str, StandardScaler]:
+        self._load_sklearn()
+        return self._scalers
+    
+    @scalers.setter
+    def scalers(self, scalers: Dict[str, StandardScaler]):
+        self._scalers = scalers
+    
+    def _load_sklearn(self):
+        """Unpickle the forests and scalers of a lazily loaded model."""
+        directory = self._source_directory
+        if directory is None:
+            return
+        self._source_directory = None
+        for name in self._models:
+            self._models[name] = joblib.load(f"{directory}/rf_{name}.joblib")
+        for name in self._scalers:
+            self._scalers[name] = joblib.load(f"{directory}/scaler_{name}.joblib")
+    
+    def _make_forest(self, n_estimators: Optional[int]=None, random_state: Optional[int]=None) -> RandomForestRegressor:
+        return RandomForestRegressor(
+            n_estimators=self.n_estimators if n_estimators is None else n_estimators,
+            max_depth=self.max_depth,
+            min_samples_split=self.min_samples_split,
+            min_samples_leaf=self.min_samples_leaf,
+            random_state=self.seed if random_state is None else random_state,
+            n_jobs=-1
+        )
+    
     def train(
         self,
         X: np.ndarray,
@@ -168,7 +376,7 @@ class DeterministicRandomForest:
         validation_size: float=0.1
     ) -> Dict[str, Any]:
         """
-        Train all three Random Forest models.
+        Train the Random Forest model(s).
         
         Args:
             X: Feature matrix
@@ -180,73 +388,57 @@ class DeterministicRandomForest:
             Training report with metrics and lineage
         """
         start_time = datetime.now(timezone.utc)
-        
-        # Split data (deterministic with fixed seed)
-        X_train, X_temp, y_train, y_temp = {}, {}, {}, {}
-        
-        for control_name, y in y_dict.items():
-            X_t, X_tmp, y_t, y_tmp = train_test_split(
-                X, y,
-                test_size=(test_size + validation_size),
-                random_state=self.seed
-            )
-            
-            X_val, X_test, y_val, y_test = train_test_split(
-                X_tmp, y_tmp,
-                test_size=(test_size / (test_size + validation_size)),
-                random_state=self.seed
-            )
-            
-            X_train[control_name] = X_t
-            y_train[control_name] = y_t
-            X_temp[control_name] = (X_val, X_test)
-            y_temp[control_name] = (y_val, y_test)
+        self._compiled = self._source_directory = None
+        
+        # Split data once (deterministic with fixed seed). The row split only
+        # depends on the sample count and seed, so all targets share it.
+        Y = np.column_stack([y_dict[name] for name in CONTROL_NAMES])
+        X_train, X_tmp, Y_train, Y_tmp = train_test_split(
+            X, Y,
+            test_size=(test_size + validation_size),
+            random_state=self.seed
+        )
+        X_val, X_test, Y_val, Y_test = train_test_split(
+            X_tmp, Y_tmp,
+            test_size=(test_size / (test_size + validation_size)),
+            random_state=self.seed
+        )
         
         print(f"✓ Data split:")
-        print(f"  - Training: {len(y_train['steering'])} samples")
-        print(f"  - Validation: {len(y_temp['steering'][0])} samples")
-        print(f"  - Test: {len(y_temp['steering'][1])} samples")
+        print(f"  - Training: {len(Y_train)} samples")
+        print(f"  - Validation: {len(Y_val)} samples")
+        print(f"  - Test: {len(Y_test)} samples")
         
         # Normalize features (fit on training data only)
-        X_train_scaled = self.scalers['features'].fit_transform(X_train['steering'])
+        X_train_scaled = self.scalers['features'].fit_transform(X_train)
+        X_val_scaled = self.scalers['features'].transform(X_val)
+        X_test_scaled = self.scalers['features'].transform(X_test)
+        
+        # Normalize targets
+        Y_train_scaled = np.column_stack([
+            self.scalers[name].fit_transform(Y_train[:, k].reshape(-1, 1)).ravel()
+            for k, name in enumerate(CONTROL_NAMES)
+        ])
+        
+        # Train
+        if self.mode == "per_target":
+            for k, control_name in enumerate(CONTROL_NAMES):
+                print(f"\n🌲 Training {control_name} model...")
+                self.models[control_name].fit(X_train_scaled, Y_train_scaled[:, k])
+        else:
+            print(f"\n🌲 Training joint {'/'.join(CONTROL_NAMES)} model...")
+            self.models['joint'].fit(X_train_scaled, Y_train_scaled)
+        
+        # Validate
+        Y_val_pred = self._predict_scaled(X_val_scaled)
+        Y_test_pred = self._predict_scaled(X_test_scaled)
         
-        # Train each model
         metrics = {}
-        for control_name in ['steering', 'throttle', 'brake']:
-            print(f"\n🌲 Training {control_name} model...")
-            
-            # Normalize target
-            y_train_scaled = self.scalers[control_name].fit_transform(
-                y_train[control_name].reshape(-1, 1)
-            ).ravel()
-            
-            # Train
-            self.models[control_name].fit(X_train_scaled, y_train_scaled)
-            
-            # Validate
-            X_val, X_test = X_temp[control_name]
-            y_val, y_test = y_temp[control_name]
-            
-            X_val_scaled = self.scalers['features'].transform(X_val)
-            X_test_scaled = self.scalers['features'].transform(X_test)
-            
-            # Predictions
-            y_val_pred_scaled = self.models[control_name].predict(X_val_scaled)
-            y_test_pred_scaled = self.models[control_name].predict(X_test_scaled)
-            
-            # Inverse transform
-            y_val_pred = self.scalers[control_name].inverse_transform(
-                y_val_pred_scaled.reshape(-1, 1)
-            ).ravel()
-            y_test_pred = self.scalers[control_name].inverse_transform(
-                y_test_pred_scaled.reshape(-1, 1)
-            ).ravel()
-            
-            # Metrics
-            val_mse = mean_squared_error(y_val, y_val_pred)
-            val_r2 = r2_score(y_val, y_val_pred)
-            test_mse = mean_squared_error(y_test, y_test_pred)
-            test_r2 = r2_score(y_test, y_test_pred)
+        for k, control_name in enumerate(CONTROL_NAMES):
+            val_mse = mean_squared_error(Y_val[:, k], Y_val_pred[:, k])
+            val_r2 = r2_score(Y_val[:, k], Y_val_pred[:, k])
+            test_mse = mean_squared_error(Y_test[:, k], Y_test_pred[:, k])
+            test_r2 = r2_score(Y_test[:, k], Y_test_pred[:, k])
             
             metrics[control_name] = {
                 'val_mse': float(val_mse),
@@ -255,26 +447,29 @@ class DeterministicRandomForest:
                 'test_r2': float(test_r2)
             }
             
-            print(f"  - Validation MSE: {val_mse:.6f}, R²: {val_r2:.4f}")
-            print(f"  - Test MSE: {test_mse:.6f}, R²: {test_r2:.4f}")
+            print(f"  - {control_name} validation MSE: {val_mse:.6f}, R²: {val_r2:.4f}")
+            print(f"  - {control_name} test MSE: {test_mse:.6f}, R²: {test_r2:.4f}")
         
         # Compute training lineage hash
         training_manifest = {
             'seed': self.seed,
             'n_estimators': self.n_estimators,
             'max_depth': self.max_depth,
-            'training_samples': len(y_train['steering']),
+            'training_samples': len(Y_train),
             'metrics': metrics,
             'timestamp': start_time.isoformat()
         }
+        if self.mode != "per_target":
+            training_manifest['forest_mode'] = self.mode
         
         training_json = json.dumps(training_manifest, sort_keys=True, separators=(',', ':'))
         training_hash = hashlib.sha256(training_json.encode('utf-8')).hexdigest()
         
+        version_prefix = 'rf_v1' if self.mode == "per_target" else 'rf_mo_v1'
         self.training_lineage.update({
             'train_time': start_time.isoformat(),
             'training_hash': training_hash,
-            'model_version': f'rf_v1_{training_hash[:8]}',
+            'model_version': f'{version_prefix}_{training_hash[:8]}',
             'metrics': metrics
         })
         
@@ -282,10 +477,197 @@ class DeterministicRandomForest:
             'status': 'success',
             'lineage_hash': training_hash,
             'model_version': self.training_lineage['model_version'],
+            'forest_mode': self.mode,
+            'metrics': metrics,
+            'training_duration': (datetime.now(timezone.utc) - start_time).total_seconds()
+        }
+    
+    def train_out_of_core(
+        self,
+        chunks: Callable[[], Iterable[Tuple[np.ndarray, Dict[str, np.ndarray]]]],
+        test_size: float=0.2,
+        validation_size: float=0.1
+    ) -> Dict[str, Any]:
+        """
+        Train from chunks streamed off disk; peak memory is bounded by the
+        chunk size plus the trees grown so far.
+        
+        Three passes over the data:
+            1. fit the feature/target scalers incrementally (partial_fit)
+            2. grow a sub-forest per chunk on its training rows and merge
+               them, n_estimators trees in total (tree_budget)
+            3. stream validation/test metrics through the merged model
+        
+        Rows are split by RowSplitter, so the split does not depend on the
+        chunking; the trees do, since each sub-forest sees one chunk.
+        
+        Args:
+            chunks: Called once per pass; returns an iterable of (X, y_dict),
+                e.g. lambda: loader.iter_feature_chunks(65536)
+            test_size: Fraction for test set
+            validation_size: Fraction for validation set
+        
+        Returns:
+            Training report with metrics and lineage, as train()
+        """
+        start_time = datetime.now(timezone.utc)
+        self._compiled = self._source_directory = None
+        splitter = RowSplitter(self.seed, test_size, validation_size)
+        counts = {TRAIN: 0, VALIDATION: 0, TEST: 0}
+        
+        # Pass 1: scalers and split sizes
+        self.scalers = {name: StandardScaler() for name in self.scalers}
+        n_chunks = 0
+        for X, y_dict in chunks():
+            codes = splitter.assign(len(X))
+            for code in counts:
+                counts[code] += int(np.count_nonzero(codes == code))
+            train = codes == TRAIN
+            if not train.any():
+                continue
+            n_chunks += 1
+            self.scalers['features'].partial_fit(X[train])
+            for name in CONTROL_NAMES:
+                self.scalers[name].partial_fit(y_dict[name][train].reshape(-1, 1))
+        if not n_chunks:
+            raise ValueError("No training rows in the chunk stream")
+        
+        print(f"✓ Data split ({n_chunks} chunks):")
+        print(f"  - Training: {counts[TRAIN]} samples")
+        print(f"  - Validation: {counts[VALIDATION]} samples")
+        print(f"  - Test: {counts[TEST]} samples")
+        
+        # Pass 2: one deterministic sub-forest per chunk
+        budget = tree_budget(self.n_estimators, n_chunks)
+        grown = {name: [] for name in self.models}
+        splitter.reset()
+        chunk_index = 0
+        for X, y_dict in chunks():
+            train = splitter.assign(len(X)) == TRAIN
+            if not train.any():
+                continue
+            X_scaled = self.scalers['features'].transform(X[train])
+            Y_scaled = np.column_stack([
+                self.scalers[name].transform(y_dict[name][train].reshape(-1, 1)).ravel()
+                for name in CONTROL_NAMES
+            ])
+            print(f"🌲 Chunk {chunk_index + 1}/{n_chunks}: {budget[chunk_index]} trees on {len(X_scaled)} samples")
+            for k, name in enumerate(self.models):
+                forest = self._make_forest(budget[chunk_index], self.seed + chunk_index)
+                forest.fit(X_scaled, Y_scaled if name == 'joint' else Y_scaled[:, k])
+                grown[name].append(forest)
+            chunk_index += 1
+        self.models = {name: merge_forests(forests) for name, forests in grown.items()}
+        
+        # Pass 3: streaming validation/test metrics
+        evaluation = {VALIDATION: StreamingRegressionMetrics(len(CONTROL_NAMES)),
+                      TEST: StreamingRegressionMetrics(len(CONTROL_NAMES))}
+        splitter.reset()
+        for X, y_dict in chunks():
+            codes = splitter.assign(len(X))
+            Y = np.column_stack([y_dict[name] for name in CONTROL_NAMES])
+            for code, stream in evaluation.items():
+                rows = codes == code
+                if rows.any():
+                    stream.update(Y[rows], self.compiled.predict(X[rows]))
+        
+        (val_mse, val_r2), (test_mse, test_r2) = evaluation[VALIDATION].summary(), evaluation[TEST].summary()
+        metrics = {}
+        for k, control_name in enumerate(CONTROL_NAMES):
+            metrics[control_name] = {
+                'val_mse': float(val_mse[k]),
+                'val_r2': float(val_r2[k]),
+                'test_mse': float(test_mse[k]),
+                'test_r2': float(test_r2[k])
+            }
+            print(f"  - {control_name} validation MSE: {val_mse[k]:.6f}, R²: {val_r2[k]:.4f}")
+            print(f"  - {control_name} test MSE: {test_mse[k]:.6f}, R²: {test_r2[k]:.4f}")
+        
+        training_manifest = {
+            'seed': self.seed,
+            'n_estimators': self.n_estimators,
+            'max_depth': self.max_depth,
+            'training_samples': counts[TRAIN],
+            'metrics': metrics,
+            'timestamp': start_time.isoformat(),
+            'training_mode': 'out_of_core',
+            'chunks': n_chunks
+        }
+        if self.mode != "per_target":
+            training_manifest['forest_mode'] = self.mode
+        
+        training_json = json.dumps(training_manifest, sort_keys=True, separators=(',', ':'))
+        training_hash = hashlib.sha256(training_json.encode('utf-8')).hexdigest()
+        
+        version_prefix = 'rf_v1' if self.mode == "per_target" else 'rf_mo_v1'
+        self.training_lineage.update({
+            'train_time': start_time.isoformat(),
+            'training_hash': training_hash,
+            'model_version': f'{version_prefix}_{training_hash[:8]}',
+            'metrics': metrics,
+            'training_mode': 'out_of_core',
+            'chunks': n_chunks,
+            'trees_per_chunk': budget
+        })
+        
+        return {
+            'status': 'success',
+            'lineage_hash': training_hash,
+            'model_version': self.training_lineage['model_version'],
+            'forest_mode': self.mode,
+            'chunks': n_chunks,
             'metrics': metrics,
             'training_duration': (datetime.now(timezone.utc) - start_time).total_seconds()
         }
     
+    def _predict_scaled(self, X_scaled: np.ndarray) -> np.ndarray:
+        """(N, 3) predictions in original target units, columns in CONTROL_NAMES order."""
+        if self.mode == "per_target":
+            Y_scaled = [self.models[name].predict(X_scaled) for name in CONTROL_NAMES]
+        else:
+            joint = self.models['joint'].predict(X_scaled)
+            Y_scaled = [joint[:, k] for k in range(len(CONTROL_NAMES))]
+        return np.column_stack([
+            self.scalers[name].inverse_transform(y.reshape(-1, 1)).ravel()
+            for name, y in zip(CONTROL_NAMES, Y_scaled)
+        ])
+    
+    @property
+    def compiled(self) -> CompiledForest:
+        """Flat-array copy of the trained forests and scalers, built on first use."""
+        if self._compiled is None:
+            self._compiled = CompiledForest.from_sklearn(
+                self.models,
+                feature_scaler=self.scalers['features'],
+                target_scalers={name: self.scalers[name] for name in CONTROL_NAMES},
+                output_names=CONTROL_NAMES
+            )
+        return self._compiled
+    
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict controls for a feature matrix.
+        
+        Returns:
+            (N, 3) array of clamped steering, throttle, brake
+        """
+        Y = self.compiled.predict(X)
+        np.clip(Y[:, 0], -1.0, 1.0, out=Y[:, 0])
+        np.clip(Y[:, 1:], 0.0, 1.0, out=Y[:, 1:])
+        return Y
+    
+    def predict_states(self, states: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """
+        Predict controls for several vehicle states in one forest call.
+        
+        Row i equals predict(states[i]).
+        
+        Returns:
+            (N, 3) array of clamped steering, throttle, brake
+        """
+        X = np.array([self._extract_features_from_state(state) for state in states], dtype=np.float32)
+        return self.predict_batch(X.reshape(len(states), FEATURES.dimension))
+    
     def predict(self, state_dict: Dict[str, Any]) -> Dict[str, float]:
         """
         Predict control commands from vehicle state.
@@ -300,18 +682,9 @@ class DeterministicRandomForest:
         features = self._extract_features_from_state(state_dict)
         X = np.array([features], dtype=np.float32)
         
-        # Normalize
-        X_scaled = self.scalers['features'].transform(X)
-        
-        # Predict
-        predictions = {}
-        for control_name in ['steering', 'throttle', 'brake']:
-            y_pred_scaled = self.models[control_name].predict(X_scaled)
-            y_pred = self.scalers[control_name].inverse_transform(
-                y_pred_scaled.reshape(-1, 1)
-            ).ravel()[0]
-            
-            predictions[control_name] = float(y_pred)
+        # Normalize and predict
+        Y = self.compiled.predict(X)
+        predictions = {name: float(Y[0, k]) for k, name in enumerate(CONTROL_NAMES)}
         
         # Clamp to valid ranges
         predictions['steering'] = np.clip(predictions['steering'], -1.0, 1.0)
@@ -322,32 +695,7 @@ class DeterministicRandomForest:
     
     def _extract_features_from_state(self, state: Dict) -> List[float]:
         """Extract feature vector from state dictionary."""
-        features = [
-            state['speed'], state['yaw_rate'],
-            state['longitudinal_accel'], state['lateral_accel'],
-            state['steering_angle'], state['throttle_input'], state['brake_input'],
-            state['engine_rpm'], state['gear'],
-            state['track_x'], state['track_y'], state['heading'],
-            state['distance_to_centerline'], state['track_progress'],
-            state['current_curvature'], state['track_gradient'],
-            state['distance_to_apex'], state['apex_radius'],
-            state['dist_left_edge'], state['dist_right_edge'],
-            state['front_ray'], state['front_left_ray'], state['front_right_ray'],
-            # Degradation features (new, with defaults for backwards compat)
-            state.get('tire_wear', 0.0),
-            state.get('tire_grip_mult', 1.0),
-            state.get('fuel_normalized', 1.0),
-            state.get('weather_grip', 1.2),
-            state.get('rain_intensity', 0.0)
-        ]
-        
-        # Add upcoming curvature
-        features.extend(state['upcoming_curvature'])
-        
-        # Add wheel speeds
-        features.extend(state['wheel_speeds'])
-        
-        return features
+        return FEATURES.row(state)
     
     def save_models(self, directory: str="./models"):
         """Save trained models and scalers with lineage."""
@@ -361,6 +709,9 @@ class DeterministicRandomForest:
         for name, scaler in self.scalers.items():
             joblib.dump(scaler, f"{directory}/scaler_{name}.joblib")
         
+        # Save the compiled forest for sklearn-free, memory-mapped inference
+        self.compiled.save_dir(f"{directory}/{COMPILED_FOREST_DIR}")
+        
         # Save lineage
         with open(f"{directory}/training_lineage.json", 'w') as f:
             json.dump(self.training_lineage, f, indent=2)
@@ -371,26 +722,102 @@ class DeterministicRandomForest:
     
     @classmethod
     def load_models(cls, directory: str="./models"):
-        """Load trained models from directory."""
-        instance = cls()
-        
-        # Load models
-        for name in ['steering', 'throttle', 'brake']:
-            instance.models[name] = joblib.load(f"{directory}/rf_{name}.joblib")
-        
-        # Load scalers
-        for name in ['features', 'steering', 'throttle', 'brake']:
-            instance.scalers[name] = joblib.load(f"{directory}/scaler_{name}.joblib")
+        """
+        Load trained models from directory.
         
-        # Load lineage
+        When the directory holds a compiled forest nothing is unpickled
+        here: the compiled tables are memory-mapped read-only (shared with
+        other processes using the same files) and the sklearn forests and
+        scalers are read on first access.
+        """
+        # Lineage first: it records the forest mode (older models are per-target)
         with open(f"{directory}/training_lineage.json", 'r') as f:
-            instance.training_lineage = json.load(f)
+            lineage = json.load(f)
+        
+        instance = cls(
+            seed=lineage.get('seed', 42),
+            n_estimators=lineage.get('n_estimators', 100),
+            max_depth=lineage.get('max_depth', 20),
+            mode=lineage.get('forest_mode', 'per_target')
+        )
+        instance.training_lineage = lineage
+        instance._source_directory = str(directory)
+        
+        compiled_dir = Path(directory) / COMPILED_FOREST_DIR
+        compiled_path = Path(directory) / "compiled_forest.npz"
+        if compiled_dir.is_dir():
+            instance._compiled = CompiledForest.load_dir(str(compiled_dir))
+        elif compiled_path.exists():
+            instance._compiled = CompiledForest.load(str(compiled_path))
+        else:
+            # Older models: compile from the sklearn forests on first use
+            instance._load_sklearn()
         
         print(f"✓ Loaded model version: {instance.training_lineage['model_version']}")
         
         return instance
 
 
+def compare_forest_modes(
+    X: np.ndarray,
+    y_dict: Dict[str, np.ndarray],
+    seed: int=42,
+    n_estimators: int=100,
+    max_depth: int=20,
+    latency_samples: int=200
+) -> Dict[str, Any]:
+    """
+    Train both forest modes on the same data and seed and report accuracy,
+    training time, serialized size and inference latency side by side.
+    """
+    single_rows = X[:latency_samples]
+    report = {'seed': seed, 'n_estimators': n_estimators, 'max_depth': max_depth,
+              'samples': int(X.shape[0]), 'modes': {}}
+    
+    for mode in FOREST_MODES:
+        rf = DeterministicRandomForest(seed=seed, n_estimators=n_estimators, max_depth=max_depth, mode=mode)
+        start = time.perf_counter()
+        training_report = rf.train(X, y_dict)
+        train_sec = time.perf_counter() - start
+        
+        size = 0
+        for model in rf.models.values():
+            buffer = io.BytesIO()
+            joblib.dump(model, buffer)
+            size += buffer.tell()
+        
+        for model in rf.models.values():
+            model.set_params(n_jobs=1)  # Single-sample latency without thread pool overhead
+        start = time.perf_counter()
+        for row in single_rows:
+            rf.predict_batch(row.reshape(1, -1))
+        single_ms = (time.perf_counter() - start) * 1000 / len(single_rows)
+        
+        start = time.perf_counter()
+        rf.predict_batch(X)
+        batch_us = (time.perf_counter() - start) * 1e6 / len(X)
+        
+        report['modes'][mode] = {
+            'metrics': training_report['metrics'],
+            'train_sec': round(train_sec, 3),
+            'model_bytes': size,
+            'predict_ms_per_sample': round(single_ms, 3),
+            'batch_predict_us_per_sample': round(batch_us, 3)
+        }
+    
+    per_target, joint = report['modes']['per_target'], report['modes']['multi_output']
+    report['multi_output_vs_per_target'] = {
+        'train_speedup': round(per_target['train_sec'] / joint['train_sec'], 2),
+        'size_ratio': round(joint['model_bytes'] / per_target['model_bytes'], 3),
+        'predict_speedup': round(per_target['predict_ms_per_sample'] / joint['predict_ms_per_sample'], 2),
+        'test_r2_delta': {
+            name: round(joint['metrics'][name]['test_r2'] - per_target['metrics'][name]['test_r2'], 4)
+            for name in CONTROL_NAMES
+        }
+    }
+    return report
+
+
 def create_training_ledger_entry(
     training_data_file: str,
     training_report: Dict,
@@ -400,10 +827,13 @@ def create_training_ledger_entry(
     Create governance ledger entry for model training.
     Compatible with existing ledger format.
     """
-    # Compute training data hash
-    data_hash = hashlib.sha256(
-        Path(training_data_file).read_bytes()
-    ).hexdigest()
+    # Compute training data hash (columnar datasets carry their own)
+    if is_columnar_dataset(training_data_file):
+        data_hash = ColumnarDataset(training_data_file).dataset_hash
+    else:
+        data_hash = hashlib.sha256(
+            Path(training_data_file).read_bytes()
+        ).hexdigest()
     
     entry = {
         'event_type': 'model_training',
@@ -4,13 +4,19 @@ Deterministic racing simulator with IPFS checkpoint integration.
 """
 
 import numpy as np
-import hashlib
 import json
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional, Tuple
+import os
+import tempfile
+from bisect import bisect_right
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import List, Dict, Any, Optional, Tuple, get_args, get_origin
 from datetime import datetime, timezone
 from enum import Enum
 
+from canonical_json import canonical_sha256
+from training_data import ColumnSpec, ColumnarWriter, import_ndjson
+
 
 class TrackSection(Enum):
     """Major sections of Nürburgring Nordschleife"""
@@ -240,6 +246,60 @@ class NurburgringTrack:
         
         # Gradient
         self.gradient_profile = np.gradient(self.elevation_profile, 10.0)  # 10m spacing
+        
+        self._compile_lookup_tables()
+    
+    def _compile_lookup_tables(self):
+        """
+        Dense per-sample tables so a query is index arithmetic only.
+        
+        Scalar queries read prebuilt Python lists of the same np.float64
+        values get_track_data has always returned; batched queries gather
+        from the arrays.
+        """
+        n = self.num_points
+        last = n - 1
+        
+        # Cumulative distance of each sample and offsets of the lookahead horizon
+        self.cumulative_distance = self.sample_distances
+        self.horizon_distances = (10, 25, 50, 100, 200)
+        self.horizon_offsets = np.array([int(d / 10) for d in self.horizon_distances], dtype=np.int64)
+        
+        # horizon_index[i, k] = min(i + offset_k, last)
+        self.horizon_index = np.minimum(np.arange(n)[:, None] + self.horizon_offsets, last)
+        self.horizon_curvature = self.curvature_profile[self.horizon_index]
+        
+        # Sections as sorted [start, end) intervals; section_id indexes section_list
+        ordered = sorted(self.sections.items(), key=lambda item: item[1][0])
+        self.section_list = tuple(sec for sec, _ in ordered)
+        self.section_starts = np.array([start for _, (start, _) in ordered], dtype=np.float64)
+        self.section_ends = np.array([end for _, (_, end) in ordered], dtype=np.float64)
+        self._default_section_id = self.section_list.index(TrackSection.HATZENBACH)
+        
+        # Per-sample section of the sample's own distance
+        self.section_id = self.get_section_ids(self.sample_distances)
+        
+        # Scalar fast path
+        self._curvature_values = list(self.curvature_profile)
+        self._gradient_values = list(self.gradient_profile)
+        self._horizon_values = [tuple(row) for row in self.horizon_curvature]
+        self._section_start_values = [float(x) for x in self.section_starts]
+        self._section_end_values = [float(x) for x in self.section_ends]
+    
+    def _section_for(self, distance: float) -> TrackSection:
+        """Section containing distance, HATZENBACH outside every section."""
+        i = bisect_right(self._section_start_values, distance) - 1
+        if i >= 0 and distance < self._section_end_values[i]:
+            return self.section_list[i]
+        return TrackSection.HATZENBACH
+    
+    def get_section_ids(self, distances: np.ndarray) -> np.ndarray:
+        """Index into section_list of the section containing each distance."""
+        distances = np.asarray(distances, dtype=np.float64)
+        i = np.searchsorted(self.section_starts, distances, side='right') - 1
+        clipped = np.maximum(i, 0)
+        inside = (i >= 0) & (distances < self.section_ends[clipped])
+        return np.where(inside, clipped, self._default_section_id)
     
     def get_track_data(self, progress: float) -> Dict[str, Any]:
         """
@@ -252,30 +312,46 @@ class NurburgringTrack:
         idx = int((distance / self.TRACK_LENGTH) * self.num_points)
         idx = min(idx, self.num_points - 1)
         
-        # Current values
-        curvature = self.curvature_profile[idx]
-        gradient = self.gradient_profile[idx]
-        
-        # Upcoming curvature horizon
-        horizon_distances = [10, 25, 50, 100, 200]
-        upcoming_curvature = []
-        for d in horizon_distances:
-            future_idx = idx + int(d / 10)
-            future_idx = min(future_idx, self.num_points - 1)
-            upcoming_curvature.append(self.curvature_profile[future_idx])
-        
-        # Determine section
-        section = TrackSection.HATZENBACH
-        for sec, (start, end) in self.sections.items():
-            if start <= distance < end:
-                section = sec
-                break
+        if idx >= 0:
+            upcoming_curvature = self._horizon_values[idx]
+        else:
+            # Negative progress wraps from the end of the profile without clamping
+            last = self.num_points - 1
+            upcoming_curvature = tuple(
+                self._curvature_values[min(idx + offset, last)] for offset in self.horizon_offsets.tolist()
+            )
+        
+        return {
+            'curvature': self._curvature_values[idx],
+            'gradient': self._gradient_values[idx],
+            'upcoming_curvature': upcoming_curvature,
+            'section': self._section_for(distance)
+        }
+    
+    def get_track_data_batch(self, progress: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized get_track_data for an array of progress values.
+        
+        Row i matches get_track_data(progress[i]): curvature and gradient
+        are (N,), upcoming_curvature is (N, 5) and section_id (N,) indexes
+        section_list.
+        """
+        progress = np.asarray(progress, dtype=np.float64)
+        distance = progress * self.TRACK_LENGTH
+        idx = np.trunc((distance / self.TRACK_LENGTH) * self.num_points).astype(np.int64)
+        np.minimum(idx, self.num_points - 1, out=idx)
+        
+        if idx.size and idx.min() < 0:
+            future = np.minimum(idx[:, None] + self.horizon_offsets, self.num_points - 1)
+            upcoming_curvature = self.curvature_profile[future]
+        else:
+            upcoming_curvature = self.horizon_curvature[idx]
         
         return {
-            'curvature': curvature,
-            'gradient': gradient,
-            'upcoming_curvature': tuple(upcoming_curvature),
-            'section': section
+            'curvature': self.curvature_profile[idx],
+            'gradient': self.gradient_profile[idx],
+            'upcoming_curvature': upcoming_curvature,
+            'section_id': self.get_section_ids(distance)
         }
 
 
@@ -408,6 +484,520 @@ class DeterministicVehiclePhysics:
         return long_accel, lat_accel, steering_angle
 
 
+# Lookup tables for BatchedVehiclePhysics (index = compound id)
+_COMPOUNDS = (TireCompound.SOFT, TireCompound.MEDIUM, TireCompound.HARD)
+_COMPOUND_INDEX = {compound: i for i, compound in enumerate(_COMPOUNDS)}
+_COMPOUND_GRIP = np.array([1.15, 1.0, 0.90])
+_COMPOUND_WEAR_RATE = np.array([1.5, 1.0, 0.6])
+_GEAR_RATIOS = np.array([3.5, 2.5, 1.8, 1.3, 1.0, 0.8])
+
+
+def _floor_at(x: np.ndarray, lower: float, mask: np.ndarray) -> None:
+    """In place x = max(lower, x), with Python's tie/sign-of-zero behaviour."""
+    np.greater(x, lower, out=mask)
+    np.logical_not(mask, out=mask)
+    np.copyto(x, lower, where=mask)
+
+
+def _ceil_at(x: np.ndarray, upper: float, mask: np.ndarray) -> None:
+    """In place x = min(upper, x), with Python's tie/sign-of-zero behaviour."""
+    np.less(x, upper, out=mask)
+    np.logical_not(mask, out=mask)
+    np.copyto(x, upper, where=mask)
+
+
+class BatchedVehiclePhysics:
+    """
+    DeterministicVehiclePhysics for N cars over struct-of-arrays state.
+    
+    Every car goes through the same floating-point operations, in the same
+    order, as the scalar model, so each trajectory is bit-identical to
+    stepping its own DeterministicVehiclePhysics. Per-step temporaries live
+    in preallocated buffers, so step() does not allocate.
+    
+    State arrays (length N unless noted):
+        position (N, 2), velocity, heading, yaw_rate, wheel_speed,
+        engine_rpm, gear, tire_compound (index into _COMPOUNDS),
+        tire_wear, tire_temperature, fuel_kg, fuel_max_kg
+    """
+    
+    DT = DeterministicVehiclePhysics.DT
+    
+    def __init__(self, num_cars: int, seed: int=42, tire_compound: TireCompound=TireCompound.MEDIUM):
+        self.num_cars = num_cars
+        self.seed = seed
+        self.initial_tire_compound = tire_compound
+        
+        n = num_cars
+        self.position = np.zeros((n, 2))
+        self.velocity = np.zeros(n)
+        self.heading = np.zeros(n)
+        self.yaw_rate = np.zeros(n)
+        self.wheel_speed = np.zeros(n)  # All four wheels share one speed
+        self.engine_rpm = np.zeros(n, dtype=np.int64)
+        self.gear = np.zeros(n, dtype=np.int64)
+        self.tire_compound = np.zeros(n, dtype=np.int64)
+        self.tire_wear = np.zeros(n)
+        self.tire_temperature = np.zeros(n)
+        self.fuel_kg = np.zeros(n)
+        self.fuel_max_kg = np.zeros(n)
+        
+        # Step outputs (overwritten by the next step)
+        self.long_accel = np.zeros(n)
+        self.lat_accel = np.zeros(n)
+        self.steering_angle = np.zeros(n)
+        
+        # Scratch buffers
+        self._grip = np.zeros(n)
+        self._tmp = [np.zeros(n) for _ in range(3)]
+        self._masks = [np.zeros(n, dtype=bool) for _ in range(3)]
+        self._gear_idx = np.zeros(n, dtype=np.int64)
+        
+        self.reset()
+    
+    def reset(self, tire_compound: Optional[TireCompound]=None):
+        """Reset every car to the initial state."""
+        compound = tire_compound or self.initial_tire_compound
+        self.position.fill(0.0)
+        self.velocity.fill(0.0)
+        self.heading.fill(0.0)
+        self.yaw_rate.fill(0.0)
+        self.wheel_speed.fill(0.0)
+        self.engine_rpm.fill(1000)
+        self.gear.fill(1)
+        self.tire_compound.fill(_COMPOUND_INDEX[compound])
+        self.tire_wear.fill(0.0)
+        self.tire_temperature.fill(60.0)
+        self.fuel_kg.fill(110.0)
+        self.fuel_max_kg.fill(110.0)
+    
+    def pit_stop(self, cars, new_compound: TireCompound=TireCompound.MEDIUM, fuel_kg: float=110.0):
+        """Pit stop for the selected cars (index array or boolean mask)."""
+        self.tire_compound[cars] = _COMPOUND_INDEX[new_compound]
+        self.tire_wear[cars] = 0.0
+        self.tire_temperature[cars] = 60.0
+        self.fuel_kg[cars] = np.minimum(fuel_kg, self.fuel_max_kg[cars])
+    
+    @property
+    def wheel_speeds(self) -> np.ndarray:
+        """(N, 4) read-only view matching DeterministicVehiclePhysics.wheel_speeds"""
+        return np.broadcast_to(self.wheel_speed[:, None], (self.num_cars, 4))
+    
+    def load_car(self, i: int, physics: DeterministicVehiclePhysics):
+        """Copy one scalar vehicle's state into slot i."""
+        self.position[i] = physics.position
+        self.velocity[i] = physics.velocity
+        self.heading[i] = physics.heading
+        self.yaw_rate[i] = physics.yaw_rate
+        self.wheel_speed[i] = physics.wheel_speeds[0]
+        self.engine_rpm[i] = physics.engine_rpm
+        self.gear[i] = physics.gear
+        self.tire_compound[i] = _COMPOUND_INDEX[physics.tire_state.compound]
+        self.tire_wear[i] = physics.tire_state.wear
+        self.tire_temperature[i] = physics.tire_state.temperature
+        self.fuel_kg[i] = physics.fuel_state.current_kg
+        self.fuel_max_kg[i] = physics.fuel_state.max_kg
+    
+    def export_car(self, i: int) -> DeterministicVehiclePhysics:
+        """Scalar DeterministicVehiclePhysics holding slot i's state."""
+        physics = DeterministicVehiclePhysics(self.seed, _COMPOUNDS[self.tire_compound[i]])
+        physics.position = self.position[i].copy()
+        physics.velocity = float(self.velocity[i])
+        physics.heading = float(self.heading[i])
+        physics.yaw_rate = float(self.yaw_rate[i])
+        physics.wheel_speeds = np.ones(4) * self.wheel_speed[i]
+        physics.engine_rpm = int(self.engine_rpm[i])
+        physics.gear = int(self.gear[i])
+        physics.tire_state.wear = float(self.tire_wear[i])
+        physics.tire_state.temperature = float(self.tire_temperature[i])
+        physics.fuel_state.current_kg = float(self.fuel_kg[i])
+        physics.fuel_state.max_kg = float(self.fuel_max_kg[i])
+        return physics
+    
+    def grip_multiplier(self, out: Optional[np.ndarray]=None) -> np.ndarray:
+        """Per-car TireState.grip_multiplier (compound x wear x temperature)."""
+        out = self._grip if out is None else out
+        wear_factor, high, _ = self._tmp
+        is_cold, is_hot, mask = self._masks
+        temperature = self.tire_temperature
+        
+        # Wear factor: max(0.3, 1 - wear ** 1.5). float_power keeps libm pow;
+        # np.power may take a SIMD path that differs in the last ulp
+        np.float_power(self.tire_wear, 1.5, out=wear_factor)
+        np.subtract(1.0, wear_factor, out=wear_factor)
+        _floor_at(wear_factor, 0.3, mask)
+        
+        # Temperature factor: cold, optimal (80-100C) and overheated branches
+        np.divide(temperature, 80, out=out)
+        np.multiply(0.3, out, out=out)
+        np.add(0.7, out, out=out)
+        np.subtract(temperature, 100, out=high)
+        np.multiply(0.01, high, out=high)
+        np.subtract(1.0, high, out=high)
+        _floor_at(high, 0.6, mask)
+        np.less(temperature, 80, out=is_cold)
+        np.greater(temperature, 100, out=is_hot)
+        np.copyto(out, high, where=is_hot)
+        np.logical_or(is_cold, is_hot, out=mask)
+        np.logical_not(mask, out=mask)
+        np.copyto(out, 1.0, where=mask)
+        
+        # compound_grip * wear_factor * temp_factor
+        np.take(_COMPOUND_GRIP, self.tire_compound, out=high)
+        np.multiply(high, wear_factor, out=high)
+        np.multiply(high, out, out=out)
+        return out
+    
+    def step(
+        self,
+        throttle: np.ndarray,
+        brake: np.ndarray,
+        steering: np.ndarray,
+        track_curvature: np.ndarray,
+        track_gradient: np.ndarray,
+        weather_grip: Optional[np.ndarray]=None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Advance every car by one timestep.
+        
+        Args:
+            throttle, brake, steering: Per-car control commands
+            track_curvature: Per-car curvature (unused, as in the scalar model)
+            track_gradient: Per-car gradient (rad)
+            weather_grip: Per-car or scalar surface grip (None = dry, 1.2)
+        
+        Returns:
+            (long_accel, lat_accel, steering_angle) buffers, overwritten by the next step
+        """
+        dt = self.DT
+        v = self.velocity
+        effective_grip = self.grip_multiplier()
+        accel, a, b = self.long_accel, self._tmp[0], self._tmp[1]
+        mask = self._masks[0]
+        
+        # Effective grip: tire * (weather / 1.2)
+        np.divide(1.2 if weather_grip is None else weather_grip, 1.2, out=a)
+        np.multiply(effective_grip, a, out=effective_grip)
+        
+        # max_accel = 10 * grip * (1 - fuel mass penalty)
+        np.divide(self.fuel_kg, self.fuel_max_kg, out=a)
+        np.multiply(a, 0.02, out=a)
+        np.subtract(1, a, out=a)
+        np.multiply(10.0, effective_grip, out=b)
+        np.multiply(b, a, out=a)
+        
+        # accel = throttle * max_accel - brake * max_brake + gravity
+        np.multiply(throttle, a, out=accel)
+        np.multiply(15.0, effective_grip, out=b)
+        np.multiply(brake, b, out=b)
+        np.subtract(accel, b, out=accel)
+        np.sin(track_gradient, out=a)
+        np.multiply(-9.81, a, out=a)
+        np.add(accel, a, out=accel)
+        
+        # Velocity (no reverse)
+        np.multiply(accel, dt, out=a)
+        np.add(v, a, out=v)
+        _floor_at(v, 0.0, mask)
+        
+        # Steering and bicycle-model yaw rate
+        steering_angle = self.steering_angle
+        np.multiply(0.52, effective_grip, out=a)
+        np.multiply(steering, a, out=steering_angle)
+        np.divide(v, 2.7, out=a)
+        np.tan(steering_angle, out=b)
+        np.multiply(a, b, out=self.yaw_rate)
+        
+        # Heading
+        np.multiply(self.yaw_rate, dt, out=a)
+        np.add(self.heading, a, out=self.heading)
+        np.remainder(self.heading, 2 * np.pi, out=self.heading)
+        
+        # Position
+        np.cos(self.heading, out=a)
+        np.multiply(v, a, out=a)
+        np.multiply(a, dt, out=a)
+        np.add(self.position[:, 0], a, out=self.position[:, 0])
+        np.sin(self.heading, out=a)
+        np.multiply(v, a, out=a)
+        np.multiply(a, dt, out=a)
+        np.add(self.position[:, 1], a, out=self.position[:, 1])
+        
+        # Wheel speeds and engine RPM (top gear keeps its last RPM)
+        np.divide(v, 0.33, out=self.wheel_speed)
+        np.subtract(self.gear, 1, out=self._gear_idx)
+        np.clip(self._gear_idx, 0, len(_GEAR_RATIOS) - 1, out=self._gear_idx)
+        np.take(_GEAR_RATIOS, self._gear_idx, out=a)
+        np.multiply(self.wheel_speed, a, out=a)
+        np.multiply(a, 60, out=a)
+        np.divide(a, 2 * np.pi, out=a)
+        np.trunc(a, out=a)
+        np.less(self.gear, len(_GEAR_RATIOS), out=mask)
+        np.copyto(self.engine_rpm, a, where=mask, casting='unsafe')
+        
+        # Auto shift
+        upshift, downshift = self._masks[1], self._masks[2]
+        np.greater(self.engine_rpm, 7000, out=upshift)
+        np.less(self.gear, 6, out=mask)
+        np.logical_and(upshift, mask, out=upshift)
+        np.less(self.engine_rpm, 3000, out=downshift)
+        np.greater(self.gear, 1, out=mask)
+        np.logical_and(downshift, mask, out=downshift)
+        np.logical_not(upshift, out=mask)
+        np.logical_and(downshift, mask, out=downshift)
+        np.add(self.gear, 1, out=self.gear, where=upshift)
+        np.subtract(self.gear, 1, out=self.gear, where=downshift)
+        
+        # Tire wear: (throttle^2 + brake^2 + speed terms) * compound rate
+        np.multiply(throttle, throttle, out=a)
+        np.multiply(0.0015, a, out=a)
+        np.multiply(brake, brake, out=b)
+        np.multiply(0.001, b, out=b)
+        np.add(a, b, out=a)
+        np.divide(v, 80.0, out=b)
+        np.multiply(0.0001, b, out=b)
+        np.add(a, b, out=a)
+        np.take(_COMPOUND_WEAR_RATE, self.tire_compound, out=b)
+        np.multiply(a, b, out=a)
+        np.add(self.tire_wear, a, out=self.tire_wear)
+        _ceil_at(self.tire_wear, 1.0, mask)
+        
+        # Tire temperature: heat from inputs, cooling at low speed
+        np.abs(steering, out=a)
+        np.add(throttle, brake, out=b)
+        np.add(b, a, out=a)
+        np.multiply(0.5, a, out=a)
+        np.divide(v, 100, out=b)
+        np.subtract(1, b, out=b)
+        np.multiply(0.2, b, out=b)
+        np.subtract(a, b, out=a)
+        np.multiply(a, dt, out=a)
+        np.multiply(a, 10, out=a)
+        np.add(self.tire_temperature, a, out=self.tire_temperature)
+        np.clip(self.tire_temperature, 20.0, 130.0, out=self.tire_temperature)
+        
+        # Fuel burn
+        np.multiply(0.5, throttle, out=a)
+        np.add(0.5, a, out=a)
+        np.multiply(0.007, a, out=a)
+        np.multiply(a, dt, out=a)
+        np.multiply(a, 60, out=a)
+        np.subtract(self.fuel_kg, a, out=self.fuel_kg)
+        _floor_at(self.fuel_kg, 0.0, mask)
+        
+        # Accelerations
+        np.multiply(v, self.yaw_rate, out=self.lat_accel)
+        
+        return self.long_accel, self.lat_accel, self.steering_angle
+
+
+_SECTIONS = tuple(TrackSection)
+_SECTION_INDEX = {section: i for i, section in enumerate(_SECTIONS)}
+_KIND_DTYPE = {'float': 'float64', 'int': 'int64', 'section': 'int8'}
+
+
+def _layout(cls) -> List[Tuple[str, str, int]]:
+    """(field, kind, width) for each dataclass field."""
+    layout = []
+    for f in fields(cls):
+        if f.type is TrackSection:
+            layout.append((f.name, 'section', 1))
+        elif get_origin(f.type) is tuple:
+            layout.append((f.name, 'tuple', len(get_args(f.type))))
+        else:
+            layout.append((f.name, 'int' if f.type is int else 'float', 1))
+    return layout
+
+
+def _training_columns(state_layout, action_layout) -> Tuple[List[ColumnSpec], Dict[Tuple[str, str], int]]:
+    """
+    Column specs of a state-action record, plus the first column of each
+    field. Column order is the order StateActionBuffer.append() gathers
+    values in: state scalars, state tuples, section, action, tick.
+    """
+    state_order = ([f for f in state_layout if f[1] in ('float', 'int')] +
+                   [f for f in state_layout if f[1] == 'tuple'] +
+                   [f for f in state_layout if f[1] == 'section'])
+    specs = []
+    column_of = {}
+    for prefix, layout in (('state', state_order), ('action', action_layout)):
+        for name, kind, width in layout:
+            column_of[(prefix, name)] = len(specs)
+            if kind == 'tuple':
+                specs.extend(ColumnSpec(f"{prefix}.{name}_{i}", 'float64', (prefix, name, i)) for i in range(width))
+            elif kind == 'section':
+                specs.append(ColumnSpec(f"{prefix}.{name}", 'int8', (prefix, name),
+                                        tuple(section.value for section in _SECTIONS)))
+            else:
+                specs.append(ColumnSpec(f"{prefix}.{name}", _KIND_DTYPE[kind], (prefix, name)))
+    specs.append(ColumnSpec('tick', 'int64', ('tick',)))
+    return specs, column_of
+
+
+def training_columns() -> List[ColumnSpec]:
+    """Column layout of state-action training datasets."""
+    return _training_columns(_layout(VehicleState), _layout(ControlInput))[0]
+
+
+def import_training_ndjson(
+    ndjson_path: str,
+    path: str,
+    compression: Optional[str]=None,
+    chunk_rows: int=65536
+) -> Dict[str, Any]:
+    """Convert an NDJSON export into a columnar training dataset."""
+    return import_ndjson(ndjson_path, path, training_columns(), chunk_rows, compression)
+
+
+class StateActionBuffer:
+    """
+    Fixed-capacity columnar ring buffer of state-action records.
+    
+    Every VehicleState/ControlInput field is stored as float64 columns in a
+    (width, capacity) array: tuple fields expand to one column per element,
+    ints round-trip exactly and the section is stored as its index. When the
+    ring is full the oldest spill_chunk rows are written to a spill file as
+    one raw column-major block, so memory stays flat however long the
+    session runs. Iterating yields the same record dicts step() used to keep,
+    oldest first, streaming spilled chunks back from disk.
+    
+    With spill=False the oldest rows are dropped instead.
+    """
+    
+    def __init__(
+        self,
+        capacity: int=65536,
+        spill_chunk: Optional[int]=None,
+        spill_dir: Optional[str]=None,
+        spill: bool=True
+    ):
+        spill_chunk = spill_chunk or max(1, capacity // 4)
+        if capacity <= 0 or capacity % spill_chunk != 0:
+            raise ValueError("capacity must be a positive multiple of spill_chunk")
+        
+        self.capacity = capacity
+        self.spill_chunk = spill_chunk
+        self.spill_dir = spill_dir
+        self.spill = spill
+        
+        # (field, kind, width): kind is 'float', 'int', 'tuple' or 'section'
+        self.state_layout = _layout(VehicleState)
+        self.action_layout = _layout(ControlInput)
+        self.column_specs, self._column_of = _training_columns(self.state_layout, self.action_layout)
+        self.columns = [spec.name for spec in self.column_specs]
+        self.width = len(self.columns)
+        
+        self._state_tuples = tuple(name for name, kind, _ in self.state_layout if kind == 'tuple')
+        self._state_scalars = attrgetter(*(name for name, kind, _ in self.state_layout
+                                           if kind in ('float', 'int')))
+        self._action_scalars = attrgetter(*(name for name, _, _ in self.action_layout))
+        
+        self._data = np.zeros((self.width, capacity))
+        self._head = 0  # Oldest in-memory row
+        self._count = 0
+        self._spill_file = None
+        self.spilled_rows = 0
+        self.dropped_rows = 0
+    
+    def __len__(self) -> int:
+        return self.spilled_rows + self._count
+    
+    def append(self, state: VehicleState, control: ControlInput, tick: int):
+        """Record one step."""
+        if self._count == self.capacity:
+            self._evict()
+        
+        row = list(self._state_scalars(state))
+        for name in self._state_tuples:
+            row.extend(getattr(state, name))
+        row.append(_SECTION_INDEX[state.current_section])
+        row.extend(self._action_scalars(control))
+        row.append(tick)
+        
+        self._data[:, (self._head + self._count) % self.capacity] = row
+        self._count += 1
+    
+    def _evict(self):
+        """Spill (or drop) the oldest spill_chunk rows."""
+        start = self._head
+        end = start + self.spill_chunk
+        if self.spill:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(prefix="state_action_", dir=self.spill_dir)
+            self._spill_file.seek(0, os.SEEK_END)
+            self._spill_file.write(np.ascontiguousarray(self._data[:, start:end]).tobytes())
+            self.spilled_rows += self.spill_chunk
+        else:
+            self.dropped_rows += self.spill_chunk
+        self._head = end % self.capacity
+        self._count -= self.spill_chunk
+    
+    def clear(self):
+        """Drop every record, including spilled chunks."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        self._head = 0
+        self._count = 0
+        self.spilled_rows = 0
+        self.dropped_rows = 0
+    
+    def iter_blocks(self):
+        """Yield (width, n) column blocks, oldest first."""
+        if self._spill_file is not None:
+            self._spill_file.flush()
+            self._spill_file.seek(0)
+            block_bytes = self.width * self.spill_chunk * 8
+            for _ in range(self.spilled_rows // self.spill_chunk):
+                data = self._spill_file.read(block_bytes)
+                yield np.frombuffer(data, dtype=np.float64).reshape(self.width, self.spill_chunk)
+        
+        end = self._head + self._count
+        if end <= self.capacity:
+            yield self._data[:, self._head:end]
+        else:
+            yield self._data[:, self._head:]
+            yield self._data[:, :end - self.capacity]
+    
+    def __iter__(self):
+        for block in self.iter_blocks():
+            yield from self._records(block)
+    
+    def _records(self, block: np.ndarray):
+        """Rebuild record dicts from a column block."""
+        columns = block.tolist()
+        decoders = []
+        for prefix, layout in (('state', self.state_layout), ('action', self.action_layout)):
+            for name, kind, width in layout:
+                decoders.append((prefix, name, kind, width, self._column_of[(prefix, name)]))
+        tick = columns[-1]
+        
+        for j in range(block.shape[1]):
+            record = {'state': {}, 'action': {}}
+            for prefix, name, kind, width, c in decoders:
+                if kind == 'float':
+                    value = columns[c][j]
+                elif kind == 'int':
+                    value = int(columns[c][j])
+                elif kind == 'section':
+                    value = _SECTIONS[int(columns[c][j])]
+                else:
+                    value = tuple(columns[c + k][j] for k in range(width))
+                record[prefix][name] = value
+            record['tick'] = int(tick[j])
+            yield record
+    
+    def recent(self, n: int) -> np.ndarray:
+        """Copy of the last n in-memory rows as (n, width), oldest first."""
+        n = min(n, self._count)
+        index = (self._head + self._count - n + np.arange(n)) % self.capacity
+        return self._data[:, index].T
+    
+    @property
+    def memory_bytes(self) -> int:
+        return self._data.nbytes
+
+
 class RacingSimulator:
     """
     Main racing simulator with checkpoint integration.
@@ -419,7 +1009,9 @@ class RacingSimulator:
         seed: int=42,
         ipfs_bridge=None,
         tire_compound: TireCompound=TireCompound.MEDIUM,
-        enable_weather: bool=True
+        enable_weather: bool=True,
+        history_capacity: int=65536,
+        history_spill_dir: Optional[str]=None
     ):
         self.seed = seed
         self.rng = np.random.RandomState(seed)
@@ -446,8 +1038,8 @@ class RacingSimulator:
         self._pit_compound = TireCompound.MEDIUM
         self._pit_fuel = 110.0
         
-        # State history for training
-        self.state_action_history: List[Dict[str, Any]] = []
+        # State history for training (bounded in memory, spills to disk)
+        self.state_action_history = StateActionBuffer(history_capacity, spill_dir=history_spill_dir)
     
     def pit_stop(self, new_compound: TireCompound=TireCompound.MEDIUM, fuel_kg: float=110.0):
         """Perform pit stop: replace tires and refuel (instant)."""
@@ -579,11 +1171,7 @@ class RacingSimulator:
         state.brake_input = control.brake_command
         
         # Record state-action pair
-        self.state_action_history.append({
-            'state': asdict(state),
-            'action': asdict(control),
-            'tick': self.tick
-        })
+        self.state_action_history.append(state, control, self.tick)
         
         self.tick += 1
         return state
@@ -674,8 +1262,7 @@ class RacingSimulator:
             'rain_intensity': float(self.weather.rain_intensity) if self.weather else 0.0
         }
         
-        state_json = json.dumps(state_payload, sort_keys=True, separators=(',', ':'))
-        state_hash = hashlib.sha256(state_json.encode('utf-8')).hexdigest()
+        state_hash = canonical_sha256(state_payload)
         
         # Build checkpoint
         checkpoint = {
@@ -703,13 +1290,35 @@ class RacingSimulator:
         
         return checkpoint
     
-    def export_training_data(self, filename: str="nurburgring_training.ndjson"):
+    def export_training_data(
+        self,
+        filename: str="nurburgring_training.ndjson",
+        format: str="ndjson",
+        compression: Optional[str]=None,
+        chunk_rows: int=65536
+    ):
         """
-        Export state-action history as NDJSON for Random Forest training.
+        Export state-action history for Random Forest training.
+        
+        format='ndjson' writes one JSON record per line; format='columnar'
+        writes a chunked columnar dataset directory (see training_data) with
+        optional zlib/lzma compression. Both stream spilled chunks and the
+        in-memory ring without materializing the whole history.
         """
-        with open(filename, 'w') as f:
-            for record in self.state_action_history:
-                f.write(json.dumps(record) + '\n')
+        history = self.state_action_history
+        if format == "columnar":
+            metadata = {"seed": self.seed, "ticks": self.tick}
+            with ColumnarWriter(filename, history.column_specs, chunk_rows, compression, metadata=metadata) as writer:
+                for block in history.iter_blocks():
+                    writer.write(block)
+        elif format == "ndjson":
+            with open(filename, 'w') as f:
+                for record in history:
+                    state = record['state']
+                    state['current_section'] = state['current_section'].value
+                    f.write(json.dumps(record) + '\n')
+        else:
+            raise ValueError(f"Unknown training data format: {format}")
         
-        print(f"✓ Exported {len(self.state_action_history)} training samples to {filename}")
+        print(f"✓ Exported {len(history)} training samples to {filename}")
         return filename
@@ -6,11 +6,16 @@ with semantic tensor embeddings and Merkle chain integrity.
 
 import hashlib
 import json
+import os
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from enum import Enum
 
+from canonical_json import canonical_sha256
+
 
 class ConfigSource(Enum):
     """Configuration data source types"""
@@ -28,15 +33,73 @@ class ManifoldType(Enum):
     CUSTOM = "CUSTOM"
 
 
+# A SHA-256 digest yields 16 two-byte coordinates, so feature counts beyond
+# this never change the embedding
+MAX_EMBEDDING_DIMENSION = 16
+
+
+def _count_features(obj: Any, limit: int = MAX_EMBEDDING_DIMENSION) -> int:
+    """Number of numeric leaves in obj, counting stops at limit"""
+    count = 0
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (int, float)):
+            count += 1
+            if count >= limit:
+                return count
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
+
+
+def _config_digest(config: Any) -> bytes:
+    """Content digest used for the embedding (and as the memo key)"""
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).digest()
+
+
+def _prepare_chunk(
+    generator: 'RuntimeBlockGenerator',
+    source: str,
+    configs: List[Dict[str, Any]],
+    manifold_type: str
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Worker entry point: normalize + embed a chunk of configs"""
+    return [generator._prepare(ConfigSource(source), config, ManifoldType(manifold_type)) for config in configs]
+
+
+def _verify_chunk(generator: 'RuntimeBlockGenerator', blocks: List[Dict[str, Any]]) -> List[bool]:
+    """Worker entry point: integrity check for a chunk of blocks"""
+    return [generator.verify_block_integrity(block) for block in blocks]
+
+
+def _chunks(items: Sequence[Any], workers: int) -> List[Sequence[Any]]:
+    size = max(1, -(-len(items) // (workers * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
 class RuntimeBlockGenerator:
     """
     Generates unified tensor runtime blocks from external configurations.
     Implements deterministic tensor embedding and hash-chained lineage.
+    
+    Embeddings are memoized by config content digest (LRU, embedding_cache_size
+    entries), so repeated configs skip feature extraction entirely.
     """
 
-    def __init__(self, embedding_space: str = "default.v1"):
+    def __init__(self, embedding_space: str = "default.v1", embedding_cache_size: int = 4096):
         self.embedding_space = embedding_space
         self.prev_block_hash: Optional[str] = None
+        self.embedding_cache_size = embedding_cache_size
+        self._embedding_cache: 'OrderedDict[Tuple[bytes, str], Tuple[float, ...]]' = OrderedDict()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers get their own (empty) cache
+        state = self.__dict__.copy()
+        state["_embedding_cache"] = OrderedDict()
+        return state
 
     def compute_integrity_hash(self, block_data: Dict[str, Any]) -> str:
         """Compute SHA-256 hash of runtime block (deterministic)"""
@@ -51,8 +114,7 @@ class RuntimeBlockGenerator:
         }
         
         # Deterministic canonical JSON
-        canonical_json = json.dumps(hashable, sort_keys=True, separators=(',', ':'))
-        return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+        return canonical_sha256(hashable)
 
     def embed_tensor_from_config(
         self,
@@ -63,45 +125,42 @@ class RuntimeBlockGenerator:
         Derive semantic tensor coordinates from configuration.
         This is a simplified embedding — real implementation would use ML/geometric methods.
         """
-        # Extract numeric features from config for embedding
-        features = self._extract_features(config)
-        
         # Simple hash-based embedding (deterministic)
         # In production, use learned embeddings or geometric projections
-        config_str = json.dumps(config, sort_keys=True)
-        hash_bytes = hashlib.sha256(config_str.encode()).digest()
+        return self._embed_digest(_config_digest(config), config, manifold_type)
+
+    def _embed_digest(
+        self,
+        hash_bytes: bytes,
+        config: Dict[str, Any],
+        manifold_type: ManifoldType
+    ) -> Dict[str, Any]:
+        """Embedding for a config whose content digest is already known"""
+        key = (hash_bytes, manifold_type.value)
+        coordinates = self._embedding_cache.get(key)
         
-        # Convert hash to normalized coordinates
-        dimension = len(features) if features else 16
-        coordinates = [
-            (int.from_bytes(hash_bytes[i:i+2], 'big') / 65535.0) * 2 - 1
-            for i in range(0, min(dimension * 2, len(hash_bytes)), 2)
-        ]
+        if coordinates is None:
+            # Numeric features only set the dimension (capped by the digest length)
+            dimension = _count_features(config) or MAX_EMBEDDING_DIMENSION
+            
+            # Convert hash to normalized coordinates
+            coordinates = tuple(
+                (int.from_bytes(hash_bytes[i:i+2], 'big') / 65535.0) * 2 - 1
+                for i in range(0, min(dimension * 2, len(hash_bytes)), 2)
+            )
+            self._embedding_cache[key] = coordinates
+            if len(self._embedding_cache) > self.embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+        else:
+            self._embedding_cache.move_to_end(key)
         
         return {
             "embedding_space": self.embedding_space,
-            "coordinates": coordinates,
+            "coordinates": list(coordinates),
             "manifold_type": manifold_type.value,
             "dimension": len(coordinates)
         }
 
-    def _extract_features(self, config: Dict[str, Any]) -> List[float]:
-        """Extract numeric features from config for tensor embedding"""
-        features = []
-        
-        def traverse(obj: Any):
-            if isinstance(obj, (int, float)):
-                features.append(float(obj))
-            elif isinstance(obj, dict):
-                for v in obj.values():
-                    traverse(v)
-            elif isinstance(obj, list):
-                for item in obj:
-                    traverse(item)
-        
-        traverse(config)
-        return features
-
     def normalize_ipfs_config(self, ipfs_json: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize IPFS-style configuration into standard runtime params.
@@ -135,33 +194,44 @@ class RuntimeBlockGenerator:
         
         return normalized
 
-    def generate_from_ipfs(
+    def _prepare(
         self,
-        ipfs_json: Dict[str, Any],
+        source: ConfigSource,
+        config: Dict[str, Any],
+        manifold_type: ManifoldType,
+        config_json: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Normalized params and tensor embedding for one source config.
+        config_json (json.dumps(config, sort_keys=True)) lets local configs
+        reuse an encoding the caller already has.
+        """
+        if source == ConfigSource.IPFS:
+            normalized_params = self.normalize_ipfs_config(config)
+            return normalized_params, self.embed_tensor_from_config(normalized_params, manifold_type)
+        if config_json is None:
+            return config, self.embed_tensor_from_config(config, manifold_type)
+        digest = hashlib.sha256(config_json.encode()).digest()
+        return config, self._embed_digest(digest, config, manifold_type)
+
+    def _assemble_block(
+        self,
+        source: ConfigSource,
+        normalized_params: Dict[str, Any],
+        tensor_semantic: Dict[str, Any],
+        raw_config: Optional[Dict[str, Any]] = None,
         ipfs_cid: Optional[str] = None,
         capsule_bindings: Optional[List[Dict[str, Any]]] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        integrity_hash: Optional[str] = None
     ) -> Dict[str, Any]:
-        """
-        Generate unified tensor runtime block from IPFS configuration.
-        
-        Args:
-            ipfs_json: IPFS configuration JSON
-            ipfs_cid: Content Identifier (optional)
-            capsule_bindings: List of bound capsules with hashes
-            metadata: Optional metadata for the block
-        
-        Returns:
-            Complete runtime block conforming to unified_tensor_runtime_block.v1.schema.json
-        """
-        # Normalize IPFS config
-        normalized_params = self.normalize_ipfs_config(ipfs_json)
-        
-        # Generate tensor embedding
-        tensor_semantic = self.embed_tensor_from_config(
-            normalized_params,
-            manifold_type=ManifoldType.EUCLIDEAN
-        )
+        """Build, hash and chain a runtime block (integrity_hash if already known)"""
+        runtime_config = {
+            "config_source": source.value,
+            "normalized_params": normalized_params
+        }
+        if raw_config is not None:
+            runtime_config["raw_config"] = raw_config  # Keep original for audit
         
         # Build runtime block
         block = {
@@ -169,11 +239,7 @@ class RuntimeBlockGenerator:
             "schema_version": "tensor.runtime.v1",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "tensor_semantic": tensor_semantic,
-            "runtime_config": {
-                "config_source": ConfigSource.IPFS.value,
-                "normalized_params": normalized_params,
-                "raw_config": ipfs_json  # Keep original for audit
-            },
+            "runtime_config": runtime_config,
             "prev_block_hash": self.prev_block_hash
         }
         
@@ -187,13 +253,43 @@ class RuntimeBlockGenerator:
             block["metadata"] = metadata
         
         # Compute integrity hash
-        block["integrity_hash"] = self.compute_integrity_hash(block)
+        block["integrity_hash"] = integrity_hash or self.compute_integrity_hash(block)
         
         # Update chain
         self.prev_block_hash = block["integrity_hash"]
         
         return block
 
+    def generate_from_ipfs(
+        self,
+        ipfs_json: Dict[str, Any],
+        ipfs_cid: Optional[str] = None,
+        capsule_bindings: Optional[List[Dict[str, Any]]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate unified tensor runtime block from IPFS configuration.
+        
+        Args:
+            ipfs_json: IPFS configuration JSON
+            ipfs_cid: Content Identifier (optional)
+            capsule_bindings: List of bound capsules with hashes
+            metadata: Optional metadata for the block
+        
+        Returns:
+            Complete runtime block conforming to unified_tensor_runtime_block.v1.schema.json
+        """
+        normalized_params, tensor_semantic = self._prepare(
+            ConfigSource.IPFS, ipfs_json, ManifoldType.EUCLIDEAN
+        )
+        return self._assemble_block(
+            ConfigSource.IPFS, normalized_params, tensor_semantic,
+            raw_config=ipfs_json,
+            ipfs_cid=ipfs_cid,
+            capsule_bindings=capsule_bindings,
+            metadata=metadata
+        )
+
     def generate_from_local(
         self,
         config: Dict[str, Any],
@@ -204,35 +300,112 @@ class RuntimeBlockGenerator:
         """
         Generate unified tensor runtime block from local configuration.
         """
-        # Generate tensor embedding
-        tensor_semantic = self.embed_tensor_from_config(config, manifold_type)
-        
-        # Build runtime block
-        block = {
-            "block_id": str(uuid.uuid4()),
-            "schema_version": "tensor.runtime.v1",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "tensor_semantic": tensor_semantic,
-            "runtime_config": {
-                "config_source": ConfigSource.LOCAL.value,
-                "normalized_params": config
-            },
-            "prev_block_hash": self.prev_block_hash
-        }
+        normalized_params, tensor_semantic = self._prepare(ConfigSource.LOCAL, config, manifold_type)
+        return self._assemble_block(
+            ConfigSource.LOCAL, normalized_params, tensor_semantic,
+            capsule_bindings=capsule_bindings,
+            metadata=metadata
+        )
+
+    def generate_batch(
+        self,
+        configs: Sequence[Dict[str, Any]],
+        source: ConfigSource = ConfigSource.LOCAL,
+        manifold_type: ManifoldType = ManifoldType.EUCLIDEAN,
+        capsule_bindings: Optional[List[Dict[str, Any]]] = None,
+        metadata: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        ipfs_cids: Optional[Sequence[Optional[str]]] = None,
+        workers: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate a chained run of blocks from many configs in one pass.
         
-        if capsule_bindings:
-            block["capsule_bindings"] = capsule_bindings
+        Identical configs are normalized and embedded once. With workers > 1,
+        normalization and embedding run in a process pool; blocks are still
+        assembled and chained in input order, so the result matches calling
+        generate_from_ipfs / generate_from_local for each config in turn.
         
-        if metadata:
-            block["metadata"] = metadata
+        Args:
+            configs: Source configurations (IPFS JSON or local params)
+            source: ConfigSource.IPFS or ConfigSource.LOCAL
+            manifold_type: Embedding manifold (IPFS blocks always use EUCLIDEAN)
+            capsule_bindings: Bindings shared by every block
+            metadata: Optional per-config metadata (same length as configs)
+            ipfs_cids: Optional per-config CIDs (IPFS only)
+            workers: Worker processes for normalization + embedding
         
-        # Compute integrity hash
-        block["integrity_hash"] = self.compute_integrity_hash(block)
+        Returns:
+            Runtime blocks in input order
+        """
+        if source not in (ConfigSource.IPFS, ConfigSource.LOCAL):
+            raise ValueError(f"Unsupported batch source: {source.value}")
+        if source == ConfigSource.IPFS:
+            manifold_type = ManifoldType.EUCLIDEAN
         
-        # Update chain
-        self.prev_block_hash = block["integrity_hash"]
+        if workers > 1 and len(configs) > 1:
+            # Workers encode, normalize and embed; repeats hit each worker's memo
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_prepare_chunk, self, source.value, list(chunk), manifold_type.value)
+                    for chunk in _chunks(configs, workers)
+                ]
+                prepared = [item for future in futures for item in future.result()]
+            slots = list(range(len(configs)))
+        else:
+            # Deduplicate by content so each distinct config is prepared once
+            unique: Dict[str, int] = {}
+            slots = []
+            prepared = []
+            for config in configs:
+                config_json = json.dumps(config, sort_keys=True)
+                slot = unique.get(config_json)
+                if slot is None:
+                    slot = unique[config_json] = len(prepared)
+                    prepared.append(self._prepare(source, config, manifold_type, config_json))
+                slots.append(slot)
         
-        return block
+        # Identical prepared configs share an integrity hash (bindings are per batch)
+        integrity_hashes: Dict[int, str] = {}
+        blocks = []
+        for i, (config, slot) in enumerate(zip(configs, slots)):
+            normalized_params, tensor_semantic = prepared[slot]
+            block = self._assemble_block(
+                source,
+                normalized_params,
+                dict(tensor_semantic, coordinates=list(tensor_semantic["coordinates"])),
+                raw_config=config if source == ConfigSource.IPFS else None,
+                ipfs_cid=ipfs_cids[i] if ipfs_cids else None,
+                capsule_bindings=capsule_bindings,
+                metadata=metadata[i] if metadata else None,
+                integrity_hash=integrity_hashes.get(slot)
+            )
+            integrity_hashes[slot] = block["integrity_hash"]
+            blocks.append(block)
+        return blocks
+
+    def generate_from_directory(
+        self,
+        directory: str,
+        source: ConfigSource = ConfigSource.LOCAL,
+        manifold_type: ManifoldType = ManifoldType.EUCLIDEAN,
+        workers: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate blocks for every *.json config in a directory (sorted by name).
+        Each block records its file in metadata["source_file"].
+        """
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+        configs = []
+        for name in names:
+            with open(os.path.join(directory, name), 'r') as f:
+                configs.append(json.load(f))
+        return self.generate_batch(
+            configs,
+            source=source,
+            manifold_type=manifold_type,
+            metadata=[{"source_file": name} for name in names],
+            workers=workers
+        )
 
     def verify_block_integrity(self, block: Dict[str, Any]) -> bool:
         """Verify integrity hash of a runtime block"""
@@ -240,24 +413,25 @@ class RuntimeBlockGenerator:
         computed_hash = self.compute_integrity_hash(block)
         return claimed_hash == computed_hash
 
-    def verify_chain(self, blocks: List[Dict[str, Any]]) -> bool:
+    def verify_blocks(self, blocks: Sequence[Dict[str, Any]], workers: int = 1) -> List[bool]:
+        """Integrity check for many blocks (optionally across a process pool)"""
+        if workers > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_verify_chunk, self, list(chunk)) for chunk in _chunks(blocks, workers)]
+                return [ok for future in futures for ok in future.result()]
+        return [self.verify_block_integrity(block) for block in blocks]
+
+    def verify_chain(self, blocks: List[Dict[str, Any]], workers: int = 1) -> bool:
         """Verify Merkle chain of runtime blocks"""
+        # Verify links first (cheap), then integrity in bulk
         for i in range(1, len(blocks)):
-            current = blocks[i]
-            previous = blocks[i - 1]
-            
-            # Verify integrity
-            if not self.verify_block_integrity(current):
-                return False
-            
-            # Verify link
-            expected_prev = previous["integrity_hash"]
-            actual_prev = current["prev_block_hash"]
+            expected_prev = blocks[i - 1]["integrity_hash"]
+            actual_prev = blocks[i]["prev_block_hash"]
             
             if expected_prev != actual_prev:
                 return False
         
-        return True
+        return all(self.verify_blocks(blocks[1:], workers=workers))
 
 
 # Example usage
@@ -0,0 +1,352 @@
+"""
+Compiled JSON Schema validators for the schemas/ directory.
+Each schema is compiled once into nested closures, so validating a document
+is a handful of type checks instead of a generic keyword traversal.
+
+Covers the draft-07 keywords our schemas use. Results match
+jsonschema.Draft7Validator (format is an annotation there too, so it is not
+asserted here either). Schemas using other keywords fall back to jsonschema.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+
+SCHEMA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'schemas'))
+
+# Keywords that never affect validity
+_ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "default", "examples", "format"}
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: type(v) is dict,
+    "array": lambda v: type(v) is list,
+    "string": lambda v: type(v) is str,
+    "boolean": lambda v: type(v) is bool,
+    "null": lambda v: v is None,
+    "number": lambda v: type(v) in (int, float),
+    "integer": lambda v: type(v) is int or (type(v) is float and v.is_integer()),
+}
+
+# Check(instance, path, errors) -> bool. errors=None means stop at the first
+# failure without building messages (the is_valid fast path).
+Check = Callable[[Any, str, Optional[List[str]]], bool]
+
+
+class SchemaValidationError(ValueError):
+    """Document does not conform to its schema"""
+
+    def __init__(self, schema_name: str, errors: List[str]):
+        self.schema_name = schema_name
+        self.errors = errors
+        super().__init__(f"{schema_name}: {'; '.join(errors)}")
+
+
+class UnsupportedSchemaError(ValueError):
+    """Schema uses a keyword the compiler does not implement"""
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """JSON equality (True != 1, 1 == 1.0), as used by enum/const"""
+    if type(a) is bool or type(b) is bool:
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _fail(errors: Optional[List[str]], path: str, message: str) -> bool:
+    if errors is not None:
+        errors.append(f"{path}: {message}")
+    return False
+
+
+def _compile(schema: Any) -> Check:
+    """Compile one schema node into a check closure"""
+    if schema is True or schema == {}:
+        return lambda instance, path, errors: True
+    if schema is False:
+        return lambda instance, path, errors: _fail(errors, path, "not allowed")
+    if not isinstance(schema, dict):
+        raise UnsupportedSchemaError(f"Schema node must be an object or boolean: {schema!r}")
+
+    unknown = set(schema) - _ANNOTATIONS - {
+        "type", "enum", "const", "required", "properties", "additionalProperties",
+        "items", "minItems", "maxItems", "minimum", "maximum", "exclusiveMinimum",
+        "exclusiveMaximum", "minLength", "maxLength", "pattern"
+    }
+    if unknown:
+        raise UnsupportedSchemaError(f"Unsupported keywords: {sorted(unknown)}")
+
+    checks: List[Check] = []
+
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        type_checks = tuple(_TYPE_CHECKS[t] for t in types)
+        type_label = " or ".join(types)
+
+        def check_type(instance, path, errors):
+            for is_type in type_checks:
+                if is_type(instance):
+                    return True
+            return _fail(errors, path, f"{instance!r} is not of type {type_label}")
+        checks.append(check_type)
+
+    if "enum" in schema:
+        options = schema["enum"]
+
+        def check_enum(instance, path, errors):
+            for option in options:
+                if _json_equal(instance, option):
+                    return True
+            return _fail(errors, path, f"{instance!r} is not one of {options!r}")
+        checks.append(check_enum)
+
+    if "const" in schema:
+        expected = schema["const"]
+
+        def check_const(instance, path, errors):
+            return _json_equal(instance, expected) or _fail(errors, path, f"{expected!r} was expected")
+        checks.append(check_const)
+
+    checks.extend(_compile_numeric(schema))
+    checks.extend(_compile_string(schema))
+    checks.extend(_compile_array(schema))
+    checks.extend(_compile_object(schema))
+
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+
+    def check_all(instance, path, errors):
+        valid = True
+        for check in checks:
+            if not check(instance, path, errors):
+                if errors is None:
+                    return False
+                valid = False
+        return valid
+    return check_all
+
+
+def _compile_numeric(schema: Dict[str, Any]) -> List[Check]:
+    bounds = [
+        (keyword, schema[keyword], compare)
+        for keyword, compare in (
+            ("minimum", lambda v, b: v >= b),
+            ("maximum", lambda v, b: v <= b),
+            ("exclusiveMinimum", lambda v, b: v > b),
+            ("exclusiveMaximum", lambda v, b: v < b),
+        )
+        if keyword in schema
+    ]
+    if not bounds:
+        return []
+
+    def check_bounds(instance, path, errors):
+        if type(instance) not in (int, float):
+            return True
+        valid = True
+        for keyword, bound, compare in bounds:
+            if not compare(instance, bound):
+                valid = _fail(errors, path, f"{instance!r} violates {keyword} {bound!r}")
+                if errors is None:
+                    return False
+        return valid
+    return [check_bounds]
+
+
+def _compile_string(schema: Dict[str, Any]) -> List[Check]:
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+    if min_length is None and max_length is None and pattern is None:
+        return []
+
+    def check_string(instance, path, errors):
+        if type(instance) is not str:
+            return True
+        valid = True
+        if min_length is not None and len(instance) < min_length:
+            valid = _fail(errors, path, f"{instance!r} is shorter than {min_length}")
+        if max_length is not None and len(instance) > max_length:
+            valid = _fail(errors, path, f"{instance!r} is longer than {max_length}")
+        if not valid and errors is None:
+            return False
+        if pattern is not None and not pattern.search(instance):
+            valid = _fail(errors, path, f"{instance!r} does not match {pattern.pattern!r}")
+        return valid
+    return [check_string]
+
+
+def _compile_array(schema: Dict[str, Any]) -> List[Check]:
+    checks: List[Check] = []
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+
+    if min_items is not None or max_items is not None:
+        def check_size(instance, path, errors):
+            if type(instance) is not list:
+                return True
+            if min_items is not None and len(instance) < min_items:
+                return _fail(errors, path, f"expected at least {min_items} items")
+            if max_items is not None and len(instance) > max_items:
+                return _fail(errors, path, f"expected at most {max_items} items")
+            return True
+        checks.append(check_size)
+
+    items = schema.get("items")
+    if isinstance(items, list):
+        item_checks = tuple(_compile(s) for s in items)
+
+        def check_tuple(instance, path, errors):
+            if type(instance) is not list:
+                return True
+            valid = True
+            for i, (check, item) in enumerate(zip(item_checks, instance)):
+                if not check(item, f"{path}[{i}]", errors):
+                    if errors is None:
+                        return False
+                    valid = False
+            return valid
+        checks.append(check_tuple)
+    elif items is not None and items is not True and items != {}:
+        item_check = _compile(items)
+
+        def check_items(instance, path, errors):
+            if type(instance) is not list:
+                return True
+            if errors is None:
+                for item in instance:
+                    if not item_check(item, path, None):
+                        return False
+                return True
+            valid = True
+            for i, item in enumerate(instance):
+                if not item_check(item, f"{path}[{i}]", errors):
+                    valid = False
+            return valid
+        checks.append(check_items)
+
+    return checks
+
+
+def _compile_object(schema: Dict[str, Any]) -> List[Check]:
+    required = tuple(schema.get("required", ()))
+    properties = tuple(
+        (name, _compile(subschema)) for name, subschema in schema.get("properties", {}).items()
+    )
+    known = frozenset(schema.get("properties", {}))
+    additional = schema.get("additionalProperties", True)
+    additional_check = None if additional is True or additional == {} else _compile(additional)
+    if not required and not properties and additional_check is None:
+        return []
+
+    def check_object(instance, path, errors):
+        if type(instance) is not dict:
+            return True
+        valid = True
+        for name in required:
+            if name not in instance:
+                valid = _fail(errors, path, f"{name!r} is a required property")
+                if errors is None:
+                    return False
+        for name, check in properties:
+            if name in instance and not check(
+                instance[name], f"{path}.{name}" if errors is not None else path, errors
+            ):
+                if errors is None:
+                    return False
+                valid = False
+        if additional_check is not None:
+            for name in instance:
+                if name not in known and not additional_check(instance[name], f"{path}.{name}", errors):
+                    if errors is None:
+                        return False
+                    valid = False
+        return valid
+    return [check_object]
+
+
+class CompiledValidator:
+    """
+    Validator callable for one schema.
+
+    Example:
+        validator = get_validator("sim_telemetry")
+        validator.is_valid(payload)      # fast path, no error messages
+        validator.validate(payload)      # raises SchemaValidationError
+    """
+
+    def __init__(self, schema: Dict[str, Any], name: str = "schema"):
+        self.schema = schema
+        self.name = name
+        self.compiled = True
+        try:
+            self._check = _compile(schema)
+        except UnsupportedSchemaError:
+            # Optional dependency: only needed for schemas outside the compiled subset
+            import jsonschema
+            self.compiled = False
+            self._check = self._jsonschema_check(jsonschema.Draft7Validator(schema))
+
+    @staticmethod
+    def _jsonschema_check(validator: Any) -> Check:
+        def check(instance, path, errors):
+            if errors is None:
+                return validator.is_valid(instance)
+            found = [
+                f"{path}{''.join(f'[{p}]' if isinstance(p, int) else f'.{p}' for p in e.absolute_path)}: {e.message}"
+                for e in validator.iter_errors(instance)
+            ]
+            errors.extend(found)
+            return not found
+        return check
+
+    def is_valid(self, instance: Any) -> bool:
+        """True if instance conforms (stops at the first failure)"""
+        return self._check(instance, "$", None)
+
+    def errors(self, instance: Any) -> List[str]:
+        """All violations as "path: message" strings"""
+        errors: List[str] = []
+        self._check(instance, "$", errors)
+        return errors
+
+    def validate(self, instance: Any) -> None:
+        """Raise SchemaValidationError if instance does not conform"""
+        if not self._check(instance, "$", None):
+            raise SchemaValidationError(self.name, self.errors(instance))
+
+    __call__ = is_valid
+
+
+def load_schema(name: str, schema_dir: str = SCHEMA_DIR) -> Dict[str, Any]:
+    """Load schemas/<name>.v1.schema.json (or an exact file name)"""
+    filename = name if name.endswith('.json') else f"{name}.v1.schema.json"
+    with open(os.path.join(schema_dir, filename), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def _cached_validator(name: str, schema_dir: str) -> CompiledValidator:
+    return CompiledValidator(load_schema(name, schema_dir), name)
+
+
+def get_validator(name: str, schema_dir: str = SCHEMA_DIR) -> CompiledValidator:
+    """Compiled validator for a named schema (compiled once per process)"""
+    return _cached_validator(name, os.path.abspath(schema_dir))
+
+
+def precompile_all(schema_dir: str = SCHEMA_DIR) -> Dict[str, CompiledValidator]:
+    """Compile every *.schema.json up front (call at startup)"""
+    validators = {}
+    for filename in sorted(os.listdir(schema_dir)):
+        if filename.endswith('.v1.schema.json'):
+            name = filename[:-len('.v1.schema.json')]
+            validators[name] = get_validator(name, schema_dir)
+    return validators
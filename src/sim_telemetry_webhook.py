@@ -15,6 +15,8 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 
+from schema_validator import get_validator
+
 
 @dataclass
 class SimTelemetryPayload:
@@ -91,7 +93,8 @@ class WebhookEmitter:
         self,
         webhook_url: Optional[str] = None,
         local_storage: bool = True,
-        storage_file: str = "telemetry_log.ndjson"
+        storage_file: str = "telemetry_log.ndjson",
+        validate_schema: bool = False
     ):
         """
         Initialize webhook emitter.
@@ -100,10 +103,12 @@ class WebhookEmitter:
             webhook_url: Zapier/Canvas webhook URL (None = dry run)
             local_storage: Save payloads locally as NDJSON
             storage_file: Local storage file path
+            validate_schema: Reject payloads that fail sim_telemetry.v1.schema.json
         """
         self.webhook_url = webhook_url
         self.local_storage = local_storage
         self.storage_file = storage_file
+        self.validator = get_validator("sim_telemetry") if validate_schema else None
         self.payloads_sent = 0
         self.errors = []
     
@@ -119,6 +124,13 @@ class WebhookEmitter:
         """
         success = True
         
+        # Schema gate (compiled validator, fast path first)
+        if self.validator is not None:
+            record = payload.to_dict()
+            if not self.validator.is_valid(record):
+                self.errors.append(f"Schema error: {'; '.join(self.validator.errors(record))}")
+                return False
+        
         # Store locally
         if self.local_storage:
             try:
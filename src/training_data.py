@@ -0,0 +1,389 @@
+"""
+Columnar Training Data Store
+Chunked, fixed-dtype column blocks with per-chunk hashes for deterministic
+training datasets. Replaces one-JSON-object-per-line exports for large runs.
+
+Layout of a dataset directory:
+    manifest.json          columns, chunk table, dataset hash
+    chunk_000000.bin       one block per column, back to back
+    ...
+
+Each column block is the column's little-endian bytes, optionally zlib or
+lzma compressed. A chunk's sha256 covers its uncompressed column bytes in
+column order, so the hash does not depend on the compression setting.
+Uncompressed datasets are read through np.memmap; compressed ones are
+decoded one chunk at a time.
+"""
+
+import hashlib
+import json
+import lzma
+import os
+import zlib
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from canonical_json import canonical_sha256
+
+FORMAT_VERSION = "rtcol.v1"
+MANIFEST_NAME = "manifest.json"
+COMPRESSIONS = (None, "zlib", "lzma")
+
+
+class TrainingDataError(ValueError):
+    """Malformed dataset or failed chunk integrity check"""
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    One stored column.
+
+    path locates the value in an NDJSON training record, e.g.
+    ('state', 'wheel_speeds', 0). Categorical columns store an index into
+    categories and map back to the label on import/export.
+    """
+    name: str
+    dtype: str  # numpy dtype name, e.g. 'float64', 'int64', 'int8'
+    path: Tuple[Any, ...]
+    categories: Optional[Tuple[str, ...]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['path'] = list(self.path)
+        data['categories'] = list(self.categories) if self.categories is not None else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ColumnSpec':
+        categories = data.get('categories')
+        return cls(
+            name=data['name'],
+            dtype=data['dtype'],
+            path=tuple(data['path']),
+            categories=tuple(categories) if categories is not None else None
+        )
+
+
+def _compress(data: bytes, compression: Optional[str], level: Optional[int]) -> bytes:
+    if compression is None:
+        return data
+    if compression == "zlib":
+        return zlib.compress(data, 6 if level is None else level)
+    return lzma.compress(data, preset=6 if level is None else level)
+
+
+def _decompress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression is None:
+        return data
+    if compression == "zlib":
+        return zlib.decompress(data)
+    return lzma.decompress(data)
+
+
+class ColumnarWriter:
+    """
+    Append column blocks and cut them into fixed-size chunks.
+
+    Blocks are either a {name: array} dict or a (num_columns, n) array in
+    column order; values are cast to each column's dtype. close() writes
+    the manifest, so a dataset without one is incomplete.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: Sequence[ColumnSpec],
+        chunk_rows: int=65536,
+        compression: Optional[str]=None,
+        level: Optional[int]=None,
+        metadata: Optional[Dict[str, Any]]=None
+    ):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {COMPRESSIONS}")
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+
+        self.path = path
+        self.columns = list(columns)
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        self.level = level
+        self.metadata = metadata or {}
+        self.dtypes = [np.dtype(c.dtype).newbyteorder('<') for c in self.columns]
+
+        # Pending rows, one preallocated array per column
+        self._pending = [np.empty(chunk_rows, dtype=dtype) for dtype in self.dtypes]
+        self._pending_rows = 0
+        self.chunks: List[Dict[str, Any]] = []
+        self.num_rows = 0
+        self.closed = False
+
+        os.makedirs(path, exist_ok=True)
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    def write(self, block: Union[Dict[str, np.ndarray], np.ndarray]) -> None:
+        """Append rows given as {name: column} or a (num_columns, n) array."""
+        if isinstance(block, dict):
+            block = [block[c.name] for c in self.columns]
+        elif len(block) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} columns, got {len(block)}")
+
+        n = len(block[0])
+        start = 0
+        while start < n:
+            take = min(n - start, self.chunk_rows - self._pending_rows)
+            end = self._pending_rows + take
+            for pending, column in zip(self._pending, block):
+                pending[self._pending_rows:end] = column[start:start + take]
+            self._pending_rows = end
+            start += take
+            if self._pending_rows == self.chunk_rows:
+                self._flush()
+
+    def _flush(self) -> None:
+        rows = self._pending_rows
+        if rows == 0:
+            return
+
+        name = f"chunk_{len(self.chunks):06d}.bin"
+        digest = hashlib.sha256()
+        offsets = []
+        tmp_path = os.path.join(self.path, name + '.tmp')
+        with open(tmp_path, 'wb') as out:
+            for pending in self._pending:
+                raw = pending[:rows].tobytes()
+                digest.update(raw)
+                data = _compress(raw, self.compression, self.level)
+                offsets.append([out.tell(), len(data)])
+                out.write(data)
+        os.replace(tmp_path, os.path.join(self.path, name))
+
+        self.chunks.append({"file": name, "rows": rows, "sha256": digest.hexdigest(), "columns": offsets})
+        self.num_rows += rows
+        self._pending_rows = 0
+
+    def close(self) -> Dict[str, Any]:
+        """Flush the last partial chunk and write the manifest."""
+        if self.closed:
+            return self.manifest
+        self._flush()
+
+        columns = [c.to_dict() for c in self.columns]
+        self.manifest = {
+            "format": FORMAT_VERSION,
+            "columns": columns,
+            "chunk_rows": self.chunk_rows,
+            "compression": self.compression,
+            "num_rows": self.num_rows,
+            "chunks": self.chunks,
+            "dataset_hash": dataset_hash(columns, [c["sha256"] for c in self.chunks]),
+            "metadata": self.metadata
+        }
+
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, manifest_path)
+
+        self.closed = True
+        return self.manifest
+
+
+def dataset_hash(columns: List[Dict[str, Any]], chunk_hashes: List[str]) -> str:
+    """Hash over the column schema and chunk hashes (independent of compression)."""
+    schema = [{"name": c["name"], "dtype": c["dtype"]} for c in columns]
+    return canonical_sha256({"format": FORMAT_VERSION, "columns": schema, "chunks": chunk_hashes})
+
+
+class ColumnarDataset:
+    """
+    Read side of a columnar dataset.
+
+    Nothing is loaded on open: chunks are memory-mapped (uncompressed) or
+    decoded on demand (compressed), one at a time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            raise TrainingDataError(f"No {MANIFEST_NAME} in {path} (incomplete or not a dataset)")
+        with open(manifest_path, 'r') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != FORMAT_VERSION:
+            raise TrainingDataError(f"Unsupported dataset format: {self.manifest.get('format')}")
+
+        self.columns = [ColumnSpec.from_dict(c) for c in self.manifest["columns"]]
+        self.column_names = [c.name for c in self.columns]
+        self._index = {name: i for i, name in enumerate(self.column_names)}
+        self.dtypes = [np.dtype(c.dtype).newbyteorder('<') for c in self.columns]
+        self.compression = self.manifest["compression"]
+        self.chunks = self.manifest["chunks"]
+        self.num_rows = self.manifest["num_rows"]
+        self.dataset_hash = self.manifest["dataset_hash"]
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def column_index(self, name: str) -> int:
+        try:
+            return self._index[name]
+        except KeyError:
+            raise KeyError(f"Unknown column: {name}") from None
+
+    def _read_column(self, chunk: Dict[str, Any], i: int) -> np.ndarray:
+        offset, length = chunk["columns"][i]
+        filepath = os.path.join(self.path, chunk["file"])
+        if self.compression is None:
+            if chunk["rows"] == 0:
+                return np.empty(0, dtype=self.dtypes[i])
+            return np.memmap(filepath, dtype=self.dtypes[i], mode='r', offset=offset, shape=(chunk["rows"],))
+        with open(filepath, 'rb') as f:
+            f.seek(offset)
+            raw = _decompress(f.read(length), self.compression)
+        return np.frombuffer(raw, dtype=self.dtypes[i])
+
+    def iter_chunks(
+        self,
+        columns: Optional[Sequence[str]]=None,
+        verify: bool=False
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yield {name: array} per chunk. Arrays are read-only views.
+        verify=True decodes every column to check the chunk hash.
+        """
+        names = list(columns) if columns is not None else self.column_names
+        wanted = [self.column_index(name) for name in names]
+        for chunk in self.chunks:
+            if verify:
+                arrays = [self._read_column(chunk, i) for i in range(len(self.columns))]
+                self._check(chunk, arrays)
+                yield {name: arrays[i] for name, i in zip(names, wanted)}
+            else:
+                yield {name: self._read_column(chunk, i) for name, i in zip(names, wanted)}
+
+    def _check(self, chunk: Dict[str, Any], arrays: List[np.ndarray]) -> None:
+        digest = hashlib.sha256()
+        for array in arrays:
+            digest.update(np.ascontiguousarray(array).tobytes())
+        if digest.hexdigest() != chunk["sha256"]:
+            raise TrainingDataError(f"Chunk {chunk['file']} failed integrity check")
+
+    def verify(self) -> bool:
+        """Check every chunk hash and the dataset hash."""
+        for _ in self.iter_chunks(verify=True):
+            pass
+        expected = dataset_hash(self.manifest["columns"], [c["sha256"] for c in self.chunks])
+        if expected != self.dataset_hash:
+            raise TrainingDataError("Dataset hash does not match chunk table")
+        return True
+
+    def read_column(self, name: str) -> np.ndarray:
+        """Whole column as one array."""
+        i = self.column_index(name)
+        out = np.empty(self.num_rows, dtype=self.dtypes[i])
+        start = 0
+        for chunk in self.chunks:
+            rows = chunk["rows"]
+            out[start:start + rows] = self._read_column(chunk, i)
+            start += rows
+        return out
+
+    def read_matrix(self, names: Sequence[str], dtype=np.float32) -> np.ndarray:
+        """(num_rows, len(names)) matrix filled chunk by chunk."""
+        out = np.empty((self.num_rows, len(names)), dtype=dtype)
+        start = 0
+        for block in self.iter_chunks(names):
+            rows = len(block[names[0]]) if names else 0
+            for j, name in enumerate(names):
+                out[start:start + rows, j] = block[name]
+            start += rows
+        return out
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Rebuild nested NDJSON-style records from column paths."""
+        for block in self.iter_chunks():
+            columns = [block[c.name].tolist() for c in self.columns]
+            for j in range(len(columns[0]) if columns else 0):
+                record: Dict[str, Any] = {}
+                for spec, values in zip(self.columns, columns):
+                    value = values[j]
+                    if spec.categories is not None:
+                        value = spec.categories[value]
+                    _set_path(record, spec.path, value)
+                yield record
+
+
+def _set_path(record: Dict[str, Any], path: Tuple[Any, ...], value: Any) -> None:
+    """Place value at path; integer path parts append to lists in column order."""
+    node = record
+    for key, nxt in zip(path[:-1], path[1:]):
+        if key not in node:
+            node[key] = {} if not isinstance(nxt, int) else []
+        node = node[key]
+    last = path[-1]
+    if isinstance(last, int):
+        node.append(value)
+    else:
+        node[last] = value
+
+
+def _get_path(record: Dict[str, Any], path: Tuple[Any, ...]) -> Any:
+    node = record
+    for key in path:
+        node = node[key]
+    return node
+
+
+def import_ndjson(
+    ndjson_path: str,
+    path: str,
+    columns: Sequence[ColumnSpec],
+    chunk_rows: int=65536,
+    compression: Optional[str]=None,
+    level: Optional[int]=None
+) -> Dict[str, Any]:
+    """
+    Stream an NDJSON training file into a columnar dataset.
+    Only chunk_rows records are held in memory at a time.
+    """
+    columns = list(columns)
+    lookups = []
+    for spec in columns:
+        labels = {label: i for i, label in enumerate(spec.categories)} if spec.categories is not None else None
+        lookups.append((spec.path, labels))
+
+    metadata = {"source": os.path.basename(ndjson_path)}
+    with ColumnarWriter(path, columns, chunk_rows, compression, level, metadata) as writer:
+        pending: List[List[Any]] = [[] for _ in columns]
+        with open(ndjson_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                for values, (spec_path, labels) in zip(pending, lookups):
+                    value = _get_path(record, spec_path)
+                    values.append(labels[value] if labels is not None else value)
+                if len(pending[0]) == chunk_rows:
+                    writer.write(pending)
+                    pending = [[] for _ in columns]
+        if pending[0]:
+            writer.write(pending)
+    return writer.manifest
+
+
+def is_columnar_dataset(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
@@ -0,0 +1,45 @@
+"""
+Shared fixtures for the forest, registry and fleet tests.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from racing_simulator import ControlInput, RacingSimulator
+
+
+def quiet(fn, *args, **kwargs):
+    """Call fn with stdout discarded."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def simulator_records(seed, steps):
+    """{'state', 'action'} records of a RacingSimulator driven by random controls."""
+    sim = RacingSimulator(seed=seed)
+    rng = np.random.RandomState(seed)
+    for _ in range(steps):
+        control = ControlInput(float(rng.uniform(-0.5, 0.5)), float(rng.rand()), float(rng.rand() * 0.3))
+        quiet(sim.step, control)
+    records = list(sim.state_action_history)
+    for record in records:
+        record['state']['current_section'] = record['state']['current_section'].value
+    return records
+
+
+def synthetic_controls(seed, rows):
+    """(rows, 37) float32 features and steering / throttle / brake targets that depend on them."""
+    X = np.random.RandomState(seed).randn(rows, 37).astype(np.float32)
+    y = {
+        'steering': np.tanh(X[:, 0]),
+        'throttle': 1 / (1 + np.exp(-X[:, 1])),
+        'brake': np.clip(X[:, 2], 0, 1)
+    }
+    return X, y
@@ -0,0 +1,230 @@
+"""
+Unit tests for the shared canonical JSON encoder.
+
+Every hash-chained record in the repo used to call json.dumps directly; these
+vectors pin the shared encoder to those exact bytes so existing ledgers,
+checkpoints and receipts keep verifying.
+"""
+
+import hashlib
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Add src path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from canonical_json import (
+    CanonicalEncoder,
+    CanonicalSchema,
+    canonical_bytes,
+    canonical_dumps,
+    canonical_sha256_stream,
+    reject_floats
+)
+from ledger import Account, LedgerEntry, Transaction, TransactionType
+from game_engine import GameEngine, IndustrySector, OperationType
+from checkpoint import compute_checkpoint_cid, compute_state_hash, create_checkpoint
+from highway_battle.battle_manager import BattleResult
+from highway_battle.sp_system import SPState
+
+
+def legacy_dumps(obj, ensure_ascii=True):
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=ensure_ascii)
+
+
+def legacy_sha256(obj, ensure_ascii=True):
+    return hashlib.sha256(legacy_dumps(obj, ensure_ascii).encode('utf-8')).hexdigest()
+
+
+VECTORS = [
+    {},
+    [],
+    {"b": 1, "a": [1, 2.5, None, True, False], "c": {"z": "x", "y": {}}},
+    {"unicode": "Nürburgring — 東京", "escape": "quote\" slash\\ tab\t nl\n \x01"},
+    {"floats": [0.1, 1e-7, 1e21, -0.0, 123456789.123456789, 2 ** 0.5]},
+    {"ints": [0, -1, 2 ** 63, -(2 ** 70)], "nested": [[{"k": [{}]}]]},
+    {"Z": 1, "a": 2, "_": 3, "é": 4, "10": 5, "9": 6},
+    "bare string",
+    12.75,
+    None,
+]
+
+
+class TestCanonicalEncoder(unittest.TestCase):
+
+    def test_matches_json_dumps_both_profiles(self):
+        for ensure_ascii in (True, False):
+            for obj in VECTORS:
+                self.assertEqual(canonical_dumps(obj, ensure_ascii), legacy_dumps(obj, ensure_ascii))
+                self.assertEqual(
+                    canonical_bytes(obj, ensure_ascii),
+                    legacy_dumps(obj, ensure_ascii).encode('utf-8')
+                )
+
+    def test_stream_matches_one_shot(self):
+        large = {
+            "companies": [{"id": f"c{i}", "cash": i * 1.5, "tags": ["ü"] * (i % 4)} for i in range(5000)],
+            "market": {"tick": 9, "demand": 0.75}
+        }
+        for obj in VECTORS + [large]:
+            for ensure_ascii in (True, False):
+                self.assertEqual(
+                    canonical_sha256_stream(obj, ensure_ascii),
+                    legacy_sha256(obj, ensure_ascii)
+                )
+
+    def test_stream_small_flush_threshold(self):
+        encoder = CanonicalEncoder(stream_depth=4)
+        encoder.FLUSH_BYTES = 7
+        obj = VECTORS[2]
+        self.assertEqual(encoder.sha256_stream(obj), legacy_sha256(obj))
+
+    def test_schema_matches_dict_encoding(self):
+        schema = CanonicalSchema(("tick", "amount_usd", "metadata", "Name", "from"))
+        values = (5, 12.5, {"b": [1, None], "a": "é"}, None, "x")
+        record = dict(zip(schema.keys, values))
+        self.assertEqual(schema.encode(*values), legacy_dumps(record))
+        self.assertEqual(schema.encode_dict(record), legacy_dumps(record))
+        self.assertEqual(schema.sha256(*values), legacy_sha256(record))
+
+        with self.assertRaises(ValueError):
+            schema.encode(1, 2)
+
+    def test_reject_floats(self):
+        reject_floats({"a": [1, "x", None, True, {"b": 2}]})
+        with self.assertRaises(ValueError):
+            reject_floats({"a": [1, {"b": 2.0}]})
+
+
+class TestCrossModuleVectors(unittest.TestCase):
+    """Each converted call site reproduces its previous json.dumps formula."""
+
+    def test_transaction_integrity_hash(self):
+        txn = Transaction(
+            transaction_id="txn_1",
+            timestamp="2026-01-01T00:00:00+00:00",
+            tick=3,
+            from_company_id="SYSTEM",
+            to_company_id="c1",
+            amount_usd=1250.5,
+            transaction_type=TransactionType.REVENUE,
+            ledger_entry=LedgerEntry(Account.CASH, Account.REVENUE),
+            prev_transaction_hash="0" * 64,
+            metadata={"note": "Ünicode ok", "units": 3}
+        )
+        data = {
+            "transaction_id": txn.transaction_id,
+            "timestamp": txn.timestamp,
+            "tick": txn.tick,
+            "from_company_id": txn.from_company_id,
+            "to_company_id": txn.to_company_id,
+            "amount_usd": txn.amount_usd,
+            "transaction_type": txn.transaction_type.value,
+            "ledger_entry": txn.ledger_entry.to_dict(),
+            "prev_transaction_hash": txn.prev_transaction_hash,
+            "related_operation_id": txn.related_operation_id,
+            "metadata": txn.metadata
+        }
+        self.assertEqual(txn.compute_integrity_hash(), legacy_sha256(data))
+
+    def test_company_state_and_checkpoint_hashes(self):
+        game = GameEngine(seed=11)
+        company = game.register_company(
+            company_name="Vector Corp",
+            founding_capital_usd=500000.0,
+            industry_sector=IndustrySector.TECH,
+            sovereign_signature="c" * 64
+        )
+        game.execute_operation(company.company_id, OperationType.HIRE, {"num_employees": 3})
+        game.tick()
+
+        state = {
+            "company_id": company.company_id,
+            "tick": company.current_tick,
+            "resources": company.resources.to_dict(),
+            "financial_state": company.financial.to_dict(),
+            "performance_metrics": company.metrics.to_dict()
+        }
+        self.assertEqual(company.compute_state_hash(), legacy_sha256(state))
+
+        engine_state = {
+            "tick": game.current_tick,
+            "seed": game.seed,
+            "market": game.market_conditions.to_dict(),
+            "companies": [c.to_dict() for c in game.companies.values()]
+        }
+        self.assertEqual(compute_state_hash(game), legacy_sha256(engine_state))
+
+        checkpoint = create_checkpoint(game)
+        payload = {key: checkpoint[key] for key in
+                   ("tick", "timestamp", "game_seed", "state_vector", "merkle_proof")}
+        self.assertEqual(compute_checkpoint_cid(checkpoint), f"ckpt_{legacy_sha256(payload)[:32]}")
+
+        capsule = game.create_checkpoint()
+        flow_state = {
+            "companies": {cid: c.to_dict() for cid, c in game.companies.items()},
+            "market_conditions": game.market_conditions.to_dict(),
+            "total_companies": len(game.companies),
+            "seed": game.seed
+        }
+        self.assertEqual(capsule["canonical_sha256"], legacy_sha256(flow_state))
+
+    def test_highway_battle_hashes(self):
+        result = BattleResult(
+            battle_id="b1",
+            winner="player",
+            loser="rival_7",
+            duration_ticks=750,
+            duration_seconds=12.5,
+            final_sp_winner=0.42,
+            final_sp_loser=0.0,
+            total_sp_drained_winner=0.58,
+            total_sp_drained_loser=1.0,
+            rival_tier="boss",
+            timestamp="2026-01-01T00:00:00+00:00"
+        )
+        self.assertEqual(result.compute_hash(), legacy_sha256(result.to_dict())[:16])
+
+        sp_state = SPState()
+        self.assertEqual(sp_state.compute_hash(), legacy_sha256(sp_state.to_dict())[:16])
+
+    def test_canonicalization_law_v1(self):
+        sys.path.insert(0, str(ROOT / "docs"))
+        try:
+            from canonicalization_law_v1 import canonical_json
+        finally:
+            sys.path.remove(str(ROOT / "docs"))
+        for obj in VECTORS:
+            self.assertEqual(canonical_json(obj), legacy_dumps(obj, ensure_ascii=False).encode('utf-8'))
+
+    def test_vault_jcs_matches_published_vector(self):
+        sys.path.insert(0, str(ROOT / "services" / "vault_mcp"))
+        try:
+            from vault import jcs_canonicalize
+        finally:
+            sys.path.remove(str(ROOT / "services" / "vault_mcp"))
+
+        vectors = ROOT / "vault_anchor_write_v1_test_vectors" / "pre_anchor"
+        with open(vectors / "pre_anchor_receipt.json") as f:
+            receipt = json.load(f)
+        expected = (vectors / "pre_anchor_jcs_bytes.txt").read_bytes().rstrip(b'\n')
+        self.assertEqual(jcs_canonicalize(receipt), expected)
+
+    def test_audit_canonical_hash(self):
+        sys.path.insert(0, str(ROOT))
+        try:
+            from audit_determinism import canonical_hash
+        finally:
+            sys.path.remove(str(ROOT))
+
+        obj = {"tick": 4, "agentId": "agent_1", "trace": ["a", "b"], "ok": True, "none": None}
+        self.assertEqual(canonical_hash(obj), legacy_sha256(obj, ensure_ascii=False))
+        with self.assertRaises(ValueError):
+            canonical_hash({"value": 1.5})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Unit tests for full-state checkpoint restore (companies, ledgers, RNG).
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from game_engine import GameEngine, IndustrySector, OperationType
+from checkpoint import (
+    LocalCheckpointStore,
+    compute_state_hash,
+    create_checkpoint,
+    replay_from_checkpoint
+)
+from ledger import LazyCompanyLedger
+
+
+def build_game(num_companies: int = 3, ticks: int = 4) -> GameEngine:
+    game = GameEngine(seed=7)
+    for i in range(num_companies):
+        company = game.register_company(
+            company_name=f"Corp {i}",
+            founding_capital_usd=250000.0 + i,
+            industry_sector=IndustrySector.MANUFACTURING,
+            sovereign_signature="b" * 64,
+            is_ai=(i % 2 == 0)
+        )
+        game.execute_operation(company.company_id, OperationType.HIRE, {"num_employees": 2})
+        game.execute_operation(company.company_id, OperationType.PRODUCE, {"units": 15})
+    for _ in range(ticks):
+        for company in game.companies.values():
+            game.execute_operation(company.company_id, OperationType.MARKET, {"units": 3})
+        game.tick()
+    return game
+
+
+class TestReplayFromCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        self.store = LocalCheckpointStore(self.base_path)
+        self.game = build_game()
+        self.cid = self.store.save_checkpoint(create_checkpoint(self.game))
+
+    def tearDown(self):
+        shutil.rmtree(self.base_path)
+
+    def test_restores_state_and_ledgers(self):
+        restored = replay_from_checkpoint(self.cid, self.store)
+
+        self.assertEqual(compute_state_hash(restored), compute_state_hash(self.game))
+        for company_id, company in self.game.companies.items():
+            restored_company = restored.companies[company_id]
+            self.assertEqual(restored_company.industry_sector, IndustrySector.MANUFACTURING)
+            self.assertEqual(
+                restored_company.ledger.export_audit_trail(),
+                company.ledger.export_audit_trail()
+            )
+        self.assertTrue(all(restored.verify_all_chains().values()))
+
+    def test_ledgers_load_lazily(self):
+        restored = replay_from_checkpoint(self.cid, self.store)
+        ledgers = [c.ledger for c in restored.companies.values()]
+        self.assertTrue(all(isinstance(l, LazyCompanyLedger) and not l.is_loaded for l in ledgers))
+
+        # Ticking chains onto the recorded head without decoding history
+        restored.tick()
+        self.assertFalse(any(l.is_loaded for l in ledgers))
+
+        self.assertTrue(all(restored.verify_all_chains().values()))
+        self.assertTrue(all(l.is_loaded for l in ledgers))
+
+    def test_restored_game_continues_deterministically(self):
+        # The market RNG is process-global, so run the two timelines in turn
+        for _ in range(3):
+            self.game.tick()
+        expected = compute_state_hash(self.game)
+
+        restored = replay_from_checkpoint(self.cid, self.store)
+        for _ in range(3):
+            restored.tick()
+        self.assertEqual(compute_state_hash(restored), expected)
+
+    def test_recheckpoint_of_untouched_restore_matches(self):
+        restored = replay_from_checkpoint(self.cid, self.store)
+        original = create_checkpoint(self.game)
+        again = create_checkpoint(restored)
+        self.assertEqual(again["merkle_proof"], original["merkle_proof"])
+        self.assertEqual(again["state_vector"], original["state_vector"])
+
+    def test_corrupted_segment_fails_verification(self):
+        restored = replay_from_checkpoint(self.cid, self.store)
+        company_id = next(iter(restored.companies))
+        other_id = list(restored.companies)[1]
+        ledger = restored.companies[company_id].ledger
+        ledger._segment = restored.companies[other_id].ledger._segment
+        with self.assertRaises(ValueError):
+            ledger.verify_chain()
+
+
+class TestGameEngineRestoreCheckpoint(unittest.TestCase):
+
+    def test_capsule_round_trip(self):
+        game = build_game()
+        capsule = game.create_checkpoint()
+
+        restored = GameEngine(seed=0)
+        restored.restore_checkpoint(capsule)
+
+        self.assertEqual(restored.current_tick, game.current_tick)
+        self.assertEqual(
+            {cid: c.to_dict() for cid, c in restored.companies.items()},
+            {cid: c.to_dict() for cid, c in game.companies.items()}
+        )
+        self.assertTrue(all(restored.verify_all_chains().values()))
+
+        # The market RNG is process-global, so run the two timelines in turn
+        game.tick()
+        expected = game.market_conditions.to_dict()
+        restored.restore_checkpoint(capsule)
+        restored.tick()
+        self.assertEqual(restored.market_conditions.to_dict(), expected)
+
+    def test_market_state_chain_continues(self):
+        game = build_game()
+        before = game.get_market_state()["merkle_state_hash"]
+        capsule = game.create_checkpoint()
+
+        restored = GameEngine(seed=0)
+        restored.restore_checkpoint(capsule)
+        self.assertEqual(restored.get_market_state()["prev_state_hash"], before)
+
+    def test_tampered_ledger_head_rejected(self):
+        game = build_game(num_companies=2)
+        capsule = game.create_checkpoint()
+        company_id = next(iter(capsule["ledger_state"]))
+        capsule["ledger_state"][company_id]["head"] = "0" * 64
+
+        with self.assertRaises(ValueError):
+            GameEngine(seed=0).restore_checkpoint(capsule)
+
+
+if __name__ == '__main__':
+    unittest.main()
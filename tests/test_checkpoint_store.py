@@ -0,0 +1,165 @@
+"""
+Unit tests for LocalCheckpointStore retention, sharding and compaction.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from checkpoint import (
+    LocalCheckpointStore,
+    RetentionPolicy,
+    compute_checkpoint_cid,
+    verify_checkpoint_chain
+)
+
+
+def make_checkpoint(tick: int, prev_cid):
+    """Minimal checkpoint capsule with the fields covered by the CID."""
+    return {
+        "tick": tick,
+        "timestamp": f"2026-01-01T00:00:{tick:02d}+00:00",
+        "game_seed": 42,
+        "state_vector": {"market_conditions": {"tick_marker": tick}, "companies": []},
+        "merkle_proof": {
+            "prev_checkpoint_cid": prev_cid,
+            "state_hash": f"{tick:064x}",
+            "ledger_root": "0" * 64
+        }
+    }
+
+
+class TestLocalCheckpointStore(unittest.TestCase):
+
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        self.store = LocalCheckpointStore(self.base_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_path)
+
+    def _save_chain(self, store, n):
+        cids = []
+        prev = None
+        for tick in range(n):
+            prev = store.save_checkpoint(make_checkpoint(tick, prev))
+            cids.append(prev)
+        return cids
+
+    def test_checkpoints_sharded_by_cid_prefix(self):
+        cid = self.store.save_checkpoint(make_checkpoint(0, None))
+        shard = cid[len("ckpt_"):len("ckpt_") + 2]
+        self.assertTrue(os.path.exists(os.path.join(self.base_path, shard, f"{cid}.json")))
+        self.assertEqual(self.store.load_checkpoint(cid)["checkpoint_id"], cid)
+
+    def test_manifest_persists_across_reopen(self):
+        cids = self._save_chain(self.store, 5)
+        self.store.tag_checkpoint(cids[1], "release")
+
+        reopened = LocalCheckpointStore(self.base_path)
+        self.assertEqual(reopened.list_checkpoints(), cids)
+        self.assertEqual(reopened.lineage_entry(cids[1]).tags, ["release"])
+        self.assertEqual([e.checkpoint_id for e in reopened.iter_lineage(cids[-1])], cids[::-1])
+
+    def test_legacy_flat_files_indexed(self):
+        legacy = make_checkpoint(0, None)
+        cid = compute_checkpoint_cid(legacy)
+        legacy["checkpoint_id"] = cid
+        legacy_path = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(legacy_path, f"{cid}.json"), 'w') as f:
+                json.dump(legacy, f, sort_keys=True, indent=2)
+
+            store = LocalCheckpointStore(legacy_path)
+            self.assertEqual(store.list_checkpoints(), [cid])
+            self.assertTrue(verify_checkpoint_chain(cid, store))
+        finally:
+            shutil.rmtree(legacy_path)
+
+    def test_retention_policy_selection(self):
+        cids = self._save_chain(self.store, 20)
+        self.store.tag_checkpoint(cids[3], "milestone")
+
+        policy = RetentionPolicy(keep_last=3, keep_every=5)
+        keep = policy.select(list(self.store.manifest.values()))
+        expected = {cids[i] for i in (0, 3, 5, 10, 15, 17, 18, 19)}
+        self.assertEqual(keep, expected)
+
+    def test_compaction_packs_prunes_and_keeps_lineage(self):
+        cids = self._save_chain(self.store, 20)
+        self.store.tag_checkpoint(cids[3], "milestone")
+
+        summary = self.store.compact(RetentionPolicy(keep_last=3, keep_every=5))
+        self.assertEqual(summary["packed"], 5)  # ticks 0, 3, 5, 10, 15
+        self.assertEqual(summary["pruned"], 12)
+
+        # Packed checkpoints load from the segment with verified CIDs
+        for i in (0, 3, 5, 10, 15):
+            self.assertEqual(self.store.load_checkpoint(cids[i])["tick"], i)
+            self.assertIsNotNone(self.store.lineage_entry(cids[i]).segment)
+
+        # Pruned content is gone but the chain still verifies end to end
+        with self.assertRaises(FileNotFoundError):
+            self.store.load_checkpoint(cids[1])
+        self.assertTrue(verify_checkpoint_chain(cids[-1], self.store, genesis_cid=cids[0]))
+        self.assertEqual(len(self.store.list_checkpoints()), 8)
+
+        # Only the hot window remains as loose files
+        loose = [
+            name for root, dirs, files in os.walk(self.base_path)
+            for name in files if name.startswith("ckpt_")
+        ]
+        self.assertEqual(sorted(loose), sorted(f"{cid}.json" for cid in cids[17:]))
+
+        # A reopened store sees the same compacted manifest
+        reopened = LocalCheckpointStore(self.base_path)
+        self.assertEqual(reopened.list_checkpoints(), self.store.list_checkpoints())
+        self.assertEqual(reopened.load_checkpoint(cids[10])["tick"], 10)
+
+    def test_repeated_compaction_appends_segments(self):
+        policy = RetentionPolicy(keep_last=2, keep_every=1)
+        cids = self._save_chain(self.store, 6)
+        first = self.store.compact(policy)
+
+        prev = cids[-1]
+        for tick in range(6, 10):
+            prev = self.store.save_checkpoint(make_checkpoint(tick, prev))
+        second = self.store.compact(policy)
+
+        self.assertNotEqual(first["segment"], second["segment"])
+        self.assertEqual(len(self.store.list_checkpoints()), 10)
+        self.assertTrue(verify_checkpoint_chain(prev, self.store))
+
+    def test_compaction_repacks_mostly_pruned_segments(self):
+        cids = self._save_chain(self.store, 10)
+        first = self.store.compact(RetentionPolicy(keep_last=1, keep_every=1))
+        self.assertEqual((first["packed"], first["removed_segments"]), (9, []))
+
+        # 7 of the 9 packed checkpoints go: their bytes are reclaimed with the old segment
+        second = self.store.compact(RetentionPolicy(keep_last=1, keep_every=5))
+        self.assertEqual((second["pruned"], second["packed"]), (7, 2))
+        self.assertEqual(second["removed_segments"], [first["segment"]])
+        segment_dir = os.path.join(self.base_path, LocalCheckpointStore.SEGMENT_DIR)
+        self.assertEqual(sorted(os.listdir(segment_dir)),
+                         ["seg_000001.index.json", "seg_000001.ndjson"])
+
+        reopened = LocalCheckpointStore(self.base_path)
+        for i in (0, 5):
+            self.assertEqual(reopened.load_checkpoint(cids[i])["tick"], i)
+            self.assertEqual(reopened.lineage_entry(cids[i]).segment, second["segment"])
+        self.assertTrue(verify_checkpoint_chain(cids[-1], reopened, genesis_cid=cids[0]))
+
+    def test_tampered_manifest_link_fails_verification(self):
+        cids = self._save_chain(self.store, 3)
+        self.store.manifest[cids[2]].prev_checkpoint_cid = cids[0]
+        self.assertFalse(verify_checkpoint_chain(cids[2], self.store))
+
+
+if __name__ == '__main__':
+    unittest.main()
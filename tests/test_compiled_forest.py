@@ -0,0 +1,155 @@
+"""
+Unit tests for the compiled flat-array forest evaluator.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from compiled_forest import CompiledForest
+from racing_ai_trainer import CONTROL_NAMES, DeterministicRandomForest
+
+from helpers import quiet, synthetic_controls
+
+
+def sklearn_reference(forests, feature_scaler, target_scalers, X):
+    """The per-tick sklearn path: transform, predict per target, inverse_transform."""
+    X_scaled = feature_scaler.transform(X)
+    return np.column_stack([
+        target_scalers[name].inverse_transform(forests[name].predict(X_scaled).reshape(-1, 1)).ravel()
+        for name in forests
+    ])
+
+
+class TestCompiledForest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.RandomState(11)
+        cls.X = (rng.randn(3000, 13) * 4 + 2).astype(np.float32)
+        cls.Y = np.column_stack([
+            np.sin(cls.X[:, 0]),
+            cls.X[:, 1] * cls.X[:, 2],
+            np.tanh(cls.X[:, 3] - cls.X[:, 4])
+        ]) + 0.05 * rng.randn(3000, 3)
+
+        cls.feature_scaler = StandardScaler().fit(cls.X)
+        X_scaled = cls.feature_scaler.transform(cls.X)
+        cls.target_scalers = {name: StandardScaler().fit(cls.Y[:, [k]]) for k, name in enumerate(CONTROL_NAMES)}
+
+        def per_target(n_estimators, max_depth):
+            return {
+                name: RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, min_samples_leaf=3,
+                                            random_state=k, n_jobs=1).fit(
+                    X_scaled, cls.target_scalers[name].transform(cls.Y[:, [k]]).ravel())
+                for k, name in enumerate(CONTROL_NAMES)
+            }
+
+        # Small forests take the per-tree walk, larger ones the level-wise path
+        cls.small = per_target(4, 6)
+        cls.large = per_target(30, 14)
+        cls.queries = cls.X[:200]
+
+    def compile(self, forests):
+        return CompiledForest.from_sklearn(forests, self.feature_scaler, self.target_scalers)
+
+    def test_single_and_batch_match_sklearn(self):
+        for forests in (self.small, self.large):
+            compiled = self.compile(forests)
+            expected = sklearn_reference(forests, self.feature_scaler, self.target_scalers, self.queries)
+            np.testing.assert_array_equal(compiled.predict(self.queries), expected)
+            for i in range(0, len(self.queries), 7):
+                np.testing.assert_array_equal(compiled.predict_one(self.queries[i]), expected[i])
+
+    def test_walk_and_level_paths_selected(self):
+        self.assertTrue(self.compile(self.small)._walk_trees)
+        self.assertFalse(self.compile(self.large)._walk_trees)
+
+    def test_float64_input_follows_scaler_dtype(self):
+        X64 = self.queries.astype(np.float64) * 1.0001
+        for forests in (self.small, self.large):
+            compiled = self.compile(forests)
+            expected = sklearn_reference(forests, self.feature_scaler, self.target_scalers, X64)
+            np.testing.assert_array_equal(compiled.predict(X64), expected)
+            np.testing.assert_array_equal(compiled.predict_one(X64[3]), expected[3])
+
+    def test_missing_values_follow_sklearn(self):
+        X = self.queries.copy()
+        X[::3, 0] = np.nan
+        X[::4, 2] = np.nan
+        for forests in (self.small, self.large):
+            compiled = self.compile(forests)
+            expected = sklearn_reference(forests, self.feature_scaler, self.target_scalers, X)
+            np.testing.assert_array_equal(compiled.predict(X), expected)
+            np.testing.assert_array_equal(compiled.predict_one(X[0]), expected[0])
+
+    def test_multi_output_forest_without_scalers(self):
+        forest = RandomForestRegressor(n_estimators=12, max_depth=10, random_state=5, n_jobs=1)
+        forest.fit(self.X.astype(np.float64), self.Y)
+        compiled = CompiledForest.from_sklearn(forest, output_names=['a', 'b', 'c'])
+        X = self.queries.astype(np.float64)
+        np.testing.assert_array_equal(compiled.predict(X), forest.predict(X))
+        np.testing.assert_array_equal(compiled.predict_one(X[9]), forest.predict(X[9:10])[0])
+        self.assertEqual(compiled.output_names, ['a', 'b', 'c'])
+
+    def test_save_load_round_trip(self):
+        compiled = self.compile(self.large)
+        directory = tempfile.mkdtemp()
+        try:
+            path = compiled.save(os.path.join(directory, 'forest.npz'))
+            loaded = CompiledForest.load(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(loaded.output_names, list(CONTROL_NAMES))
+        np.testing.assert_array_equal(loaded.predict(self.queries), compiled.predict(self.queries))
+
+    def test_save_dir_over_mapped_directory(self):
+        first, second = self.compile(self.small), self.compile(self.large)
+        directory = tempfile.mkdtemp()
+        try:
+            first.save_dir(directory)
+            mapped = CompiledForest.load_dir(directory)
+            # Rewriting the mapped files in place would truncate them under `mapped` (SIGBUS)
+            second.save_dir(directory)
+            np.testing.assert_array_equal(mapped.predict(self.queries), first.predict(self.queries))
+            np.testing.assert_array_equal(CompiledForest.load_dir(directory).predict(self.queries),
+                                          second.predict(self.queries))
+            self.assertEqual(len([name for name in os.listdir(directory) if name.startswith('tables-')]), 1)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_rejects_wrong_feature_count(self):
+        compiled = self.compile(self.small)
+        with self.assertRaises(ValueError):
+            compiled.predict(np.zeros(5, dtype=np.float32))
+        with self.assertRaises(ValueError):
+            CompiledForest.from_sklearn(RandomForestRegressor())
+
+
+class TestTrainerUsesCompiledForest(unittest.TestCase):
+
+    def test_predictions_match_sklearn_path_in_both_modes(self):
+        X, y_dict = synthetic_controls(4, 400)
+        for mode in ('per_target', 'multi_output'):
+            rf = DeterministicRandomForest(seed=4, n_estimators=8, max_depth=8, mode=mode)
+            quiet(rf.train, X, y_dict)
+            for model in rf.models.values():
+                model.set_params(n_jobs=1)
+
+            expected = rf._predict_scaled(rf.scalers['features'].transform(X[:50]))
+            np.clip(expected[:, 0], -1.0, 1.0, out=expected[:, 0])
+            np.clip(expected[:, 1:], 0.0, 1.0, out=expected[:, 1:])
+            np.testing.assert_array_equal(rf.predict_batch(X[:50]), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Unit tests for the batched RF fleet controller.
+"""
+
+import os
+import sys
+import unittest
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from fleet_controller import RFFleetController
+from racing_ai_trainer import FEATURES, DeterministicRandomForest
+
+from helpers import quiet, simulator_records
+
+
+class TestRFFleetController(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        records = simulator_records(21, 500)
+        cls.states = [record['state'] for record in records]
+        X, y = FEATURES.extract_records(records)
+
+        cls.per_target = DeterministicRandomForest(seed=2, n_estimators=6, max_depth=6)
+        cls.joint = DeterministicRandomForest(seed=2, n_estimators=40, max_depth=12, mode="multi_output")
+        quiet(cls.per_target.train, X, y)
+        quiet(cls.joint.train, X, y)
+
+    def test_tick_matches_per_car_predict(self):
+        fleet = RFFleetController()
+        for car in range(8):
+            fleet.add_car(f"car_{car}", self.per_target if car % 3 else self.joint)
+
+        for tick in range(0, 400, 50):
+            states = {car_id: self.states[tick + k] for k, car_id in enumerate(fleet.car_ids)}
+            controls = fleet.tick(states)
+            self.assertEqual(list(controls), list(states))
+            for car_id, state in states.items():
+                expected = (self.per_target if int(car_id[-1]) % 3 else self.joint).predict(state)
+                self.assertEqual(controls[car_id], expected)
+
+    def test_cars_without_state_skipped_and_unknown_rejected(self):
+        fleet = RFFleetController()
+        fleet.add_car("a", self.per_target)
+        fleet.add_car("b", self.per_target)
+        self.assertEqual(list(fleet.tick({"b": self.states[3]})), ["b"])
+        self.assertEqual(fleet.tick({}), {})
+        with self.assertRaises(KeyError):
+            fleet.tick({"c": self.states[3]})
+
+        fleet.remove_car("a")
+        fleet.add_car("b", self.joint)
+        self.assertEqual(fleet.car_ids, ["b"])
+        self.assertEqual(fleet.tick({"b": self.states[5]})["b"], self.joint.predict(self.states[5]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit tests for out-of-core (chunked) forest training.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from incremental_forest import TEST, TRAIN, VALIDATION, RowSplitter, StreamingRegressionMetrics, merge_forests, tree_budget
+from racing_ai_trainer import CONTROL_NAMES, DeterministicRandomForest
+
+from helpers import quiet, synthetic_controls
+
+
+class TestIncrementalHelpers(unittest.TestCase):
+
+    def test_split_does_not_depend_on_chunking(self):
+        splitter = RowSplitter(seed=9, test_size=0.2, validation_size=0.1)
+        whole = splitter.assign(10000)
+        splitter.reset()
+        chunked = np.concatenate([splitter.assign(n) for n in (1, 999, 3000, 6000)])
+        np.testing.assert_array_equal(whole, chunked)
+        shares = [np.mean(whole == code) for code in (TRAIN, VALIDATION, TEST)]
+        np.testing.assert_allclose(shares, [0.7, 0.1, 0.2], atol=0.02)
+        with self.assertRaises(ValueError):
+            RowSplitter(seed=1, test_size=0.6, validation_size=0.4)
+
+    def test_tree_budget(self):
+        self.assertEqual(tree_budget(10, 3), [4, 3, 3])
+        self.assertEqual(sum(tree_budget(100, 7)), 100)
+        self.assertEqual(tree_budget(2, 4), [1, 1, 1, 1])
+        self.assertEqual(tree_budget(5, 0), [])
+
+    def test_streaming_metrics_match_sklearn(self):
+        rng = np.random.RandomState(3)
+        y_true = rng.randn(5000, 3) * [1.0, 5.0, 0.1] + [0.0, 100.0, -2.0]
+        y_pred = y_true + 0.3 * rng.randn(5000, 3)
+        metrics = StreamingRegressionMetrics(3)
+        for start in range(0, 5000, 777):
+            metrics.update(y_true[start:start + 777], y_pred[start:start + 777])
+        np.testing.assert_allclose(metrics.mse(), mean_squared_error(y_true, y_pred, multioutput='raw_values'))
+        np.testing.assert_allclose(metrics.r2(), r2_score(y_true, y_pred, multioutput='raw_values'))
+
+    def test_merge_forests_keeps_tree_order(self):
+        rng = np.random.RandomState(0)
+        X, y = rng.randn(300, 4), rng.randn(300)
+        forests = [RandomForestRegressor(n_estimators=n, random_state=n).fit(X, y) for n in (2, 3)]
+        trees = forests[0].estimators_ + forests[1].estimators_
+        merged = merge_forests(forests)
+        self.assertEqual(merged.n_estimators, 5)
+        self.assertEqual(merged.estimators_, trees)
+        expected = np.mean([tree.predict(X) for tree in trees], axis=0)
+        np.testing.assert_allclose(merged.predict(X), expected)
+
+
+class TestOutOfCoreTraining(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.X, cls.y = synthetic_controls(6, 4000)
+
+    def chunks(self, size):
+        return lambda: ((self.X[i:i + size], {k: v[i:i + size] for k, v in self.y.items()})
+                        for i in range(0, len(self.X), size))
+
+    def test_deterministic_and_merges_to_n_estimators(self):
+        for mode in ('per_target', 'multi_output'):
+            first = DeterministicRandomForest(seed=5, n_estimators=7, max_depth=8, mode=mode)
+            second = DeterministicRandomForest(seed=5, n_estimators=7, max_depth=8, mode=mode)
+            report = quiet(first.train_out_of_core, self.chunks(1000))
+            quiet(second.train_out_of_core, self.chunks(1000))
+
+            self.assertEqual(report['chunks'], 4)
+            self.assertEqual(first.training_lineage['trees_per_chunk'], [2, 2, 2, 1])
+            for forest in first.models.values():
+                self.assertEqual(len(forest.estimators_), 7)
+            np.testing.assert_array_equal(first.predict_batch(self.X), second.predict_batch(self.X))
+            for name in CONTROL_NAMES:
+                self.assertGreater(report['metrics'][name]['test_r2'], 0.8)
+
+    def test_save_load_round_trip(self):
+        rf = DeterministicRandomForest(seed=5, n_estimators=4, max_depth=6)
+        quiet(rf.train_out_of_core, self.chunks(1500))
+        directory = tempfile.mkdtemp()
+        try:
+            quiet(rf.save_models, directory)
+            loaded = quiet(DeterministicRandomForest.load_models, directory)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(loaded.training_lineage['training_mode'], 'out_of_core')
+        np.testing.assert_array_equal(loaded.predict_batch(self.X[:100]), rf.predict_batch(self.X[:100]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Unit tests for the hash-keyed model registry and lazy model loading.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from compiled_forest import CompiledForest
+from model_registry import ModelRegistry
+from racing_ai_trainer import DeterministicRandomForest, create_training_ledger_entry
+
+from helpers import quiet, synthetic_controls
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.X, y = synthetic_controls(4, 1500)
+        cls.rf = DeterministicRandomForest(seed=4, n_estimators=6, max_depth=7)
+        cls.report = quiet(cls.rf.train, cls.X, y)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        data_file = os.path.join(self.directory, 'training.ndjson')
+        with open(data_file, 'w') as f:
+            f.write('{}\n')
+        self.entry = create_training_ledger_entry(data_file, self.report, 'models/test')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_register_and_resolve(self):
+        registry = ModelRegistry(os.path.join(self.directory, 'registry'))
+        key = registry.register(self.rf, self.entry)
+        self.assertEqual(key, self.entry['hash'])
+        self.assertEqual(registry.register(self.rf, self.entry), key)
+        self.assertEqual(len(registry), 1)
+
+        # A fresh registry on the same root sees the entry under every key form
+        reopened = ModelRegistry(registry.root)
+        for alias in (key, key[:12], self.report['lineage_hash'], self.report['model_version']):
+            self.assertEqual(reopened.resolve(alias), key)
+        self.assertNotIn('0' * 64, reopened)
+        with self.assertRaises(KeyError):
+            reopened.get('deadbeefdeadbeef')
+        self.assertEqual(reopened.ledger_entry(key), self.entry)
+
+        with self.assertRaises(ValueError):
+            registry.register(self.rf, dict(self.entry, lineage_hash='0' * 64, hash='1' * 64))
+
+    def test_get_is_lazy_and_bit_identical(self):
+        registry = ModelRegistry(os.path.join(self.directory, 'registry'))
+        key = registry.register(self.rf, self.entry)
+        model = registry.get(key)
+        self.assertIs(registry.get(self.report['model_version']), model)
+
+        # Memory-mapped tables, nothing unpickled to predict
+        self.assertIsInstance(model.compiled._child2, np.memmap)
+        np.testing.assert_array_equal(model.predict_batch(self.X), self.rf.predict_batch(self.X))
+        self.assertIsNotNone(model._source_directory)
+
+        # sklearn forests are unpickled on access
+        self.assertEqual(len(model.models['steering'].estimators_), 6)
+        self.assertIsNone(model._source_directory)
+
+    def test_register_recovers_and_merges_index(self):
+        root = os.path.join(self.directory, 'registry')
+        key = ModelRegistry(root).register(self.rf, self.entry)
+
+        # Crash between the rename and the index write: the entry directory is adopted
+        os.remove(os.path.join(root, 'index.json'))
+        registry = ModelRegistry(root)
+        self.assertEqual(registry.register(self.rf, self.entry), key)
+        self.assertEqual(registry.keys(), [key])
+        self.assertEqual(sorted(os.listdir(root)), sorted([key, 'index.json', 'index.json.lock']))
+
+        # Two registries opened before either writes: neither entry is lost
+        data_file = os.path.join(self.directory, 'other.ndjson')
+        with open(data_file, 'w') as f:
+            f.write('{"other": 1}\n')
+        other = create_training_ledger_entry(data_file, self.report, 'models/other')
+        shared = os.path.join(self.directory, 'shared')
+        first, second = ModelRegistry(shared), ModelRegistry(shared)
+        first.register(self.rf, self.entry)
+        second.register(self.rf, other)
+        self.assertEqual(ModelRegistry(shared).keys(), sorted([key, other['hash']]))
+
+        # A directory under the hash that holds something else is not adopted
+        with open(os.path.join(root, key, 'ledger_entry.json'), 'w') as f:
+            f.write('{}')
+        os.remove(os.path.join(root, 'index.json'))
+        with self.assertRaises(ValueError):
+            ModelRegistry(root).register(self.rf, self.entry)
+        self.assertNotIn(key, ModelRegistry(root))
+
+    def test_compiled_dir_round_trip(self):
+        compiled = self.rf.compiled
+        path = compiled.save_dir(os.path.join(self.directory, 'forest'))
+        for mmap_mode in ('r', None):
+            loaded = CompiledForest.load_dir(path, mmap_mode=mmap_mode)
+            np.testing.assert_array_equal(loaded.predict(self.X), compiled.predict(self.X))
+            np.testing.assert_array_equal(loaded.predict(self.X[0]), compiled.predict(self.X[0]))
+        np.testing.assert_array_equal(CompiledForest.load(path).apply(self.X[:10]), compiled.apply(self.X[:10]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for DeterministicRandomForest forest modes.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from racing_ai_trainer import FEATURES, DeterministicRandomForest, compare_forest_modes
+
+from helpers import quiet, simulator_records
+
+
+class TestForestModes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.X, cls.y = FEATURES.extract_records(simulator_records(8, 600))
+        cls.params = dict(seed=3, n_estimators=8, max_depth=6)
+
+    def test_per_target_matches_independent_forests(self):
+        rf = DeterministicRandomForest(**self.params)
+        quiet(rf.train, self.X, self.y)
+
+        # Legacy procedure: a separate split and forest per target
+        X_t, X_tmp, y_t, _ = train_test_split(self.X, self.y['throttle'], test_size=0.2 + 0.1, random_state=3)
+        X_scaler = StandardScaler().fit(X_t)
+        y_scaler = StandardScaler().fit(y_t.reshape(-1, 1))
+        legacy = RandomForestRegressor(n_estimators=8, max_depth=6, min_samples_split=10,
+                                       min_samples_leaf=5, random_state=3, n_jobs=-1)
+        legacy.fit(X_scaler.transform(X_t), y_scaler.transform(y_t.reshape(-1, 1)).ravel())
+
+        np.testing.assert_array_equal(
+            rf.models['throttle'].predict(rf.scalers['features'].transform(X_tmp)),
+            legacy.predict(X_scaler.transform(X_tmp))
+        )
+
+    def test_multi_output_is_deterministic_and_single_model(self):
+        first = DeterministicRandomForest(mode="multi_output", **self.params)
+        second = DeterministicRandomForest(mode="multi_output", **self.params)
+        report = quiet(first.train, self.X, self.y)
+        quiet(second.train, self.X, self.y)
+
+        self.assertEqual(list(first.models), ['joint'])
+        self.assertEqual(report['forest_mode'], 'multi_output')
+        self.assertEqual(set(report['metrics']), {'steering', 'throttle', 'brake'})
+        np.testing.assert_array_equal(first.predict_batch(self.X), second.predict_batch(self.X))
+
+        Y = first.predict_batch(self.X[:20])
+        self.assertEqual(Y.shape, (20, 3))
+        self.assertTrue(np.all(Y[:, 1:] >= 0.0) and np.all(Y[:, 1:] <= 1.0))
+
+    def test_predict_matches_batch_in_both_modes(self):
+        state = dict(zip(FEATURES.names, self.X[7].tolist()))
+        state['upcoming_curvature'] = [state[f'upcoming_curvature_{i}'] for i in range(5)]
+        state['wheel_speeds'] = [state[f'wheel_speed_{i}'] for i in range(4)]
+        for mode in ("per_target", "multi_output"):
+            rf = DeterministicRandomForest(mode=mode, **self.params)
+            quiet(rf.train, self.X, self.y)
+            single = rf.predict(state)
+            batch = rf.predict_batch(self.X[7:8])[0]
+            self.assertEqual([single['steering'], single['throttle'], single['brake']], batch.tolist())
+
+    def test_save_load_round_trip(self):
+        directory = tempfile.mkdtemp()
+        try:
+            for mode in ("per_target", "multi_output"):
+                rf = DeterministicRandomForest(mode=mode, **self.params)
+                quiet(rf.train, self.X, self.y)
+                path = os.path.join(directory, mode)
+                quiet(rf.save_models, path)
+                loaded = quiet(DeterministicRandomForest.load_models, path)
+                self.assertEqual(loaded.mode, mode)
+                np.testing.assert_array_equal(loaded.predict_batch(self.X), rf.predict_batch(self.X))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_comparison_report(self):
+        report = quiet(compare_forest_modes, self.X, self.y, latency_samples=5, **self.params)
+        self.assertEqual(set(report['modes']), {'per_target', 'multi_output'})
+        self.assertIn('predict_speedup', report['multi_output_vs_per_target'])
+        self.assertGreater(report['modes']['multi_output']['model_bytes'], 0)
+
+    def test_unknown_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            DeterministicRandomForest(mode="boosted")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,8 @@ import unittest
 import hashlib
 import json
 import os
+import tempfile
+from dataclasses import asdict
 
 # Add src path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
@@ -19,8 +21,13 @@ from racing_simulator import (
     TireState,
     FuelState,
     WeatherState,
-    DeterministicVehiclePhysics
+    DeterministicVehiclePhysics,
+    BatchedVehiclePhysics,
+    NurburgringTrack,
+    TrackSection,
+    StateActionBuffer
 )
+import numpy as np
 
 
 class TestTireDegradation(unittest.TestCase):
@@ -253,6 +260,220 @@ class TestDeterminism(unittest.TestCase):
         print(f"\n✅ Checkpoint state: tire_wear={sv['tire_wear']:.4f}, fuel={sv['fuel_kg']:.1f}kg")
 
 
+def legacy_track_data(track, progress):
+    """get_track_data prior to the precomputed lookup tables"""
+    distance = progress * track.TRACK_LENGTH
+    idx = int((distance / track.TRACK_LENGTH) * track.num_points)
+    idx = min(idx, track.num_points - 1)
+    
+    upcoming_curvature = []
+    for d in [10, 25, 50, 100, 200]:
+        future_idx = min(idx + int(d / 10), track.num_points - 1)
+        upcoming_curvature.append(track.curvature_profile[future_idx])
+    
+    section = TrackSection.HATZENBACH
+    for sec, (start, end) in track.sections.items():
+        if start <= distance < end:
+            section = sec
+            break
+    
+    return {
+        'curvature': track.curvature_profile[idx],
+        'gradient': track.gradient_profile[idx],
+        'upcoming_curvature': tuple(upcoming_curvature),
+        'section': section
+    }
+
+
+class TestTrackLookup(unittest.TestCase):
+    """Precomputed track tables must answer exactly like the original loop."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.track = NurburgringTrack(seed=42)
+        rng = np.random.RandomState(7)
+        boundaries = [start / cls.track.TRACK_LENGTH for start, _ in cls.track.sections.values()]
+        cls.progress = np.concatenate([
+            rng.rand(2000),
+            np.linspace(0.0, 1.0, 4167),
+            np.nextafter(boundaries, -1.0),
+            np.nextafter(boundaries, 2.0),
+            boundaries,
+            [0.0, 0.9999999, 1.0, 1.2, -0.0, -0.001, -0.5]
+        ])
+    
+    def test_scalar_matches_legacy(self):
+        for p in self.progress.tolist():
+            expected = legacy_track_data(self.track, p)
+            actual = self.track.get_track_data(p)
+            self.assertEqual(actual['section'], expected['section'], p)
+            for key in ('curvature', 'gradient'):
+                self.assertEqual(type(actual[key]), type(expected[key]))
+                self.assertEqual(actual[key].tobytes(), expected[key].tobytes(), p)
+            self.assertEqual(np.array(actual['upcoming_curvature']).tobytes(),
+                             np.array(expected['upcoming_curvature']).tobytes(), p)
+    
+    def test_batch_matches_legacy(self):
+        for progress in (self.progress, self.progress[self.progress >= 0]):
+            batch = self.track.get_track_data_batch(progress)
+            self.assertEqual(batch['upcoming_curvature'].shape, (len(progress), 5))
+            for i, p in enumerate(progress.tolist()):
+                expected = legacy_track_data(self.track, p)
+                self.assertEqual(self.track.section_list[batch['section_id'][i]], expected['section'], p)
+                self.assertEqual(batch['curvature'][i].tobytes(), expected['curvature'].tobytes(), p)
+                self.assertEqual(batch['gradient'][i].tobytes(), expected['gradient'].tobytes(), p)
+                self.assertEqual(batch['upcoming_curvature'][i].tobytes(),
+                                 np.array(expected['upcoming_curvature']).tobytes(), p)
+    
+    def test_section_table_covers_samples(self):
+        self.assertEqual(self.track.section_id.shape, (self.track.num_points,))
+        self.assertEqual(self.track.section_list[self.track.section_id[0]], TrackSection.HATZENBACH)
+        self.assertEqual(self.track.section_list[self.track.section_id[800]], TrackSection.KARUSSELL)
+
+
+class TestStateActionHistory(unittest.TestCase):
+    """Ring-buffered history must export exactly what asdict() recorded."""
+    
+    def _run(self, steps, **kwargs):
+        sim = RacingSimulator(seed=3, **kwargs)
+        rng = np.random.RandomState(3)
+        expected = []
+        for _ in range(steps):
+            control = ControlInput(float(rng.uniform(-0.3, 0.3)), float(rng.rand()), float(rng.rand() * 0.1))
+            tick = sim.tick
+            state = sim.step(control)
+            record = {'state': asdict(state), 'action': asdict(control), 'tick': tick}
+            record['state']['current_section'] = record['state']['current_section'].value
+            expected.append(json.dumps(record))
+        return sim, expected
+    
+    def test_export_matches_asdict_across_spills(self):
+        sim, expected = self._run(250, history_capacity=32)
+        history = sim.state_action_history
+        self.assertEqual(len(history), 250)
+        self.assertGreater(history.spilled_rows, 0)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = sim.export_training_data(os.path.join(tmp, "train.ndjson"))
+            with open(path) as f:
+                self.assertEqual(f.read().splitlines(), expected)
+    
+    def test_memory_is_bounded(self):
+        sim, _ = self._run(600, history_capacity=64)
+        history = sim.state_action_history
+        self.assertEqual(history.memory_bytes, history.width * 64 * 8)
+        self.assertLessEqual(history._count, 64)
+        self.assertEqual(history.spilled_rows + history._count, 600)
+    
+    def test_drop_mode_keeps_latest_rows(self):
+        buffer = StateActionBuffer(capacity=16, spill_chunk=4, spill=False)
+        sim = RacingSimulator(seed=1, enable_weather=False)
+        control = ControlInput(0.0, 1.0, 0.0)
+        for tick in range(50):
+            buffer.append(sim.step(control), control, tick)
+        ticks = [record['tick'] for record in buffer]
+        self.assertEqual(ticks, list(range(50 - len(ticks), 50)))
+        self.assertEqual(buffer.dropped_rows + len(buffer), 50)
+        self.assertEqual(buffer.recent(3)[:, buffer.columns.index('tick')].tolist(), [47.0, 48.0, 49.0])
+    
+    def test_capacity_must_be_chunk_multiple(self):
+        with self.assertRaises(ValueError):
+            StateActionBuffer(capacity=10, spill_chunk=4)
+
+
+class TestBatchedVehiclePhysics(unittest.TestCase):
+    """Batched N-car kernel must match the scalar model bit-for-bit."""
+    
+    COMPOUNDS = (TireCompound.SOFT, TireCompound.MEDIUM, TireCompound.HARD)
+    
+    def _run(self, num_cars, steps, controls, weather=True, pit_at=None):
+        singles = [DeterministicVehiclePhysics(42, self.COMPOUNDS[i % 3]) for i in range(num_cars)]
+        batch = BatchedVehiclePhysics(num_cars)
+        for i, physics in enumerate(singles):
+            batch.load_car(i, physics)
+        
+        for t in range(steps):
+            throttle, brake, steering, gradient, grip = controls(t)
+            if t == pit_at:
+                pitted = np.arange(0, num_cars, 4)
+                batch.pit_stop(pitted, TireCompound.HARD, 70.0)
+                for i in pitted:
+                    singles[i].pit_stop(TireCompound.HARD, 70.0)
+            
+            outputs = batch.step(throttle, brake, steering, np.zeros(num_cars), gradient,
+                                 grip if weather else None)
+            for i, physics in enumerate(singles):
+                expected = physics.step(
+                    ControlInput(float(steering[i]), float(throttle[i]), float(brake[i])),
+                    0.0,
+                    gradient[i],
+                    WeatherState(grip_mu=grip[i]) if weather else None
+                )
+                for got, want in zip(outputs, expected):
+                    self.assertEqual(np.float64(got[i]).tobytes(), np.float64(want).tobytes())
+        
+        for i, physics in enumerate(singles):
+            self.assertEqual(batch.position[i].tobytes(), physics.position.tobytes())
+            self.assertEqual(batch.wheel_speeds[i].tobytes(), physics.wheel_speeds.tobytes())
+            for got, want in (
+                (batch.velocity[i], physics.velocity),
+                (batch.heading[i], physics.heading),
+                (batch.yaw_rate[i], physics.yaw_rate),
+                (batch.tire_wear[i], physics.tire_state.wear),
+                (batch.tire_temperature[i], physics.tire_state.temperature),
+                (batch.fuel_kg[i], physics.fuel_state.current_kg),
+            ):
+                self.assertEqual(np.float64(got).tobytes(), np.float64(want).tobytes())
+            self.assertEqual(batch.engine_rpm[i], physics.engine_rpm)
+            self.assertEqual(batch.gear[i], physics.gear)
+            self.assertEqual(batch.grip_multiplier()[i], physics.tire_state.grip_multiplier)
+        return batch
+    
+    def test_random_controls_match_scalar(self):
+        n = 24
+        rng = np.random.RandomState(7)
+        
+        def controls(t):
+            brake = np.where(rng.rand(n) < 0.2, rng.rand(n), 0.0)
+            return rng.rand(n), brake, rng.uniform(-1, 1, n), rng.uniform(-0.1, 0.1, n), rng.uniform(0.6, 1.2, n)
+        
+        self._run(n, 800, controls, pit_at=400)
+    
+    def test_steady_acceleration_shifts_gears(self):
+        n = 12
+        throttle = np.linspace(0.05, 1.0, n)
+        zeros = np.zeros(n)
+        
+        def controls(t):
+            return throttle, zeros, np.full(n, 0.05), np.full(n, 0.02), np.full(n, 1.2)
+        
+        batch = self._run(n, 600, controls, weather=False)
+        self.assertGreater(batch.gear.max(), 1)
+    
+    def test_braking_to_standstill(self):
+        n = 8
+        ones, zeros = np.ones(n), np.zeros(n)
+        
+        def controls(t):
+            if t < 200:
+                return ones, zeros, zeros, zeros, np.full(n, 1.2)
+            return zeros, ones, zeros, np.full(n, -0.01), np.full(n, 1.2)
+        
+        batch = self._run(n, 900, controls, weather=False)
+        self.assertTrue(np.all(batch.velocity == 0.0))
+    
+    def test_reset_restores_initial_state(self):
+        batch = BatchedVehiclePhysics(4, tire_compound=TireCompound.SOFT)
+        ones = np.ones(4)
+        batch.step(ones, ones * 0, ones * 0.2, ones * 0, ones * 0.01)
+        batch.reset()
+        fresh = DeterministicVehiclePhysics(42, TireCompound.SOFT)
+        exported = batch.export_car(2)
+        self.assertEqual(exported.velocity, fresh.velocity)
+        self.assertEqual(exported.tire_state, fresh.tire_state)
+        self.assertEqual(exported.fuel_state, fresh.fuel_state)
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("  🏎️  Racing Simulator Physics Test Suite")
@@ -0,0 +1,156 @@
+"""
+Unit tests for RuntimeBlockGenerator batch generation and bulk verification.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from runtime_block_generator import ConfigSource, ManifoldType, RuntimeBlockGenerator
+from schema_validator import get_validator
+
+
+def legacy_embedding(config, embedding_space, manifold_type=ManifoldType.EUCLIDEAN):
+    """Embedding formula prior to memoization"""
+    features = []
+
+    def traverse(obj):
+        if isinstance(obj, (int, float)):
+            features.append(float(obj))
+        elif isinstance(obj, dict):
+            for v in obj.values():
+                traverse(v)
+        elif isinstance(obj, list):
+            for item in obj:
+                traverse(item)
+
+    traverse(config)
+    hash_bytes = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).digest()
+    dimension = len(features) if features else 16
+    coordinates = [
+        (int.from_bytes(hash_bytes[i:i+2], 'big') / 65535.0) * 2 - 1
+        for i in range(0, min(dimension * 2, len(hash_bytes)), 2)
+    ]
+    return {
+        "embedding_space": embedding_space,
+        "coordinates": coordinates,
+        "manifold_type": manifold_type.value,
+        "dimension": len(coordinates)
+    }
+
+
+def ipfs_config(i):
+    return {
+        "Addresses": {"API": f"/ip4/127.0.0.1/tcp/{5000 + i}", "Gateway": "/ip4/127.0.0.1/tcp/8080"},
+        "Datastore": {"Type": "levelds", "Path": f"~/.ipfs/{i}", "Spec": {"shards": i % 3}},
+        "Bootstrap": [f"/dnsaddr/peer{i}"],
+        "Identity": {"PeerID": f"QmPeer{i}"}
+    }
+
+
+def local_config(i):
+    return {"seed": f"s{i % 7}", "simulation": {"ticks": i % 7, "dt": 0.01}, "flags": [True, None, "x"]}
+
+
+def stable(block):
+    """Block without per-call uuid/timestamp"""
+    return {k: v for k, v in block.items() if k not in ("block_id", "timestamp")}
+
+
+class TestRuntimeBlockGenerator(unittest.TestCase):
+
+    def test_embedding_matches_legacy_formula(self):
+        generator = RuntimeBlockGenerator(embedding_space="test.v1")
+        configs = [{}, {"a": "x"}, local_config(3), {"n": list(range(40))}, {"b": [1.5, {"c": 2}]}]
+        for config in configs:
+            for manifold in (ManifoldType.EUCLIDEAN, ManifoldType.SE3):
+                expected = legacy_embedding(config, "test.v1", manifold)
+                self.assertEqual(generator.embed_tensor_from_config(config, manifold), expected)
+                # Second call is served from the memo
+                self.assertEqual(generator.embed_tensor_from_config(config, manifold), expected)
+
+    def test_embedding_cache_is_bounded(self):
+        generator = RuntimeBlockGenerator(embedding_cache_size=4)
+        for i in range(10):
+            generator.embed_tensor_from_config({"i": i})
+        self.assertEqual(len(generator._embedding_cache), 4)
+
+    def test_batch_matches_sequential(self):
+        for source, make in ((ConfigSource.LOCAL, local_config), (ConfigSource.IPFS, ipfs_config)):
+            configs = [make(i) for i in range(20)]
+            bindings = [{"capsule_id": "cap_1", "capsule_hash": "ab" * 32}]
+
+            sequential = RuntimeBlockGenerator(embedding_space="batch.v1")
+            expected = []
+            for i, config in enumerate(configs):
+                if source == ConfigSource.IPFS:
+                    expected.append(sequential.generate_from_ipfs(
+                        config, ipfs_cid=f"Qm{i}", capsule_bindings=bindings, metadata={"i": i}
+                    ))
+                else:
+                    expected.append(sequential.generate_from_local(
+                        config, capsule_bindings=bindings, metadata={"i": i}
+                    ))
+
+            for workers in (1, 2):
+                batched = RuntimeBlockGenerator(embedding_space="batch.v1")
+                blocks = batched.generate_batch(
+                    configs,
+                    source=source,
+                    capsule_bindings=bindings,
+                    metadata=[{"i": i} for i in range(len(configs))],
+                    ipfs_cids=[f"Qm{i}" for i in range(len(configs))] if source == ConfigSource.IPFS else None,
+                    workers=workers
+                )
+                self.assertEqual([stable(b) for b in blocks], [stable(b) for b in expected])
+                self.assertEqual(batched.prev_block_hash, sequential.prev_block_hash)
+                self.assertTrue(batched.verify_chain(blocks))
+
+    def test_batch_blocks_do_not_share_embeddings(self):
+        generator = RuntimeBlockGenerator()
+        blocks = generator.generate_batch([{"x": 1}, {"x": 1}])
+        blocks[0]["tensor_semantic"]["coordinates"].append(0.0)
+        self.assertEqual(blocks[1]["tensor_semantic"]["dimension"], len(blocks[1]["tensor_semantic"]["coordinates"]))
+
+    def test_blocks_conform_to_schema(self):
+        generator = RuntimeBlockGenerator()
+        validator = get_validator("unified_tensor_runtime_block")
+        for block in generator.generate_batch([ipfs_config(i) for i in range(3)], source=ConfigSource.IPFS):
+            self.assertTrue(validator.is_valid(block), validator.errors(block))
+
+    def test_bulk_verification_flags_tampering(self):
+        generator = RuntimeBlockGenerator()
+        blocks = generator.generate_batch([local_config(i) for i in range(12)])
+        blocks[5]["runtime_config"]["normalized_params"]["seed"] = "tampered"
+
+        for workers in (1, 2):
+            results = generator.verify_blocks(blocks, workers=workers)
+            self.assertEqual(results, [i != 5 for i in range(12)])
+            self.assertFalse(generator.verify_chain(blocks, workers=workers))
+
+    def test_generate_from_directory(self):
+        directory = tempfile.mkdtemp()
+        try:
+            for i in range(4):
+                with open(os.path.join(directory, f"cfg_{i}.json"), 'w') as f:
+                    json.dump(local_config(i), f)
+            with open(os.path.join(directory, "notes.txt"), 'w') as f:
+                f.write("ignored")
+
+            blocks = RuntimeBlockGenerator().generate_from_directory(directory)
+            self.assertEqual([b["metadata"]["source_file"] for b in blocks],
+                             [f"cfg_{i}.json" for i in range(4)])
+            self.assertEqual(blocks[2]["runtime_config"]["normalized_params"], local_config(2))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
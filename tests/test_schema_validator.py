@@ -0,0 +1,167 @@
+"""
+Unit tests for compiled schema validators.
+
+Equivalence is checked against jsonschema.Draft7Validator on documents the
+engine emits and on targeted mutations of them.
+"""
+
+import copy
+import sys
+import unittest
+from pathlib import Path
+
+import jsonschema
+
+# Add src path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from schema_validator import (
+    CompiledValidator,
+    SchemaValidationError,
+    get_validator,
+    precompile_all
+)
+from game_engine import GameEngine, IndustrySector, OperationType
+
+
+def build_documents():
+    """One real document per schema, produced by the engine"""
+    game = GameEngine(seed=3)
+    company = game.register_company(
+        company_name="Schema Corp",
+        founding_capital_usd=400000.0,
+        industry_sector=IndustrySector.RETAIL,
+        sovereign_signature="d" * 64
+    )
+    game.execute_operation(company.company_id, OperationType.HIRE, {"num_employees": 2})
+    game.tick()
+
+    operation_hash = "ab" * 32
+    return {
+        "checkpoint_capsule": game.create_checkpoint(),
+        "company_state": company.to_dict(),
+        "market_state": game.get_market_state(),
+        "business_operation": {
+            "operation_id": "8b0f6c1e-3c1a-4f7e-9a51-0f6b3f1f2a10",
+            "company_id": company.company_id,
+            "tick": 1,
+            "operation_type": "HIRE",
+            "resource_delta": {"cash_usd": -1500.0, "employees": 2, "market_share_pct": 0.5},
+            "decision_trace": [{"step": "budget_check", "result": "PASS", "details": {"cash": 1}}],
+            "prev_operation_hash": None,
+            "operation_hash": operation_hash,
+            "metadata": {"ai_controlled": True, "justification": "growth"}
+        },
+        "sim_telemetry": {
+            "schema_version": "sim.telemetry.v1",
+            "run_id": "sim_run_01",
+            "vehicle_id": "car_3",
+            "tick": 12,
+            "timestamp_ms": 1760000000000,
+            "speed_mps": 41.5,
+            "accel_mps2": 6.2,
+            "heading_deg": 270.0,
+            "surface": "wet"
+        },
+    }
+
+
+def mutations(document):
+    """Yield targeted edits of a valid document, one leaf at a time"""
+    def walk(node, path):
+        if isinstance(node, dict):
+            for key in list(node):
+                yield path + [key]
+                yield from walk(node[key], path + [key])
+        elif isinstance(node, list) and node:
+            yield path + [0]
+            yield from walk(node[0], path + [0])
+
+    replacements = [None, True, 1, 1.0, 2.5, -1, 1e9, "", "x", "car_x", [], {}, "0" * 64]
+    for path in walk(document, []):
+        for replacement in replacements + ["__delete__"]:
+            mutated = copy.deepcopy(document)
+            parent = mutated
+            for key in path[:-1]:
+                parent = parent[key]
+            if replacement == "__delete__":
+                if isinstance(parent, dict):
+                    del parent[path[-1]]
+                else:
+                    parent.pop(path[-1])
+            else:
+                parent[path[-1]] = replacement
+            yield mutated
+
+    extra = copy.deepcopy(document)
+    extra["unexpected_field"] = 1
+    yield extra
+
+
+class TestCompiledValidators(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.documents = build_documents()
+        cls.validators = precompile_all()
+
+    def test_all_schemas_compile(self):
+        self.assertTrue(all(v.compiled for v in self.validators.values()))
+        self.assertIs(get_validator("sim_telemetry"), self.validators["sim_telemetry"])
+
+    def test_engine_documents_are_valid(self):
+        for name, document in self.documents.items():
+            validator = self.validators[name]
+            self.assertTrue(validator.is_valid(document), (name, validator.errors(document)))
+            validator.validate(document)
+
+    def test_equivalent_to_jsonschema(self):
+        for name, document in self.documents.items():
+            validator = self.validators[name]
+            reference = jsonschema.Draft7Validator(validator.schema)
+            checked = 0
+            for mutated in mutations(document):
+                expected = reference.is_valid(mutated)
+                self.assertEqual(validator.is_valid(mutated), expected, (name, mutated))
+                self.assertEqual(not validator.errors(mutated), expected, name)
+                checked += 1
+            self.assertGreater(checked, 10)
+
+    def test_type_semantics_match_draft7(self):
+        validator = CompiledValidator({
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "minimum": 0},
+                "flag": {"enum": [True, 1]},
+                "tag": {"const": 1}
+            }
+        })
+        reference = jsonschema.Draft7Validator(validator.schema)
+        for doc in (
+            {"count": 3.0}, {"count": True}, {"count": -0.5}, {"flag": 1.0},
+            {"flag": False}, {"tag": True}, {"tag": 1.0}, [], "x"
+        ):
+            self.assertEqual(validator.is_valid(doc), reference.is_valid(doc), doc)
+
+    def test_validate_reports_paths(self):
+        document = copy.deepcopy(self.documents["sim_telemetry"])
+        document["vehicle_id"] = "truck_1"
+        document["speed_mps"] = -1
+        del document["tick"]
+        with self.assertRaises(SchemaValidationError) as ctx:
+            self.validators["sim_telemetry"].validate(document)
+        errors = ctx.exception.errors
+        self.assertEqual(len(errors), 3)
+        self.assertTrue(any(e.startswith("$.vehicle_id:") for e in errors))
+        self.assertTrue(any(e.startswith("$.speed_mps:") for e in errors))
+
+    def test_unsupported_keyword_falls_back_to_jsonschema(self):
+        validator = CompiledValidator({"anyOf": [{"type": "string"}, {"type": "integer"}]})
+        self.assertFalse(validator.compiled)
+        self.assertTrue(validator.is_valid(3))
+        self.assertFalse(validator.is_valid(2.5))
+        self.assertEqual(len(validator.errors(2.5)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
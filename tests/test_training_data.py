@@ -0,0 +1,203 @@
+"""
+Unit tests for the columnar training data store.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add src path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from racing_ai_trainer import FEATURE_SPEC, FEATURES, CompiledFeatureSpec, FeatureSpec, TrainingDataLoader
+from racing_simulator import ControlInput, RacingSimulator, import_training_ndjson
+from training_data import (
+    ColumnarDataset,
+    ColumnarWriter,
+    ColumnSpec,
+    TrainingDataError,
+    is_columnar_dataset
+)
+
+
+class TestColumnarTrainingData(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.sim = RacingSimulator(seed=11, history_capacity=64)
+        rng = np.random.RandomState(11)
+        for _ in range(300):
+            cls.sim.step(ControlInput(float(rng.uniform(-0.2, 0.2)), float(rng.rand()), float(rng.rand() * 0.2)))
+        cls.ndjson = cls.sim.export_training_data(os.path.join(cls.tmp, "train.ndjson"))
+        cls.datasets = {
+            compression: cls.sim.export_training_data(
+                os.path.join(cls.tmp, f"train_{compression}"), format="columnar",
+                compression=compression, chunk_rows=50
+            )
+            for compression in (None, "zlib", "lzma")
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def test_records_round_trip_ndjson(self):
+        with open(self.ndjson) as f:
+            expected = [json.loads(line) for line in f]
+        for path in self.datasets.values():
+            dataset = ColumnarDataset(path)
+            self.assertEqual(len(dataset), 300)
+            self.assertEqual(len(dataset.chunks), 6)
+            self.assertEqual(list(dataset.iter_records()), expected)
+
+    def test_hash_independent_of_compression(self):
+        hashes = {ColumnarDataset(path).dataset_hash for path in self.datasets.values()}
+        self.assertEqual(len(hashes), 1)
+        for path in self.datasets.values():
+            self.assertTrue(ColumnarDataset(path).verify())
+
+    def test_ndjson_import_matches_direct_export(self):
+        path = os.path.join(self.tmp, "imported")
+        manifest = import_training_ndjson(self.ndjson, path, compression="zlib", chunk_rows=50)
+        self.assertEqual(manifest["dataset_hash"], ColumnarDataset(self.datasets[None]).dataset_hash)
+
+    def test_loader_features_match_ndjson_loader(self):
+        legacy = TrainingDataLoader(self.ndjson)
+        legacy.load()
+        X_legacy, y_legacy = legacy.extract_features()
+
+        for path in self.datasets.values():
+            self.assertTrue(is_columnar_dataset(path))
+            loader = TrainingDataLoader(path)
+            self.assertEqual(loader.load(), 300)
+            X, y = loader.extract_features()
+            self.assertEqual(X.dtype, np.float32)
+            self.assertEqual(X.tobytes(), X_legacy.tobytes())
+            for name in ('steering', 'throttle', 'brake'):
+                self.assertEqual(y[name].tobytes(), y_legacy[name].tobytes())
+
+    def test_corrupt_chunk_fails_verification(self):
+        path = os.path.join(self.tmp, "corrupt")
+        shutil.copytree(self.datasets[None], path)
+        with open(os.path.join(path, "chunk_000002.bin"), 'r+b') as f:
+            f.seek(16)
+            f.write(b'\xff')
+        with self.assertRaises(TrainingDataError):
+            ColumnarDataset(path).verify()
+
+    def test_writer_chunks_and_categories(self):
+        path = os.path.join(self.tmp, "small")
+        columns = [
+            ColumnSpec("x", "float32", ("x",)),
+            ColumnSpec("label", "int8", ("label",), ("a", "b"))
+        ]
+        with ColumnarWriter(path, columns, chunk_rows=4) as writer:
+            writer.write({"x": np.arange(6, dtype=np.float32), "label": [0, 1, 0, 1, 0, 1]})
+            writer.write(np.array([[6.0, 7.0], [1, 1]]))
+
+        dataset = ColumnarDataset(path)
+        self.assertEqual([c["rows"] for c in dataset.chunks], [4, 4])
+        self.assertEqual(dataset.read_column("x").tolist(), list(range(8)))
+        self.assertEqual([r["label"] for r in dataset.iter_records()], list("abababbb"))
+
+    def test_incomplete_dataset_rejected(self):
+        path = os.path.join(self.tmp, "incomplete")
+        os.makedirs(path)
+        with self.assertRaises(TrainingDataError):
+            ColumnarDataset(path)
+
+
+
+def legacy_extract(records):
+    """extract_features prior to the compiled feature spec"""
+    feature_names = [spec.name for spec in FEATURE_SPEC]
+    X = np.zeros((len(records), len(feature_names)), dtype=np.float32)
+    for i, record in enumerate(records):
+        state = record['state']
+        for j, fname in enumerate(feature_names):
+            if fname.startswith('upcoming_curvature'):
+                X[i, j] = state['upcoming_curvature'][int(fname.split('_')[-1])]
+            elif fname.startswith('wheel_speed'):
+                X[i, j] = state['wheel_speeds'][int(fname.split('_')[-1])]
+            else:
+                X[i, j] = state[fname]
+    y = {name: np.array([r['action'][f'{name}_command'] for r in records], dtype=np.float32)
+         for name in ('steering', 'throttle', 'brake')}
+    return X, y
+
+
+class TestFeatureExtraction(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        sim = RacingSimulator(seed=5)
+        rng = np.random.RandomState(5)
+        for _ in range(257):
+            sim.step(ControlInput(float(rng.uniform(-0.5, 0.5)), float(rng.rand()), float(rng.rand() * 0.3)))
+        cls.ndjson = sim.export_training_data(os.path.join(cls.tmp, "train.ndjson"))
+        cls.columnar = sim.export_training_data(os.path.join(cls.tmp, "train_col"), format="columnar", chunk_rows=64)
+        with open(cls.ndjson) as f:
+            cls.records = [json.loads(line) for line in f]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def test_matches_legacy_loop(self):
+        X_legacy, y_legacy = legacy_extract(self.records)
+        self.assertEqual(X_legacy.shape, (257, 37))
+
+        loader = TrainingDataLoader(self.ndjson)
+        loader.load()
+        X, y = loader.extract_features()
+        self.assertEqual(X.tobytes(), X_legacy.tobytes())
+        for name in y_legacy:
+            self.assertEqual(y[name].tobytes(), y_legacy[name].tobytes())
+
+    def test_chunked_extraction_concatenates_to_full(self):
+        X_full, y_full = legacy_extract(self.records)
+        for path in (self.ndjson, self.columnar):
+            chunks = list(TrainingDataLoader(path).iter_feature_chunks(chunk_rows=100))
+            self.assertGreater(len(chunks), 1)
+            X = np.concatenate([X for X, _ in chunks])
+            self.assertEqual(X.tobytes(), X_full.tobytes())
+            for name in y_full:
+                y = np.concatenate([y[name] for _, y in chunks])
+                self.assertEqual(y.tobytes(), y_full[name].tobytes())
+
+    def test_row_matches_matrix_and_defaults(self):
+        X = FEATURES.extract_states([r['state'] for r in self.records[:10]])
+        for i, record in enumerate(self.records[:10]):
+            row = np.array([FEATURES.row(record['state'])], dtype=np.float32)
+            self.assertEqual(row.tobytes(), X[i:i + 1].tobytes())
+
+        old_state = dict(self.records[0]['state'])
+        del old_state['tire_wear'], old_state['weather_grip']
+        row = FEATURES.row(old_state)
+        self.assertEqual(row[FEATURES.names.index('tire_wear')], 0.0)
+        self.assertEqual(row[FEATURES.names.index('weather_grip')], 1.2)
+
+    def test_transform_applied_column_wise(self):
+        spec = CompiledFeatureSpec([
+            FeatureSpec('speed_kmh', ('speed',), transform=lambda v: v * 3.6),
+            FeatureSpec('wheel_speed_3', ('wheel_speeds', 3))
+        ])
+        states = [r['state'] for r in self.records[:5]]
+        X = spec.extract_states(states)
+        expected = np.array([[s['speed'] * 3.6, s['wheel_speeds'][3]] for s in states], dtype=np.float32)
+        self.assertEqual(X.tobytes(), expected.tobytes())
+
+        # Prediction rows go through the same transform as the training matrix
+        rows = np.array([spec.row(s) for s in states], dtype=np.float32)
+        self.assertEqual(rows.tobytes(), X.tobytes())
+
+
+if __name__ == '__main__':
+    unittest.main()